@@ -0,0 +1,32 @@
+"""add vehicle_document (status, uploaded_at) index
+
+Revision ID: h8i9j0k1l2m3
+Revises: g7h8i9j0k1l2
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'h8i9j0k1l2m3'
+down_revision: Union[str, None] = 'g7h8i9j0k1l2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Onay kuyruğu (/pending) ve durum istatistikleri için composite index
+    op.create_index(
+        'ix_vehicle_document_status_uploaded',
+        'vehicle_document',
+        ['status', 'uploaded_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_vehicle_document_status_uploaded', table_name='vehicle_document')
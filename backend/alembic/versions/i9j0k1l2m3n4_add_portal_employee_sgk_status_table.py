@@ -0,0 +1,45 @@
+"""add portal_employee_sgk_status table
+
+Revision ID: i9j0k1l2m3n4
+Revises: h8i9j0k1l2m3
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'i9j0k1l2m3n4'
+down_revision: Union[str, None] = 'h8i9j0k1l2m3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Materialize edilmiş SGK uyum durumu (çalışan × dönem)
+    op.create_table(
+        'portal_employee_sgk_status',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('cari_id', sa.Integer(), nullable=False),
+        sa.Column('period_code', sa.String(length=7), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.ForeignKeyConstraint(['employee_id'], ['portal_employee.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['cari_id'], ['Cari.Id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('employee_id', 'period_code', name='uq_portal_emp_sgk_status_emp_period'),
+    )
+    op.create_index(
+        'ix_portal_emp_sgk_status_cari_period',
+        'portal_employee_sgk_status',
+        ['cari_id', 'period_code', 'status'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_portal_emp_sgk_status_cari_period', table_name='portal_employee_sgk_status')
+    op.drop_table('portal_employee_sgk_status')
@@ -0,0 +1,40 @@
+"""add sgk_parse_result table
+
+Revision ID: j0k1l2m3n4o5
+Revises: i9j0k1l2m3n4
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'j0k1l2m3n4o5'
+down_revision: Union[str, None] = 'i9j0k1l2m3n4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SGK hizmet dökümü parse sonuçları (PDF SHA-256 checksum'ı ile)
+    op.create_table(
+        'sgk_parse_result',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('checksum', sa.String(length=64), nullable=False),
+        sa.Column('parser_version', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('period', sa.String(length=6), nullable=True),
+        sa.Column('employee_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('last_used_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_sgk_parse_result_checksum', 'sgk_parse_result', ['checksum'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sgk_parse_result_checksum', table_name='sgk_parse_result')
+    op.drop_table('sgk_parse_result')
@@ -0,0 +1,51 @@
+"""add audit_events_archive table
+
+Revision ID: k1l2m3n4o5p6
+Revises: j0k1l2m3n4o5
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'k1l2m3n4o5p6'
+down_revision: Union[str, None] = 'j0k1l2m3n4o5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Saklama süresini aşan audit kayıtları (id'ler audit_events ile aynı, FK yok)
+    op.create_table(
+        'audit_events_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('method', sa.String(length=10), nullable=False),
+        sa.Column('path', sa.String(length=300), nullable=False),
+        sa.Column('action', sa.String(length=50), nullable=True),
+        sa.Column('resource', sa.String(length=50), nullable=True),
+        sa.Column('entity_id', sa.Integer(), nullable=True),
+        sa.Column('status_code', sa.Integer(), nullable=False),
+        sa.Column('duration_ms', sa.Integer(), nullable=True),
+        sa.Column('roles', sa.String(length=200), nullable=True),
+        sa.Column('ip', sa.String(length=64), nullable=True),
+        sa.Column('user_agent', sa.String(length=300), nullable=True),
+        sa.Column('extra', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_audit_events_archive_created_at', 'audit_events_archive', ['created_at'])
+    op.create_index('ix_audit_events_archive_user_id', 'audit_events_archive', ['user_id'])
+    op.create_index('ix_audit_events_archive_resource', 'audit_events_archive', ['resource'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_events_archive_resource', table_name='audit_events_archive')
+    op.drop_index('ix_audit_events_archive_user_id', table_name='audit_events_archive')
+    op.drop_index('ix_audit_events_archive_created_at', table_name='audit_events_archive')
+    op.drop_table('audit_events_archive')
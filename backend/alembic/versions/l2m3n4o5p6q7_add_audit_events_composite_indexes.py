@@ -0,0 +1,40 @@
+"""add audit_events composite indexes
+
+Revision ID: l2m3n4o5p6q7
+Revises: k1l2m3n4o5p6
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'l2m3n4o5p6q7'
+down_revision: Union[str, None] = 'k1l2m3n4o5p6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Audit sorgu filtreleri + (created_at, id) keyset sıralaması
+    op.create_index('ix_audit_events_user_created', 'audit_events', ['user_id', 'created_at', 'id'])
+    op.create_index('ix_audit_events_resource_action_created', 'audit_events', ['resource', 'action', 'created_at', 'id'])
+    op.create_index('ix_audit_events_status_created', 'audit_events', ['status_code', 'created_at', 'id'])
+    op.create_index('ix_audit_events_path_created', 'audit_events', ['path', 'created_at', 'id'])
+    # Composite index'lerin ön ekiyle karşılanan tek kolon index'ler
+    op.drop_index('ix_audit_events_user_id', table_name='audit_events')
+    op.drop_index('ix_audit_events_resource', table_name='audit_events')
+    op.drop_index('ix_audit_events_path', table_name='audit_events')
+
+
+def downgrade() -> None:
+    op.create_index('ix_audit_events_path', 'audit_events', ['path'])
+    op.create_index('ix_audit_events_resource', 'audit_events', ['resource'])
+    op.create_index('ix_audit_events_user_id', 'audit_events', ['user_id'])
+    op.drop_index('ix_audit_events_path_created', table_name='audit_events')
+    op.drop_index('ix_audit_events_status_created', table_name='audit_events')
+    op.drop_index('ix_audit_events_resource_action_created', table_name='audit_events')
+    op.drop_index('ix_audit_events_user_created', table_name='audit_events')
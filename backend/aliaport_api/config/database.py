@@ -3,6 +3,9 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from pathlib import Path
 
+from ..core.metrics import instrument_sqlalchemy
+from ..core.query_diagnostics import query_diagnostics
+
 # SQLite database - Enterprise yapı
 # Database dosyası backend/database klasöründe (database/aliaport.db)
 DB_PATH = Path(__file__).parent.parent.parent / "database" / "aliaport.db"
@@ -15,6 +18,12 @@ engine = create_engine(
     connect_args={"check_same_thread": False}
 )
 
+# Prometheus: sorgu süreleri + istek başına sorgu sayısı (tüm Engine'ler)
+instrument_sqlalchemy()
+
+# Slow query log + N+1 dedektörü (opt-in: QUERY_DIAGNOSTICS=1)
+query_diagnostics.install(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -1,10 +1,12 @@
-"""Storage configuration helpers for SGK uploads."""
+"""Storage configuration helpers for SGK uploads and generated exports."""
 from __future__ import annotations
 
 import os
+import re
 from pathlib import Path
 
 DEFAULT_BASE_SGK_DIR = "./uploads/sgk"  # Proje içinde uploads klasörü
+DEFAULT_EXPORTS_DIR = "./uploads/exports"  # Hazırlanmış indirme arşivleri
 
 
 def get_base_sgk_dir() -> Path:
@@ -19,3 +21,20 @@ def get_base_sgk_dir() -> Path:
     except FileNotFoundError:
         # Path may be on a mount that does not exist yet; fall back to expanded path
         return base_path
+
+
+def get_exports_dir() -> Path:
+    """Return the base directory for prepared export archives as an absolute Path."""
+    base_path = Path(os.getenv("EXPORTS_DIR", DEFAULT_EXPORTS_DIR)).expanduser()
+    base_path.mkdir(parents=True, exist_ok=True)
+    try:
+        return base_path.resolve()
+    except FileNotFoundError:
+        return base_path
+
+
+def sanitize_storage_segment(raw_value: str) -> str:
+    """Normalize path segments so they are filesystem safe."""
+    cleaned = (raw_value or "FIRMA").strip().upper()
+    safe_value = re.sub(r"[^A-Z0-9_-]+", "_", cleaned)
+    return safe_value or "FIRMA"
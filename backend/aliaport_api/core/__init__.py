@@ -9,8 +9,11 @@ from .responses import (
     PaginatedResponse,
     success_response,
     error_response,
-    paginated_response
+    paginated_response,
+    fast_success_response,
+    fast_paginated_response
 )
+from .json_response import FastJSONResponse, RawJSONResponse
 from .error_codes import (
     ErrorCode,
     get_http_status_for_error,
@@ -25,6 +28,10 @@ __all__ = [
     'success_response',
     'error_response',
     'paginated_response',
+    'fast_success_response',
+    'fast_paginated_response',
+    'FastJSONResponse',
+    'RawJSONResponse',
     'ErrorCode',
     'get_http_status_for_error',
     'get_default_message',
@@ -8,6 +8,8 @@ from typing import Any, Optional, Dict, Tuple, Callable
 import time
 import threading
 
+from .metrics import record_cache_lookup
+
 
 # ============================================================================
 # ABSTRACTION LAYER: Cache Backend Interface
@@ -52,6 +54,7 @@ class CacheBackend(ABC):
     def get_or_set(self, key: str, ttl_seconds: int, fetcher: Callable[[], Any]) -> Tuple[Any, bool]:
         """Get from cache or compute and store. Returns (value, cache_hit)."""
         data = self.get(key)
+        record_cache_lookup(key, data is not None)
         if data is not None:
             return data, True  # cache hit
         value = fetcher()
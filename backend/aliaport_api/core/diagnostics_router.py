@@ -0,0 +1,26 @@
+"""
+SQL Teşhis Endpoint'leri (yalnızca sistem yöneticisi)
+
+QUERY_DIAGNOSTICS=1 iken toplanan istek profillerini (sorgu sayısı, DB süresi,
+en yavaş statement'lar, N+1 şekilleri) gösterir.
+"""
+from fastapi import APIRouter, Depends
+
+from .query_diagnostics import query_diagnostics
+from .responses import success_response
+from ..modules.auth.dependencies import require_role
+
+router = APIRouter(prefix="/api/diagnostics", tags=["Monitoring"])
+
+
+@router.get("/queries")
+def get_query_diagnostics(_admin=Depends(require_role(["SISTEM_YONETICISI"]))):
+    """Son isteklerin SQL profilleri ve route bazında özet"""
+    return success_response(data=query_diagnostics.snapshot(), message="Sorgu teşhis raporu")
+
+
+@router.delete("/queries")
+def reset_query_diagnostics(_admin=Depends(require_role(["SISTEM_YONETICISI"]))):
+    """Toplanan profilleri temizler"""
+    query_diagnostics.reset()
+    return success_response(data=None, message="Sorgu teşhis raporu temizlendi")
@@ -0,0 +1,101 @@
+"""
+Aliaport v3.1 - Hızlı JSON Serileştirme
+
+- FastJSONResponse: orjson tabanlı JSONResponse (uygulama varsayılanı).
+  Decimal / datetime / date / Enum / UUID / Pydantic modelleri doğrudan işler.
+  orjson kurulu değilse stdlib json'a düşer (aynı çıktı kuralları).
+- serialize_rows: ORM satırlarını şema başına cache'lenmiş TypeAdapter ile
+  JSON byte'larına çevirir. Üç adım vardır: validate_python (from_attributes)
+  -> dump_python -> orjson. TypeAdapter.dump_json kullanılmaz: Pydantic
+  Decimal'i string yazar, uygulamanın geri kalanı (FastJSONResponse) ise sayı.
+  Kazanç satır başına model_validate/jsonable_encoder yerine tek adapter
+  çağrısı ve Rust tarafında kalan dönüşümlerdir.
+- RawJSONResponse: Önceden üretilmiş JSON byte'larını tekrar işlemeden döner
+  (FastAPI'nin jsonable_encoder geçişi atlanır).
+"""
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Iterable, List, Type
+from uuid import UUID
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - opsiyonel bağımlılık
+    orjson = None
+
+
+def _decimal_to_number(value: Decimal):
+    """FastAPI jsonable_encoder ile aynı kural: tam sayıysa int, değilse float."""
+    if value.as_tuple().exponent >= 0:
+        return int(value)
+    return float(value)
+
+
+def json_default(obj: Any) -> Any:
+    """orjson/json'un doğrudan desteklemediği tipler için dönüştürücü."""
+    if isinstance(obj, Decimal):
+        return _decimal_to_number(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    # Aşağıdakiler yalnızca stdlib json fallback'inde gerekir (orjson native destekler)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """Objeyi JSON byte'larına çevirir."""
+        return orjson.dumps(obj, default=json_default, option=_ORJSON_OPTIONS)
+else:  # pragma: no cover
+    def dumps(obj: Any) -> bytes:
+        """Objeyi JSON byte'larına çevirir (stdlib fallback)."""
+        return json.dumps(obj, default=json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson ile render eden JSONResponse (app default_response_class)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class RawJSONResponse(Response):
+    """Hazır JSON byte'larını olduğu gibi dönen response."""
+
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=256)
+def schema_serializer(schema: Type[BaseModel]) -> TypeAdapter:
+    """Şema için List[schema] TypeAdapter'ı (şema başına bir kez oluşturulur)."""
+    return TypeAdapter(List[schema])
+
+
+def rows_to_dicts(schema: Type[BaseModel], rows: Iterable[Any]) -> List[dict]:
+    """ORM satırlarını tek adapter üzerinden şemaya göre doğrulayıp dict listesine çevirir."""
+    adapter = schema_serializer(schema)
+    rows = rows if isinstance(rows, list) else list(rows)
+    return adapter.dump_python(adapter.validate_python(rows, from_attributes=True))
+
+
+def serialize_rows(schema: Type[BaseModel], rows: Iterable[Any]) -> bytes:
+    """ORM satırlarını JSON dizisi byte'larına çevirir (Decimal kuralı FastJSONResponse ile aynı)."""
+    return dumps(rows_to_dicts(schema, rows))
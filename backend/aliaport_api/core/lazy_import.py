@@ -0,0 +1,89 @@
+"""
+Aliaport v3.1 - Lazy Import Yardımcıları
+
+Cold start süresini kısaltmak için ağır/opsiyonel bağımlılıklar (pdfminer,
+openpyxl, psutil) ve modül router'ları ilk kullanımda yüklenir.
+
+Kullanım:
+    psutil = lazy_import("psutil")          # psutil.cpu_percent() ilk çağrıda import eder
+
+    # Paket __init__.py (PEP 562):
+    __getattr__ = lazy_exports(globals(), router=".router:router")
+"""
+
+import importlib
+import threading
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional
+
+
+class LazyModule(ModuleType):
+    """İlk attribute erişiminde gerçek modülü import eden vekil modül."""
+
+    def __init__(self, name: str, on_load: Optional[Callable[[str, float], None]] = None):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+        self.__dict__["_lazy_on_load"] = on_load
+
+    def _load(self) -> ModuleType:
+        target = self.__dict__["_lazy_target"]
+        if target is not None:
+            return target
+        with self.__dict__["_lazy_lock"]:
+            target = self.__dict__["_lazy_target"]
+            if target is None:
+                start = time.perf_counter()
+                target = importlib.import_module(self.__name__)
+                self.__dict__["_lazy_target"] = target
+                on_load = self.__dict__["_lazy_on_load"]
+                if on_load:
+                    on_load(self.__name__, time.perf_counter() - start)
+        return target
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._load(), item)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__["_lazy_target"] is not None
+
+
+def _record_lazy_load(name: str, seconds: float) -> None:
+    from .startup_profile import startup_profile
+
+    startup_profile.record_lazy_import(name, seconds)
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Modülü ilk kullanımda import eden vekil döner (yükleme süresi startup profiline yazılır)."""
+    return LazyModule(name, on_load=_record_lazy_load)
+
+
+def lazy_exports(module_globals: Dict[str, Any], **exports: str) -> Callable[[str], Any]:
+    """
+    Paket seviyesinde PEP 562 `__getattr__` üretir.
+
+    Args:
+        module_globals: Paketin globals() sözlüğü
+        exports: {isim: ".altmodul:attribute"} eşlemesi
+
+    Yüklenen değer paketin globals'ına yazılır; sonraki erişimler doğrudan olur.
+    """
+    package = module_globals["__name__"]
+
+    def __getattr__(name: str) -> Any:
+        target = exports.get(name)
+        if target is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module_path, _, attr = target.partition(":")
+        module = importlib.import_module(module_path, package)
+        value = getattr(module, attr) if attr else module
+        module_globals[name] = value
+        return value
+
+    return __getattr__
@@ -1,16 +1,41 @@
 """
 Aliaport v3.1 - Logging Configuration
 Structured JSON logging with rotation and filtering
+
+Pipeline:
+    logger -> SamplingFilter -> NonBlockingQueueHandler -> queue.Queue
+           -> BatchingQueueListener (arka plan thread) -> console / app / api / error / audit
+
+Request yolundaki maliyet bir filtre + queue put'tur. Formatlama (JSON),
+dosyaya yazma ve flush listener thread'inde, kuyruktaki kayıtlar toplu
+(batch) işlenerek yapılır. Kuyruk doluysa kayıt bekletilmez, düşürülür ve
+sayaçta görünür (get_logging_stats / GET /status).
+
+Ortam değişkenleri:
+    LOG_QUEUE_SIZE        Kuyruk kapasitesi (varsayılan 10000)
+    LOG_BATCH_SIZE        Listener'ın bir seferde yazdığı max kayıt (varsayılan 256)
+    LOG_API_SAMPLE_RATE   api_request kayıtlarının tutulma oranı 0-1 (varsayılan 1.0);
+                          4xx/5xx ve yavaş istekler her zaman tutulur
 """
 
+import atexit
+import copy
 import logging
+import os
+import queue
+import random
 import sys
+import threading
+import time
 from pathlib import Path
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
-from datetime import datetime
-import json
-from typing import Any, Dict
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 from aliaport_api.modules.audit.utils import persist_business_event  # DB persistence for audit
+from .json_response import dumps as json_dumps
+
+AUDIT_LOGGER_NAME = "audit"
+API_REQUEST_TYPE = "api_request"
 
 
 class JSONFormatter(logging.Formatter):
@@ -22,8 +47,9 @@ class JSONFormatter(logging.Formatter):
         """
         Format log record as JSON
         """
+        # Kayıt listener thread'inde formatlanır; zaman damgası kaydın oluştuğu an
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).replace(tzinfo=None).isoformat() + "Z",
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -40,15 +66,17 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "user_id"):
             log_data["user_id"] = record.user_id
         
-        # Exception bilgisi varsa ekle
+        # Exception bilgisi varsa ekle (queue handler traceback'i önceden metne çevirir)
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_data["exception"] = record.exc_text
         
         # Extra fields
         if hasattr(record, "extra_data"):
             log_data["extra"] = record.extra_data
         
-        return json.dumps(log_data, ensure_ascii=False)
+        return json_dumps(log_data).decode("utf-8")
 
 
 class ColoredConsoleFormatter(logging.Formatter):
@@ -70,17 +98,327 @@ class ColoredConsoleFormatter(logging.Formatter):
         """
         Format with colors for console
         """
-        color = self.COLORS.get(record.levelname, self.RESET)
-        record.levelname = f"{color}{record.levelname}{self.RESET}"
-        return super().format(record)
+        # Kayıt diğer handler'larla paylaşıldığı için levelname kalıcı değiştirilmez
+        original_levelname = record.levelname
+        color = self.COLORS.get(original_levelname, self.RESET)
+        record.levelname = f"{color}{original_levelname}{self.RESET}"
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = original_levelname
+
+
+# ============================================
+# QUEUE PIPELINE
+# ============================================
+
+def _is_api_request(record: logging.LogRecord) -> bool:
+    extra_data = getattr(record, "extra_data", None)
+    return isinstance(extra_data, dict) and extra_data.get("type") == API_REQUEST_TYPE
+
+
+def _is_audit(record: logging.LogRecord) -> bool:
+    return record.name == AUDIT_LOGGER_NAME or record.name.startswith(AUDIT_LOGGER_NAME + ".")
+
+
+class _RouteFilter(logging.Filter):
+    """Listener tarafında kaydı doğru dosyaya yönlendiren filtre."""
+
+    def __init__(self, audit: bool, api_request: Optional[bool] = None):
+        super().__init__()
+        self.audit = audit
+        self.api_request = api_request
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if _is_audit(record) != self.audit:
+            return False
+        if self.api_request is not None and _is_api_request(record) != self.api_request:
+            return False
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Yüksek hacimli api_request kayıtlarını örnekler (logger bazlı oran).
+
+    Hata (status >= 400) ve yavaş (duration_ms >= slow_ms) istekler her zaman tutulur.
+    Diğer kayıtlar etkilenmez.
+    """
+
+    def __init__(self, default_rate: float = 1.0, rates: Optional[Dict[str, float]] = None, slow_ms: float = 1000.0):
+        super().__init__()
+        self.default_rate = default_rate
+        self.rates = rates or {}
+        self.slow_ms = slow_ms
+        self.sampled_out = 0
+
+    def rate_for(self, logger_name: str) -> float:
+        return self.rates.get(logger_name, self.default_rate)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        extra_data = getattr(record, "extra_data", None)
+        if not isinstance(extra_data, dict) or extra_data.get("type") != API_REQUEST_TYPE:
+            return True
+        rate = self.rate_for(record.name)
+        if rate >= 1.0:
+            return True
+        if extra_data.get("status_code", 0) >= 400 or extra_data.get("duration_ms", 0) >= self.slow_ms:
+            return True
+        if random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Kaydı formatlamadan kuyruğa koyan handler.
+
+    QueueHandler.prepare() kaydı çağıran thread'de formatlar; burada yalnızca
+    mesaj argümanları çözülür (mutable argümanların sonradan değişmesine karşı),
+    JSON/konsol formatlaması listener thread'ine bırakılır.
+    Exception traceback'i (nadir) çağıran thread'de metne çevrilir: frame'ler
+    kuyrukta tutulmaz ve Python 3.11'de traceback formatlaması (ast.parse)
+    thread-safe değildir.
+    Stdlib'deki gibi kaydın kopyası değiştirilir; aynı kaydı gören diğer
+    handler/filtreler (caplog vb.) orijinal msg/args/exc_info'yu görür.
+    Kuyruk doluysa kayıt düşürülür (request bloklanmaz).
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        record = copy.copy(record)
+        record.message = message
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+class _DeferredFlushMixin:
+    """Batch süresince flush'ı erteleyen handler mixin'i (batch sonunda tek flush)."""
+
+    _defer_flush = False
+
+    def flush(self) -> None:
+        if not self._defer_flush:
+            super().flush()
+
+    def begin_batch(self) -> None:
+        self._defer_flush = True
+
+    def end_batch(self) -> None:
+        self._defer_flush = False
+        self.flush()
+
+
+class BatchedConsoleHandler(_DeferredFlushMixin, logging.StreamHandler):
+    """
+    sys.stdout'a yazan handler; stream her yazımda çözülür.
+
+    Listener thread'i uzun yaşar; sys.stdout sonradan değiştirilirse (test
+    capture, reload) kapanmış eski stream'e yazılmaz.
+    """
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class BatchedFileHandler(_DeferredFlushMixin, logging.FileHandler):
+    pass
+
+
+class BatchedRotatingFileHandler(_DeferredFlushMixin, RotatingFileHandler):
+    pass
+
+
+class BatchedTimedRotatingFileHandler(_DeferredFlushMixin, TimedRotatingFileHandler):
+    pass
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    Kuyruğu arka plan thread'inde boşaltan listener.
+
+    Bir kayıt geldiğinde kuyrukta bekleyenler (batch_size'a kadar) beklemeden
+    alınır, tüm handler'lara yazılır ve handler'lar batch sonunda bir kez flush edilir.
+    """
+
+    def __init__(self, log_queue: "queue.Queue", *handlers: logging.Handler, batch_size: int = 256):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.written = 0
+        self.batches = 0
+
+    def _monitor(self) -> None:
+        q = self.queue
+        while True:
+            batch = [q.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            for handler in self.handlers:
+                if isinstance(handler, _DeferredFlushMixin):
+                    handler.begin_batch()
+            try:
+                for record in batch:
+                    if record is self._sentinel:
+                        stop = True
+                        continue
+                    try:
+                        self.handle(record)
+                        self.written += 1
+                    except Exception:
+                        pass
+            finally:
+                for handler in self.handlers:
+                    if isinstance(handler, _DeferredFlushMixin):
+                        try:
+                            handler.end_batch()
+                        except Exception:
+                            pass
+                self.batches += 1
+                for _ in batch:
+                    q.task_done()
+            if stop:
+                break
+
+
+class LoggingPipeline:
+    """Queue handler + listener çiftini ve sayaçlarını bir arada tutar."""
+
+    def __init__(
+        self,
+        handlers: List[logging.Handler],
+        queue_size: int = 10000,
+        batch_size: int = 256,
+        sampling: Optional[SamplingFilter] = None,
+    ):
+        self.queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.queue_handler = NonBlockingQueueHandler(self.queue)
+        self.sampling = sampling
+        if sampling is not None:
+            self.queue_handler.addFilter(sampling)
+        self.handlers = handlers
+        self.listener = BatchingQueueListener(self.queue, *handlers, batch_size=batch_size)
+        self._started = False
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if not self._started:
+                self.listener.start()
+                self._started = True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Kuyruktaki tüm kayıtlar yazılana kadar bekler (timeout'ta False)."""
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks:
+            if not self._started or time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Kuyruğu boşaltıp listener'ı durdurur ve handler'ları kapatır.
+
+        Listener thread'i ölmüşse veya timeout içinde boşaltamazsa kapanış
+        askıda kalmaz; kuyrukta kalan kayıtlar bırakılır.
+        """
+        with self._lock:
+            if not self._started:
+                return
+            self._started = False
+            thread = self.listener._thread
+            if thread is not None and thread.is_alive():
+                # Kuyruk doluysa sentinel beklemeli eklenir (listener boşaltıyor)
+                try:
+                    self.queue.put(self.listener._sentinel, timeout=timeout)
+                except queue.Full:
+                    pass
+                else:
+                    thread.join(timeout)
+            self.listener._thread = None
+            for handler in self.handlers:
+                handler.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+            "enqueued": self.queue_handler.enqueued,
+            "written": self.listener.written,
+            "dropped": self.queue_handler.dropped,
+            "sampled_out": self.sampling.sampled_out if self.sampling else 0,
+            "batches": self.listener.batches,
+        }
+
+
+_pipeline: Optional[LoggingPipeline] = None
+
+
+def get_logging_pipeline() -> Optional[LoggingPipeline]:
+    return _pipeline
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Kuyruk / yazılan / düşürülen kayıt sayaçları (pipeline yoksa boş)."""
+    return _pipeline.stats() if _pipeline is not None else {}
+
+
+def flush_logging(timeout: float = 5.0) -> bool:
+    """Bekleyen log kayıtlarını diske yazar."""
+    return _pipeline.flush(timeout) if _pipeline is not None else True
+
+
+def shutdown_logging() -> None:
+    """Listener'ı durdurur (process çıkışında atexit ile çağrılır)."""
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.stop()
+        _pipeline = None
 
 
 def setup_logging(
     log_dir: Path = Path("logs"),
     log_level: str = "INFO",
     enable_console: bool = True,
-    enable_json: bool = True
-) -> None:
+    enable_json: bool = True,
+    queue_size: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    api_sample_rate: Optional[float] = None,
+    sample_rates: Optional[Dict[str, float]] = None,
+) -> LoggingPipeline:
     """
     Setup logging configuration
     
@@ -89,23 +427,36 @@ def setup_logging(
         log_level: Minimum log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         enable_console: Enable console output
         enable_json: Enable JSON file output
+        queue_size: Log kuyruğu kapasitesi (None ise LOG_QUEUE_SIZE)
+        batch_size: Listener batch boyutu (None ise LOG_BATCH_SIZE)
+        api_sample_rate: api_request örnekleme oranı (None ise LOG_API_SAMPLE_RATE)
+        sample_rates: Logger bazlı api_request örnekleme oranları
+    
+    Returns:
+        LoggingPipeline (sayaçlar için)
     """
+    global _pipeline
+    
+    if queue_size is None:
+        queue_size = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    if batch_size is None:
+        batch_size = int(os.getenv("LOG_BATCH_SIZE", "256"))
+    if api_sample_rate is None:
+        api_sample_rate = float(os.getenv("LOG_API_SAMPLE_RATE", "1.0"))
+    
+    # Yeniden kurulumda önceki listener'ı durdur
+    shutdown_logging()
     
     # Log dizinini oluştur
     log_dir.mkdir(parents=True, exist_ok=True)
     
-    # Root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, log_level.upper()))
-    
-    # Clear existing handlers
-    root_logger.handlers.clear()
+    handlers: List[logging.Handler] = []
     
     # ============================================
     # CONSOLE HANDLER (Development)
     # ============================================
     if enable_console:
-        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler = BatchedConsoleHandler()
         console_handler.setLevel(logging.DEBUG)
         
         # Colored formatter for development
@@ -115,67 +466,85 @@ def setup_logging(
             datefmt="%Y-%m-%d %H:%M:%S"
         )
         console_handler.setFormatter(console_formatter)
-        root_logger.addHandler(console_handler)
+        console_handler.addFilter(_RouteFilter(audit=False))
+        handlers.append(console_handler)
     
     # ============================================
     # FILE HANDLERS
     # ============================================
+    json_formatter = JSONFormatter()
     
-    # 1. General Application Log (JSON, Daily Rotation)
+    # 1. General Application Log (JSON, Daily Rotation) - api_request kayıtları hariç
     if enable_json:
-        app_log_file = log_dir / "app.log"
-        app_handler = TimedRotatingFileHandler(
-            filename=app_log_file,
+        app_handler = BatchedTimedRotatingFileHandler(
+            filename=log_dir / "app.log",
             when="midnight",
             interval=1,
             backupCount=30,  # 30 gün saklama
             encoding="utf-8"
         )
         app_handler.setLevel(logging.INFO)
-        app_handler.setFormatter(JSONFormatter())
-        root_logger.addHandler(app_handler)
+        app_handler.setFormatter(json_formatter)
+        app_handler.addFilter(_RouteFilter(audit=False, api_request=False))
+        handlers.append(app_handler)
     
-    # 2. API Request Log (JSON, Daily Rotation)
-    api_log_file = log_dir / "api.log"
-    api_handler = logging.FileHandler(
-        filename=api_log_file,
+    # 2. API Request Log (JSON) - yalnızca api_request kayıtları (app.log'a tekrar yazılmaz)
+    api_handler = BatchedFileHandler(
+        filename=log_dir / "api.log",
         encoding="utf-8"
     )
     api_handler.setLevel(logging.INFO)
-    api_handler.setFormatter(JSONFormatter())
-    
-    # Sadece API logger'ından gelenleri yaz
-    api_logger = logging.getLogger("aliaport_api")
-    api_logger.addHandler(api_handler)
-    api_logger.propagate = True  # Root logger'a da gönder
+    api_handler.setFormatter(json_formatter)
+    api_handler.addFilter(_RouteFilter(audit=False, api_request=True))
+    handlers.append(api_handler)
     
     # 3. Error Log (Only ERROR and CRITICAL, Size-based Rotation)
-    error_log_file = log_dir / "error.log"
-    error_handler = RotatingFileHandler(
-        filename=error_log_file,
+    error_handler = BatchedRotatingFileHandler(
+        filename=log_dir / "error.log",
         maxBytes=10 * 1024 * 1024,  # 10 MB
         backupCount=10,
         encoding="utf-8"
     )
     error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(JSONFormatter())
-    root_logger.addHandler(error_handler)
+    error_handler.setFormatter(json_formatter)
+    error_handler.addFilter(_RouteFilter(audit=False))
+    handlers.append(error_handler)
     
     # 4. Audit Log (Critical business operations)
-    audit_log_file = log_dir / "audit.log"
-    audit_handler = TimedRotatingFileHandler(
-        filename=audit_log_file,
+    audit_handler = BatchedTimedRotatingFileHandler(
+        filename=log_dir / "audit.log",
         when="midnight",
         interval=1,
         backupCount=90,  # 90 gün saklama (önemli işlemler)
         encoding="utf-8"
     )
     audit_handler.setLevel(logging.INFO)
-    audit_handler.setFormatter(JSONFormatter())
+    audit_handler.setFormatter(json_formatter)
+    audit_handler.addFilter(_RouteFilter(audit=True))
+    handlers.append(audit_handler)
+    
+    pipeline = LoggingPipeline(
+        handlers,
+        queue_size=queue_size,
+        batch_size=batch_size,
+        sampling=SamplingFilter(default_rate=api_sample_rate, rates=sample_rates),
+    )
+    
+    # Root logger: tek handler (queue put)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(getattr(logging, log_level.upper()))
+    root_logger.handlers.clear()
+    root_logger.addHandler(pipeline.queue_handler)
     
-    # Audit logger (ayrı namespace)
-    audit_logger = logging.getLogger("audit")
-    audit_logger.addHandler(audit_handler)
+    # API logger'ına ayrı handler eklenmez (root üzerinden tek kez kuyruğa girer)
+    api_logger = logging.getLogger("aliaport_api")
+    api_logger.handlers.clear()
+    api_logger.propagate = True
+    
+    # Audit logger (ayrı namespace, root'a gönderilmez; aynı kuyruğu kullanır)
+    audit_logger = logging.getLogger(AUDIT_LOGGER_NAME)
+    audit_logger.handlers.clear()
+    audit_logger.addHandler(pipeline.queue_handler)
     audit_logger.propagate = False  # Root'a gönderme
     
     # ============================================
@@ -184,8 +553,16 @@ def setup_logging(
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
     
+    pipeline.start()
+    _pipeline = pipeline
+    
     # Initial log
-    root_logger.info(f"Logging initialized: level={log_level}, dir={log_dir}")
+    root_logger.info(f"Logging initialized: level={log_level}, dir={log_dir}, queue={queue_size}, batch={batch_size}")
+    
+    return pipeline
+
+
+atexit.register(shutdown_logging)
 
 
 def get_logger(name: str) -> logging.Logger:
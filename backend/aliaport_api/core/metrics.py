@@ -0,0 +1,321 @@
+"""
+Prometheus Metrikleri (FAZ 6)
+
+Tüm metrik tanımları burada tutulur; monitoring router'ı, request pipeline,
+cache katmanı, SQLAlchemy event'leri ve scheduler buradan besler. Modül yalnızca
+prometheus_client / sqlalchemy import eder (config/database import döngüsü yok).
+
+- HTTP (RED): route şablonu bazında istek sayısı + süre histogramı, işlenen istek gauge'u
+  (endpoint etiketi ham path değil `/api/cari/{cari_id}` gibi şablondur; eşleşmeyen
+  istekler "unmatched" etiketine düşer, kardinalite sınırlı kalır)
+- DB: sorgu süresi (operasyon bazında) + istek başına sorgu sayısı ve toplam DB süresi
+  (query_diagnostics statement gözlemcisi olarak aynı listener'a bağlanır)
+- Cache: namespace bazında hit/miss
+- Scheduler: job süreleri (başarılı/hatalı) ve kaçırılan çalıştırmalar
+- Auth: şifre hash havuzunda kuyruk bekleme, hash süresi, bekleyen/reddedilen işlemler
+- Rate limit: limiter/policy bazında izin verilen ve reddedilen istekler
+- Audit: arşiv tablosuna taşınan kayıt sayısı
+
+Çok worker'lı uvicorn/gunicorn: PROMETHEUS_MULTIPROC_DIR ayarlıysa değerler
+prometheus_client tarafından süreç başına mmap dosyalarına yazılır ve /metrics
+tüm worker'ları MultiProcessCollector ile toplar. Dizin her deploy'da boş olarak
+oluşturulmalıdır.
+"""
+
+import os
+import time
+import weakref
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+UNMATCHED_ENDPOINT = "unmatched"
+
+# HTTP (RED)
+REQUEST_COUNT = Counter('aliaport_http_requests_total', 'Total HTTP requests', ['method', 'endpoint', 'status'])
+REQUEST_DURATION = Histogram(
+    'aliaport_http_request_duration_seconds', 'HTTP request duration', ['method', 'endpoint'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    'aliaport_http_requests_in_progress', 'HTTP requests currently being processed', ['method'],
+    multiprocess_mode='livesum',
+)
+
+# Database
+DB_QUERY_DURATION = Histogram(
+    'aliaport_db_query_duration_seconds', 'Database statement duration', ['operation'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    'aliaport_db_queries_per_request', 'Database statements executed per HTTP request', ['endpoint'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    'aliaport_db_time_per_request_seconds', 'Total database time per HTTP request', ['endpoint'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+DB_CONNECTIONS = Gauge('aliaport_db_connections', 'Database connections', multiprocess_mode='max')
+
+# Cache
+CACHE_REQUESTS = Counter('aliaport_cache_requests_total', 'Cache lookups', ['namespace', 'result'])
+CACHE_HIT_RATE = Gauge('aliaport_cache_hit_rate', 'Cache hit rate percentage', multiprocess_mode='liveall')
+
+# Scheduler
+SCHEDULER_JOB_DURATION = Histogram(
+    'aliaport_scheduler_job_duration_seconds', 'Background job run duration', ['job_id', 'status'],
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+SCHEDULER_JOB_MISSED = Counter('aliaport_scheduler_job_missed_total', 'Missed background job runs', ['job_id'])
+
+# Auth (şifre hash havuzu)
+PASSWORD_HASH_QUEUE_WAIT = Histogram(
+    'aliaport_password_hash_queue_wait_seconds', 'Time password operations wait for a pool worker', ['operation'],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+PASSWORD_HASH_DURATION = Histogram(
+    'aliaport_password_hash_duration_seconds', 'Password hash/verify duration', ['operation'],
+    buckets=(0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.5),
+)
+PASSWORD_HASH_PENDING = Gauge(
+    'aliaport_password_hash_pending', 'Password operations queued or running', multiprocess_mode='livesum',
+)
+PASSWORD_HASH_REJECTED = Counter(
+    'aliaport_password_hash_rejected_total', 'Password operations rejected by a saturated pool', ['operation'],
+)
+
+# Rate limit (policy etiketi "10 per 1 minute" biçimindedir; sayısı dekoratörlerle sınırlı)
+RATE_LIMIT_REQUESTS = Counter(
+    'aliaport_rate_limit_requests_total', 'Rate limit decisions', ['limiter', 'policy', 'result'],
+)
+
+# Audit arşivi
+AUDIT_ARCHIVED_ROWS = Counter('aliaport_audit_archived_rows_total', 'Audit events moved to the archive table')
+
+# Users
+ACTIVE_USERS = Gauge('aliaport_active_users', 'Number of active users', multiprocess_mode='livesum')
+
+# Business Metrics
+WORK_ORDERS_TOTAL = Counter('aliaport_work_orders_total', 'Total work orders created', ['status'])
+GATE_LOGS_TOTAL = Counter('aliaport_gate_logs_total', 'Total gate logs', ['direction'])
+CURRENCY_SYNC_SUCCESS = Counter('aliaport_currency_sync_success', 'Successful currency syncs')
+CURRENCY_SYNC_FAILURE = Counter('aliaport_currency_sync_failure', 'Failed currency syncs')
+
+
+# ============================================
+# HTTP
+# ============================================
+
+def route_template(scope) -> str:
+    """Routing sonrası eşleşen route'un şablonunu döner (eşleşme yoksa 'unmatched')."""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path or UNMATCHED_ENDPOINT
+
+
+def observe_request(method: str, endpoint: str, status_code: int, duration_seconds: float,
+                    db_stats: Optional["RequestDbStats"] = None) -> None:
+    """Tamamlanan HTTP isteğinin RED ve DB metriklerini kaydeder."""
+    REQUEST_COUNT.labels(method, endpoint, str(status_code)).inc()
+    REQUEST_DURATION.labels(method, endpoint).observe(duration_seconds)
+    if db_stats is not None:
+        DB_QUERIES_PER_REQUEST.labels(endpoint).observe(db_stats.query_count)
+        DB_TIME_PER_REQUEST.labels(endpoint).observe(db_stats.duration)
+
+
+# ============================================
+# DATABASE
+# ============================================
+
+@dataclass
+class RequestDbStats:
+    """Bir istek boyunca çalışan SQL statement sayısı ve toplam süresi"""
+    query_count: int = 0
+    duration: float = 0.0
+    profile: Optional[Any] = None  # QUERY_DIAGNOSTICS açıkken isteğin QueryProfile'ı
+
+
+# Request pipeline her istek için yeni bir RequestDbStats koyar. Sync endpoint'ler
+# threadpool'da context kopyasıyla çalışır; nesne aynı olduğu için sayımlar birikir.
+request_db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("aliaport_request_db_stats", default=None)
+
+_QUERY_START_ATTR = "_aliaport_query_start"
+
+# Engine bazında statement gözlemcileri: (statement, süre_sn, istek stats'ı).
+# Süre burada bir kez ölçülür; query_diagnostics kendi listener'ını eklemez.
+StatementObserver = Callable[[str, float, Optional[RequestDbStats]], None]
+_statement_observers: "weakref.WeakKeyDictionary[Any, List[StatementObserver]]" = weakref.WeakKeyDictionary()
+_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE"})
+
+
+def statement_operation(statement: str) -> str:
+    """SQL'in ilk anahtar kelimesinden düşük kardinaliteli operasyon etiketi üretir."""
+    keyword = statement.lstrip()[:6].upper()
+    return keyword.lower() if keyword in _OPERATIONS else "other"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        setattr(context, _QUERY_START_ATTR, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, _QUERY_START_ATTR, None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    DB_QUERY_DURATION.labels(statement_operation(statement)).observe(elapsed)
+    stats = request_db_stats.get()
+    if stats is not None:
+        stats.query_count += 1
+        stats.duration += elapsed
+    for observer in _statement_observers.get(conn.engine, ()):
+        observer(statement, elapsed, stats)
+
+
+def add_statement_observer(engine, observer: StatementObserver) -> None:
+    """Engine'in statement'larını metrik listener'ından (aynı süre ölçümüyle) alır; tekrar eklemez."""
+    instrument_sqlalchemy()
+    observers = _statement_observers.setdefault(engine, [])
+    if observer not in observers:
+        observers.append(observer)
+
+
+def has_statement_observer(engine, observer: StatementObserver) -> bool:
+    return observer in _statement_observers.get(engine, ())
+
+
+def instrument_sqlalchemy() -> None:
+    """Tüm Engine'lere sorgu süresi listener'larını bir kez ekler (test engine'leri dahil)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ============================================
+# CACHE
+# ============================================
+
+def record_cache_lookup(key: str, hit: bool) -> None:
+    """Cache anahtarının namespace'i (ilk ':' öncesi) bazında hit/miss sayar."""
+    namespace = key.split(":", 1)[0]
+    CACHE_REQUESTS.labels(namespace, "hit" if hit else "miss").inc()
+
+
+# ============================================
+# SCHEDULER
+# ============================================
+
+def run_timed_job(job_id: str, func_ref: str, *args, **kwargs):
+    """
+    Job gövdesini çalıştırıp süresini histogram'a yazar (instrument_scheduler'ın sarmalayıcısı).
+
+    Fonksiyon metin referansıyla (module:qualname) taşınır; böylece job
+    SQLAlchemyJobStore'da serileştirilebilir kalır.
+    """
+    from apscheduler.util import ref_to_obj
+
+    func = ref_to_obj(func_ref)
+    status = "error"
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+        status = "success"
+        return result
+    finally:
+        SCHEDULER_JOB_DURATION.labels(job_id, status).observe(time.perf_counter() - start)
+
+
+async def run_timed_coroutine_job(job_id: str, func_ref: str, *args, **kwargs):
+    """run_timed_job'ın coroutine job'lar için karşılığı."""
+    from apscheduler.util import ref_to_obj
+
+    func = ref_to_obj(func_ref)
+    status = "error"
+    start = time.perf_counter()
+    try:
+        result = await func(*args, **kwargs)
+        status = "success"
+        return result
+    finally:
+        SCHEDULER_JOB_DURATION.labels(job_id, status).observe(time.perf_counter() - start)
+
+
+def instrument_scheduler(scheduler) -> None:
+    """
+    Job sürelerini ve kaçırılan çalıştırmaları ölçer.
+
+    Süre job'ın içinde ölçülür: `scheduler.add_job` sarmalanır ve job fonksiyonu
+    run_timed_job / run_timed_coroutine_job üzerinden çağrılır. (APScheduler
+    EVENT_JOB_SUBMITTED'ı executor.submit_job'dan sonra yayınlar; kısa bir job
+    EXECUTED'ı SUBMITTED'dan önce üretebildiği için event eşleştirmesi yanlış
+    süreler verir.) Metin referansı alınamayan fonksiyonlar (lambda, iç
+    fonksiyon) sarmalanmaz. Kaçırılan çalıştırmalar EVENT_JOB_MISSED ile sayılır.
+    """
+    import functools
+    import inspect
+
+    from apscheduler.events import EVENT_JOB_MISSED
+    from apscheduler.util import obj_to_ref, ref_to_obj
+
+    add_job = scheduler.add_job
+
+    @functools.wraps(add_job)
+    def timed_add_job(func, trigger=None, args=None, kwargs=None, id=None, name=None, **options):
+        try:
+            func_ref = func if isinstance(func, str) else obj_to_ref(func)
+            target = ref_to_obj(func_ref)
+        except (LookupError, TypeError, ValueError):
+            return add_job(func, trigger, args, kwargs, id, name, **options)
+        wrapper = run_timed_coroutine_job if inspect.iscoroutinefunction(target) else run_timed_job
+        return add_job(
+            wrapper, trigger, [id or func_ref, func_ref, *(args or ())], kwargs, id,
+            name or getattr(target, "__name__", func_ref), **options,
+        )
+
+    scheduler.add_job = timed_add_job
+
+    def listener(job_event) -> None:
+        SCHEDULER_JOB_MISSED.labels(job_event.job_id).inc()
+
+    scheduler.add_listener(listener, EVENT_JOB_MISSED)
+
+
+# ============================================
+# EXPOSITION
+# ============================================
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Prometheus exposition çıktısı (içerik, content-type).
+
+    PROMETHEUS_MULTIPROC_DIR ayarlıysa tüm worker'ların değerleri toplanır.
+    """
+    if os.getenv(MULTIPROC_DIR_ENV):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Gunicorn child_exit hook'u için: ölen worker'ın live gauge dosyalarını temizler."""
+    if os.getenv(MULTIPROC_DIR_ENV):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
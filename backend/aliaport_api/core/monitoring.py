@@ -6,27 +6,34 @@ from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import Dict
-import psutil
 import os
 
+from .lazy_import import lazy_import
+from .startup_profile import startup_profile
+from .logging_config import get_logging_stats
+
 from ..config.database import get_db, engine
 from ..core.responses import success_response
-from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from .metrics import (  # noqa: F401  (geriye dönük uyumluluk: metrikler buradan da import edilir)
+    REQUEST_COUNT,
+    REQUEST_DURATION,
+    ACTIVE_USERS,
+    DB_CONNECTIONS,
+    CACHE_HIT_RATE,
+    WORK_ORDERS_TOTAL,
+    GATE_LOGS_TOTAL,
+    CURRENCY_SYNC_SUCCESS,
+    CURRENCY_SYNC_FAILURE,
+    render_metrics,
+)
+from .cache import get_cache
 
-router = APIRouter(tags=["Monitoring"])
+# psutil yalnızca /metrics ve /status çağrıldığında yüklenir (cold start)
+psutil = lazy_import("psutil")
 
-# Prometheus Metrics
-REQUEST_COUNT = Counter('aliaport_http_requests_total', 'Total HTTP requests', ['method', 'endpoint', 'status'])
-REQUEST_DURATION = Histogram('aliaport_http_request_duration_seconds', 'HTTP request duration', ['method', 'endpoint'])
-ACTIVE_USERS = Gauge('aliaport_active_users', 'Number of active users')
-DB_CONNECTIONS = Gauge('aliaport_db_connections', 'Database connections')
-CACHE_HIT_RATE = Gauge('aliaport_cache_hit_rate', 'Cache hit rate percentage')
+router = APIRouter(tags=["Monitoring"])
 
-# Business Metrics
-WORK_ORDERS_TOTAL = Counter('aliaport_work_orders_total', 'Total work orders created', ['status'])
-GATE_LOGS_TOTAL = Counter('aliaport_gate_logs_total', 'Total gate logs', ['direction'])
-CURRENCY_SYNC_SUCCESS = Counter('aliaport_currency_sync_success', 'Successful currency syncs')
-CURRENCY_SYNC_FAILURE = Counter('aliaport_currency_sync_failure', 'Failed currency syncs')
+# Metrik tanımları core/metrics.py'de
 
 
 @router.get("/health")
@@ -77,6 +84,7 @@ async def metrics():
     Format: Prometheus exposition format
     """
     # Update runtime metrics
+    CACHE_HIT_RATE.set(get_cache().stats().get("hit_rate_percent", 0.0))
     try:
         # System metrics
         cpu_percent = psutil.cpu_percent(interval=0.1)
@@ -92,8 +100,9 @@ async def metrics():
     except Exception:
         pass  # Metrics collection hatası loglara düşer, endpoint patlamaz
     
-    # Generate Prometheus format
-    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    # Generate Prometheus format (PROMETHEUS_MULTIPROC_DIR varsa tüm worker'lar)
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
 
 
 @router.get("/status")
@@ -133,7 +142,9 @@ async def detailed_status(db: Session = Depends(get_db)):
                     "status": db_status,
                     "engine": str(engine.url.drivername)
                 },
-                "environment": os.getenv("ENVIRONMENT", "development")
+                "environment": os.getenv("ENVIRONMENT", "development"),
+                "startup": startup_profile.as_dict(),
+                "logging": get_logging_stats()
             },
             message="Detailed system status"
         )
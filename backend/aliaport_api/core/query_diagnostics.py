@@ -0,0 +1,230 @@
+"""
+SQL Sorgu Teşhisi (slow query log + N+1 dedektörü)
+
+Opt-in: QUERY_DIAGNOSTICS=1 ile açılır; config/database.py engine'e bağlar,
+request pipeline her istek için bir QueryProfile başlatır. Ayrı cursor listener'ı
+yoktur: statement'lar core/metrics.py'nin listener'ından aynı süre ölçümüyle gelir,
+sorgu sayısı/DB süresi isteğin RequestDbStats'ından okunur; burada yalnızca
+normalize SQL şekilleri tutulur.
+
+- İstek başına sorgu sayısı, toplam DB süresi ve en yavaş N statement
+  (normalize SQL: literal'ler ve IN listeleri '?' ile sadeleşir)
+- Aynı SQL şekli bir istekte N+1_THRESHOLD kez (varsayılan 5) tekrar ederse N+1
+  olarak işaretlenir ve route şablonuyla loglanır
+- SLOW_QUERY_MS (varsayılan 200) üzerindeki statement'lar her zaman loglanır
+  (request dışında, örn. job'larda da)
+- Cevaba `Server-Timing: db;dur=..;desc="N queries", app;dur=..` başlığı eklenir
+- Son istek raporları bellekte tutulur: GET /api/diagnostics/queries
+
+Kapalıyken engine'e gözlemci eklenmez ve pipeline ek iş yapmaz.
+"""
+
+import heapq
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .metrics import RequestDbStats, add_statement_observer, route_template
+
+logger = logging.getLogger(__name__)
+
+MAX_SQL_LENGTH = 500
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(statement: str) -> str:
+    """SQL'i şekline indirger: boşluklar tekleşir, literal'ler '?' olur, IN (?, ?, ...) -> IN (?...)."""
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(?...)", sql)
+    return sql[:MAX_SQL_LENGTH]
+
+
+class QueryProfile:
+    """Tek bir isteğin SQL profili (sayı/süre isteğin RequestDbStats'ından)"""
+
+    def __init__(self, stats: RequestDbStats, top_n: int = 5, scope: Optional[dict] = None):
+        self.stats = stats
+        self.top_n = top_n
+        self.scope = scope
+        self.started = time.perf_counter()
+        self.shapes: Counter = Counter()
+        self._slowest: List[Tuple[float, int, str]] = []  # min-heap (süre, sıra, sql)
+
+    @property
+    def route(self) -> str:
+        return route_template(self.scope) if self.scope is not None else "-"
+
+    @property
+    def query_count(self) -> int:
+        return self.stats.query_count
+
+    @property
+    def total_ms(self) -> float:
+        return self.stats.duration * 1000
+
+    def record(self, sql: str, duration_ms: float) -> None:
+        self.shapes[sql] += 1
+        entry = (duration_ms, self.query_count, sql)
+        if len(self._slowest) < self.top_n:
+            heapq.heappush(self._slowest, entry)
+        elif duration_ms > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self) -> List[Dict[str, Any]]:
+        return [
+            {"sql": sql, "duration_ms": round(duration_ms, 3)}
+            for duration_ms, _, sql in sorted(self._slowest, reverse=True)
+        ]
+
+    def repeated_shapes(self, threshold: int) -> List[Dict[str, Any]]:
+        """Eşik kadar tekrar eden SELECT şekilleri (N+1 adayları), çoktan aza."""
+        return [
+            {"sql": sql, "count": count}
+            for sql, count in self.shapes.most_common()
+            if count >= threshold and sql[:6].upper() == "SELECT"
+        ]
+
+    def server_timing(self) -> bytes:
+        app_ms = (time.perf_counter() - self.started) * 1000
+        return (
+            f'db;dur={self.total_ms:.1f};desc="{self.query_count} queries", app;dur={app_ms:.1f}'
+        ).encode("latin-1")
+
+
+class QueryDiagnostics:
+    """
+    Engine gözlemcisi + istek profilleri + son raporların tutulduğu halka tampon.
+
+    Args:
+        enabled: Kapalıysa install/begin hiçbir şey yapmaz
+        slow_query_ms: Bu süreyi aşan statement'lar WARNING ile loglanır
+        n_plus_one_threshold: Aynı SELECT şeklinin bir istekte kaç tekrarı N+1 sayılır
+        top_n: Rapor başına saklanan en yavaş statement sayısı
+        history_size: Bellekte tutulan istek raporu sayısı
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        slow_query_ms: float = 200.0,
+        n_plus_one_threshold: int = 5,
+        top_n: int = 5,
+        history_size: int = 200,
+    ):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.top_n = top_n
+        self._history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "QueryDiagnostics":
+        return cls(
+            enabled=os.getenv("QUERY_DIAGNOSTICS", "0") == "1",
+            slow_query_ms=float(os.getenv("SLOW_QUERY_MS", "200")),
+            n_plus_one_threshold=int(os.getenv("N_PLUS_ONE_THRESHOLD", "5")),
+        )
+
+    # -------------------------------------------------------------- engine
+
+    def install(self, engine) -> None:
+        """Engine'in metrik listener'ına statement gözlemcisi ekler (kapalıysa no-op)."""
+        if self.enabled:
+            add_statement_observer(engine, self.observe_statement)
+
+    def observe_statement(self, statement: str, elapsed: float, stats: Optional[RequestDbStats]) -> None:
+        duration_ms = elapsed * 1000
+        profile = stats.profile if stats is not None else None
+        slow = duration_ms >= self.slow_query_ms
+        if profile is None and not slow:
+            return
+        sql = normalize_sql(statement)
+        if profile is not None:
+            profile.record(sql, duration_ms)
+        if slow:
+            logger.warning(
+                f"Slow query ({duration_ms:.1f} ms)",
+                extra={"extra_data": {
+                    "type": "slow_query",
+                    "route": profile.route if profile is not None else "-",
+                    "duration_ms": round(duration_ms, 2),
+                    "sql": sql,
+                }},
+            )
+
+    # ------------------------------------------------------------- request
+
+    def begin(self, stats: RequestDbStats, scope: Optional[dict] = None) -> Optional[QueryProfile]:
+        """İsteğin RequestDbStats'ına profil bağlar; kapalıysa None döner."""
+        if not self.enabled:
+            return None
+        profile = QueryProfile(stats, top_n=self.top_n, scope=scope)
+        stats.profile = profile
+        return profile
+
+    def end(self, profile: QueryProfile, method: str, status_code: int) -> Dict[str, Any]:
+        """Profili kapatır, N+1 varsa loglar ve raporu geçmişe ekler."""
+        profile.stats.profile = None
+        route = profile.route
+        n_plus_one = profile.repeated_shapes(self.n_plus_one_threshold)
+        report = {
+            "method": method,
+            "route": route,
+            "status_code": status_code,
+            "query_count": profile.query_count,
+            "db_ms": round(profile.total_ms, 2),
+            "duration_ms": round((time.perf_counter() - profile.started) * 1000, 2),
+            "slowest": profile.slowest(),
+            "n_plus_one": n_plus_one,
+        }
+        if n_plus_one:
+            logger.warning(
+                f"N+1 query pattern: {method} {route}",
+                extra={"extra_data": {"type": "n_plus_one", **report}},
+            )
+        with self._lock:
+            self._history.append(report)
+        return report
+
+    # --------------------------------------------------------- diagnostics
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Son istek raporları (yeniden eskiye) ve route bazında özet."""
+        with self._lock:
+            reports = list(self._history)
+        routes: Dict[str, Dict[str, Any]] = {}
+        for report in reports:
+            key = f"{report['method']} {report['route']}"
+            summary = routes.setdefault(key, {"requests": 0, "total_queries": 0, "max_queries": 0, "db_ms": 0.0, "n_plus_one": 0})
+            summary["requests"] += 1
+            summary["total_queries"] += report["query_count"]
+            summary["max_queries"] = max(summary["max_queries"], report["query_count"])
+            summary["db_ms"] = round(summary["db_ms"] + report["db_ms"], 2)
+            summary["n_plus_one"] += bool(report["n_plus_one"])
+        return {
+            "enabled": self.enabled,
+            "slow_query_ms": self.slow_query_ms,
+            "n_plus_one_threshold": self.n_plus_one_threshold,
+            "routes": routes,
+            "requests": reports[::-1],
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._history.clear()
+
+
+query_diagnostics = QueryDiagnostics.from_env()
@@ -0,0 +1,340 @@
+"""
+Rate Limit Altyapısı - paylaşımlı storage, atomik sliding window, metrikler
+
+SlowAPI varsayılan olarak süreç içi bellek kullanır: N uvicorn worker'ında efektif
+limit N katına çıkar ve her restart'ta sayaçlar sıfırlanır. Buradaki katman:
+
+- Storage `RATE_LIMIT_STORAGE_URI` ile seçilir (limits storage registry):
+    memory://                 tek süreç (geliştirme, varsayılan)
+    resp://[:şifre@]host:port/db  Redis protokolü konuşan herhangi bir sunucu
+                              (Redis, KeyDB, Dragonfly); ek istemci paketi gerekmez
+- Strateji `RATE_LIMIT_STRATEGY` (varsayılan sliding-window-counter): önceki
+  pencerenin ağırlıklı sayısı + mevcut pencere. resp:// storage'da sayaç
+  MULTI/EXEC içinde önce artırılır, sonra kontrol edilir; limit aşıldıysa geri
+  alınır (DECRBY). Eşzamanlı istekler limitin üstüne asla çıkamaz; yoğun
+  çekişmede en kötü ihtimalle birkaç istek fazladan reddedilir.
+- Paylaşımlı storage erişilemezse SlowAPI süreç içi belleğe düşer (fail-open,
+  availability > katılık) ve storage geri geldiğinde ona döner.
+- Her karar `aliaport_rate_limit_requests_total{limiter, policy, result}`
+  metriğine yazılır.
+- `verified_user_id`: rate limit anahtarı için access token'ın HS256 imzası
+  stdlib HMAC ile doğrulanır (mikrosaniyeler; token -> kimlik LRU cache'li,
+  süre kontrolü her çağrıda). İmzasız/sahte token user kovası açamaz, IP
+  anahtarına düşer; aksi halde her istekte yeni user_id ile limit aşılabilirdi.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import queue
+import socket
+import time
+from functools import lru_cache
+from math import floor
+from typing import Any, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from limits.storage import SlidingWindowCounterSupport, Storage
+from limits.storage.base import TimestampedSlidingWindow
+from slowapi import Limiter
+
+from .metrics import RATE_LIMIT_REQUESTS
+
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "sliding-window-counter")
+
+_LIMIT_KEY_PATTERN = "LIMITER/*"  # limits RateLimitItem.key_for namespace'i
+
+
+# ============================================
+# REDIS PROTOKOLÜ (RESP2) İSTEMCİSİ
+# ============================================
+
+class RespError(Exception):
+    """Sunucunun döndürdüğü -ERR yanıtı veya protokol hatası"""
+
+
+def _encode_command(args: Sequence[Any]) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        value = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(value), value))
+    return b"".join(parts)
+
+
+class _RespConnection:
+    def __init__(self, host: str, port: int, timeout: float):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+
+    def send(self, commands: Sequence[Sequence[Any]]) -> None:
+        self.sock.sendall(b"".join(_encode_command(command) for command in commands))
+
+    def read(self) -> Any:
+        line = self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("RESP bağlantısı kapandı")
+        prefix, body = line[:1], line[1:-2]
+        if prefix == b"+":
+            return body.decode()
+        if prefix == b"-":
+            return RespError(body.decode())
+        if prefix == b":":
+            return int(body)
+        if prefix == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self.reader.read(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(body)
+            return None if length < 0 else [self.read() for _ in range(length)]
+        raise RespError(f"Beklenmeyen RESP yanıtı: {line!r}")
+
+    def close(self) -> None:
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RespClient:
+    """
+    Minimal, thread-safe RESP2 istemcisi (bağlantı havuzlu).
+    Hatalı bağlantı havuza geri konmaz; sonraki çağrı yeni bağlantı açar.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, timeout: float = 1.0):
+        self.host, self.port, self.db, self.password, self.timeout = host, port, db, password, timeout
+        self._idle: "queue.LifoQueue[_RespConnection]" = queue.LifoQueue()
+
+    def _connect(self) -> _RespConnection:
+        conn = _RespConnection(self.host, self.port, self.timeout)
+        setup = ([["AUTH", self.password]] if self.password else []) + ([["SELECT", self.db]] if self.db else [])
+        if setup:
+            conn.send(setup)
+            for reply in [conn.read() for _ in setup]:
+                if isinstance(reply, RespError):
+                    conn.close()
+                    raise reply
+        return conn
+
+    def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """Komutları tek round-trip'te gönderir, yanıtları sırayla döner."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            conn.send(commands)
+            replies = [conn.read() for _ in commands]
+        except BaseException:
+            conn.close()
+            raise
+        self._idle.put(conn)
+        return replies
+
+    def execute(self, *args: Any) -> Any:
+        reply = self.pipeline([args])[0]
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    def transaction(self, *commands: Sequence[Any]) -> List[Any]:
+        """MULTI/EXEC: komutlar atomik çalışır; EXEC sonuç listesini döner."""
+        replies = self.pipeline([["MULTI"], *commands, ["EXEC"]])
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        results = replies[-1]
+        if results is None:
+            raise RespError("Transaction iptal edildi")
+        return results
+
+
+# ============================================
+# LIMITS STORAGE (resp://)
+# ============================================
+
+class RespStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """
+    Redis protokolü üzerinden paylaşımlı rate limit storage'ı.
+
+    fixed-window ve sliding-window-counter stratejilerini destekler.
+    URI: resp://[:password@]host[:port][/db]
+    """
+
+    STORAGE_SCHEME = ["resp"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options: Any):
+        parsed = urlparse(uri)
+        self.client = RespClient(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(parsed.path.strip("/") or 0),
+            password=parsed.password,
+            timeout=float(options.get("socket_timeout", 1.0)),
+        )
+        super().__init__(uri, wrap_exceptions=wrap_exceptions)
+
+    @property
+    def base_exceptions(self) -> Tuple[type, ...]:
+        return (OSError, RespError)
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        # SET NX PX: süre yalnızca sayaç ilk oluşturulduğunda ayarlanır
+        _, count = self.client.transaction(
+            ["SET", key, 0, "PX", int(expiry * 1000), "NX"],
+            ["INCRBY", key, amount],
+        )
+        return count
+
+    def get(self, key: str) -> int:
+        return int(self.client.execute("GET", key) or 0)
+
+    def get_expiry(self, key: str) -> float:
+        return time.time() + max(self.client.execute("PTTL", key), 0) / 1000
+
+    def check(self) -> bool:
+        try:
+            return self.client.execute("PING") == "PONG"
+        except self.base_exceptions:
+            return False
+
+    def reset(self) -> Optional[int]:
+        cursor, removed = b"0", 0
+        while True:
+            cursor, keys = self.client.execute("SCAN", cursor, "MATCH", _LIMIT_KEY_PATTERN, "COUNT", 1000)
+            if keys:
+                removed += self.client.execute("DEL", *keys)
+            if cursor in (b"0", "0"):
+                return removed
+
+    def clear(self, key: str) -> None:
+        self.client.execute("DEL", key)
+
+    @staticmethod
+    def _window_ttls(now: float, expiry: int) -> Tuple[float, float]:
+        """(önceki pencerenin ağırlığa giren kalan süresi, mevcut pencerenin TTL'i)"""
+        previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_ttl, current_ttl
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        _, current_count, previous_count = self.client.transaction(
+            ["SET", current_key, 0, "PX", int(2 * expiry * 1000), "NX"],
+            ["INCRBY", current_key, amount],
+            ["GET", previous_key],
+        )
+        previous_ttl, _ = self._window_ttls(now, expiry)
+        weighted_count = int(previous_count or 0) * previous_ttl / expiry + current_count
+        if floor(weighted_count) > limit:
+            # Limit aşıldı: bu isteğin artışını geri al
+            self.client.execute("DECRBY", current_key, amount)
+            return False
+        return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count, current_count = self.client.transaction(["GET", previous_key], ["GET", current_key])
+        previous_count, current_count = int(previous_count or 0), int(current_count or 0)
+        previous_ttl, current_ttl = self._window_ttls(now, expiry)
+        return previous_count, previous_ttl if previous_count else 0.0, current_count, current_ttl
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self.client.execute("DEL", previous_key, current_key)
+
+
+# ============================================
+# LIMITER (metrikli)
+# ============================================
+
+class InstrumentedRateLimiter:
+    """limits stratejisini sarar; her hit kararını policy bazında sayar."""
+
+    def __init__(self, inner: Any, limiter_name: str):
+        self._inner = inner
+        self._limiter_name = limiter_name
+
+    def hit(self, item: Any, *identifiers: str, cost: int = 1) -> bool:
+        allowed = self._inner.hit(item, *identifiers, cost=cost)
+        RATE_LIMIT_REQUESTS.labels(self._limiter_name, str(item), "allowed" if allowed else "rejected").inc()
+        return allowed
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+
+class AliaportLimiter(Limiter):
+    """
+    Ortam değişkenlerinden storage/strateji alan, kararları metriklere yazan Limiter.
+    Paylaşımlı storage kullanılırken bellek fallback'i açıktır.
+    """
+
+    def __init__(self, name: str, key_func, storage_uri: Optional[str] = None,
+                 strategy: Optional[str] = None, **kwargs: Any):
+        storage_uri = storage_uri or RATE_LIMIT_STORAGE_URI
+        kwargs.setdefault("in_memory_fallback_enabled", not storage_uri.startswith("memory://"))
+        super().__init__(
+            key_func=key_func,
+            storage_uri=storage_uri,
+            strategy=strategy or RATE_LIMIT_STRATEGY,
+            key_prefix=name,
+            **kwargs,
+        )
+        self.name = name
+        self._limiter = InstrumentedRateLimiter(self._limiter, name)
+        if self._fallback_limiter is not None:
+            self._fallback_limiter = InstrumentedRateLimiter(self._fallback_limiter, f"{name}-fallback")
+
+
+# ============================================
+# ANAHTAR ÇIKARIMI
+# ============================================
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+@lru_cache(maxsize=4096)
+def _verified_claims(token: str, secret_key: str) -> Optional[Tuple[str, Optional[float]]]:
+    """İmzası geçerli access token için (user_id, exp); aksi halde None."""
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = json.loads(_b64decode(header_b64))
+        signature = _b64decode(signature_b64)
+        if not isinstance(header, dict) or header.get("alg") != "HS256":
+            return None
+        expected = hmac.new(secret_key.encode(), f"{header_b64}.{payload_b64}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(signature, expected):
+            return None
+        payload = json.loads(_b64decode(payload_b64))
+    except ValueError:
+        return None
+    if not isinstance(payload, dict) or payload.get("type") != "access" or payload.get("user_id") is None:
+        return None
+    exp = payload.get("exp")
+    return str(payload["user_id"]), float(exp) if isinstance(exp, (int, float)) else None
+
+
+def verified_user_id(token: str, secret_key: str) -> Optional[str]:
+    """İmzası doğrulanmış, süresi dolmamış access token'daki user_id (rate limit anahtarı için)."""
+    claims = _verified_claims(token, secret_key)
+    if claims is None:
+        return None
+    user_id, exp = claims
+    if exp is not None and exp < time.time():
+        return None
+    return user_id
@@ -4,7 +4,7 @@ Tüm API endpoint'lerde tutarlı response formatı için Pydantic modelleri
 """
 
 from datetime import datetime
-from typing import Any, Generic, List, Optional, TypeVar
+from typing import Any, Generic, List, Optional, Type, TypeVar
 from pydantic import BaseModel, Field
 
 
@@ -294,6 +294,94 @@ def paginated_response(
     return result
 
 
+# ============================================
+# FAST PATH: ORM satırlarından doğrudan JSON byte'ları
+# ============================================
+
+def _envelope_bytes(envelope: dict, data_bytes: bytes) -> bytes:
+    """Zarfı serileştirir ve önceden üretilmiş `data` byte'larını içine yerleştirir."""
+    from .json_response import dumps
+
+    head = dumps(envelope)
+    return head[:-1] + b',"data":' + data_bytes + b'}'
+
+
+def _envelope_meta() -> dict:
+    import uuid
+
+    timestamp = datetime.utcnow().isoformat()
+    return {
+        'timestamp': timestamp,
+        'meta': {'timestamp': timestamp, 'request_id': str(uuid.uuid4())}
+    }
+
+
+def fast_success_response(
+    rows: List[Any],
+    schema: Type[BaseModel],
+    message: str = "İşlem başarılı",
+    status_code: int = 200
+):
+    """
+    success_response'un liste endpoint'leri için hızlı versiyonu.
+
+    ORM satırları şema başına cache'lenmiş serializer ile (satır başına encode yok) JSON'a
+    çevrilir ve RawJSONResponse olarak döner (FastAPI yeniden encode etmez).
+    Çıktı zarfı success_response ile aynıdır.
+
+    Args:
+        rows: ORM nesneleri (from_attributes şemasıyla uyumlu)
+        schema: Pydantic response şeması
+        message: Kullanıcı mesajı
+        status_code: HTTP status code
+    """
+    from .json_response import RawJSONResponse, serialize_rows
+
+    envelope = {'success': True, 'message': message, **_envelope_meta()}
+    body = _envelope_bytes(envelope, serialize_rows(schema, rows))
+    return RawJSONResponse(content=body, status_code=status_code)
+
+
+def fast_paginated_response(
+    rows: List[Any],
+    schema: Type[BaseModel],
+    page: int,
+    page_size: int,
+    total: int,
+    message: str = "Liste başarıyla getirildi"
+):
+    """
+    paginated_response'un hızlı versiyonu (aynı zarf, tek serileştirme geçişi).
+
+    Args:
+        rows: Sayfadaki ORM nesneleri
+        schema: Pydantic response şeması
+        page: Şu anki sayfa (1-indexed)
+        page_size: Sayfa başına kayıt
+        total: Toplam kayıt sayısı
+        message: Kullanıcı mesajı
+    """
+    import math
+    from .json_response import RawJSONResponse, serialize_rows
+
+    total_pages = math.ceil(total / page_size) if page_size > 0 else 0
+    envelope = {
+        'success': True,
+        'message': message,
+        'pagination': {
+            'page': page,
+            'page_size': page_size,
+            'total': total,
+            'total_pages': total_pages,
+            'has_next': page < total_pages,
+            'has_prev': page > 1
+        },
+        **_envelope_meta()
+    }
+    body = _envelope_bytes(envelope, serialize_rows(schema, rows))
+    return RawJSONResponse(content=body)
+
+
 # ============================================
 # LEGACY SUPPORT (Eski format için)
 # ============================================
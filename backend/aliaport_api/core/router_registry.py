@@ -0,0 +1,151 @@
+"""
+Aliaport v3.1 - Lazy Router Registry
+
+Router'lar açılışta import edilmez; registry'ye modül yolu + URL prefix
+ipuçlarıyla kaydedilir ve ilgili prefix'e gelen ilk istekte mount edilir.
+Böylece worker'lar modül zincirini (pdfminer, jinja2, e-posta servisi vb.)
+yüklemeden hazır hale gelir.
+
+Kurallar:
+- Path ipucuyla eşleşen tüm router'lar (kayıt sırasıyla) mount edilir.
+- Hiçbir ipucuna uymayan path'lerde (404 doğruluğu için) tüm router'lar mount edilir.
+- OpenAPI şeması üretilmeden önce mount_all() çağrılır.
+- Route sırası her mount'tan sonra kayıt sırasına göre yeniden düzenlenir; lazy
+  yükleme eager include_router ile aynı eşleşme sırasını verir.
+
+ROUTER_LOADING=eager ile tüm router'lar açılışta mount edilir.
+"""
+
+import importlib
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .logging_config import get_logger
+from .startup_profile import startup_profile
+
+logger = get_logger(__name__)
+
+# Router yüklenmeden de cevaplanabilen path'ler (uygulama seviyesinde tanımlı)
+ALWAYS_AVAILABLE_PATHS = ("/docs", "/redoc", "/health", "/ready", "/metrics", "/status")
+
+
+@dataclass
+class RouterSpec:
+    """Lazy mount edilecek router tanımı"""
+    name: str
+    target: str  # ".paket.modul:attribute" (registry package'ına göre) veya mutlak yol
+    paths: Tuple[str, ...]  # Bu router'ın cevapladığı URL prefix'leri
+    prefix: str = ""
+    tags: Optional[List[str]] = None
+    optional: bool = False  # Import hatası uygulamayı düşürmez (örn. legacy sefer)
+    mounted: bool = False
+    routes: list = field(default_factory=list)
+
+
+class RouterRegistry:
+    """Router'ları ilk ihtiyaçta mount eden kayıt defteri"""
+
+    def __init__(self, app, package: Optional[str] = None):
+        self.app = app
+        self.package = package
+        self._specs: List[RouterSpec] = []
+        self._lock = threading.RLock()
+        self._base_routes: Optional[list] = None
+
+    def register(
+        self,
+        name: str,
+        target: str,
+        paths: Tuple[str, ...],
+        prefix: str = "",
+        tags: Optional[List[str]] = None,
+        optional: bool = False,
+    ) -> None:
+        self._specs.append(RouterSpec(name=name, target=target, paths=tuple(paths), prefix=prefix, tags=tags, optional=optional))
+
+    @property
+    def pending(self) -> List[RouterSpec]:
+        return [s for s in self._specs if not s.mounted]
+
+    def _mount(self, spec: RouterSpec) -> None:
+        if self._base_routes is None:
+            # Registry dışı route'lar (monitoring, "/", docs) ilk mount anında sabitlenir
+            self._base_routes = list(self.app.router.routes)
+        module_path, _, attr = spec.target.partition(":")
+        start = time.perf_counter()
+        try:
+            module = importlib.import_module(module_path, self.package)
+            router = getattr(module, attr)
+        except Exception as exc:
+            spec.mounted = True
+            if spec.optional:
+                logger.warning(f"Optional router skipped: {spec.name} ({exc})")
+                return
+            raise
+        before = len(self.app.router.routes)
+        kwargs = {}
+        if spec.prefix:
+            kwargs["prefix"] = spec.prefix
+        if spec.tags:
+            kwargs["tags"] = spec.tags
+        self.app.include_router(router, **kwargs)
+        spec.routes = self.app.router.routes[before:]
+        spec.mounted = True
+        startup_profile.record_lazy_import(f"router:{spec.name}", time.perf_counter() - start)
+
+    def _reorder(self) -> None:
+        """Route listesini: registry dışı route'lar + kayıt sırasına göre router route'ları."""
+        spec_routes = [route for spec in self._specs for route in spec.routes]
+        spec_ids = {id(r) for r in spec_routes}
+        base_ids = {id(r) for r in self._base_routes}
+        extra = [r for r in self.app.router.routes if id(r) not in spec_ids and id(r) not in base_ids]
+        self.app.router.routes[:] = self._base_routes + extra + spec_routes
+        self.app.openapi_schema = None
+
+    def mount_for_path(self, path: str) -> int:
+        """Path'e uyan bekleyen router'ları mount eder. Mount edilen router sayısını döner."""
+        if not self.pending or path == "/" or path.startswith(ALWAYS_AVAILABLE_PATHS):
+            return 0
+        with self._lock:
+            matched = [s for s in self.pending if any(path.startswith(p) for p in s.paths)]
+            if not matched:
+                # Bilinmeyen path: doğru 404/405 için her şeyi yükle
+                matched = self.pending
+            for spec in matched:
+                self._mount(spec)
+            self._reorder()
+            return len(matched)
+
+    def mount_all(self) -> int:
+        """Bekleyen tüm router'ları mount eder (OpenAPI, eager mod)."""
+        if not self.pending:
+            return 0
+        with self._lock:
+            pending = self.pending
+            for spec in pending:
+                self._mount(spec)
+            self._reorder()
+            return len(pending)
+
+    def status(self) -> Dict:
+        return {
+            "mounted": [s.name for s in self._specs if s.mounted],
+            "pending": [s.name for s in self.pending],
+        }
+
+
+class LazyRouterMiddleware:
+    """İstek path'ine göre gerekli router'ları routing'den önce mount eden ASGI middleware"""
+
+    def __init__(self, app: ASGIApp, registry: RouterRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and self.registry.pending:
+            self.registry.mount_for_path(scope["path"])
+        await self.app(scope, receive, send)
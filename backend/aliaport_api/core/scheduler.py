@@ -10,6 +10,8 @@ from datetime import datetime
 import logging
 import os
 
+from .metrics import instrument_scheduler
+
 logger = logging.getLogger(__name__)
 
 # Database URL (PostgreSQL için job persistence)
@@ -44,6 +46,9 @@ scheduler = AsyncIOScheduler(
     timezone='Europe/Istanbul'  # Türkiye saati
 )
 
+# Job süreleri Prometheus'a (aliaport_scheduler_job_duration_seconds)
+instrument_scheduler(scheduler)
+
 
 def start_scheduler():
     """
@@ -0,0 +1,76 @@
+"""
+Aliaport v3.1 - Startup Profili
+
+Uygulama açılışındaki aşamaların (logging, modeller, router'lar, middleware,
+veritabanı hazırlığı) ve lazy yüklenen modüllerin sürelerini toplar.
+Breakdown startup event'inde loglanır ve /status endpoint'inde döner.
+
+Kullanım:
+    with startup_profile.phase("models"):
+        from .modules.cari.models import Cari
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class StartupProfile:
+    """Açılış aşama süreleri ve lazy import süreleri"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.ready_at: Optional[float] = None
+        self._phases: List[Dict] = []
+        self._lazy_imports: List[Dict] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Bir açılış aşamasını ölçer."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, time.perf_counter() - start)
+
+    def record_phase(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._phases.append({"name": name, "ms": round(seconds * 1000, 2)})
+
+    def record_lazy_import(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._lazy_imports.append({
+                "name": name,
+                "ms": round(seconds * 1000, 2),
+                "after_start_ms": round((time.perf_counter() - self.started_at) * 1000, 2),
+            })
+
+    def mark_ready(self) -> None:
+        if self.ready_at is None:
+            self.ready_at = time.perf_counter()
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            total_ms = None
+            if self.ready_at is not None:
+                total_ms = round((self.ready_at - self.started_at) * 1000, 2)
+            return {
+                "ready_ms": total_ms,
+                "phases": list(self._phases),
+                "lazy_imports": list(self._lazy_imports),
+            }
+
+    def report(self, logger) -> None:
+        """Aşama breakdown'ını (en yavaştan hızlıya) loglar."""
+        data = self.as_dict()
+        lines = [f"{p['name']}={p['ms']:.1f}ms" for p in sorted(data["phases"], key=lambda p: -p["ms"])]
+        logger.info(
+            f"⏱️  Startup profile: ready in {data['ready_ms']}ms | " + ", ".join(lines),
+            extra={"extra_data": {"type": "startup_profile", **data}},
+        )
+
+
+# Modül import edildiği an sayaç başlar; main.py bunu en başta import eder.
+startup_profile = StartupProfile()
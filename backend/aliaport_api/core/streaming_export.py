@@ -0,0 +1,133 @@
+"""
+Aliaport v3.1 - Streaming Export (CSV / Excel)
+
+Rapor export'ları tüm veriyi belleğe almadan üretilir:
+
+- iter_csv: Satırları parça parça CSV byte'larına çevirir; indirme ilk
+  parçayla birlikte başlar.
+- iter_xlsx: openpyxl write-only workbook kullanır (satırlar diske akar,
+  hücre nesneleri bellekte tutulmaz). Dosya geçici dosyaya kaydedilip
+  parça parça okunur.
+- streaming_download: Iterator'ı Content-Disposition başlıklı
+  StreamingResponse'a sarar.
+
+Satır kaynağı olarak genellikle `query.execution_options(yield_per=N)` ile
+iterasyon yapılan tek bir join'li sorgu verilir.
+"""
+
+import csv
+import io
+import tempfile
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Excel'in UTF-8 CSV'yi (Türkçe karakterler) doğru açması için BOM
+UTF8_BOM = b"\xef\xbb\xbf"
+
+DEFAULT_CSV_CHUNK_ROWS = 500
+DEFAULT_FILE_CHUNK_SIZE = 64 * 1024
+# Write-only workbook bu boyuta kadar bellekte, üstünde diskte tutulur
+XLSX_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+def iter_csv(
+    headers: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    chunk_rows: int = DEFAULT_CSV_CHUNK_ROWS,
+    delimiter: str = ";",
+    bom: bool = True,
+) -> Iterator[bytes]:
+    """
+    Satırları CSV byte parçaları olarak üretir.
+
+    Args:
+        headers: Başlık satırı
+        rows: Satır iterable'ı (generator olabilir; tek geçişte tüketilir)
+        chunk_rows: Her parçadaki satır sayısı
+        delimiter: Ayraç (Türkçe Excel varsayılanı ';')
+        bom: UTF-8 BOM ile başla
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter, lineterminator="\r\n")
+    writer.writerow(headers)
+    pending = 0
+    first = True
+
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= chunk_rows:
+            chunk = buffer.getvalue().encode("utf-8")
+            yield (UTF8_BOM + chunk) if (first and bom) else chunk
+            first = False
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+
+    chunk = buffer.getvalue().encode("utf-8")
+    if chunk or first:
+        yield (UTF8_BOM + chunk) if (first and bom) else chunk
+
+
+def iter_xlsx(
+    headers: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    sheet_title: str = "Rapor",
+    column_widths: Optional[Sequence[float]] = None,
+    header_color: str = "366092",
+    chunk_size: int = DEFAULT_FILE_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Satırları write-only workbook'a yazıp xlsx byte parçaları olarak üretir.
+
+    Sütun genişlikleri sabit verilir (auto-size için tüm hücrelerin tekrar
+    gezilmesi gerekmez).
+    """
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, PatternFill
+    from openpyxl.utils import get_column_letter
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title)
+
+    if column_widths:
+        for index, width in enumerate(column_widths, start=1):
+            ws.column_dimensions[get_column_letter(index)].width = width
+
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color=header_color, end_color=header_color, fill_type="solid")
+    header_alignment = Alignment(horizontal="center")
+    header_cells = []
+    for title in headers:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = header_alignment
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    for row in rows:
+        ws.append(list(row))
+
+    with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_MAX_SIZE) as output:
+        wb.save(output)
+        output.seek(0)
+        while True:
+            chunk = output.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def streaming_download(content: Iterable[bytes], filename: str, media_type: str) -> StreamingResponse:
+    """Iterator'ı dosya indirme olarak dönen StreamingResponse."""
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
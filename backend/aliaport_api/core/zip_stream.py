@@ -0,0 +1,195 @@
+"""
+Aliaport v3.1 - Streaming ZIP Writer
+
+Toplu belge indirmelerinde arşiv bellekte kurulmaz:
+
+- Dosyalar blok blok (varsayılan 1 MB) okunur, sıkıştırılan parçalar anında
+  yield edilir; bellek kullanımı dosya boyutundan bağımsızdır.
+- Zaten sıkıştırılmış formatlar (PDF, JPEG, PNG, ZIP, ...) deflate edilmeden
+  STORED olarak eklenir (CPU tasarrufu, boyut farkı ihmal edilebilir).
+- 2 GB üzeri dosyalar için ZIP64 başlıkları otomatik açılır.
+- Aynı arşiv adı tekrar ederse "_2", "_3" eki ile ayrıştırılır.
+
+Kullanım:
+    entries = [ZipEntry(path="uploads/a.pdf", arcname="FIRMA/a.pdf"), ...]
+    StreamingResponse(iter_zip(entries), media_type="application/zip")
+
+    # Hazırlanmış (resumable) arşiv için:
+    write_zip_file(entries, "exports/arsiv.zip")
+
+    # Başlangıçta yarım kalmış (.part) arşivleri temizle:
+    remove_stale_parts(get_exports_dir())
+
+Not: iter_zip sync generator'dır; StreamingResponse onu threadpool'da
+iterate eder, dosya I/O'su event loop'u bloklamaz.
+"""
+
+import os
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+# Bu süredir yazılmayan .part dosyası yarım kalmıştır (süreç öldü / yeniden başladı);
+# daha yeni olanlar başka bir worker'ın sürmekte olan yazımı olabilir.
+STALE_PART_SECONDS = 10 * 60
+
+# Deflate ile anlamlı kazanç sağlamayan (zaten sıkıştırılmış) uzantılar
+STORED_EXTENSIONS = frozenset({
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic",
+    ".zip", ".gz", ".7z", ".rar", ".docx", ".xlsx", ".pptx", ".mp4",
+})
+
+
+@dataclass
+class ZipEntry:
+    """Arşive eklenecek dosya"""
+    path: str
+    arcname: str
+    modified_at: Optional[float] = None  # epoch; None ise dosyanın mtime'ı
+
+
+def compress_type_for(arcname: str) -> int:
+    """Uzantıya göre STORED/DEFLATED seçer."""
+    return zipfile.ZIP_STORED if os.path.splitext(arcname)[1].lower() in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+class _ChunkSink:
+    """ZipFile'ın yazdığı byte'ları toplayan, seek desteklemeyen hedef."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _unique_arcname(arcname: str, used: Set[str]) -> str:
+    if arcname not in used:
+        used.add(arcname)
+        return arcname
+    stem, ext = os.path.splitext(arcname)
+    counter = 2
+    while f"{stem}_{counter}{ext}" in used:
+        counter += 1
+    unique = f"{stem}_{counter}{ext}"
+    used.add(unique)
+    return unique
+
+
+def _write_entries(zf: zipfile.ZipFile, entries: Iterable[ZipEntry], block_size: int) -> Iterator[None]:
+    """
+    Girdileri ZipFile'a blok blok yazar.
+
+    Her blok yazıldıktan sonra yield eder; çağıran taraf bu noktada üretilen
+    byte'ları boşaltabilir (streaming) veya yalnızca tüketebilir (dosyaya yazım).
+    """
+    used: Set[str] = set()
+    for entry in entries:
+        try:
+            stat = os.stat(entry.path)
+        except OSError:
+            logger.warning(f"ZIP: dosya bulunamadı, atlandı: {entry.path}")
+            continue
+
+        info = zipfile.ZipInfo(
+            _unique_arcname(entry.arcname, used),
+            date_time=time.localtime(entry.modified_at or stat.st_mtime)[:6],
+        )
+        info.compress_type = compress_type_for(entry.arcname)
+        # Boyut önceden bilindiği için ZIP64 kararı doğru verilir
+        info.file_size = stat.st_size
+
+        with open(entry.path, "rb") as source, zf.open(info, "w") as target:
+            while True:
+                block = source.read(block_size)
+                if not block:
+                    break
+                target.write(block)
+                yield
+        # Local header / data descriptor
+        yield
+
+
+def iter_zip(entries: Iterable[ZipEntry], block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[bytes]:
+    """
+    Girdileri okuyup ZIP byte parçaları olarak üretir.
+
+    Her blok okunduktan sonra ZipFile'ın ürettiği byte'lar yield edilir;
+    ilk byte ilk dosyanın ilk bloğuyla birlikte gönderilir.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", allowZip64=True) as zf:
+        for _ in _write_entries(zf, entries, block_size):
+            data = sink.drain()
+            if data:
+                yield data
+    # Central directory
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def write_zip_file(entries: Iterable[ZipEntry], destination: str, block_size: int = DEFAULT_BLOCK_SIZE) -> int:
+    """
+    Arşivi diske yazar (hazırlanmış / resumable indirme için).
+
+    Önce "<destination>.part" dosyasına yazılır, tamamlanınca atomik olarak
+    yeniden adlandırılır; yarım arşiv hiçbir zaman indirilemez.
+
+    Returns:
+        Arşive eklenen dosya sayısı
+    """
+    part_path = f"{destination}.part"
+    try:
+        with zipfile.ZipFile(part_path, "w", allowZip64=True) as zf:
+            for _ in _write_entries(zf, entries, block_size):
+                pass
+            written = len(zf.infolist())
+        os.replace(part_path, destination)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    return written
+
+
+def remove_stale_parts(directory, max_age_seconds: float = STALE_PART_SECONDS) -> int:
+    """
+    Dizin altında yazımı yarım kalmış "*.part" arşivleri siler.
+
+    Returns:
+        Silinen dosya sayısı
+    """
+    root = Path(directory)
+    if not root.exists():
+        return 0
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for path in root.rglob("*.part"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            pass
+    if removed:
+        logger.info(f"Removed {removed} stale partial archive(s) under {root}")
+    return removed
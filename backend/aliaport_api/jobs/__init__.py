@@ -49,6 +49,13 @@ def register_jobs():
         logger.info("✅ SGK reminder job registered")
     except ImportError as e:
         logger.warning(f"⚠️  SGK reminder job not available: {e}")
+
+    try:
+        from .sgk_status_job import register_sgk_status_job
+        register_sgk_status_job(scheduler)
+        logger.info("✅ SGK status rollover job registered")
+    except ImportError as e:
+        logger.warning(f"⚠️  SGK status rollover job not available: {e}")
     
     # Gelecekte eklenecek job'lar
     # try:
@@ -1,91 +1,71 @@
 """
 Audit Log Archiving Job
-90 günden eski audit event kayıtlarını arşiv tablosuna taşıma
+Saklama süresini (varsayılan 90 gün) aşan audit event kayıtlarını arşiv tablosuna taşıma
 """
+from __future__ import annotations
+
+import logging
+import time
 
 from apscheduler.triggers.cron import CronTrigger
-from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
 from sqlalchemy import text
-import logging
+from sqlalchemy.orm import Session
+
+from ..config.database import SessionLocal
+from ..modules.audit.archive import ArchiveResult, archive_audit_events, archive_cutoff
 
 logger = logging.getLogger(__name__)
 
 
-async def audit_log_archive_job():
+def audit_log_archive_job(session: Session | None = None) -> ArchiveResult:
     """
-    90 günden eski audit event'leri arşiv tablosuna taşı
-    
+    Saklama süresini aşan audit event'leri arşiv tablosuna taşı
+
     Schedule: Her gün 03:00 (düşük trafik saati)
-    
+
     Workflow:
-    1. 90 günden eski kayıtları seç (created_at < NOW() - INTERVAL '90 days')
-    2. audit_events_archive tablosuna INSERT
-    3. audit_events tablosundan DELETE
-    4. VACUUM ANALYZE (PostgreSQL - disk space geri kazanım)
-    5. Metrics: archived_records_total, archive_duration_seconds
+    1. created_at < cutoff kayıtları id sırasıyla batch'ler halinde seç
+    2. audit_events_archive tablosuna INSERT, audit_events'ten DELETE (batch başına commit)
+    3. AUDIT_ARCHIVE_EXPORT_DIR ayarlıysa aylık .jsonl.gz dosyalarına ekle
+    4. PostgreSQL: ANALYZE audit_events (planner istatistikleri küçülen tabloya göre)
+    5. Metrics: aliaport_audit_archived_rows_total, aliaport_scheduler_job_duration_seconds
     """
-    from ..config.database import get_db
-    
-    db: Session = next(get_db())
-    cutoff_date = datetime.utcnow() - timedelta(days=90)
-    
+    owns_session = session is None
+    session = session or SessionLocal()
+    cutoff = archive_cutoff()
+    started = time.perf_counter()
+
     try:
-        logger.info(f"🗂️  Audit log archiving başladı. Cutoff date: {cutoff_date}")
-        
-        # Step 1: Arşivlenecek kayıt sayısını say
-        # TODO: audit_events tablosu eklenince bu query çalışacak
-        # Şimdilik placeholder
-        count_result = 0
-        
-        # count_result = db.execute(
-        #     text("SELECT COUNT(*) FROM audit_events WHERE created_at < :cutoff"),
-        #     {"cutoff": cutoff_date}
-        # ).scalar()
-        
-        if count_result == 0:
+        logger.info(f"🗂️  Audit log archiving başladı. Cutoff date: {cutoff}")
+        result = archive_audit_events(session, cutoff=cutoff)
+
+        if result.archived == 0:
             logger.info("✅ Arşivlenecek kayıt yok")
-            return
-        
-        logger.info(f"📊 {count_result} kayıt arşivlenecek")
-        
-        # TODO: Batch processing implementation (FAZ 5 Phase 3)
-        # batch_size = 1000
-        # archived_count = 0
-        
-        # while True:
-        #     result = db.execute(text("""
-        #         WITH old_records AS (
-        #             SELECT * FROM audit_events 
-        #             WHERE created_at < :cutoff
-        #             LIMIT :batch_size
-        #         )
-        #         INSERT INTO audit_events_archive 
-        #         SELECT * FROM old_records
-        #         RETURNING id
-        #     """), {"cutoff": cutoff_date, "batch_size": batch_size})
-        #     
-        #     batch_count = result.rowcount
-        #     if batch_count == 0:
-        #         break
-        #     
-        #     archived_count += batch_count
-        #     db.commit()
-        
-        logger.info(f"✅ Audit log archiving başarılı (placeholder)")
-        
+            return result
+
+        if session.get_bind().dialect.name == "postgresql":
+            session.execute(text("ANALYZE audit_events"))
+            session.commit()
+
+        logger.info(
+            f"✅ Audit log archiving başarılı: {result.archived} kayıt, {result.batches} batch, "
+            f"{time.perf_counter() - started:.1f}s"
+        )
+        return result
+
     except Exception as e:
         logger.error(f"❌ Audit log archiving failed: {str(e)}", exc_info=True)
-        db.rollback()
+        session.rollback()
         raise
     finally:
-        db.close()
+        if owns_session:
+            session.close()
 
 
 def register_audit_archive_job(scheduler):
     """
     Audit archive job'ını scheduler'a kaydet
-    
+
     Args:
         scheduler: APScheduler instance
     """
@@ -94,6 +74,8 @@ def register_audit_archive_job(scheduler):
         trigger=CronTrigger(hour=3, minute=0, timezone='Europe/Istanbul'),
         id='audit_archive_daily',
         name='Audit Log Archiving (90+ days)',
-        replace_existing=True
+        replace_existing=True,
+        misfire_grace_time=3600,
+        max_instances=1,
     )
     logger.info("📋 Audit archive job registered (daily at 03:00)")
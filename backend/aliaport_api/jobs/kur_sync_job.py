@@ -38,6 +38,7 @@ async def kur_guncelleme_job():
     from ..config.database import get_db
     from ..modules.kurlar.models import ExchangeRate
     from ..integrations.evds_client import EVDSClient, EVDSAPIError
+    from ..core.metrics import CURRENCY_SYNC_FAILURE, CURRENCY_SYNC_SUCCESS
     
     start_time = datetime.utcnow()
     db: Session = next(get_db())
@@ -114,6 +115,7 @@ async def kur_guncelleme_job():
                 continue
         
         db.commit()
+        CURRENCY_SYNC_SUCCESS.inc()
         
         duration = (datetime.utcnow() - start_time).total_seconds()
         logger.info(
@@ -125,6 +127,7 @@ async def kur_guncelleme_job():
         
     except Exception as e:
         logger.error(f"❌ Kur güncelleme job failed: {str(e)}", exc_info=True)
+        CURRENCY_SYNC_FAILURE.inc()
         db.rollback()
         raise  # Re-raise for APScheduler retry
     
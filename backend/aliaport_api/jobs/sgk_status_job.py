@@ -0,0 +1,73 @@
+"""SGK durum tablosu dönem devri job'u."""
+from __future__ import annotations
+
+import logging
+
+from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..config.database import SessionLocal
+from ..modules.dijital_arsiv.models import PortalEmployee, PortalEmployeeSgkStatus
+from ..modules.dijital_arsiv.sgk_status import get_active_sgk_period, recompute_sgk_status
+
+logger = logging.getLogger(__name__)
+
+
+def sgk_status_rollover_job(session: Session | None = None) -> int:
+    """
+    Aktif SGK dönemi için materialize edilmiş durumları hazırlar.
+
+    Dönem her ayın 26'sında (tatilse sonraki iş günü) değişir; job her gün
+    çalışır ve aktif dönemde satırı eksik olan çalışan varsa tüm aktif
+    çalışanları batch'ler halinde yeniden hesaplar. Dönem zaten hazırsa
+    yalnızca iki COUNT sorgusu çalışır.
+
+    Returns:
+        Hesaplanan çalışan sayısı (dönem hazırsa 0)
+    """
+    owns_session = session is None
+    session = session or SessionLocal()
+    try:
+        period_code = get_active_sgk_period()
+        active_employees = (
+            session.query(func.count(PortalEmployee.id))
+            .filter(PortalEmployee.is_active == True)  # noqa: E712
+            .scalar()
+        )
+        materialized = (
+            session.query(func.count(PortalEmployeeSgkStatus.id))
+            .join(PortalEmployee, PortalEmployee.id == PortalEmployeeSgkStatus.employee_id)
+            .filter(
+                PortalEmployeeSgkStatus.period_code == period_code,
+                PortalEmployee.is_active == True,  # noqa: E712
+            )
+            .scalar()
+        )
+        if materialized >= active_employees:
+            logger.debug("SGK status rollover skipped | period=%s already materialized", period_code)
+            return 0
+
+        processed = recompute_sgk_status(session, period_code=period_code)
+        logger.info("SGK status rollover finished | period=%s | employees=%s", period_code, processed)
+        return processed
+    except Exception:
+        logger.exception("SGK status rollover job failed")
+        raise
+    finally:
+        if owns_session:
+            session.close()
+
+
+def register_sgk_status_job(scheduler):
+    """Register SGK status rollover job to run daily at 00:15."""
+    scheduler.add_job(
+        sgk_status_rollover_job,
+        trigger=CronTrigger(hour=0, minute=15, timezone="Europe/Istanbul"),
+        id="sgk_status_rollover",
+        name="SGK durum tablosu dönem devri",
+        replace_existing=True,
+        misfire_grace_time=3600,
+        max_instances=1,
+    )
+    logger.info("📋 SGK status rollover job registered (daily 00:15)")
@@ -3,10 +3,12 @@
 Aliaport Liman Yönetim Sistemi - Ana Uygulama
 FastAPI backend application
 """
+# Startup profili: açılış aşamalarının süresi (en başta import edilir)
+from .core.startup_profile import startup_profile
+
 from fastapi import FastAPI, Request
 from fastapi.openapi.utils import get_openapi
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
@@ -22,15 +24,16 @@ from pathlib import Path
 load_dotenv()
 
 # Logging setup (önce başlatılmalı)
-from .core.logging_config import setup_logging, get_logger
+from .core.logging_config import setup_logging, get_logger, flush_logging
 
 # Setup logging
-setup_logging(
-    log_dir=Path("logs"),
-    log_level=os.getenv("LOG_LEVEL", "INFO"),
-    enable_console=True,
-    enable_json=True
-)
+with startup_profile.phase("logging"):
+    setup_logging(
+        log_dir=Path("logs"),
+        log_level=os.getenv("LOG_LEVEL", "INFO"),
+        enable_console=True,
+        enable_json=True
+    )
 
 logger = get_logger(__name__)
 
@@ -38,20 +41,22 @@ logger = get_logger(__name__)
 from .config.database import Base, engine
 
 # Models - Import for table creation
-from .modules.cari.models import Cari
-from .modules.motorbot.models import Motorbot, MbTrip
-from .modules.hizmet.models import Hizmet
-from .modules.kurlar.models import ExchangeRate
-from .modules.parametre.models import Parametre
-from .modules.tarife.models import PriceList, PriceListItem
-from .modules.barinma.models import BarinmaContract
-from .modules.isemri.models import WorkOrder, WorkOrderItem, WorkOrderPerson
-from .modules.saha.models import WorkLog
-from .modules.guvenlik.models import GateLog, GateChecklistItem
-from .modules.auth.models import User, Role, Permission, PasswordResetToken  # FAZ 4: Authentication models
-from .modules.dijital_arsiv.models import PortalUser, ArchiveDocument, Notification  # Dijital Arşiv
-from .modules.sgk.models import SgkPeriodCheck  # SGK entegrasyonu
-from .modules.audit.models import AuditEvent  # Audit
+# Not: Modül paketleri router'larını lazy export eder; model import'u router zincirini yüklemez.
+with startup_profile.phase("models"):
+    from .modules.cari.models import Cari
+    from .modules.motorbot.models import Motorbot, MbTrip
+    from .modules.hizmet.models import Hizmet
+    from .modules.kurlar.models import ExchangeRate
+    from .modules.parametre.models import Parametre
+    from .modules.tarife.models import PriceList, PriceListItem
+    from .modules.barinma.models import BarinmaContract
+    from .modules.isemri.models import WorkOrder, WorkOrderItem, WorkOrderPerson
+    from .modules.saha.models import WorkLog
+    from .modules.guvenlik.models import GateLog, GateChecklistItem
+    from .modules.auth.models import User, Role, Permission, PasswordResetToken  # FAZ 4: Authentication models
+    from .modules.dijital_arsiv.models import PortalUser, ArchiveDocument, Notification  # Dijital Arşiv
+    from .modules.sgk.models import SgkPeriodCheck  # SGK entegrasyonu
+    from .modules.audit.models import AuditEvent  # Audit
 
 # ============================================
 # DATABASE INITIALIZATION
@@ -62,67 +67,48 @@ from .modules.audit.models import AuditEvent  # Audit
 # Production ortamında schema değişiklikleri SADECE Alembic migration'lar ile yapılmalıdır.
 # create_all() sadece development ortamında hızlı prototipleme için kullanılır.
 # Bu sayede migration history bozulmaz ve schema drift önlenir.
+#
+# create_all() ve bootstrap import anında değil startup event'inde çalışır
+# (testler ve araçlar main'i import ederken bu maliyeti ödemez).
 
 APP_ENV = os.getenv("APP_ENV", "production").lower()
 IS_DEVELOPMENT = APP_ENV == "development" or os.getenv("DEBUG", "False").lower() == "true"
 
-if IS_DEVELOPMENT:
-    # Development mode: Auto-create tables from models
-    Base.metadata.create_all(bind=engine)
-    logger.info(f"✅ [DEVELOPMENT] Database tables created/verified via SQLAlchemy models")
-    logger.warning("⚠️  Development mode: create_all() is active. Use Alembic migrations for production!")
-else:
-    # Production mode: Alembic migrations only
-    logger.info(f"✅ [PRODUCTION] Database schema managed by Alembic migrations only")
-    logger.info("   To apply migrations: alembic upgrade head")
-
-# Bootstrap application (Development mode only)
-from .core.bootstrap import bootstrap_application
-if IS_DEVELOPMENT:
-    bootstrap_application()
-    logger.info("✅ [DEVELOPMENT] Bootstrap data initialized")
-else:
-    logger.info("ℹ️  [PRODUCTION] Bootstrap skipped (manual data seeding required)")
-
-# Routers
-from .modules.cari import router as router_cari
-from .modules.motorbot import router as router_motorbot
-# sefer router ayrı modülde (legacy /api/mb-trip)
-try:
-    from .modules.sefer import router as router_sefer  # optional mb-trip legacy endpoints
-except Exception:
-    router_sefer = None
-from .modules.hizmet import router as router_hizmet
-from .modules.kurlar import router as router_kurlar
-from .modules.parametre import router as router_parametre
-from .modules.tarife import router as router_tarife
-from .modules.barinma import router as router_barinma
-from .modules.isemri import router as router_isemri
-from .modules.isemri.work_order_person_router import router as work_order_person_router
-from .modules.saha import router as router_saha
-from .modules.saha.saha_personel_router import router as saha_personel_router
-from .modules.guvenlik import router as router_guvenlik
-from .modules.guvenlik.security_router import router as security_router
-from .modules.auth import auth_router  # FAZ 4: Authentication endpoints
-from .modules.audit.router import router as audit_router
-from .core.monitoring import router as monitoring_router  # FAZ 6: Monitoring
-from .modules.dijital_arsiv.portal_router import router as portal_router  # Portal API
-from .modules.dijital_arsiv.portal_employee_router import router as portal_employee_router  # Portal Employee & Vehicle
-from .modules.dijital_arsiv.admin_employee_router import router as admin_employee_router  # Admin Employee Reports
-from .modules.dijital_arsiv.admin_vehicle_document_router import router as admin_vehicle_document_router  # Admin Vehicle Document Approval
-from .modules.dijital_arsiv.internal_router import router as internal_router  # Internal Dijital Arşiv API
-from .modules.dijital_arsiv import router as dijital_arsiv_router  # Dijital Arşiv API (stats, upload, approve, reject)
+
+def initialize_database() -> None:
+    """Development: tabloları oluştur + bootstrap verisi. Production: yalnızca bilgi logu."""
+    if IS_DEVELOPMENT:
+        # Development mode: Auto-create tables from models
+        with startup_profile.phase("db_create_all"):
+            Base.metadata.create_all(bind=engine)
+        logger.info(f"✅ [DEVELOPMENT] Database tables created/verified via SQLAlchemy models")
+        logger.warning("⚠️  Development mode: create_all() is active. Use Alembic migrations for production!")
+
+        # Bootstrap application (Development mode only)
+        from .core.bootstrap import bootstrap_application
+        with startup_profile.phase("bootstrap"):
+            bootstrap_application()
+        logger.info("✅ [DEVELOPMENT] Bootstrap data initialized")
+    else:
+        # Production mode: Alembic migrations only
+        logger.info(f"✅ [PRODUCTION] Database schema managed by Alembic migrations only")
+        logger.info("   To apply migrations: alembic upgrade head")
+        logger.info("ℹ️  [PRODUCTION] Bootstrap skipped (manual data seeding required)")
 
 # Middleware
-from .middleware.request_logging import RequestLoggingMiddleware
+from .middleware.asgi_pipeline import RequestPipelineMiddleware
 from .middleware.error_handler import global_exception_handler
-from .modules.audit.utils import persist_audit_event
-import time
+from .core.json_response import FastJSONResponse
+from .core.router_registry import RouterRegistry, LazyRouterMiddleware
+from .core.monitoring import router as monitoring_router  # FAZ 6: Monitoring
+from .core.rate_limit import AliaportLimiter, verified_user_id
+from .modules.audit.utils import audit_queue
 
 app = FastAPI(
     title="Aliaport v3.1 - Liman Yönetim Sistemi",
     version="3.1.0",
-    description="Aliaport Liman Yönetim Sistemi API. Standart yanıt zarfı: success, message, data, error, pagination. Hata kodları için ErrorResponse şemasını inceleyin."
+    description="Aliaport Liman Yönetim Sistemi API. Standart yanıt zarfı: success, message, data, error, pagination. Hata kodları için ErrorResponse şemasını inceleyin.",
+    default_response_class=FastJSONResponse  # orjson: Decimal/datetime/enum native
 )
 
 # TODO(RATE_LIMITS.md): Belgele
@@ -160,22 +146,20 @@ DEFAULT_RATE_LIMITS = ["300/minute"]  # TODO: Config'e alınabilir (ENV: RATE_LI
 
 def auth_aware_key_func(request: Request):
     """Kimlik doğrulanmış isteklerde user_id, aksi halde IP bazlı anahtar döndürür.
-    Not: Performans için JWT decode minimal yapılır; başarısız olursa IP'ye düşer.
+    Not: Access token'ın HS256 imzası doğrulanır (stdlib HMAC, cache'li); imzasız
+    veya süresi dolmuş token IP'ye düşer, böylece sahte user_id ile limit aşılamaz.
     """
     auth = request.headers.get("Authorization", "")
     if auth.startswith("Bearer "):
-        token = auth.split(" ", 1)[1]
-        try:
-            from .modules.auth.utils import verify_token
-            payload = verify_token(token, token_type="access")
-            if payload and payload.get("user_id"):
-                return f"user:{payload['user_id']}"
-        except Exception:
-            pass
+        from .modules.auth.utils import SECRET_KEY
+        user_id = verified_user_id(auth[7:], SECRET_KEY)
+        if user_id:
+            return f"user:{user_id}"
     # Fallback IP
     return f"ip:{get_remote_address(request)}"
 
-limiter = Limiter(key_func=auth_aware_key_func, default_limits=DEFAULT_RATE_LIMITS, headers_enabled=True)
+# Storage/strateji: RATE_LIMIT_STORAGE_URI, RATE_LIMIT_STRATEGY (bkz. core/rate_limit.py)
+limiter = AliaportLimiter("api", key_func=auth_aware_key_func, default_limits=DEFAULT_RATE_LIMITS, headers_enabled=True)
 app.state.limiter = limiter
 
 @app.exception_handler(RateLimitExceeded)
@@ -223,22 +207,6 @@ app.add_exception_handler(Exception, global_exception_handler)
 # MIDDLEWARE
 # ============================================
 
-# Request logging middleware (her request için timing ve ID)
-app.add_middleware(RequestLoggingMiddleware)
-
-# Audit middleware (her HTTP isteğini DB'ye yazar)
-@app.middleware("http")
-async def audit_middleware(request: Request, call_next):
-    start = time.monotonic()
-    response = await call_next(request)
-    duration_ms = int((time.monotonic() - start) * 1000)
-    # Persist audit (non-blocking, safe-fail)
-    try:
-        persist_audit_event(request, response, duration_ms)
-    except Exception:
-        pass
-    return response
-
 # CORS middleware - Frontend'in backend'e erişmesi için
 # Tüm origins'i dev modunda allow et
 ALLOWED_ORIGINS = [
@@ -270,28 +238,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["*"],
-    expose_headers=["x-request-id", "x-ratelimit-limit", "x-ratelimit-remaining"],
+    expose_headers=["x-request-id", "x-ratelimit-limit", "x-ratelimit-remaining", "x-total-count", "x-page", "x-page-size"],
     max_age=3600,
 )
 
 # ============================================
-# SECURITY HEADERS MIDDLEWARE
+# REQUEST PIPELINE MIDDLEWARE (pure ASGI)
 # ============================================
-@app.middleware("http")
-async def security_headers(request: Request, call_next):
-    response = await call_next(request)
-    # Temel güvenlik başlıkları
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    response.headers["Permissions-Policy"] = "geolocation=()"  # gerekirse genişlet
-    # Dev ortamında CSP esnek; prod'da sıkılaştırılmalı
-    csp = "default-src 'self'; script-src 'self'; style-src 'self' 'unsafe-inline'; img-src 'self' data:;"
-    response.headers["Content-Security-Policy"] = csp
-    # HTTPS production için
-    if os.getenv("ENABLE_HSTS","0") == "1":
-        response.headers["Strict-Transport-Security"] = "max-age=63072000; includeSubDomains; preload"
-    return response
+# Request ID + timing + yapılandırılmış log + güvenlik başlıkları + audit kuyruğu
+# tek katmanda. En dışta eklenir: CORS preflight cevapları da başlıkları alır.
+# Streaming response'ları buffer etmez (dosya önizleme, export).
+app.add_middleware(RequestPipelineMiddleware)
 
 # ============================================
 # DATABASE MIGRATIONS
@@ -308,17 +265,32 @@ async def security_headers(request: Request, call_next):
 
 @app.on_event("startup")
 async def startup_event():
-    """Uygulama başlangıcında scheduler ve job'ları başlat"""
+    """Uygulama başlangıcında veritabanı, scheduler ve job'ları başlat"""
     from .core.scheduler import start_scheduler
     from .jobs import register_jobs
+    from .config.storage import get_exports_dir
+    from .core.zip_stream import remove_stale_parts
     
-    # Scheduler'ı başlat
-    start_scheduler()
+    initialize_database()
     
-    # Job'ları kaydet (kur sync, audit archive, vb.)
-    register_jobs()
+    # Önceki süreçten yarım kalmış hazırlanmış arşivler (.part) 24 saat beklemez
+    remove_stale_parts(get_exports_dir())
+    
+    with startup_profile.phase("scheduler"):
+        # Scheduler'ı başlat
+        start_scheduler()
+        
+        # Job'ları kaydet (kur sync, audit archive, vb.)
+        register_jobs()
     
     logger.info("✅ Background jobs initialized")
+    
+    if ROUTER_LOADING == "eager":
+        with startup_profile.phase("routers_eager"):
+            router_registry.mount_all()
+    
+    startup_profile.mark_ready()
+    startup_profile.report(logger)
 
 
 @app.on_event("shutdown")
@@ -327,40 +299,51 @@ async def shutdown_event():
     from .core.scheduler import shutdown_scheduler
     
     shutdown_scheduler()
+    audit_queue.stop()
     logger.info("✅ Application shutdown complete")
+    # Listener thread process çıkışında (atexit) durur; burada kuyruk boşaltılır
+    flush_logging()
 
 # ============================================
 
-# Router'ları ekle
+# Router'ları kaydet
+# Monitoring eager mount edilir (health check'ler açılıştan itibaren hazır).
+# Diğer router'lar RouterRegistry ile ilgili prefix'e gelen ilk istekte mount edilir;
+# `paths` ipuçları router'ın cevapladığı URL prefix'leridir. ROUTER_LOADING=eager ile
+# hepsi startup'ta mount edilir.
 app.include_router(monitoring_router)  # FAZ 6: /health, /ready, /metrics, /status
-if auth_router is not None:
-    app.include_router(auth_router, prefix="/api/auth")  # FAZ 4: /api/auth endpoints (login, logout, refresh, users)
-app.include_router(audit_router)  # Register audit router
-app.include_router(router_cari)
-app.include_router(router_motorbot)  # içinde /sefer endpoints var
-if router_sefer is not None:
-    app.include_router(router_sefer)  # /api/mb-trip legacy sefer endpoints
-app.include_router(router_hizmet, prefix="/api/hizmet", tags=["Hizmet"])
-app.include_router(router_kurlar, prefix="/api/exchange-rate", tags=["Kurlar"])
-app.include_router(router_parametre)
-app.include_router(router_tarife, prefix="/api/price-list", tags=["Tarife"])
-app.include_router(router_barinma, prefix="/api/barinma", tags=["Barinma"])
-app.include_router(router_isemri, prefix="/api", tags=["İş Emri"])
-app.include_router(work_order_person_router, prefix="/api", tags=["İş Emri"])
-app.include_router(router_saha)  # /api/worklog
-app.include_router(saha_personel_router, prefix="/api", tags=["Saha Personeli"])
-app.include_router(router_guvenlik)  # /api/gatelog
-app.include_router(security_router, prefix="/api", tags=["Güvenlik"])
-app.include_router(portal_router, prefix="/api/v1")  # Portal API - /api/v1/portal/*
-app.include_router(portal_employee_router, prefix="/api/v1")  # Portal Employee & Vehicle - /api/v1/portal/employees, /vehicles
-app.include_router(admin_employee_router, prefix="/api/v1")  # Admin Employee Reports - /api/v1/admin/*
-app.include_router(admin_vehicle_document_router, prefix="/api/v1")  # Admin Vehicle Document Approval - /api/v1/admin/vehicles/documents/*
-app.include_router(internal_router, prefix="/api/v1")  # Internal Dijital Arşiv API - /api/v1/internal/*
-app.include_router(dijital_arsiv_router, prefix="/api", tags=["Dijital Arşiv"])  # Dijital Arşiv API - /api/archive/*
 
+ROUTER_LOADING = os.getenv("ROUTER_LOADING", "lazy").lower()
+router_registry = RouterRegistry(app, package=__package__)
+app.state.router_registry = router_registry
+
+router_registry.register("auth", ".modules.auth.router:router", paths=("/api/auth",), prefix="/api/auth", optional=True)  # FAZ 4: /api/auth endpoints (login, logout, refresh, users)
+router_registry.register("audit", ".modules.audit.router:router", paths=("/api/audit",))
+router_registry.register("diagnostics", ".core.diagnostics_router:router", paths=("/api/diagnostics",))  # SQL teşhis raporu (QUERY_DIAGNOSTICS=1)
+router_registry.register("cari", ".modules.cari.router:router", paths=("/api/cari",))
+router_registry.register("motorbot", ".modules.motorbot.router:router", paths=("/api/motorbot",))  # içinde /sefer endpoints var
+router_registry.register("sefer", ".modules.sefer.router:router", paths=("/api/mb-trip",), optional=True)  # /api/mb-trip legacy sefer endpoints
+router_registry.register("hizmet", ".modules.hizmet.router:router", paths=("/api/hizmet",), prefix="/api/hizmet", tags=["Hizmet"])
+router_registry.register("kurlar", ".modules.kurlar.router:router", paths=("/api/exchange-rate",), prefix="/api/exchange-rate", tags=["Kurlar"])
+router_registry.register("parametre", ".modules.parametre.router:router", paths=("/api/parametre",))
+router_registry.register("tarife", ".modules.tarife.router:router", paths=("/api/price-list",), prefix="/api/price-list", tags=["Tarife"])
+router_registry.register("barinma", ".modules.barinma.router:router", paths=("/api/barinma",), prefix="/api/barinma", tags=["Barinma"])
+router_registry.register("isemri", ".modules.isemri.router:router", paths=("/api/work-order", "/api/api/"), prefix="/api", tags=["İş Emri"])
+router_registry.register("work_order_person", ".modules.isemri.work_order_person_router:router", paths=("/api/work-order",), prefix="/api", tags=["İş Emri"])
+router_registry.register("saha", ".modules.saha.router:router", paths=("/api/worklog",))  # /api/worklog
+router_registry.register("saha_personel", ".modules.saha.saha_personel_router:router", paths=("/api/saha-personel",), prefix="/api", tags=["Saha Personeli"])
+router_registry.register("guvenlik", ".modules.guvenlik.router:router", paths=("/api/gatelog",))  # /api/gatelog
+router_registry.register("security", ".modules.guvenlik.security_router:router", paths=("/api/security",), prefix="/api", tags=["Güvenlik"])
+router_registry.register("portal", ".modules.dijital_arsiv.portal_router:router", paths=("/api/v1/portal",), prefix="/api/v1")  # Portal API - /api/v1/portal/*
+router_registry.register("portal_employee", ".modules.dijital_arsiv.portal_employee_router:router", paths=("/api/v1/portal",), prefix="/api/v1")  # Portal Employee & Vehicle - /api/v1/portal/employees, /vehicles
+router_registry.register("admin_employee", ".modules.dijital_arsiv.admin_employee_router:router", paths=("/api/v1/admin",), prefix="/api/v1")  # Admin Employee Reports - /api/v1/admin/*
+router_registry.register("admin_vehicle_document", ".modules.dijital_arsiv.admin_vehicle_document_router:router", paths=("/api/v1/admin",), prefix="/api/v1")  # Admin Vehicle Document Approval - /api/v1/admin/vehicles/documents/*
+router_registry.register("internal", ".modules.dijital_arsiv.internal_router:router", paths=("/api/v1/internal",), prefix="/api/v1")  # Internal Dijital Arşiv API - /api/v1/internal/*
+router_registry.register("dijital_arsiv", ".modules.dijital_arsiv.router:router", paths=("/api/api/",), prefix="/api", tags=["Dijital Arşiv"])  # Dijital Arşiv API - /api/archive/*
 # Admin vehicle document init (temporary)
-from .admin_vehicle_init import router as admin_vehicle_router
-app.include_router(admin_vehicle_router, prefix="/api/v1", tags=["Admin Utils"])
+router_registry.register("admin_vehicle_init", ".admin_vehicle_init:router", paths=("/api/v1/admin",), prefix="/api/v1", tags=["Admin Utils"])
+
+app.add_middleware(LazyRouterMiddleware, registry=router_registry)
 
 
 @app.get("/")
@@ -414,6 +397,7 @@ from .core.responses import StandardResponse, ErrorResponse, PaginatedResponse
 def custom_openapi():
     if app.openapi_schema:
         return app.openapi_schema
+    router_registry.mount_all()
     schema = get_openapi(
         title=app.title,
         version=app.version,
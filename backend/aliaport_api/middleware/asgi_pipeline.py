@@ -0,0 +1,193 @@
+"""
+Request Pipeline Middleware (pure ASGI)
+
+RequestLoggingMiddleware + audit_middleware + security_headers katmanlarını tek bir
+saf ASGI middleware'de birleştirir:
+
+- Request ID üretimi (scope["state"] -> request.state.request_id)
+- Timing + yapılandırılmış api_request logu
+- Prometheus RED metrikleri (route şablonu bazında) + istek başına DB sorgu sayısı/süresi
+- QUERY_DIAGNOSTICS açıksa SQL profili (slow query / N+1) ve Server-Timing başlığı
+- Güvenlik başlıkları (byte değerleri başlangıçta bir kez hesaplanır)
+- Audit kaydının arka plan kuyruğuna eklenmesi (DB yazımı request yolunda yapılmaz)
+
+BaseHTTPMiddleware'in aksine response gövdesini sarmaz/buffer etmez; streaming
+response'lar (dosya önizleme, export) parça parça istemciye akar.
+"""
+
+import os
+import time
+import uuid
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.logging_config import get_logger, log_api_request
+from ..core.metrics import REQUESTS_IN_PROGRESS, RequestDbStats, observe_request, request_db_stats, route_template
+from ..core.query_diagnostics import query_diagnostics as default_query_diagnostics
+from ..modules.audit.utils import audit_queue
+
+logger = get_logger(__name__)
+
+CONTENT_SECURITY_POLICY = "default-src 'self'; script-src 'self'; style-src 'self' 'unsafe-inline'; img-src 'self' data:;"
+HSTS_VALUE = "max-age=63072000; includeSubDomains; preload"
+
+
+def build_security_headers(enable_hsts: bool = False) -> List[Tuple[bytes, bytes]]:
+    """Statik güvenlik başlıklarını (isim, değer) byte çiftleri olarak döner."""
+    headers = [
+        (b"x-frame-options", b"DENY"),
+        (b"x-content-type-options", b"nosniff"),
+        (b"referrer-policy", b"strict-origin-when-cross-origin"),
+        (b"permissions-policy", b"geolocation=()"),
+        (b"content-security-policy", CONTENT_SECURITY_POLICY.encode("latin-1")),
+    ]
+    if enable_hsts:
+        headers.append((b"strict-transport-security", HSTS_VALUE.encode("latin-1")))
+    return headers
+
+
+class RequestPipelineMiddleware:
+    """
+    Request ID, timing, loglama, güvenlik başlıkları ve audit için tek ASGI katmanı.
+
+    Args:
+        app: Sarılan ASGI uygulaması
+        enable_hsts: HSTS başlığı eklensin mi (None ise ENABLE_HSTS env okunur)
+        enable_audit: Audit kaydı kuyruğa eklensin mi
+        audit_sink: Audit kayıtlarını alacak nesne (enqueue(dict) metodu olmalı)
+        query_diagnostics: SQL teşhis katmanı (None ise global QueryDiagnostics)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        enable_hsts: Optional[bool] = None,
+        enable_audit: bool = True,
+        audit_sink=None,
+        query_diagnostics=None,
+    ):
+        self.app = app
+        if enable_hsts is None:
+            enable_hsts = os.getenv("ENABLE_HSTS", "0") == "1"
+        self.security_headers = build_security_headers(enable_hsts)
+        self._security_header_names = frozenset(name for name, _ in self.security_headers)
+        self.enable_audit = enable_audit
+        self.audit_sink = audit_sink if audit_sink is not None else audit_queue
+        self.query_diagnostics = query_diagnostics if query_diagnostics is not None else default_query_diagnostics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = str(uuid.uuid4())
+        request_id_bytes = request_id.encode("latin-1")
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        method = scope["method"]
+        db_stats = RequestDbStats()
+        db_stats_token = request_db_stats.set(db_stats)
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        query_profile = self.query_diagnostics.begin(db_stats, scope)
+
+        start = time.perf_counter()
+        status_code = 500
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                message["headers"] = self._merge_headers(message.get("headers") or [], request_id_bytes)
+                if query_profile is not None:
+                    message["headers"].append((b"server-timing", query_profile.server_timing()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            duration_ms = (time.perf_counter() - start) * 1000
+            observe_request(method, route_template(scope), 500, duration_ms / 1000, db_stats)
+            logger.error(
+                f"Request failed: {scope['method']} {scope['path']}",
+                extra={
+                    "request_id": request_id,
+                    "extra_data": {
+                        "type": "request_error",
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "duration_ms": round(duration_ms, 2),
+                        "error": str(exc),
+                    },
+                },
+                exc_info=exc,
+            )
+            raise
+        finally:
+            in_progress.dec()
+            request_db_stats.reset(db_stats_token)
+            if query_profile is not None:
+                self.query_diagnostics.end(query_profile, method, status_code if response_started else 500)
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        final_status = status_code if response_started else 500
+        observe_request(method, route_template(scope), final_status, duration_ms / 1000, db_stats)
+        self._after_response(scope, request_id, final_status, duration_ms)
+
+    def _merge_headers(self, headers: Iterable[Tuple[bytes, bytes]], request_id: bytes) -> List[Tuple[bytes, bytes]]:
+        """Uygulamanın başlıklarına request id ve güvenlik başlıklarını ekler (aynı isimleri ezer)."""
+        merged = [
+            (name, value)
+            for name, value in headers
+            if name.lower() not in self._security_header_names and name.lower() != b"x-request-id"
+        ]
+        merged.append((b"x-request-id", request_id))
+        merged.extend(self.security_headers)
+        return merged
+
+    def _after_response(self, scope: Scope, request_id: str, status_code: int, duration_ms: float) -> None:
+        method = scope["method"]
+        path = scope["path"]
+        query_string = scope.get("query_string", b"")
+        client = scope.get("client")
+        client_host = client[0] if client else None
+
+        # Header'lar tek geçişte okunur (log + audit için gerekli olanlar)
+        auth_header = None
+        user_agent = None
+        for name, value in scope.get("headers", ()):
+            if name == b"authorization":
+                auth_header = value.decode("latin-1")
+            elif name == b"user-agent":
+                user_agent = value.decode("latin-1")
+
+        log_api_request(
+            logger=logger,
+            method=method,
+            path=path,
+            status_code=status_code,
+            duration_ms=duration_ms,
+            request_id=request_id,
+            extra_data={
+                "query_params": dict(parse_qsl(query_string.decode("latin-1"))) if query_string else None,
+                "client_host": client_host,
+            },
+        )
+
+        if self.enable_audit:
+            try:
+                self.audit_sink.enqueue({
+                    "method": method,
+                    "path": path,
+                    "status_code": status_code,
+                    "duration_ms": int(duration_ms),
+                    "auth_header": auth_header,
+                    "ip": client_host,
+                    "user_agent": user_agent,
+                })
+            except Exception:
+                pass
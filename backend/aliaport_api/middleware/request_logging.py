@@ -1,6 +1,9 @@
 """
 Request Logging Middleware
 Logs all API requests with timing and request ID
+
+Not: main.py artık middleware/asgi_pipeline.RequestPipelineMiddleware kullanır;
+bu sınıf geriye dönük uyumluluk ve benchmark karşılaştırması için tutulur.
 """
 
 from fastapi import Request, Response
@@ -0,0 +1,126 @@
+"""
+Audit event arşivleme.
+
+Saklama süresini (AUDIT_RETENTION_DAYS, varsayılan 90 gün) aşan kayıtlar
+audit_events tablosundan audit_events_archive tablosuna sınırlı batch'ler
+halinde taşınır. Her batch tek transaction'dır (INSERT + DELETE + commit);
+job yarıda kesilirse taşınmış batch'ler kalıcı, kalanlar sıcak tabloda kalır.
+
+AUDIT_ARCHIVE_EXPORT_DIR ayarlıysa taşınan kayıtlar ayrıca aylık
+`audit_events_YYYY-MM.jsonl.gz` dosyalarına eklenir (gzip çoklu member;
+`zcat`/`gzip.open` dosyayı tek akış olarak okur).
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from ...core.metrics import AUDIT_ARCHIVED_ROWS
+from .models import AuditEvent, AuditEventArchive
+
+logger = logging.getLogger(__name__)
+
+AUDIT_RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "90"))
+AUDIT_ARCHIVE_BATCH_SIZE = int(os.getenv("AUDIT_ARCHIVE_BATCH_SIZE", "1000"))
+AUDIT_ARCHIVE_EXPORT_DIR = os.getenv("AUDIT_ARCHIVE_EXPORT_DIR") or None
+
+_HOT = AuditEvent.__table__
+_ARCHIVE = AuditEventArchive.__table__
+_COLUMNS = [column.name for column in _HOT.columns]
+
+
+@dataclass
+class ArchiveResult:
+    archived: int = 0
+    batches: int = 0
+    exported_files: List[str] = field(default_factory=list)
+
+
+def archive_cutoff(now: Optional[datetime] = None, retention_days: int = AUDIT_RETENTION_DAYS) -> datetime:
+    """Bu tarihten eski kayıtlar arşive taşınır (naive UTC, created_at ile aynı)."""
+    return (now or datetime.utcnow()) - timedelta(days=retention_days)
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} JSON'a çevrilemez")
+
+
+def _export_rows(export_dir: Path, rows: List[Dict]) -> List[str]:
+    """Satırları created_at ayına göre gruplayıp aylık .jsonl.gz dosyalarına ekler."""
+    by_month: Dict[str, List[Dict]] = {}
+    for row in rows:
+        by_month.setdefault(row["created_at"].strftime("%Y-%m"), []).append(row)
+
+    export_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for month, month_rows in sorted(by_month.items()):
+        path = export_dir / f"audit_events_{month}.jsonl.gz"
+        with gzip.open(path, "at", encoding="utf-8") as fh:
+            for row in month_rows:
+                fh.write(json.dumps(row, default=_json_default, ensure_ascii=False) + "\n")
+        written.append(str(path))
+    return written
+
+
+def archive_audit_events(
+    session: Session,
+    cutoff: Optional[datetime] = None,
+    batch_size: int = AUDIT_ARCHIVE_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+    export_dir: Optional[str] = AUDIT_ARCHIVE_EXPORT_DIR,
+) -> ArchiveResult:
+    """
+    cutoff'tan eski audit kayıtlarını id sırasıyla batch'ler halinde arşive taşır.
+
+    Args:
+        session: SQLAlchemy session (her batch sonunda commit edilir)
+        cutoff: Bu tarihten eski kayıtlar taşınır (varsayılan: archive_cutoff())
+        batch_size: Batch başına satır (transaction ve kilit süresini sınırlar)
+        max_batches: Tek çalıştırmada en fazla batch (None = hepsi)
+        export_dir: Ayarlıysa taşınan satırlar aylık .jsonl.gz dosyalarına da yazılır
+
+    Returns:
+        ArchiveResult (taşınan satır, batch sayısı, yazılan export dosyaları)
+    """
+    cutoff = cutoff or archive_cutoff()
+    result = ArchiveResult()
+    exported = set()
+    batch_query = (
+        select(*(_HOT.c[name] for name in _COLUMNS))
+        .where(_HOT.c.created_at < cutoff)
+        .order_by(_HOT.c.id)
+        .limit(batch_size)
+    )
+
+    while max_batches is None or result.batches < max_batches:
+        rows = [dict(row) for row in session.execute(batch_query).mappings()]
+        if not rows:
+            break
+        ids = [row["id"] for row in rows]
+        try:
+            session.execute(insert(_ARCHIVE), rows)
+            session.execute(delete(_HOT).where(_HOT.c.id.in_(ids)))
+            if export_dir:
+                exported.update(_export_rows(Path(export_dir), rows))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        result.archived += len(rows)
+        result.batches += 1
+        AUDIT_ARCHIVED_ROWS.inc(len(rows))
+        logger.debug("Audit archive batch | rows=%s | last_id=%s", len(rows), ids[-1])
+
+    result.exported_files = sorted(exported)
+    return result
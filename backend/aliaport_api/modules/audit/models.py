@@ -1,17 +1,25 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, JSON
 from sqlalchemy.sql import func
 from ...config.database import Base
 
 class AuditEvent(Base):
     __tablename__ = "audit_events"
-    __table_args__ = {"extend_existing": True}
+    # Olay incelemesindeki gerçek filtreler + (created_at, id) keyset sıralaması;
+    # user_id / resource tek kolon index'leri bu index'lerin ön ekiyle karşılanır
+    __table_args__ = (
+        Index("ix_audit_events_user_created", "user_id", "created_at", "id"),
+        Index("ix_audit_events_resource_action_created", "resource", "action", "created_at", "id"),
+        Index("ix_audit_events_status_created", "status_code", "created_at", "id"),
+        Index("ix_audit_events_path_created", "path", "created_at", "id"),
+        {"extend_existing": True},
+    )
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     method = Column(String(10), nullable=False)
-    path = Column(String(300), index=True, nullable=False)
+    path = Column(String(300), nullable=False)
     action = Column(String(50), index=True, nullable=True)  # inferred resource action
-    resource = Column(String(50), index=True, nullable=True)
+    resource = Column(String(50), nullable=True)
     entity_id = Column(Integer, nullable=True)
     status_code = Column(Integer, nullable=False)
     duration_ms = Column(Integer, nullable=True)
@@ -20,3 +28,28 @@ class AuditEvent(Base):
     user_agent = Column(String(300), nullable=True)
     extra = Column(JSON, nullable=True)
     created_at = Column(DateTime, nullable=False, server_default=func.now(), index=True)
+
+
+class AuditEventArchive(Base):
+    """Saklama süresini aşmış audit kayıtları (id'ler audit_events ile aynı kalır).
+
+    user_id için FK yok: kullanıcı silinse de arşiv kaydı korunur.
+    """
+    __tablename__ = "audit_events_archive"
+    __table_args__ = {"extend_existing": True}
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, index=True, nullable=True)
+    method = Column(String(10), nullable=False)
+    path = Column(String(300), nullable=False)
+    action = Column(String(50), nullable=True)
+    resource = Column(String(50), index=True, nullable=True)
+    entity_id = Column(Integer, nullable=True)
+    status_code = Column(Integer, nullable=False)
+    duration_ms = Column(Integer, nullable=True)
+    roles = Column(String(200), nullable=True)
+    ip = Column(String(64), nullable=True)
+    user_agent = Column(String(300), nullable=True)
+    extra = Column(JSON, nullable=True)
+    created_at = Column(DateTime, nullable=False, index=True)
+    archived_at = Column(DateTime, nullable=False, server_default=func.now())
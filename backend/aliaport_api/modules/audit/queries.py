@@ -0,0 +1,238 @@
+"""
+Audit event sorguları: filtreler, keyset sayfalama ve SQL içinde hesaplanan özetler.
+
+Liste ve özet sorguları aynı kaynak select'ini kullanır: filtreler her tabloya
+ayrı uygulanır (composite index'ler kullanılabilsin diye), `date_from`
+saklama süresinden eskiyse arşiv tablosu UNION ALL ile eklenir.
+
+Sıralama her zaman (created_at DESC, id DESC); cursor son satırın bu ikilisidir.
+Özetler (path/kullanıcı/saat) kısa TTL ile cache'lenir; pencere verilmezse
+son 24 saat kullanılır.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, func, literal, select, tuple_, union_all
+from sqlalchemy.orm import Session
+
+from ...core.cache import cache_key, cached_get_or_set
+from .archive import archive_cutoff
+from .models import AuditEvent, AuditEventArchive
+
+AUDIT_STATS_CACHE_PREFIX = "audit:stats"
+AUDIT_STATS_TTL = 60  # saniye; olay yönetiminde "son durum" için yeterince taze
+AUDIT_STATS_DEFAULT_WINDOW = timedelta(hours=24)
+
+LIST_COLUMNS = ("id", "user_id", "method", "path", "resource", "action", "entity_id",
+                "status_code", "roles", "duration_ms", "ip", "created_at")
+
+
+class InvalidCursor(ValueError):
+    """Cursor çözülemedi (bozuk veya başka bir API'den gelmiş)."""
+
+
+@dataclass(frozen=True)
+class AuditFilters:
+    user_id: Optional[int] = None
+    resource: Optional[str] = None
+    action: Optional[str] = None
+    status_code: Optional[int] = None
+    path: Optional[str] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+
+    def spans_archive(self) -> bool:
+        return self.date_from is not None and self.date_from < archive_cutoff()
+
+
+def encode_cursor(created_at: datetime, event_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{event_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, event_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(event_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def _table_select(model, archived: bool, columns: Sequence[str], filters: AuditFilters,
+                  after: Optional[Tuple[datetime, int]]):
+    stmt = select(*(getattr(model, name) for name in columns), literal(archived).label("archived"))
+    if filters.user_id is not None:
+        stmt = stmt.where(model.user_id == filters.user_id)
+    if filters.resource:
+        stmt = stmt.where(model.resource == filters.resource)
+    if filters.action:
+        stmt = stmt.where(model.action == filters.action)
+    if filters.status_code is not None:
+        stmt = stmt.where(model.status_code == filters.status_code)
+    if filters.path:
+        stmt = stmt.where(model.path == filters.path)
+    if filters.date_from is not None:
+        stmt = stmt.where(model.created_at >= filters.date_from)
+    if filters.date_to is not None:
+        stmt = stmt.where(model.created_at < filters.date_to)
+    if after is not None:
+        stmt = stmt.where(tuple_(model.created_at, model.id) < tuple_(*after))
+    return stmt
+
+
+def events_source(filters: AuditFilters, columns: Sequence[str] = LIST_COLUMNS,
+                  after: Optional[Tuple[datetime, int]] = None):
+    """Filtrelenmiş olayların subquery'si (gerekirse sıcak + arşiv)."""
+    stmt = _table_select(AuditEvent, False, columns, filters, after)
+    if filters.spans_archive():
+        stmt = union_all(stmt, _table_select(AuditEventArchive, True, columns, filters, after))
+    return stmt.subquery("events")
+
+
+def list_events_page(db: Session, filters: AuditFilters, page_size: int, page: int = 1,
+                     cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Bir sayfa olay döndürür.
+
+    cursor verilirse keyset sayfalama yapılır (OFFSET ve COUNT yok, `total` None);
+    verilmezse eski page/offset davranışı korunur. Her iki modda da sayfa dolu
+    ise `next_cursor` döner.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    events = events_source(filters, after=after)
+    query = select(events).order_by(events.c.created_at.desc(), events.c.id.desc()).limit(page_size)
+    total = None
+    if after is None:
+        query = query.offset((page - 1) * page_size)
+        total = db.execute(select(func.count()).select_from(events)).scalar_one()
+
+    rows = db.execute(query).mappings().all()
+    next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if len(rows) == page_size else None
+    return {"rows": rows, "total": total, "next_cursor": next_cursor}
+
+
+# ============================================
+# ÖZETLER
+# ============================================
+
+def _windowed(filters: AuditFilters) -> AuditFilters:
+    if filters.date_from is not None:
+        return filters
+    return AuditFilters(**{**asdict(filters), "date_from": datetime.utcnow() - AUDIT_STATS_DEFAULT_WINDOW})
+
+
+def _error_counts(status_code) -> List:
+    return [
+        func.sum(case((status_code.between(400, 499), 1), else_=0)).label("client_errors"),
+        func.sum(case((status_code >= 500, 1), else_=0)).label("server_errors"),
+    ]
+
+
+def _with_error_rate(row: Dict[str, Any]) -> Dict[str, Any]:
+    row = dict(row)
+    row["error_rate"] = round(row["server_errors"] / row["count"], 4) if row["count"] else 0.0
+    return row
+
+
+def compute_path_stats(db: Session, filters: AuditFilters, limit: int = 20, order_by: str = "count") -> List[Dict[str, Any]]:
+    """
+    Path bazında HTTP istek özetleri: sayı, 4xx/5xx, ortalama, p50 ve p95 duration_ms.
+
+    Percentile'lar nearest-rank ile SQL'de hesaplanır (ROW_NUMBER + COUNT
+    pencere fonksiyonları); SQLite ve PostgreSQL'de aynı sonucu verir.
+    """
+    src = events_source(_windowed(filters), columns=("id", "path", "status_code", "duration_ms", "created_at"))
+    ranked = (
+        select(
+            src.c.path, src.c.status_code, src.c.duration_ms,
+            func.row_number().over(partition_by=src.c.path, order_by=src.c.duration_ms).label("rn"),
+            func.count().over(partition_by=src.c.path).label("n"),
+        )
+        .where(src.c.duration_ms.isnot(None))
+        .subquery("ranked")
+    )
+
+    def percentile(pct: int):
+        # nearest-rank: ceil(pct/100 * n) == (n*pct + 99) // 100
+        return func.max(case((ranked.c.rn == (ranked.c.n * pct + 99) // 100, ranked.c.duration_ms)))
+
+    count = func.count().label("count")
+    p95 = percentile(95).label("p95_ms")
+    stmt = (
+        select(ranked.c.path, count, *_error_counts(ranked.c.status_code),
+               func.avg(ranked.c.duration_ms).label("avg_ms"), percentile(50).label("p50_ms"), p95)
+        .group_by(ranked.c.path)
+        .order_by((p95 if order_by == "p95" else count).desc(), ranked.c.path)
+        .limit(limit)
+    )
+    rows = []
+    for row in db.execute(stmt).mappings():
+        row = _with_error_rate(row)
+        row["avg_ms"] = round(float(row["avg_ms"]), 1)
+        rows.append(row)
+    return rows
+
+
+def compute_user_stats(db: Session, filters: AuditFilters, limit: int = 20) -> List[Dict[str, Any]]:
+    """Kullanıcı bazında olay sayısı, 4xx/5xx ve son görülme zamanı."""
+    src = events_source(_windowed(filters), columns=("id", "user_id", "status_code", "created_at"))
+    stmt = (
+        select(src.c.user_id, func.count().label("count"), *_error_counts(src.c.status_code),
+               func.max(src.c.created_at).label("last_seen"))
+        .group_by(src.c.user_id)
+        .order_by(func.count().desc(), src.c.user_id)
+        .limit(limit)
+    )
+    rows = []
+    for row in db.execute(stmt).mappings():
+        row = _with_error_rate(row)
+        row["last_seen"] = row["last_seen"].isoformat() if isinstance(row["last_seen"], datetime) else row["last_seen"]
+        rows.append(row)
+    return rows
+
+
+def _hour_bucket(db: Session, column):
+    if db.get_bind().dialect.name == "postgresql":
+        return func.to_char(func.date_trunc("hour", column), "YYYY-MM-DD\"T\"HH24:00:00")
+    return func.strftime("%Y-%m-%dT%H:00:00", column)
+
+
+def compute_hourly_stats(db: Session, filters: AuditFilters) -> List[Dict[str, Any]]:
+    """Saat bazında olay sayısı, 4xx/5xx ve 5xx oranı (kronolojik)."""
+    src = events_source(_windowed(filters), columns=("id", "status_code", "created_at"))
+    hour = _hour_bucket(db, src.c.created_at).label("hour")
+    stmt = (
+        select(hour, func.count().label("count"), *_error_counts(src.c.status_code))
+        .group_by(hour)
+        .order_by(hour)
+    )
+    return [_with_error_rate(row) for row in db.execute(stmt).mappings()]
+
+
+_STATS = {
+    "paths": compute_path_stats,
+    "users": compute_user_stats,
+    "hourly": compute_hourly_stats,
+}
+
+
+def get_audit_stats(db: Session, kind: str, filters: AuditFilters, **options: Any) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Cache'li özet. Returns: (rows, cache_hit)
+
+    Pencere verilmemişse anahtar "son 24 saat" olarak kurulur; TTL boyunca
+    aynı sonuç döner.
+    """
+    key = cache_key(
+        AUDIT_STATS_CACHE_PREFIX,
+        kind=kind,
+        **{name: value for name, value in asdict(filters).items() if value is not None},
+        **options,
+    )
+    return cached_get_or_set(key, ttl_seconds=AUDIT_STATS_TTL, fetcher=lambda: _STATS[kind](db, filters, **options))
@@ -1,57 +1,115 @@
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from ...config.database import get_db
-from .models import AuditEvent
+from ...core.error_codes import ErrorCode
+from ...core.responses import error_response
+from .queries import LIST_COLUMNS, AuditFilters, InvalidCursor, get_audit_stats, list_events_page
 from ..auth.dependencies import get_current_active_user, require_role
 
 router = APIRouter(prefix="/api/audit", tags=["Audit"])
 
-@router.get("/events")
-async def list_events(
-    page: int = Query(1, ge=1),
-    page_size: int = Query(50, ge=1, le=200),
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # created_at naive UTC tutulur; "...Z" / "+03:00" ile gelen tarihler UTC'ye çevrilir
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def audit_filters(
     user_id: Optional[int] = Query(None),
     resource: Optional[str] = Query(None),
     action: Optional[str] = Query(None),
     status_code: Optional[int] = Query(None),
+    path: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None, description="Başlangıç (dahil, UTC)"),
+    date_to: Optional[datetime] = Query(None, description="Bitiş (hariç, UTC)"),
+) -> AuditFilters:
+    return AuditFilters(user_id, resource, action, status_code, path, _naive_utc(date_from), _naive_utc(date_to))
+
+
+def _meta() -> dict:
+    return {"timestamp": datetime.utcnow().isoformat()}
+
+
+@router.get("/events")
+def list_events(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Önceki yanıtın next_cursor değeri (keyset sayfalama)"),
+    filters: AuditFilters = Depends(audit_filters),
     db: Session = Depends(get_db),
     _admin = Depends(require_role(["SISTEM_YONETICISI"]))
 ):
-    q = db.query(AuditEvent)
-    if user_id is not None:
-        q = q.filter(AuditEvent.user_id == user_id)
-    if resource:
-        q = q.filter(AuditEvent.resource == resource)
-    if action:
-        q = q.filter(AuditEvent.action == action)
-    if status_code is not None:
-        q = q.filter(AuditEvent.status_code == status_code)
-    total = q.count()
-    items = q.order_by(AuditEvent.id.desc()).offset((page-1)*page_size).limit(page_size).all()
+    try:
+        result = list_events_page(db, filters, page_size, page=page, cursor=cursor)
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_response(code=ErrorCode.INVALID_INPUT, message="Geçersiz cursor", details={"cursor": cursor}),
+        )
+    total = result["total"]
     return {
         "success": True,
         "data": {
             "items": [
                 {
-                    "id": e.id,
-                    "user_id": e.user_id,
-                    "method": e.method,
-                    "path": e.path,
-                    "resource": e.resource,
-                    "action": e.action,
-                    "entity_id": e.entity_id,
-                    "status_code": e.status_code,
-                    "roles": e.roles,
-                    "duration_ms": e.duration_ms,
-                    "ip": e.ip,
-                    "created_at": e.created_at.isoformat(),
-                } for e in items
+                    **{name: e[name] for name in LIST_COLUMNS if name != "created_at"},
+                    "created_at": e["created_at"].isoformat(),
+                    "archived": bool(e["archived"]),
+                } for e in result["rows"]
             ],
-            "page": page,
+            "page": None if cursor else page,
             "page_size": page_size,
             "total": total,
-            "total_pages": (total + page_size - 1)//page_size
+            "total_pages": None if total is None else (total + page_size - 1)//page_size,
+            "next_cursor": result["next_cursor"],
         },
-        "meta": {"timestamp": __import__("datetime").datetime.utcnow().isoformat()}
+        "meta": _meta()
     }
+
+
+def _stats_response(rows: List[dict], cache_hit: bool, filters: AuditFilters) -> dict:
+    return {
+        "success": True,
+        "data": {"items": rows, "date_from": filters.date_from, "date_to": filters.date_to},
+        "meta": {**_meta(), "cached": cache_hit},
+    }
+
+
+@router.get("/stats/paths")
+def path_stats(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: str = Query("count", pattern="^(count|p95)$", description="count: en çok çağrılan, p95: en yavaş"),
+    filters: AuditFilters = Depends(audit_filters),
+    db: Session = Depends(get_db),
+    _admin = Depends(require_role(["SISTEM_YONETICISI"]))
+):
+    """Path bazında istek sayısı, 4xx/5xx, p50/p95 duration_ms (varsayılan: son 24 saat)."""
+    rows, hit = get_audit_stats(db, "paths", filters, limit=limit, order_by=order_by)
+    return _stats_response(rows, hit, filters)
+
+
+@router.get("/stats/users")
+def user_stats(
+    limit: int = Query(20, ge=1, le=200),
+    filters: AuditFilters = Depends(audit_filters),
+    db: Session = Depends(get_db),
+    _admin = Depends(require_role(["SISTEM_YONETICISI"]))
+):
+    """Kullanıcı bazında olay ve hata sayıları (varsayılan: son 24 saat)."""
+    rows, hit = get_audit_stats(db, "users", filters, limit=limit)
+    return _stats_response(rows, hit, filters)
+
+
+@router.get("/stats/hourly")
+def hourly_stats(
+    filters: AuditFilters = Depends(audit_filters),
+    db: Session = Depends(get_db),
+    _admin = Depends(require_role(["SISTEM_YONETICISI"]))
+):
+    """Saatlik olay sayısı ve 5xx oranı (varsayılan: son 24 saat)."""
+    rows, hit = get_audit_stats(db, "hourly", filters)
+    return _stats_response(rows, hit, filters)
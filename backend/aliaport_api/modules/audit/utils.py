@@ -1,13 +1,14 @@
 # backend/aliaport_api/modules/audit/utils.py
 """Utility functions for persisting audit events."""
-from typing import Optional
+from typing import List, Optional
 from fastapi import Request, Response
 from sqlalchemy.orm import Session
 from ...config.database import SessionLocal
 from ..auth.utils import verify_token
 from ..auth.models import User
 from .models import AuditEvent
-import time
+import queue
+import threading
 
 METHOD_ACTION_MAP = {
     "GET": "read",
@@ -28,51 +29,166 @@ def infer_resource_and_action(path: str, method: str) -> (Optional[str], Optiona
         resource = parts[0]
     return resource, action
 
+def _resolve_user(db: Session, auth_header: Optional[str]) -> (Optional[int], Optional[str]):
+    """Authorization header'dan user_id ve rol listesini çözer."""
+    if not auth_header or not auth_header.startswith('Bearer '):
+        return None, None
+    token = auth_header.split(' ', 1)[1]
+    payload = verify_token(token, token_type='access')
+    if not payload or not payload.get('user_id'):
+        return None, None
+    user_id = payload['user_id']
+    user = db.query(User).filter(User.id == user_id).first()
+    roles_str = ','.join(r.name for r in user.roles) if user else None
+    return user_id, roles_str
+
+def _build_audit_event(db: Session, record: dict) -> AuditEvent:
+    user_id, roles_str = _resolve_user(db, record.get('auth_header'))
+    resource, action = infer_resource_and_action(record['path'], record['method'])
+    return AuditEvent(
+        user_id=user_id,
+        method=record['method'],
+        path=record['path'],
+        action=action,
+        resource=resource,
+        status_code=record['status_code'],
+        duration_ms=record['duration_ms'],
+        roles=roles_str,
+        ip=record.get('ip'),
+        user_agent=record.get('user_agent'),
+    )
+
 def persist_audit_event(request: Request, response: Response, duration_ms: int) -> None:
     """Persist an audit event for an HTTP request. Safe-fail (never raises)."""
+    persist_audit_records([{
+        'method': request.method,
+        'path': str(request.url.path),
+        'status_code': response.status_code,
+        'duration_ms': duration_ms,
+        'auth_header': request.headers.get('Authorization'),
+        'ip': request.client.host if request.client else None,
+        'user_agent': request.headers.get('User-Agent'),
+    }])
+
+def persist_audit_records(records: List[dict]) -> int:
+    """Persist a batch of raw audit records in one transaction. Safe-fail, returns written count."""
+    db: Optional[Session] = None
     try:
-        auth_header = request.headers.get('Authorization')
-        user_id = None
-        roles_str = None
-        db: Session = SessionLocal()
-        user: Optional[User] = None
-        if auth_header and auth_header.startswith('Bearer '):
-            token = auth_header.split(' ', 1)[1]
-            payload = verify_token(token, token_type='access')
-            if payload and payload.get('user_id'):
-                user_id = payload['user_id']
-                user = db.query(User).filter(User.id == user_id).first()
-                if user:
-                    roles_str = ','.join(r.name for r in user.roles)
-        resource, action = infer_resource_and_action(str(request.url.path), request.method)
-        ip = request.client.host if request.client else None
-        user_agent = request.headers.get('User-Agent')
-        event = AuditEvent(
-            user_id=user_id,
-            method=request.method,
-            path=str(request.url.path),
-            action=action,
-            resource=resource,
-            status_code=response.status_code,
-            duration_ms=duration_ms,
-            roles=roles_str,
-            ip=ip,
-            user_agent=user_agent,
-        )
-        db.add(event)
+        db = SessionLocal()
+        events = []
+        for record in records:
+            try:
+                events.append(_build_audit_event(db, record))
+            except Exception:
+                continue
+        db.add_all(events)
         db.commit()
+        return len(events)
     except Exception:
         # Silent fail: we don't want auditing to break request flow.
         try:
-            db.rollback()
+            if db is not None:
+                db.rollback()
         except Exception:
             pass
+        return 0
     finally:
         try:
-            db.close()
+            if db is not None:
+                db.close()
         except Exception:
             pass
 
+
+class AuditEventQueue:
+    """Request audit kayıtlarını arka plan thread'inde toplu olarak yazar.
+
+    Request yolunda maliyet yalnızca bir `queue.put_nowait` çağrısıdır; JWT çözümü,
+    kullanıcı/rol sorgusu ve DB yazımı worker thread'inde batch halinde yapılır.
+    Kuyruk doluysa kayıt düşürülür ve `dropped` sayacı artar (istek asla bloklanmaz).
+    """
+
+    def __init__(self, maxsize: int = 10000, batch_size: int = 200, flush_interval: float = 0.5, writer=None):
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=maxsize)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._writer = writer or persist_audit_records
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def enqueue(self, record: dict) -> bool:
+        if self._thread is None:
+            self.start()
+        try:
+            self._queue.put_nowait(record)
+            self.enqueued += 1
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self) -> None:
+        while True:
+            batch: List[dict] = []
+            try:
+                item = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                continue
+            stop = item is None
+            if not stop:
+                batch.append(item)
+            while not stop and len(batch) < self._batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+            if batch:
+                self.written += self._writer(batch)
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def flush(self) -> None:
+        """Kuyruktaki tüm kayıtlar yazılana kadar bekler."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Kalan kayıtları yazıp worker thread'i durdurur."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+
+audit_queue = AuditEventQueue()
+
+
 def persist_business_event(event_type: str, description: str, user_id: Optional[int], entity_type: Optional[str], entity_id: Optional[int], details: Optional[dict]):
     """Persist business event into audit_events table with type mapping."""
     try:
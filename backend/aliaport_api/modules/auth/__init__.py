@@ -15,12 +15,20 @@ from .schemas import (
     TokenResponse,
     RoleResponse,
 )
-# Router import koşullu yapılır; Alembic migration sırasında gereksiz ve hata üretebilir.
-try:
-    # Alembic ortamında da testler için router yüklenmesine izin veriyoruz.
-    from .router import router as auth_router  # type: ignore
-except Exception:
-    auth_router = None
+from ...core.lazy_import import lazy_exports
+
+# Router ilk erişimde yüklenir; Alembic migration sırasında gereksiz ve hata üretebilir.
+_lazy_getattr = lazy_exports(globals(), auth_router=".router:router")
+
+
+def __getattr__(name):
+    if name == "auth_router":
+        try:
+            return _lazy_getattr(name)
+        except Exception:
+            globals()["auth_router"] = None
+            return None
+    return _lazy_getattr(name)
 from .dependencies import get_current_user, get_current_active_user, require_role
 
 __all__ = [
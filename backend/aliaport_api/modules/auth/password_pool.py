@@ -0,0 +1,133 @@
+# backend/aliaport_api/modules/auth/password_pool.py
+"""
+Password hashing/verification worker pool.
+
+bcrypt is deliberately CPU-expensive (~250-300 ms at 12 rounds). At shift
+changes hundreds of staff and portal users sign in at once; verifying inline
+either blocks the event loop (async endpoints) or lets every request thread
+compete for the CPU at the same time (sync endpoints). All hash/verify calls go
+through this pool instead:
+
+- A fixed number of worker threads (the bcrypt C extension releases the GIL,
+  so threads run in parallel on multiple cores)
+- At most ``max_pending`` operations queued or running; beyond that the call
+  fails fast with ``PasswordPoolSaturated`` (endpoints answer 503 + Retry-After)
+- Queue-wait and hashing duration histograms per operation (core.metrics)
+- ``verify_and_update`` returns a new hash when the stored hash was created with
+  different cost parameters, so callers can rehash transparently on login
+
+Environment:
+    PASSWORD_POOL_WORKERS      worker threads (default: min(4, CPU count))
+    PASSWORD_POOL_MAX_PENDING  queued + running operations (default: 256)
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from ...core.metrics import (
+    PASSWORD_HASH_DURATION,
+    PASSWORD_HASH_PENDING,
+    PASSWORD_HASH_QUEUE_WAIT,
+    PASSWORD_HASH_REJECTED,
+)
+
+
+class PasswordPoolSaturated(Exception):
+    """Raised when the pool already holds ``max_pending`` operations."""
+
+
+class PasswordHasherPool:
+    """Bounded thread pool for a passlib CryptContext."""
+
+    def __init__(self, context: CryptContext, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.context = context
+        self.max_workers = max_workers or int(os.getenv("PASSWORD_POOL_WORKERS", min(4, os.cpu_count() or 1)))
+        self.max_pending = max_pending or int(os.getenv("PASSWORD_POOL_MAX_PENDING", "256"))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Lazy: no threads are started at import time (scripts, tests)
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-pool")
+        return self._executor
+
+    def _submit(self, operation: str, func: Callable[..., Any], *args: Any) -> Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                PASSWORD_HASH_REJECTED.labels(operation).inc()
+                raise PasswordPoolSaturated(f"Password pool saturated ({self.max_pending} pending)")
+            self._pending += 1
+        PASSWORD_HASH_PENDING.inc()
+        enqueued = time.perf_counter()
+
+        def run() -> Any:
+            started = time.perf_counter()
+            PASSWORD_HASH_QUEUE_WAIT.labels(operation).observe(started - enqueued)
+            try:
+                return func(*args)
+            finally:
+                PASSWORD_HASH_DURATION.labels(operation).observe(time.perf_counter() - started)
+
+        try:
+            future = self._get_executor().submit(run)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future: Optional[Future]) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+        PASSWORD_HASH_PENDING.dec()
+
+    # Sync API (sync endpoints, services, scripts)
+
+    def hash(self, password: str) -> str:
+        return self._submit("hash", self.context.hash, password).result()
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self._submit("verify", self.context.verify, password, hashed).result()
+
+    def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """(valid, new_hash); new_hash is set only if the stored hash needs a rehash."""
+        return self._submit("verify", self.context.verify_and_update, password, hashed).result()
+
+    # Async API (awaits without blocking the event loop)
+
+    async def hash_async(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit("hash", self.context.hash, password))
+
+    async def verify_and_update_async(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        return await asyncio.wrap_future(
+            self._submit("verify", self.context.verify_and_update, password, hashed)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
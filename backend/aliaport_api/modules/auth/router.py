@@ -20,15 +20,15 @@ from .schemas import (
 from .service import AuthService
 from .dependencies import get_current_active_user, get_current_user, require_role, require_permission
 from .models import User
-from .utils import verify_token
+from .utils import verify_token, PasswordPoolSaturated
 
 from fastapi.routing import APIRoute
 
 router = APIRouter(tags=["Authentication"])
 
-from slowapi import Limiter
 from slowapi.util import get_remote_address
-limiter = Limiter(key_func=get_remote_address)
+from ...core.rate_limit import AliaportLimiter
+limiter = AliaportLimiter("auth", key_func=get_remote_address)
 
 
 # ============================================
@@ -54,8 +54,15 @@ async def login(
         - token_type: "bearer"
         - expires_in: Access token expiry in seconds
     """
-    # Şifre ile giriş
-    user = AuthService.authenticate_user(db, credentials.email, credentials.password)
+    # Şifre ile giriş (bcrypt şifre havuzunda; event loop bloklanmaz)
+    try:
+        user = await AuthService.authenticate_user_async(db, credentials.email, credentials.password)
+    except PasswordPoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Login service busy, please retry",
+            headers={"Retry-After": "1"},
+        )
     
     if not user:
         raise HTTPException(
@@ -71,12 +78,12 @@ async def login(
             detail="User account is inactive",
         )
     
-    # Update last login
-    AuthService.update_last_login(db, user.id)
-    
     # Generate tokens
     tokens = AuthService.generate_tokens(user)
     
+    # Update last login (commit sonrası user'a dokunulmaz: bağlantı yanıt öncesi havuza döner)
+    AuthService.update_last_login(db, user.id)
+    
     return TokenResponse(**tokens)
 
 
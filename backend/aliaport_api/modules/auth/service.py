@@ -8,7 +8,13 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from .models import User, Role
 from .schemas import UserCreate, UserUpdate
-from .utils import hash_password, verify_password, create_access_token, create_refresh_token
+from .utils import (
+    hash_password,
+    verify_and_update_password,
+    verify_and_update_password_async,
+    create_access_token,
+    create_refresh_token,
+)
 
 
 class AuthService:
@@ -30,8 +36,34 @@ class AuthService:
         user = db.query(User).filter(User.email == email).first()
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = verify_and_update_password(password, user.hashed_password)
+        return AuthService._verified_user(user, valid, new_hash)
+
+    @staticmethod
+    async def authenticate_user_async(db: Session, email: str, password: str) -> Optional[User]:
+        """
+        Same as authenticate_user, but awaits bcrypt in the password pool
+        instead of blocking the event loop (for async endpoints).
+        """
+        user = db.query(User).filter(User.email == email).first()
+        if not user:
+            return None
+        hashed_password = user.hashed_password
+        # End the read transaction so the connection goes back to the pool while
+        # bcrypt runs; otherwise a login burst pins every pooled connection and the
+        # next checkout blocks the event loop itself.
+        db.commit()
+        valid, new_hash = await verify_and_update_password_async(password, hashed_password)
+        return AuthService._verified_user(user, valid, new_hash)
+
+    @staticmethod
+    def _verified_user(user: User, valid: bool, new_hash: Optional[str]) -> Optional[User]:
+        """Return the user if the password was valid; stage a rehash if the cost parameters changed."""
+        if not valid:
             return None
+        if new_hash:
+            # Committed together with the last_login update
+            user.hashed_password = new_hash
         return user
 
     @staticmethod
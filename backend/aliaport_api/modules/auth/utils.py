@@ -5,25 +5,41 @@ Password hashing, JWT token utilities for authentication.
 import os
 from datetime import datetime, timedelta
 import uuid
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 
+from .password_pool import PasswordHasherPool, PasswordPoolSaturated  # noqa: F401
+
 # ============================================
 # Password Hashing (bcrypt)
 # ============================================
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes with a different cost are upgraded on the next successful login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+password_pool = PasswordHasherPool(pwd_context)
 
 
 def hash_password(password: str) -> str:
-    """Hash a plaintext password using bcrypt."""
-    return pwd_context.hash(password)
+    """Hash a plaintext password using bcrypt (in the password pool)."""
+    return password_pool.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plaintext password against a bcrypt hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a plaintext password against a bcrypt hash (in the password pool)."""
+    return password_pool.verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; returns (valid, new_hash) where new_hash is set if a rehash is due."""
+    return password_pool.verify_and_update(plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Async variant of verify_and_update_password; never blocks the event loop."""
+    return await password_pool.verify_and_update_async(plain_password, hashed_password)
 
 
 # ============================================
@@ -8,7 +8,7 @@ from ...config.database import get_db
 from ...core import (
     success_response,
     error_response,
-    paginated_response,
+    fast_paginated_response,
     ErrorCode,
     get_http_status_for_error
 )
@@ -51,11 +51,10 @@ def list_cari(
         offset = (page - 1) * page_size
         items = query.order_by(Cari.Unvan).offset(offset).limit(page_size).all()
         
-        # Convert to Pydantic models and then to dicts
-        cari_list = [CariOut.model_validate(item).model_dump() for item in items]
-        
-        return paginated_response(
-            data=cari_list,
+        # ORM -> JSON byte'ları (cache'li şema serializer)
+        return fast_paginated_response(
+            rows=items,
+            schema=CariOut,
             page=page,
             page_size=page_size,
             total=total,
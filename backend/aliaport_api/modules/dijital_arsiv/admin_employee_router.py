@@ -3,22 +3,34 @@ ADMIN EMPLOYEE ROUTER
 Admin kullanıcıları için tüm firmaların çalışan ve belge raporları
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path as PathParam, Query, Request, Response, status
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from sqlalchemy import exists, func
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from typing import Dict, List, Optional
+from collections import defaultdict
 from datetime import datetime
-import zipfile
-import io
+from pathlib import Path
 import os
+import time
+import uuid
 
 from ...config.database import get_db
-from .models import PortalEmployee, PortalEmployeeDocument, PortalUser
+from ...config.storage import get_exports_dir
+from ...core.logging_config import get_logger
+from ...core.zip_stream import ZipEntry, iter_zip, remove_stale_parts, write_zip_file
+from ..cari.models import Cari
+from .models import PortalEmployee, PortalEmployeeDocument, PortalEmployeeSgkPeriod, PortalUser
 from .portal_router import get_current_portal_user
 from .sgk_status import EmployeeSgkStatus, compute_employee_sgk_status
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/admin", tags=["Admin - Employee Reports"])
+logger = get_logger(__name__)
+
+# Hazırlanmış (resumable indirilebilir) ZIP arşivleri: EXPORTS_DIR/employee_documents
+PREPARED_ARCHIVE_SUBDIR = "employee_documents"
+PREPARED_ARCHIVE_TTL_SECONDS = 24 * 60 * 60
 
 
 # ============================================
@@ -74,29 +86,106 @@ def check_admin_permission(current_user: PortalUser):
         )
 
 
+def collect_employee_document_entries(db: Session, cari_id: Optional[int] = None) -> List[ZipEntry]:
+    """
+    ZIP'e eklenecek çalışan belgelerini tek sorguda toplar.
+
+    Yalnızca dosya yolu ve arşiv adı için gereken kolonlar okunur; dosya
+    içerikleri ZIP yazımı sırasında blok blok okunur.
+    Arşiv adı: FirmaKodu/CalisanAdi/BelgeTipi_Tarih.ext
+    """
+    query = (
+        db.query(
+            PortalEmployeeDocument.file_path,
+            PortalEmployeeDocument.file_name,
+            PortalEmployeeDocument.document_type,
+            PortalEmployeeDocument.uploaded_at,
+            Cari.CariKod,
+            PortalEmployee.full_name,
+        )
+        .outerjoin(Cari, Cari.Id == PortalEmployeeDocument.cari_id)
+        .outerjoin(PortalEmployee, PortalEmployee.id == PortalEmployeeDocument.employee_id)
+    )
+
+    if cari_id:
+        query = query.filter(PortalEmployeeDocument.cari_id == cari_id)
+
+    entries = []
+    for file_path, file_name, document_type, uploaded_at, cari_code, employee_name in query.order_by(PortalEmployeeDocument.id):
+        cari_code = cari_code or 'UNKNOWN'
+        employee_name = employee_name.replace(' ', '_') if employee_name else 'UNKNOWN'
+        file_ext = os.path.splitext(file_name)[1]
+        timestamp = uploaded_at.strftime('%Y%m%d')
+        entries.append(ZipEntry(
+            path=file_path,
+            arcname=f"{cari_code}/{employee_name}/{document_type}_{timestamp}{file_ext}",
+        ))
+    return entries
+
+
+def _prepared_archive_dir() -> Path:
+    return get_exports_dir() / PREPARED_ARCHIVE_SUBDIR
+
+
+def _prepared_archive_path(archive_id: str) -> Path:
+    return _prepared_archive_dir() / f"{archive_id}.zip"
+
+
+def _cleanup_prepared_archives() -> None:
+    """Süresi dolmuş hazırlanmış arşivleri ve yarım kalmış .part dosyalarını siler."""
+    archive_dir = _prepared_archive_dir()
+    if not archive_dir.exists():
+        return
+    remove_stale_parts(archive_dir)
+    cutoff = time.time() - PREPARED_ARCHIVE_TTL_SECONDS
+    for path in archive_dir.glob("*.zip"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def _build_prepared_archive(entries: List[ZipEntry], archive_id: str) -> None:
+    """Background task: arşivi diske yazar (.part -> .zip)."""
+    try:
+        written = write_zip_file(entries, str(_prepared_archive_path(archive_id)))
+        logger.info(f"Employee document archive prepared: {archive_id} ({written} files)")
+    except Exception as exc:
+        logger.error(f"Employee document archive failed: {archive_id} ({exc})")
+
+
 # ============================================
 # ENDPOINTS
 # ============================================
 
 @router.get("/employees", response_model=List[EmployeeReportResponse])
 def get_all_employees(
+    response: Response,
     current_user: PortalUser = Depends(get_current_portal_user),
     cari_id: Optional[int] = Query(None, description="Firmaya göre filtrele"),
     position: Optional[str] = Query(None, description="Pozisyona göre filtrele"),
     document_type: Optional[str] = Query(None, description="Belge tipine göre filtrele (EHLIYET, SRC5)"),
     is_active: Optional[bool] = Query(None, description="Aktiflik durumuna göre filtrele"),
+    page: int = Query(1, ge=1, description="Sayfa numarası (page_size ile)"),
+    page_size: Optional[int] = Query(None, ge=1, le=5000, description="Sayfa başına kayıt (verilmezse tüm liste)"),
     db: Session = Depends(get_db)
 ):
     """
     Tüm firmaların çalışanlarını listele (Admin only)
     Filtreleme seçenekleri: firma, pozisyon, belge tipi, aktiflik
+    
+    Sayfalama isteğe bağlıdır: page_size verilmezse tüm liste döner. Gövde
+    liste olarak kalır; toplam kayıt X-Total-Count, sayfa bilgisi X-Page /
+    X-Page-Size başlıklarında döner (CORS expose_headers'ta açık).
+    
+    Sorgular (sayfa başına sabit): [count] + çalışanlar (cari join) + belgeler
+    (IN) + SGK dönem kayıtları (IN). Count yalnızca sayfalı istekte çalışır.
     """
     check_admin_permission(current_user)
     
     # Base query
-    query = db.query(PortalEmployee).options(
-        joinedload(PortalEmployee.cari)
-    )
+    query = db.query(PortalEmployee)
     
     # Filtreler
     if cari_id is not None:
@@ -108,25 +197,52 @@ def get_all_employees(
     if is_active is not None:
         query = query.filter(PortalEmployee.is_active == is_active)
     
-    employees = query.order_by(PortalEmployee.cari_id, PortalEmployee.full_name).all()
+    if document_type:
+        # Yalnızca bu tipte belgesi olan çalışanlar
+        query = query.filter(
+            exists().where(
+                PortalEmployeeDocument.employee_id == PortalEmployee.id,
+                PortalEmployeeDocument.document_type == document_type,
+            )
+        )
+    
+    employees_query = query.options(joinedload(PortalEmployee.cari)).order_by(
+        PortalEmployee.cari_id, PortalEmployee.full_name, PortalEmployee.id
+    )
+    if page_size is None:
+        employees = employees_query.all()
+        total = len(employees)
+    else:
+        total = query.order_by(None).count()
+        employees = employees_query.offset((page - 1) * page_size).limit(page_size).all()
+        response.headers["X-Page"] = str(page)
+        response.headers["X-Page-Size"] = str(page_size)
+    response.headers["X-Total-Count"] = str(total)
+    
+    if not employees:
+        return []
+    
+    employee_ids = [emp.id for emp in employees]
+    
+    # Sayfadaki tüm çalışanların belgeleri tek sorguda (SGK işe giriş kontrolü için tipi filtrelenmeden)
+    documents_by_employee: Dict[int, List[PortalEmployeeDocument]] = defaultdict(list)
+    for doc in (
+        db.query(PortalEmployeeDocument)
+        .filter(PortalEmployeeDocument.employee_id.in_(employee_ids))
+        .order_by(PortalEmployeeDocument.employee_id, PortalEmployeeDocument.id)
+    ):
+        documents_by_employee[doc.employee_id].append(doc)
+    
+    # SGK dönem kayıtları tek sorguda
+    periods_by_employee: Dict[int, List[PortalEmployeeSgkPeriod]] = defaultdict(list)
+    for period in db.query(PortalEmployeeSgkPeriod).filter(PortalEmployeeSgkPeriod.employee_id.in_(employee_ids)):
+        periods_by_employee[period.employee_id].append(period)
     
-    # Belgeleri yükle ve filtrele
     result = []
     for emp in employees:
-        # Belgeleri yükle
-        docs = db.query(PortalEmployeeDocument).filter(
-            PortalEmployeeDocument.employee_id == emp.id
-        ).all()
-        
-        # Belge tipi filtrelemesi
-        if document_type:
-            docs = [d for d in docs if d.document_type == document_type]
-            # Eğer belge tipi filtresi varsa ve çalışanda o belge yoksa, atla
-            if not docs:
-                continue
+        all_docs = documents_by_employee.get(emp.id, [])
+        docs = [d for d in all_docs if d.document_type == document_type] if document_type else all_docs
         
-        # Response oluştur
-        emp.documents = docs
         emp_response = EmployeeReportResponse(
             id=emp.id,
             full_name=emp.full_name,
@@ -138,10 +254,15 @@ def get_all_employees(
             is_active=emp.is_active,
             sgk_last_check_period=emp.sgk_last_check_period,
             sgk_is_active_last_period=emp.sgk_is_active_last_period,
-            sgk_status=compute_employee_sgk_status(db, emp),
+            sgk_status=compute_employee_sgk_status(
+                db,
+                emp,
+                prefetched_periods=periods_by_employee.get(emp.id, []),
+                prefetched_documents=all_docs,
+            ),
             cari_id=emp.cari_id,
             cari_code=emp.cari.CariKod if emp.cari else None,
-            cari_title=emp.cari.CariIsim if emp.cari else None,
+            cari_title=emp.cari.Unvan if emp.cari else None,
             documents=[EmployeeDocumentResponse.from_orm(d) for d in docs]
         )
         result.append(emp_response)
@@ -154,41 +275,42 @@ def get_employee_stats(
     current_user: PortalUser = Depends(get_current_portal_user),
     db: Session = Depends(get_db)
 ):
-    """Çalışan istatistikleri (Admin only)"""
+    """Çalışan istatistikleri (Admin only) - gruplanmış çalışan sorgusu + belge sayısı"""
     check_admin_permission(current_user)
     
-    total_employees = db.query(PortalEmployee).count()
-    active_employees = db.query(PortalEmployee).filter(PortalEmployee.is_active == True).count()
-    total_documents = db.query(PortalEmployeeDocument).count()
+    total_documents = db.query(func.count(PortalEmployeeDocument.id)).scalar()
     
-    # Pozisyon dağılımı
-    from sqlalchemy import func
-    position_distribution = db.query(
+    rows = db.query(
+        PortalEmployee.cari_id,
         PortalEmployee.position,
-        func.count(PortalEmployee.id)
-    ).filter(
-        PortalEmployee.is_active == True
+        PortalEmployee.is_active,
+        func.count(PortalEmployee.id),
     ).group_by(
-        PortalEmployee.position
-    ).all()
-    
-    # Firma başına çalışan sayısı
-    employees_by_company = db.query(
         PortalEmployee.cari_id,
-        func.count(PortalEmployee.id)
-    ).filter(
-        PortalEmployee.is_active == True
-    ).group_by(
-        PortalEmployee.cari_id
+        PortalEmployee.position,
+        PortalEmployee.is_active
     ).all()
     
+    total_employees = 0
+    active_employees = 0
+    position_distribution: Dict[str, int] = defaultdict(int)
+    companies_with_employees = set()
+    
+    for row_cari_id, row_position, row_is_active, count in rows:
+        total_employees += count
+        if row_is_active:
+            active_employees += count
+            companies_with_employees.add(row_cari_id)
+            if row_position:
+                position_distribution[row_position] += count
+    
     return {
         "total_employees": total_employees,
         "active_employees": active_employees,
         "inactive_employees": total_employees - active_employees,
         "total_documents": total_documents,
-        "position_distribution": {pos: count for pos, count in position_distribution if pos},
-        "companies_with_employees": len(employees_by_company)
+        "position_distribution": dict(position_distribution),
+        "companies_with_employees": len(companies_with_employees)
     }
 
 
@@ -203,46 +325,86 @@ def download_employee_documents_zip(
     """
     check_admin_permission(current_user)
     
-    # Belgeleri filtrele
-    query = db.query(PortalEmployeeDocument).options(
-        joinedload(PortalEmployeeDocument.employee),
-        joinedload(PortalEmployeeDocument.cari)
-    )
-    
-    if cari_id:
-        query = query.filter(PortalEmployeeDocument.cari_id == cari_id)
-    
-    documents = query.all()
+    # Belgeleri filtrele (dosyalar yanıt akarken blok blok okunur)
+    entries = collect_employee_document_entries(db, cari_id)
     
-    if not documents:
+    if not entries:
         raise HTTPException(status_code=404, detail="Belge bulunamadı")
     
-    # ZIP oluştur
-    zip_buffer = io.BytesIO()
-    
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for doc in documents:
-            if os.path.exists(doc.file_path):
-                # Dosya adı: FirmaKodu_CalisanAdi_BelgeTipi_Tarih.ext
-                cari_code = doc.cari.CariKod if doc.cari else 'UNKNOWN'
-                employee_name = doc.employee.full_name.replace(' ', '_') if doc.employee else 'UNKNOWN'
-                file_ext = os.path.splitext(doc.file_name)[1]
-                timestamp = doc.uploaded_at.strftime('%Y%m%d')
-                
-                zip_filename = f"{cari_code}/{employee_name}/{doc.document_type}_{timestamp}{file_ext}"
-                
-                # Dosyayı ZIP'e ekle
-                with open(doc.file_path, 'rb') as f:
-                    zip_file.writestr(zip_filename, f.read())
-    
-    # ZIP'i döndür
-    zip_buffer.seek(0)
-    
     filename = f"calisanlar_belgeleri_{cari_id if cari_id else 'tum'}_{datetime.now().strftime('%Y%m%d')}.zip"
     
+    # Sync generator -> StreamingResponse threadpool'da iterate eder (event loop bloklanmaz)
     return StreamingResponse(
-        zip_buffer,
+        iter_zip(entries),
         media_type="application/zip",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
+
+@router.post("/employees/documents/download-zip/prepare", status_code=status.HTTP_202_ACCEPTED)
+def prepare_employee_documents_zip(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    cari_id: Optional[int] = Query(None, description="Firmaya göre filtrele"),
+    current_user: PortalUser = Depends(get_current_portal_user),
+    db: Session = Depends(get_db)
+):
+    """
+    ZIP arşivini arka planda diske hazırla (Admin only)
+    
+    Hazırlanan arşiv `GET /employees/documents/archives/{archive_id}` ile
+    Range destekli (kesilen indirme kaldığı yerden devam eder) indirilir.
+    Arşivler 24 saat saklanır.
+    """
+    check_admin_permission(current_user)
+    
+    entries = collect_employee_document_entries(db, cari_id)
+    
+    if not entries:
+        raise HTTPException(status_code=404, detail="Belge bulunamadı")
+    
+    _cleanup_prepared_archives()
+    _prepared_archive_dir().mkdir(parents=True, exist_ok=True)
+    
+    archive_id = uuid.uuid4().hex
+    # İndirme hazırlanıyor durumunu göstermek için boş .part dosyası
+    Path(f"{_prepared_archive_path(archive_id)}.part").touch()
+    background_tasks.add_task(_build_prepared_archive, entries, archive_id)
+    
+    return {
+        "archive_id": archive_id,
+        "status": "preparing",
+        "file_count": len(entries),
+        "download_url": request.app.url_path_for("download_prepared_employee_documents_zip", archive_id=archive_id),
+    }
+
+
+@router.get("/employees/documents/archives/{archive_id}")
+def download_prepared_employee_documents_zip(
+    archive_id: str = PathParam(..., pattern=r"^[0-9a-f]{32}$"),
+    current_user: PortalUser = Depends(get_current_portal_user),
+):
+    """
+    Hazırlanmış ZIP arşivini indir (Admin only)
+    
+    Range / If-Range desteklidir. Arşiv henüz hazırlanıyorsa 202 döner.
+    """
+    check_admin_permission(current_user)
+    
+    archive_path = _prepared_archive_path(archive_id)
+    
+    if archive_path.exists():
+        return FileResponse(
+            archive_path,
+            media_type="application/zip",
+            filename=f"calisanlar_belgeleri_{archive_id[:8]}.zip",
+        )
+    
+    if Path(f"{archive_path}.part").exists():
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"archive_id": archive_id, "status": "preparing"},
+        )
+    
+    raise HTTPException(status_code=404, detail="Arşiv bulunamadı veya süresi doldu")
+
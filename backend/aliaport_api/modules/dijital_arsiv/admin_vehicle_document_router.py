@@ -2,15 +2,17 @@
 ADMIN VEHICLE DOCUMENT APPROVAL ENDPOINTS
 Araç evraklarının onay/red işlemleri için admin endpoint'leri
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func
 from typing import List, Optional
 from datetime import datetime, date
 from pydantic import BaseModel
 
 from ...config.database import get_db
 from .models import VehicleDocument, VehicleDocumentType, PortalVehicle, PortalUser
+from .vehicle_documents import get_vehicle_document_stats, invalidate_vehicle_document_stats
+from ..cari.models import Cari
 from ...modules.auth.dependencies import require_permission
 from ...services.email_service import EmailService
 
@@ -78,19 +80,23 @@ def get_pending_documents(
     - cari_id: Firmaya göre filtrele (opsiyonel)
     - doc_type_code: Evrak tipine göre filtrele (opsiyonel)
     """
+    # Toplam sayı aynı sorguda window fonksiyonuyla gelir (ayrı COUNT yok).
+    # Firma adı Cari'den alınır; PortalUser join'i firma başına birden fazla
+    # kullanıcı olduğunda satırları çoğaltıyordu.
     query = db.query(
         VehicleDocument,
         PortalVehicle.plaka,
         PortalVehicle.cari_id,
-        PortalUser.company_name,
+        Cari.Unvan,
         VehicleDocumentType.code,
-        VehicleDocumentType.name
+        VehicleDocumentType.name,
+        func.count(VehicleDocument.id).over().label("total_count")
     ).join(
         PortalVehicle, VehicleDocument.vehicle_id == PortalVehicle.id
     ).join(
         VehicleDocumentType, VehicleDocument.doc_type_id == VehicleDocumentType.id
-    ).join(
-        PortalUser, PortalVehicle.cari_id == PortalUser.cari_id
+    ).outerjoin(
+        Cari, PortalVehicle.cari_id == Cari.Id
     ).filter(
         VehicleDocument.status == "PENDING"
     )
@@ -102,21 +108,28 @@ def get_pending_documents(
     if doc_type_code:
         query = query.filter(VehicleDocumentType.code == doc_type_code.upper())
     
-    # Toplam sayı
-    total = query.count()
+    # Sayfalama (status + uploaded_at composite index'i sıralamayı karşılar)
+    results = query.order_by(
+        VehicleDocument.uploaded_at.desc(), VehicleDocument.id.desc()
+    ).offset(skip).limit(limit).all()
     
-    # Sayfalama
-    results = query.order_by(VehicleDocument.uploaded_at.desc()).offset(skip).limit(limit).all()
+    if results:
+        total = results[0].total_count
+    elif skip:
+        # Son sayfanın ötesi: satır yoksa window sonucu da yok
+        total = query.with_entities(func.count(VehicleDocument.id)).order_by(None).scalar()
+    else:
+        total = 0
     
     # Response oluştur
     items = []
-    for doc, plaka, cari_id, company_name, doc_code, doc_name in results:
+    for doc, plaka, doc_cari_id, company_name, doc_code, doc_name, _total in results:
         items.append(PendingDocumentItem(
             id=doc.id,
             vehicle_id=doc.vehicle_id,
             vehicle_plaka=plaka,
-            cari_id=cari_id,
-            cari_name=company_name,
+            cari_id=doc_cari_id,
+            cari_name=company_name or "",
             doc_type_code=doc_code,
             doc_type_name=doc_name,
             uploaded_at=doc.uploaded_at,
@@ -170,6 +183,7 @@ def approve_document(
     
     db.commit()
     db.refresh(doc)
+    invalidate_vehicle_document_stats()
     
     # Email bildirimi gönder
     try:
@@ -235,6 +249,7 @@ def reject_document(
     
     db.commit()
     db.refresh(doc)
+    invalidate_vehicle_document_stats()
     
     # Email bildirimi gönder
     try:
@@ -265,23 +280,18 @@ def reject_document(
 
 @router.get("/stats")
 def get_approval_stats(
+    group_by: Optional[str] = Query(None, pattern="^(firma|doc_type)$"),
     db: Session = Depends(get_db),
     _perm = Depends(require_permission("vehicle_documents", "read"))
 ):
     """
     Evrak onay istatistikleri
-    """
-    total_pending = db.query(VehicleDocument).filter(VehicleDocument.status == "PENDING").count()
-    total_approved = db.query(VehicleDocument).filter(VehicleDocument.status == "APPROVED").count()
-    total_rejected = db.query(VehicleDocument).filter(VehicleDocument.status == "REJECTED").count()
-    total_expired = db.query(VehicleDocument).filter(VehicleDocument.status == "EXPIRED").count()
-    total_missing = db.query(VehicleDocument).filter(VehicleDocument.status == "MISSING").count()
     
-    return {
-        "pending": total_pending,
-        "approved": total_approved,
-        "rejected": total_rejected,
-        "expired": total_expired,
-        "missing": total_missing,
-        "total": total_pending + total_approved + total_rejected + total_expired + total_missing
-    }
+    Tüm durum sayıları tek GROUP BY sorgusuyla hesaplanır ve cache'lenir;
+    onay, red ve yüklemede cache temizlenir.
+    
+    Query Parameters:
+    - group_by: "firma" (cari bazında) veya "doc_type" (evrak tipi bazında) kırılım (opsiyonel)
+    """
+    stats, _hit = get_vehicle_document_stats(db, group_by)
+    return stats
@@ -1,97 +1,157 @@
 """
-DİJİTAL ARŞİV - Excel Rapor Export
+DİJİTAL ARŞİV - Excel / CSV Rapor Export
+
+Belge listesi export'u streaming çalışır: tek bir join'li sorgu (iş emri,
+cari, yükleyen, onaylayan) `yield_per` ile parça parça okunur ve
+write-only workbook / CSV generator'ına aktarılır. Satır başına lazy
+relationship yüklemesi yapılmaz, bellek kullanımı satır sayısından bağımsızdır.
 """
 
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment
 from datetime import datetime
 from io import BytesIO
+from typing import Iterator, Optional
+
+from sqlalchemy.orm import Session, aliased
+
+from ...core.streaming_export import iter_csv, iter_xlsx
+from ..auth.models import User
+from ..cari.models import Cari
+from ..isemri.models import WorkOrder
+from .models import ArchiveDocument, DocumentCategory, DocumentStatus, PortalUser
+
+
+DOCUMENT_LIST_HEADERS = [
+    "ID", "Belge Tipi", "Kategori", "Durum", "İş Emri No",
+    "Cari", "Yükleyen", "Yüklenme Tarihi", "Onaylayan", "Onay Tarihi",
+    "Dosya Adı", "Boyut (MB)"
+]
+
+# Sabit sütun genişlikleri (auto-size için tüm hücreleri gezmek yerine)
+DOCUMENT_LIST_COLUMN_WIDTHS = [8, 22, 18, 14, 18, 40, 28, 18, 28, 18, 40, 12]
+
+EXPORT_BATCH_SIZE = 1000
+
+
+def _format_dt(value: Optional[datetime]) -> str:
+    return value.strftime("%Y-%m-%d %H:%M") if value else ""
+
+
+def _enum_value(value) -> str:
+    return value.value if hasattr(value, "value") else (value or "")
 
 
 class ArchiveReportExporter:
-    """Excel rapor export"""
-    
+    """Excel / CSV rapor export"""
+
+    def document_rows(
+        self,
+        db: Session,
+        status: Optional[DocumentStatus] = None,
+        category: Optional[DocumentCategory] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> Iterator[list]:
+        """
+        Belge listesi satırlarını tek join'li sorgudan parça parça üretir.
+
+        Yalnızca export'ta kullanılan kolonlar seçilir (ORM nesnesi oluşturulmaz).
+        """
+        uploader = aliased(User)
+        approver = aliased(User)
+
+        query = (
+            db.query(
+                ArchiveDocument.id,
+                ArchiveDocument.document_type,
+                ArchiveDocument.category,
+                ArchiveDocument.status,
+                WorkOrder.wo_number,
+                Cari.Unvan,
+                uploader.full_name,
+                PortalUser.full_name,
+                ArchiveDocument.uploaded_at,
+                approver.full_name,
+                ArchiveDocument.approved_at,
+                ArchiveDocument.file_name,
+                ArchiveDocument.file_size,
+            )
+            .outerjoin(WorkOrder, WorkOrder.id == ArchiveDocument.work_order_id)
+            .outerjoin(Cari, Cari.Id == ArchiveDocument.cari_id)
+            .outerjoin(uploader, uploader.id == ArchiveDocument.uploaded_by_id)
+            .outerjoin(PortalUser, PortalUser.id == ArchiveDocument.uploaded_by_portal_user_id)
+            .outerjoin(approver, approver.id == ArchiveDocument.approved_by_id)
+            .filter(ArchiveDocument.is_latest_version == True)
+        )
+
+        if status:
+            query = query.filter(ArchiveDocument.status == status)
+
+        if category:
+            query = query.filter(ArchiveDocument.category == category)
+
+        query = query.order_by(ArchiveDocument.id).execution_options(yield_per=batch_size)
+
+        for (
+            doc_id, document_type, doc_category, doc_status, wo_number, cari_title,
+            internal_uploader, portal_uploader, uploaded_at, approver_name, approved_at,
+            file_name, file_size,
+        ) in query:
+            yield [
+                doc_id,
+                _enum_value(document_type),
+                _enum_value(doc_category),
+                _enum_value(doc_status),
+                wo_number or "",
+                cari_title or "",
+                internal_uploader or portal_uploader or "",
+                _format_dt(uploaded_at),
+                approver_name or "",
+                _format_dt(approved_at),
+                file_name,
+                round((file_size or 0) / (1024 * 1024), 2),
+            ]
+
+    def stream_document_list_excel(self, rows) -> Iterator[bytes]:
+        """Belge listesi satırlarını xlsx byte parçaları olarak üretir (write-only)."""
+        return iter_xlsx(
+            DOCUMENT_LIST_HEADERS,
+            rows,
+            sheet_title="Belgeler",
+            column_widths=DOCUMENT_LIST_COLUMN_WIDTHS,
+        )
+
+    def stream_document_list_csv(self, rows) -> Iterator[bytes]:
+        """Belge listesi satırlarını CSV byte parçaları olarak üretir."""
+        return iter_csv(DOCUMENT_LIST_HEADERS, rows)
+
     def export_document_list(self, documents: list, filters: dict = None) -> BytesIO:
         """
-        Belge listesini Excel'e export et
-        
+        Belge listesini (yüklenmiş ORM nesneleri) Excel'e export et
+
+        Not: Büyük listeler için document_rows + stream_document_list_excel kullanın.
+
         Returns:
             BytesIO (Excel dosyası)
         """
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Belgeler"
-        
-        # Header
-        headers = [
-            "ID", "Belge Tipi", "Kategori", "Durum", "İş Emri No", 
-            "Cari", "Yükleyen", "Yüklenme Tarihi", "Onaylayan", "Onay Tarihi",
-            "Dosya Adı", "Boyut (MB)"
-        ]
-        
-        ws.append(headers)
-        
-        # Header styling
-        for cell in ws[1]:
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-        
-        # Data rows
-        for doc in documents:
-            # Work order no
-            wo_no = ""
-            if hasattr(doc, 'work_order') and doc.work_order:
-                wo_no = doc.work_order.wo_number
-            
-            # Cari title
-            cari_title = ""
-            if hasattr(doc, 'cari') and doc.cari:
-                cari_title = doc.cari.Unvan
-            
-            # Uploader
-            uploader = ""
-            if hasattr(doc, 'uploaded_by') and doc.uploaded_by:
-                uploader = doc.uploaded_by.full_name
-            elif hasattr(doc, 'uploaded_by_portal_user') and doc.uploaded_by_portal_user:
-                uploader = doc.uploaded_by_portal_user.full_name
-            
-            # Approver
-            approver = ""
-            if hasattr(doc, 'approved_by') and doc.approved_by:
-                approver = doc.approved_by.full_name
-            
-            ws.append([
+        rows = (
+            [
                 doc.id,
-                doc.document_type.value,
-                doc.category.value,
-                doc.status.value,
-                wo_no,
-                cari_title,
-                uploader,
-                doc.uploaded_at.strftime("%Y-%m-%d %H:%M"),
-                approver,
-                doc.approved_at.strftime("%Y-%m-%d %H:%M") if doc.approved_at else "",
+                _enum_value(doc.document_type),
+                _enum_value(doc.category),
+                _enum_value(doc.status),
+                doc.work_order.wo_number if doc.work_order else "",
+                doc.cari.Unvan if doc.cari else "",
+                doc.uploaded_by_portal_user.full_name if doc.uploaded_by_portal_user else "",
+                _format_dt(doc.uploaded_at),
+                "",
+                _format_dt(doc.approved_at),
                 doc.file_name,
-                doc.file_size_mb
-            ])
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-        
-        return output
+                doc.file_size_mb,
+            ]
+            for doc in documents
+        )
+        return BytesIO(b"".join(self.stream_document_list_excel(rows)))
     
     def export_expiry_report(self, expiring_docs: list, expired_docs: list) -> BytesIO:
         """
@@ -3,8 +3,7 @@ DİJİTAL ARŞİV MODÜLÜ - Internal API Router
 Aliaport personeli için endpoints (belge onaylama, portal kullanıcı yönetimi, vb.)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status, Query
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from datetime import datetime
@@ -13,6 +12,7 @@ from pathlib import Path
 
 from ...config.database import get_db
 from ..auth.dependencies import get_current_user  # FIXED: Auth dependency doğru konumdan import
+from .preview import document_file_response, thumbnail_service
 from .models import (
     PortalUser, ArchiveDocument, Notification,
     DocumentStatus, DocumentCategory, DocumentType
@@ -538,10 +538,11 @@ def get_archive_document(
 @router.get("/archive/documents/{document_id}/preview")
 def preview_document(
     document_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Belge önizleme (PDF stream)"""
+    """Belge önizleme (PDF stream, ETag / 304 / Range destekli)"""
     document = db.query(ArchiveDocument).filter(ArchiveDocument.id == document_id).first()
     
     if not document:
@@ -552,10 +553,34 @@ def preview_document(
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="Dosya bulunamadı")
     
-    return FileResponse(
-        path=str(file_path),
+    return document_file_response(
+        request,
+        str(file_path),
         media_type=document.file_type,
-        filename=document.file_name
+        filename=document.file_name,
+        checksum=document.file_hash,
+    )
+
+
+@router.get("/archive/documents/{document_id}/thumbnail")
+def get_document_thumbnail(
+    document_id: int,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """İlk sayfa thumbnail'i (hazır değilse arka planda üretilir, 202 + Retry-After)"""
+    document = db.query(ArchiveDocument).filter(ArchiveDocument.id == document_id).first()
+    
+    if not document:
+        raise HTTPException(status_code=404, detail="Belge bulunamadı")
+    
+    if not Path(document.file_path).exists():
+        raise HTTPException(status_code=404, detail="Dosya bulunamadı")
+    
+    return thumbnail_service.response(
+        request, background_tasks, document.file_path, document.file_type, document.file_hash
     )
 
 
@@ -754,28 +779,36 @@ def export_documents_excel(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Belge listesini Excel'e export"""
+    """Belge listesini Excel'e export (write-only workbook, streaming)"""
     from .export import ArchiveReportExporter
-    from io import BytesIO
-    
-    # Belgeler getir
-    query = db.query(ArchiveDocument).filter(ArchiveDocument.is_latest_version == True)
+    from ...core.streaming_export import streaming_download, XLSX_MEDIA_TYPE
     
-    if status:
-        query = query.filter(ArchiveDocument.status == status)
-    
-    if category:
-        query = query.filter(ArchiveDocument.category == category)
+    exporter = ArchiveReportExporter()
+    rows = exporter.document_rows(db, status=status, category=category)
     
-    documents = query.all()
+    return streaming_download(
+        exporter.stream_document_list_excel(rows),
+        filename=f"belgeler_{datetime.now().strftime('%Y%m%d')}.xlsx",
+        media_type=XLSX_MEDIA_TYPE,
+    )
+
+
+@router.get("/archive/export/csv")
+def export_documents_csv(
+    status: Optional[DocumentStatus] = None,
+    category: Optional[DocumentCategory] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Belge listesini CSV olarak export (satırlar parça parça akar)"""
+    from .export import ArchiveReportExporter
+    from ...core.streaming_export import streaming_download, CSV_MEDIA_TYPE
     
-    # Excel oluştur
     exporter = ArchiveReportExporter()
-    excel_file = exporter.export_document_list(documents)
+    rows = exporter.document_rows(db, status=status, category=category)
     
-    # Stream response
-    return StreamingResponse(
-        excel_file,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename=belgeler_{datetime.now().strftime('%Y%m%d')}.xlsx"}
+    return streaming_download(
+        exporter.stream_document_list_csv(rows),
+        filename=f"belgeler_{datetime.now().strftime('%Y%m%d')}.csv",
+        media_type=CSV_MEDIA_TYPE,
     )
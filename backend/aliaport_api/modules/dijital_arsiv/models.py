@@ -3,7 +3,7 @@ DİJİTAL ARŞİV MODÜLÜ - SQLAlchemy Models
 ArchiveDocument (Merkezi belge deposu) + PortalUser (Dış müşteri kullanıcıları)
 """
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Date, ForeignKey, Text, Enum as SQLEnum, Index
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Date, ForeignKey, Text, Enum as SQLEnum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime, timedelta
 import enum
@@ -130,16 +130,21 @@ class PortalUser(Base):
     documents = relationship("ArchiveDocument", back_populates="uploaded_by_portal_user", foreign_keys="ArchiveDocument.uploaded_by_portal_user_id")
     
     def verify_password(self, plain_password: str) -> bool:
-        """Şifre doğrulama"""
-        from passlib.context import CryptContext
-        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        return pwd_context.verify(plain_password, self.hashed_password)
+        """
+        Şifre doğrulama (auth şifre havuzunda).
+        Hash farklı cost parametreleriyle üretilmişse şeffaf olarak yeniden
+        hash'lenir; kalıcı olması için çağıran commit eder.
+        """
+        from ..auth.utils import verify_and_update_password
+        valid, new_hash = verify_and_update_password(plain_password, self.hashed_password)
+        if valid and new_hash:
+            self.hashed_password = new_hash
+        return valid
     
     def set_password(self, plain_password: str):
-        """Şifre hash'leme"""
-        from passlib.context import CryptContext
-        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        self.hashed_password = pwd_context.hash(plain_password)
+        """Şifre hash'leme (auth şifre havuzunda)"""
+        from ..auth.utils import hash_password
+        self.hashed_password = hash_password(plain_password)
         self.password_changed_at = datetime.utcnow()
         self.must_change_password = False
     
@@ -342,6 +347,29 @@ class PortalEmployeeSgkPeriod(Base):
     employee = relationship("PortalEmployee", back_populates="sgk_periods")
 
 
+class PortalEmployeeSgkStatus(Base):
+    """
+    PORTAL ÇALIŞAN SGK UYUM DURUMU (materialize)
+    compute_employee_sgk_status sonucunun (çalışan × dönem) saklanmış hali.
+    SGK hizmet dökümü, işe giriş bildirgesi ve çalışan güncellemelerinde
+    yeniden hesaplanır; aktif dönem değişince (26'sı) job ile toplu doldurulur.
+    Durum: TAM, EKSİK, ONAY_BEKLIYOR
+    """
+    __tablename__ = "portal_employee_sgk_status"
+    __table_args__ = (
+        UniqueConstraint("employee_id", "period_code", name="uq_portal_emp_sgk_status_emp_period"),
+        Index("ix_portal_emp_sgk_status_cari_period", "cari_id", "period_code", "status"),
+        {"extend_existing": True}
+    )
+
+    id = Column(Integer, primary_key=True)
+    employee_id = Column(Integer, ForeignKey("portal_employee.id", ondelete="CASCADE"), nullable=False)
+    cari_id = Column(Integer, ForeignKey("Cari.Id"), nullable=False)
+    period_code = Column(String(7), nullable=False)  # "2025-10" formatı
+    status = Column(String(20), nullable=False)
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class PortalEmployeeDocument(Base):
     """
     PORTAL ÇALIŞAN BELGELERİ
@@ -503,6 +531,8 @@ class VehicleDocument(Base):
     __tablename__ = "vehicle_document"
     __table_args__ = (
         Index("ix_vehicle_document_vehicle_type", "vehicle_id", "doc_type_id"),
+        # Onay kuyruğu: status filtresi + uploaded_at sıralaması tek index'ten
+        Index("ix_vehicle_document_status_uploaded", "status", "uploaded_at"),
         {"extend_existing": True}
     )
 
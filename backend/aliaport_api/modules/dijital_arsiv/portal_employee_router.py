@@ -9,9 +9,7 @@ from typing import List, Optional
 from datetime import datetime, date
 import uuid
 import os
-import time
 from pathlib import Path
-from sqlalchemy import event
 
 from ...config.database import get_db
 from .models import (
@@ -24,17 +22,22 @@ from .models import (
     VehicleDocumentType,
 )
 from .portal_router import get_current_portal_user
-from .vehicle_documents import compute_vehicle_status, create_default_vehicle_documents
+from .vehicle_documents import (
+    compute_vehicle_status,
+    create_default_vehicle_documents,
+    invalidate_vehicle_document_stats,
+)
 from .sgk_status import (
+    SGK_HIRE_DOCUMENT_TYPES,
     EmployeeSgkStatus,
-    compute_employee_sgk_status,
+    get_sgk_status_map,
+    refresh_sgk_status,
 )
 from pydantic import BaseModel, Field
 from ...core.logging_config import get_logger
 
 router = APIRouter(prefix="/portal", tags=["Portal Employees & Vehicles"])
 logger = get_logger(__name__)
-IS_DEV_ENV = os.getenv("APP_ENV", "production").lower() == "development" or os.getenv("DEBUG", "False").lower() == "true"
 
 
 # ============================================
@@ -174,6 +177,7 @@ class VehicleDocumentsResponse(BaseModel):
 
 # Perf log (EMP-PERF-1): İlk ölçüm ~30 sorgu / ~28 sn (29 kayıt, N+1 problemli)
 # Perf log (EMP-PERF-2): selectinload + SGK helper prefetch edildi => 35 kayıt / 4 sorgu / ~34 sn (IO gecikmesi Holiday API)
+# Sorgu sayısı/süresi artık QUERY_DIAGNOSTICS=1 ile tüm endpoint'ler için ölçülür (core/query_diagnostics.py)
 @router.get("/employees", response_model=List[PortalEmployeeResponse])
 def get_employees(
     current_user: PortalUser = Depends(get_current_portal_user),
@@ -182,8 +186,7 @@ def get_employees(
 ):
     """Firma çalışanları listesi"""
     query = db.query(PortalEmployee).options(
-        selectinload(PortalEmployee.documents),
-        selectinload(PortalEmployee.sgk_periods)
+        selectinload(PortalEmployee.documents)
     ).filter(
         PortalEmployee.cari_id == current_user.cari_id
     )
@@ -191,46 +194,14 @@ def get_employees(
     if is_active is not None:
         query = query.filter(PortalEmployee.is_active == is_active)
 
-    employees: List[PortalEmployee] = []
-    query_counter = {"value": 0}
-    bind = db.get_bind()
-    listener = None
-
-    if IS_DEV_ENV and bind is not None:
-        def after_cursor_execute(*_):
-            query_counter["value"] += 1
-
-        listener = after_cursor_execute
-        event.listen(bind, "after_cursor_execute", listener)
-
-    start = time.perf_counter()
-    try:
-        employees = query.order_by(PortalEmployee.full_name).all()
-
-        for emp in employees:
-            emp.sgk_status = compute_employee_sgk_status(
-                db,
-                emp,
-                prefetched_periods=getattr(emp, "sgk_periods", None),
-                prefetched_documents=getattr(emp, "documents", None),
-            )
-        
-        return employees
-    finally:
-        duration_ms = (time.perf_counter() - start) * 1000
-        if IS_DEV_ENV:
-            logger.info(
-                "portal.get_employees perf",
-                extra={
-                    "type": "perf",
-                    "endpoint": "/portal/employees",
-                    "employee_count": len(employees),
-                    "queries": query_counter["value"],
-                    "duration_ms": round(duration_ms, 2),
-                }
-            )
-        if listener is not None and bind is not None:
-            event.remove(bind, "after_cursor_execute", listener)
+    employees = query.order_by(PortalEmployee.full_name).all()
+
+    # Materialize edilmiş SGK durumu: tek indexed lookup
+    statuses = get_sgk_status_map(db, employees)
+    for emp in employees:
+        emp.sgk_status = statuses[emp.id]
+
+    return employees
 
 
 @router.get("/employees/{employee_id}", response_model=PortalEmployeeResponse)
@@ -250,7 +221,7 @@ def get_employee(
     if not employee:
         raise HTTPException(status_code=404, detail="Çalışan bulunamadı")
     
-    employee.sgk_status = compute_employee_sgk_status(db, employee)
+    employee.sgk_status = get_sgk_status_map(db, [employee])[employee.id]
     return employee
 
 
@@ -289,9 +260,11 @@ def create_employee(
     )
     
     db.add(employee)
+    db.flush()
+    sgk_status = refresh_sgk_status(db, employee_ids=[employee.id])[employee.id]
     db.commit()
     db.refresh(employee)
-    employee.sgk_status = compute_employee_sgk_status(db, employee)
+    employee.sgk_status = sgk_status
     employee.documents = []
     
     return employee
@@ -328,12 +301,13 @@ def update_employee(
     employee.updated_by = current_user.id
     employee.updated_at = datetime.utcnow()
     
+    sgk_status = refresh_sgk_status(db, employee_ids=[employee.id])[employee.id]
     db.commit()
     db.refresh(employee)
     employee.documents = db.query(PortalEmployeeDocument).filter(
         PortalEmployeeDocument.employee_id == employee.id
     ).all()
-    employee.sgk_status = compute_employee_sgk_status(db, employee)
+    employee.sgk_status = sgk_status
     
     return employee
 
@@ -699,8 +673,10 @@ async def upload_employee_document(
             from datetime import datetime
             now = datetime.utcnow()
             employee.sgk_last_check_period = f"{now.year}{now.month:02d}"
-    # Güncel SGK statüsünü tekrar hesapla
-    employee.sgk_status = compute_employee_sgk_status(db, employee)
+    # Güncel SGK statüsünü tekrar hesapla (işe giriş bildirgesi durumu değiştirir)
+    if document_type in SGK_HIRE_DOCUMENT_TYPES:
+        db.flush()
+        refresh_sgk_status(db, employee_ids=[employee.id])
     
     db.commit()
     db.refresh(doc)
@@ -806,6 +782,9 @@ def delete_employee_document(
     
     # Veritabanından sil
     db.delete(doc)
+    if doc.document_type in SGK_HIRE_DOCUMENT_TYPES:
+        db.flush()
+        refresh_sgk_status(db, employee_ids=[employee_id])
     db.commit()
     
     return {"message": "Belge silindi"}
@@ -973,6 +952,7 @@ def upload_vehicle_document(
     
     db.commit()
     db.refresh(vehicle_doc)
+    invalidate_vehicle_document_stats()
     
     return {
         "id": vehicle_doc.id,
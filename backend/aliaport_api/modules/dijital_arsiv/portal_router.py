@@ -3,28 +3,33 @@ DİJİTAL ARŞİV MODÜLÜ - Portal API Router
 Dış müşteri (portal kullanıcı) için endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status, UploadFile, File, Form
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional, Set
+from typing import List, Optional
 from datetime import datetime, timedelta
 import hashlib
 import jwt
 import os
 from pathlib import Path
-import re
 import logging
-from io import BytesIO
-from pdfminer.high_level import extract_text
 
 logger = logging.getLogger(__name__)
 
 from ...config.database import get_db
-from .models import PortalUser, ArchiveDocument, Notification, DocumentStatus, DocumentCategory, DocumentType, PortalEmployee, PortalEmployeeSgkPeriod
-from ...config.storage import get_base_sgk_dir
+from .models import PortalUser, ArchiveDocument, Notification, DocumentStatus, DocumentCategory, DocumentType
+from ...config.storage import get_base_sgk_dir, sanitize_storage_segment
+from .preview import document_file_response, thumbnail_service
+from .portal_work_orders import insert_work_order_children, resolve_work_order_references
+from .sgk_reconciliation import reconcile_sgk_employees
+from .sgk_status import refresh_sgk_status
 from ...core.error_codes import ErrorCode
+from ...core.metrics import WORK_ORDERS_TOTAL
 from ...core.responses import success_response, error_response
+from ..auth.password_pool import PasswordPoolSaturated
 from ..sgk.models import SgkPeriodCheck
+from ..sgk.parse_store import get_or_parse
+from ..sgk.pdf_parser import SGK_MIN_TC_COUNT, parse_sgk_pdf
 from ..isemri.models import WorkOrder, WorkOrderStatus
 from ..hizmet.models import Hizmet
 from .schemas import (
@@ -46,7 +51,6 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 480  # 8 saat
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/portal/auth/login")
 
 SGK_MAX_FILE_SIZE_BYTES = 10 * 1024 * 1024  # 10 MB
-TC_REGEX = re.compile(r"\b[1-9][0-9]{10}\b")
 
 
 def _normalize_period(period_value: str) -> str:
@@ -66,188 +70,6 @@ def _normalize_period(period_value: str) -> str:
     return parsed.strftime("%Y%m")
 
 
-def _sanitize_storage_segment(raw_value: str) -> str:
-    """Normalize path segments so they are filesystem safe."""
-    cleaned = (raw_value or "FIRMA").strip().upper()
-    safe_value = re.sub(r"[^A-Z0-9_-]+", "_", cleaned)
-    return safe_value or "FIRMA"
-
-
-def _extract_tc_numbers(file_bytes: bytes) -> Set[str]:
-    """Extract TC Kimlik numbers from PDF bytes."""
-    try:
-        text = extract_text(BytesIO(file_bytes))
-    except Exception:
-        return set()
-    if not text:
-        return set()
-    return set(TC_REGEX.findall(text))
-
-
-def _extract_sgk_employees(file_bytes: bytes) -> dict[str, str]:
-    """
-    SGK PDF'inden çalışan bilgilerini çıkar - INDEX BAZLI EŞLEŞTİRME.
-    Returns: {tc_no: full_name} dict
-    
-    Yaklaşım:
-    1. Tüm TC numaralarını topla (sırayla)
-    2. TC'den 2 satır sonrasındaki tüm kelimeleri topla (AD listesi)
-    3. INDEX bazlı eşleştir: TC[i] => AD[i] + SOYAD[i]
-    """
-    try:
-        text = extract_text(BytesIO(file_bytes))
-    except Exception as e:
-        logger.error(f"PDF extract HATA: {e}")
-        return {}
-    
-    if not text:
-        logger.warning("PDF boş text döndü")
-        return {}
-    
-    lines = [line.strip() for line in text.split('\n')]
-    logger.info(f"SGK PDF parsing: {len(lines)} satır bulundu")
-    
-    # 1. ADIM: Tüm TC'leri topla ve pozisyonlarını kaydet
-    tc_list = []
-    tc_positions = {}  # {line_index: tc_no}
-    
-    for i, line in enumerate(lines):
-        if not line:
-            continue
-        tc_match = TC_REGEX.search(line)
-        if tc_match:
-            tc_no = tc_match.group(0)
-            tc_list.append(tc_no)
-            tc_positions[i] = tc_no
-    
-    logger.info(f"📋 {len(tc_list)} TC numarası bulundu")
-    
-    # 2. ADIM: Her TC için +2 offset'teki satırı al (AD)
-    ad_list = []
-    for i, line in enumerate(lines):
-        if i in tc_positions:
-            # TC bulundu, +2 satır sonraki kelimeleri al
-            ad_line = lines[i + 2] if i + 2 < len(lines) else ""
-            ad_words = [w for w in ad_line.split() if w.isalpha() and len(w) >= 2]
-            ad = " ".join(ad_words) if ad_words else ""
-            ad_list.append(ad)
-    
-    # 3. ADIM: Her TC için +4 veya sonraki satırlarda soyad ara
-    soyad_list = []
-    tc_indices = sorted(tc_positions.keys())
-    
-    for idx_pos, tc_idx in enumerate(tc_indices):
-        # Sonraki TC'nin pozisyonu
-        next_tc_idx = tc_indices[idx_pos + 1] if idx_pos + 1 < len(tc_indices) else len(lines)
-        
-        # TC+4 ile NextTC arası first non-empty, non-TC kelime
-        soyad = ""
-        for offset in range(4, next_tc_idx - tc_idx):
-            check_idx = tc_idx + offset
-            if check_idx >= len(lines):
-                break
-            
-            check_line = lines[check_idx].strip()
-            if not check_line:
-                continue
-            
-            # TC ise atla
-            if TC_REGEX.search(check_line):
-                break
-            
-            # Kelime varsa al
-            words = [w for w in check_line.split() if w.isalpha() and len(w) >= 2]
-            if words:
-                soyad = " ".join(words)
-                break
-        
-        soyad_list.append(soyad)
-    
-    # 4. ADIM: Eşleştir
-    result = {}
-    for i, tc_no in enumerate(tc_list):
-        ad = ad_list[i] if i < len(ad_list) else ""
-        soyad = soyad_list[i] if i < len(soyad_list) else ""
-        
-        full_name = f"{ad} {soyad}".strip().upper()
-        
-        # Türkçe karakter düzeltmeleri
-        if full_name:
-            full_name = full_name.replace('î', 'İ').replace('Î', 'İ')
-            full_name = full_name.replace('û', 'Ü').replace('Û', 'Ü')
-            full_name = full_name.replace('Ü', 'Ü').replace('ü', 'ü')
-        
-        # İlk 5 kaydı logla
-        if i < 5:
-            logger.info(f"🔍 TC #{i+1}: {tc_no}")
-            logger.info(f"   AD: [{ad}]")
-            logger.info(f"   SOYAD: [{soyad}]")
-            logger.info(f"   ✅ TAM İSİM: [{full_name}]")
-        
-        # Kaydet
-        if len(full_name) >= 3:
-            result[tc_no] = full_name
-        else:
-            result[tc_no] = ""
-    
-    successful_names = sum(1 for v in result.values() if v)
-    success_rate = (successful_names * 100 // len(result)) if result else 0
-    logger.info(f"✅ SGK extraction: {len(result)} TC bulundu, {successful_names} tanesi isimli ({success_rate}%)")
-    
-    return result
-
-
-def _extract_period_from_pdf(file_bytes: bytes) -> Optional[str]:
-    """
-    Extract period (YYYYMM format) from SGK PDF content.
-    Searches for patterns like: '2017-09', '2024-11', 'KASIM 2024', etc.
-    Returns normalized period in YYYYMM format or None if not found.
-    """
-    try:
-        text = extract_text(BytesIO(file_bytes))
-    except Exception:
-        return None
-    
-    if not text:
-        return None
-    
-    # Pattern 1: "Yıl - Ay" field in SGK documents (most reliable)
-    # Look for ": YYYY-M" or ": YYYY-MM" after "Yıl" or near the field labels
-    yil_ay_pattern = re.search(r':\s*(20[0-9]{2})\s*[-–]\s*([1-9]|0[1-9]|1[0-2])\b', text)
-    if yil_ay_pattern:
-        year = yil_ay_pattern.group(1)
-        month = yil_ay_pattern.group(2).zfill(2)  # Pad single digit with zero
-        return f"{year}{month}"
-    
-    # Pattern 2: YYYY-MM format anywhere in document (less reliable, but fallback)
-    pattern2 = re.search(r'\b(20[0-9]{2})[-–]\s*(0[1-9]|1[0-2])\b', text)
-    if pattern2:
-        year, month = pattern2.groups()
-        return f"{year}{month}"
-    
-    # Pattern 3: Month name + Year (Turkish months)
-    # OCAK, ŞUBAT, MART, NİSAN, MAYIS, HAZİRAN, TEMMUZ, AĞUSTOS, EYLÜL, EKİM, KASIM, ARALIK
-    month_map = {
-        'OCAK': '01', 'ŞUBAT': '02', 'MART': '03', 'NİSAN': '04',
-        'MAYIS': '05', 'HAZİRAN': '06', 'TEMMUZ': '07', 'AĞUSTOS': '08',
-        'EYLÜL': '09', 'EKİM': '10', 'KASIM': '11', 'ARALIK': '12'
-    }
-    
-    for month_name, month_num in month_map.items():
-        # Look for "EYLÜL 2017", "2017 EYLÜL", "EYLÜL AYI 2017", etc.
-        pattern = rf'\b(?:({month_name})\s*(?:AYI)?\s*(20[0-9]{{2}})|(20[0-9]{{2}})\s*(?:AYI)?\s*({month_name}))\b'
-        match = re.search(pattern, text.upper())
-        if match:
-            # Check which group matched
-            if match.group(1):  # Month Year format
-                year = match.group(2)
-            else:  # Year Month format
-                year = match.group(3)
-            return f"{year}{month_num}"
-    
-    return None
-
-
 # ============================================
 # AUTH HELPERS
 # ============================================
@@ -310,7 +132,15 @@ def portal_login(
         joinedload(PortalUser.cari)
     ).filter(PortalUser.email == form_data.username).first()
     
-    if not user or not user.verify_password(form_data.password):
+    try:
+        password_ok = user is not None and user.verify_password(form_data.password)
+    except PasswordPoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Giriş servisi yoğun, lütfen tekrar deneyin",
+            headers={"Retry-After": "1"},
+        )
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email veya şifre hatalı"
@@ -476,6 +306,7 @@ def create_work_order(
     - Durum: DRAFT
     - Belge yüklenene kadar SUBMITTED olmaz
     - Employee/Vehicle ilişkilendirmesi yapılır
+    - Hizmet kodu bulunamayan veya başka firmaya ait/pasif çalışan-araç seçilirse 400 döner
     """
     # Cari kontrolü
     if request.CariId != current_user.cari_id:
@@ -484,8 +315,21 @@ def create_work_order(
             detail="Sadece kendi firmanız için talep oluşturabilirsiniz"
         )
     
+    # Hizmet, çalışan ve araç referanslarını tür başına tek sorguyla doğrula
+    refs = resolve_work_order_references(
+        db, request.CariId, request.ServiceCodes, request.EmployeeIds, request.VehicleIds
+    )
+    if not refs.is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_response(
+                code=ErrorCode.INVALID_INPUT,
+                message="Geçersiz hizmet, çalışan veya araç seçimi",
+                details=refs.invalid_details(),
+            ),
+        )
+    
     # WO number oluştur
-    from datetime import datetime
     # microsecond ekleyerek aynı saniyede gelen taleplerde çakışmayı önle
     wo_number = f"WO{datetime.utcnow().strftime('%Y%m%d%H%M%S%f')}"
     
@@ -514,74 +358,12 @@ def create_work_order(
     db.add(work_order)
     db.flush()  # Get work_order.id without commit
     
-    # Çoklu hizmet seçimi (ServiceCodes array olarak gelirse)
-    # Frontend'den gelebilecek ServiceCodes field'ını handle et
-    service_codes = getattr(request, 'ServiceCodes', None) or []
-    if service_codes and isinstance(service_codes, list):
-        from ..isemri.models import WorkOrderItem, WorkOrderItemType
-        
-        for service_code in service_codes:
-            hizmet = db.query(Hizmet).filter(Hizmet.Kod == service_code).first()
-            if not hizmet:
-                continue
-            unit = (hizmet.Birim or "ADET").upper()
-            unit_price = float(hizmet.Fiyat or 0)
-            vat_rate = float(hizmet.KdvOrani or 0)
-            quantity = 1.0
-            currency = (hizmet.ParaBirimi or "TRY").upper()[:3]
-            total_amount = quantity * unit_price
-            vat_amount = round(total_amount * (vat_rate / 100), 2) if vat_rate else 0.0
-            grand_total = total_amount + vat_amount
-            
-            wo_item = WorkOrderItem(
-                work_order_id=work_order.id,
-                wo_number=work_order.wo_number,
-                item_type=WorkOrderItemType.SERVICE,
-                service_code=service_code,
-                service_name=hizmet.Ad,
-                quantity=quantity,
-                unit=unit,
-                unit_price=unit_price,
-                currency=currency,
-                total_amount=total_amount,
-                vat_rate=vat_rate,
-                vat_amount=vat_amount,
-                grand_total=grand_total,
-                notes=hizmet.Aciklama or "",
-                created_by_name=current_user.full_name
-            )
-            db.add(wo_item)
-    
-    # Firma çalışanları seçimi (PortalEmployee master data'dan)
-    if request.EmployeeIds:
-        from ..isemri.models import WorkOrderEmployee
-        for emp_id in request.EmployeeIds:
-            wo_emp = WorkOrderEmployee(work_order_id=work_order.id, employee_id=emp_id)
-            db.add(wo_emp)
-    
-    # Firma araçları seçimi (PortalVehicle master data'dan)
-    if request.VehicleIds:
-        from ..isemri.models import WorkOrderVehicle
-        for veh_id in request.VehicleIds:
-            wo_veh = WorkOrderVehicle(work_order_id=work_order.id, vehicle_id=veh_id)
-            db.add(wo_veh)
-    
-    # Personel listesi (Personel Transfer hizmeti için - dinamik form)
-    if request.PersonelList:
-        from ..isemri.models import WorkOrderPerson
-        for person in request.PersonelList:
-            wo_person = WorkOrderPerson(
-                work_order_id=work_order.id,
-                full_name=person.get('full_name'),
-                tc_kimlik_no=person.get('tc_kimlik'),
-                passport_no=person.get('pasaport'),
-                nationality=person.get('nationality', 'TUR'),
-                phone=person.get('phone')
-            )
-            db.add(wo_person)
+    # Hizmet kalemleri, firma çalışanları/araçları ve personel listesi: tablo başına tek bulk INSERT
+    insert_work_order_children(db, work_order, refs, request.PersonelList, current_user.full_name)
     
     db.commit()
     db.refresh(work_order)
+    WORK_ORDERS_TOTAL.labels(work_order.status.value).inc()
     
     # Bildirim oluştur (internal user'lara)
     # TODO: Notification oluştur
@@ -746,8 +528,15 @@ async def upload_sgk_service_document(
             ),
         )
 
+    # Parse sonucu checksum ile saklanır; aynı PDF tekrar okunmaz
+    checksum = hashlib.sha256(file_bytes).hexdigest()
+    parsed, from_store = get_or_parse(db, checksum, lambda: parse_sgk_pdf(file_bytes))
+    if not from_store:
+        # Yükleme aşağıda reddedilse de parse sonucu saklansın (öncesinde bekleyen yazım yok)
+        db.commit()
+
     # DÖNEM KONTROLÜ: PDF içindeki dönem ile seçilen dönem uyumlu olmalı
-    pdf_period = _extract_period_from_pdf(file_bytes)
+    pdf_period = parsed.period
     if pdf_period and pdf_period != normalized_period:
         # PDF'de dönem bulundu ama eşleşmiyor
         # PDF'deki dönemi kullanıcı dostu formata çevir (YYYY-MM)
@@ -782,7 +571,7 @@ async def upload_sgk_service_document(
         )
 
     base_dir = get_base_sgk_dir()
-    firma_segment = _sanitize_storage_segment(portal_user.cari.CariKod or f"FIRMA_{portal_user.cari_id}")
+    firma_segment = sanitize_storage_segment(portal_user.cari.CariKod or f"FIRMA_{portal_user.cari_id}")
     year_segment = normalized_period[:4]
     storage_dir = base_dir / year_segment / firma_segment / normalized_period
     storage_dir.mkdir(parents=True, exist_ok=True)
@@ -796,11 +585,10 @@ async def upload_sgk_service_document(
 
     storage_key = "/".join([year_segment, firma_segment, normalized_period, filename])
     file_size = len(file_bytes)
-    checksum = hashlib.sha256(file_bytes).hexdigest()
-    sgk_employees = _extract_sgk_employees(file_bytes)  # {tc_no: full_name}
+    sgk_employees = parsed.employees  # {tc_no: full_name}
     sgk_tc_set = set(sgk_employees.keys())
 
-    if len(sgk_tc_set) < 3:
+    if len(sgk_tc_set) < SGK_MIN_TC_COUNT:
         failure_record = SgkPeriodCheck(
             firma_id=portal_user.cari_id,
             period=normalized_period,
@@ -823,90 +611,12 @@ async def upload_sgk_service_document(
             ),
         )
 
-    employees = db.query(PortalEmployee).filter(PortalEmployee.cari_id == portal_user.cari_id).all()
-    employee_tc_map = {}
-    for employee in employees:
-        tc_value = (employee.tc_kimlik or "").strip()
-        if tc_value:
-            employee_tc_map[tc_value] = employee
-
-    matched_tcs = sgk_tc_set.intersection(employee_tc_map.keys())
-    
-    # YENİ PERSONELLER: SGK'da olup sistemde olmayan TC'ler (yeni işe girenler)
-    new_employee_tcs = sgk_tc_set - set(employee_tc_map.keys())
-    new_employees_added = 0
-
-    # Not: SGK hizmet dökümünde genellikle sadece TC listesi bulunuyor.
-    # İsim bilgisi çözülebilirse burada full_name alanını gerçek ad/soyad ile
-    # dolduracak şekilde güncellenebilir. Şimdilik kullanıcıya portal
-    # arayüzünden bu kayıtları güncelletiyoruz; isim alanını boş bırakıyoruz
-    # ve sadece TC üzerinden yeni çalışan ekliyoruz.
-
-    if new_employee_tcs:
-        # Yeni personelleri otomatik olarak ekle
-        for tc_no in new_employee_tcs:
-            full_name = sgk_employees.get(tc_no, "").strip()
-            new_employee = PortalEmployee(
-                cari_id=portal_user.cari_id,
-                full_name=full_name or "",  # SGK listesinden okunan ad soyad (varsa)
-                tc_kimlik=tc_no,
-                nationality="TUR",
-                is_active=True,
-                sgk_last_check_period=normalized_period,
-                sgk_is_active_last_period=True,  # SGK'da olduğu için aktif
-                created_at=datetime.utcnow()
-            )
-            db.add(new_employee)
-            employee_tc_map[tc_no] = new_employee  # Map'e ekle
-            new_employees_added += 1
-        
-        db.flush()  # Yeni personelleri flush et (id almak için)
-        
-        # Matched count'u güncelle
-        matched_tcs = matched_tcs.union(new_employee_tcs)
-    
-    # Dönem kodunu tire ile formatla (YYYY-MM)
-    period_code_with_dash = f"{normalized_period[:4]}-{normalized_period[4:]}"
-    
-    # TÜM matched personeller için SGK period kaydı oluştur/güncelle
-    for tc_no in matched_tcs:
-        employee = employee_tc_map.get(tc_no)
-        if not employee:
-            continue
-            
-        # Bu çalışan için bu dönem kaydı var mı kontrol et
-        period_record = db.query(PortalEmployeeSgkPeriod).filter(
-            PortalEmployeeSgkPeriod.employee_id == employee.id,
-            PortalEmployeeSgkPeriod.period_code == period_code_with_dash
-        ).first()
-        
-        if not period_record:
-            # Yeni kayıt oluştur
-            period_record = PortalEmployeeSgkPeriod(
-                employee_id=employee.id,
-                period_code=period_code_with_dash,
-                is_active=True,
-                source="HIZMET_LISTESI",
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            db.add(period_record)
-        else:
-            # Mevcut kaydı güncelle
-            period_record.is_active = True
-            period_record.source = "HIZMET_LISTESI"
-            period_record.updated_at = datetime.utcnow()
-    
-    # Mevcut personellerin eski alanlarını da güncelle (geriye dönük uyumluluk)
-    for employee in employees:
-        employee.sgk_last_check_period = normalized_period
-        tc_value = (employee.tc_kimlik or "").strip()
-        employee.sgk_is_active_last_period = tc_value in matched_tcs
-
-    employee_count = len(employees) + new_employees_added
-    matched_employee_count = len(matched_tcs)
-    missing_employee_count = max(employee_count - matched_employee_count, 0)
-    extra_in_sgk_count = max(len(sgk_tc_set - set(employee_tc_map.keys())) - new_employees_added, 0)  # Yeni eklenenleri çıkar
+    # Küme işlemleriyle mutabakat; yeni çalışanlar ve dönem kayıtları toplu yazılır
+    reconciliation = reconcile_sgk_employees(db, portal_user.cari_id, normalized_period, sgk_employees)
+    new_employees_added = reconciliation.new_employees_added
+    matched_employee_count = reconciliation.matched_employee_count
+    missing_employee_count = reconciliation.missing_employee_count
+    extra_in_sgk_count = reconciliation.extra_in_sgk_count
 
     success_record = SgkPeriodCheck(
         firma_id=portal_user.cari_id,
@@ -921,6 +631,8 @@ async def upload_sgk_service_document(
         extra_in_sgk_count=extra_in_sgk_count,
     )
     db.add(success_record)
+    # Firmanın materialize SGK durumlarını yenile (aynı transaction)
+    refresh_sgk_status(db, cari_id=portal_user.cari_id)
     db.commit()
 
     return success_response(
@@ -948,6 +660,7 @@ async def upload_document(
     description: Optional[str] = Form(None),
     issue_date: Optional[datetime] = Form(None),
     file: UploadFile = File(...),
+    background_tasks: BackgroundTasks = None,
     current_user: PortalUser = Depends(get_current_portal_user),
     db: Session = Depends(get_db)
 ):
@@ -1045,6 +758,10 @@ async def upload_document(
     # Bildirim oluştur (internal user'lara)
     # TODO: Notification oluştur
     
+    # İnceleme ekranı için thumbnail'i önceden üret
+    if background_tasks is not None:
+        thumbnail_service.schedule(background_tasks, document.file_path, document.file_type, document.file_hash)
+    
     return FileUploadResponse(
         file_name=document.file_name,
         file_path=document.file_path,
@@ -1092,6 +809,62 @@ def list_documents(
     )
 
 
+def _get_visible_document(db: Session, document_id: int, current_user: PortalUser) -> ArchiveDocument:
+    """Portal kullanıcısının görebileceği belgeyi döner (list_documents ile aynı kurallar)."""
+    document = db.query(ArchiveDocument).filter(ArchiveDocument.id == document_id).first()
+    
+    if not document:
+        raise HTTPException(status_code=404, detail="Belge bulunamadı")
+    
+    if current_user.is_admin:
+        allowed = document.cari_id == current_user.cari_id
+    else:
+        allowed = document.uploaded_by_portal_user_id == current_user.id
+    
+    if not allowed:
+        raise HTTPException(status_code=403, detail="Bu belgeye erişim yetkiniz yok")
+    
+    if not os.path.exists(document.file_path):
+        raise HTTPException(status_code=404, detail="Dosya bulunamadı")
+    
+    return document
+
+
+@router.get("/documents/{document_id}/preview")
+def preview_document(
+    document_id: int,
+    request: Request,
+    current_user: PortalUser = Depends(get_current_portal_user),
+    db: Session = Depends(get_db)
+):
+    """Belge önizleme (ETag / 304 / Range destekli)"""
+    document = _get_visible_document(db, document_id, current_user)
+    
+    return document_file_response(
+        request,
+        document.file_path,
+        media_type=document.file_type,
+        filename=document.file_name,
+        checksum=document.file_hash,
+    )
+
+
+@router.get("/documents/{document_id}/thumbnail")
+def get_document_thumbnail(
+    document_id: int,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    current_user: PortalUser = Depends(get_current_portal_user),
+    db: Session = Depends(get_db)
+):
+    """İlk sayfa thumbnail'i (hazır değilse 202 + Retry-After)"""
+    document = _get_visible_document(db, document_id, current_user)
+    
+    return thumbnail_service.response(
+        request, background_tasks, document.file_path, document.file_type, document.file_hash
+    )
+
+
 # ============================================
 # NOTIFICATION ENDPOINTS
 # ============================================
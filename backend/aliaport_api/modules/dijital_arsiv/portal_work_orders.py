@@ -0,0 +1,169 @@
+"""
+PORTAL İŞ EMRİ - Toplu Oluşturma
+
+Portal talebinde gelen hizmet kodları, çalışanlar ve araçlar her biri tek
+`IN` sorgusuyla doğrulanır; alt kayıtlar (kalem, çalışan, araç, kişi) satır
+satır ORM nesnesi yerine tablo başına tek bulk INSERT ile yazılır. Talep
+başına sorgu sayısı ekip/araç/hizmet sayısından bağımsızdır.
+
+Doğrulama kuralları:
+- Hizmet kodu Hizmet.Kod'da bulunmalı (eskiden bilinmeyen kodlar sessizce atlanırdı)
+- Çalışan ve araç talep eden carinin aktif kaydı olmalı
+- Tekrarlanan çalışan/araç id'leri tek kayda indirilir; hizmet kodları her
+  geçişte ayrı kalem olarak eklenir (eski davranış)
+
+Fonksiyonlar commit etmez; endpoint iş emri ile aynı transaction'da commit eder.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ..hizmet.models import Hizmet
+from ..isemri.models import WorkOrder, WorkOrderEmployee, WorkOrderItem, WorkOrderItemType, WorkOrderPerson, WorkOrderVehicle
+from .models import PortalEmployee, PortalVehicle
+
+
+@dataclass
+class WorkOrderReferences:
+    """Talepte geçen hizmet/çalışan/araç referanslarının doğrulanmış hali"""
+    service_codes: List[str] = field(default_factory=list)
+    services: Dict[str, Hizmet] = field(default_factory=dict)
+    employee_ids: List[int] = field(default_factory=list)
+    vehicle_ids: List[int] = field(default_factory=list)
+    invalid_service_codes: List[str] = field(default_factory=list)
+    invalid_employee_ids: List[int] = field(default_factory=list)
+    invalid_vehicle_ids: List[int] = field(default_factory=list)
+
+    @property
+    def is_valid(self) -> bool:
+        return not (self.invalid_service_codes or self.invalid_employee_ids or self.invalid_vehicle_ids)
+
+    def invalid_details(self) -> Dict[str, List[Any]]:
+        return {
+            name: values for name, values in (
+                ("invalid_service_codes", self.invalid_service_codes),
+                ("invalid_employee_ids", self.invalid_employee_ids),
+                ("invalid_vehicle_ids", self.invalid_vehicle_ids),
+            ) if values
+        }
+
+
+def _unique(values: Optional[Iterable]) -> List:
+    # Sırayı koruyarak tekrarları at
+    return list(dict.fromkeys(values or ()))
+
+
+def resolve_work_order_references(
+    db: Session,
+    cari_id: int,
+    service_codes: Optional[List[str]],
+    employee_ids: Optional[List[int]],
+    vehicle_ids: Optional[List[int]],
+) -> WorkOrderReferences:
+    """
+    Talep referanslarını referans türü başına tek IN sorgusuyla doğrular.
+
+    Args:
+        cari_id: Talep eden firma (çalışan/araç sahipliği buna göre kontrol edilir)
+        service_codes: Hizmet kodları (tekrar edebilir, her biri ayrı kalem)
+        employee_ids: PortalEmployee id'leri
+        vehicle_ids: PortalVehicle id'leri
+    """
+    refs = WorkOrderReferences(
+        service_codes=list(service_codes or []),
+        employee_ids=_unique(employee_ids),
+        vehicle_ids=_unique(vehicle_ids),
+    )
+
+    codes = _unique(refs.service_codes)
+    if codes:
+        for hizmet in db.query(Hizmet).filter(Hizmet.Kod.in_(codes)).order_by(Hizmet.Id):
+            refs.services.setdefault(hizmet.Kod, hizmet)
+        refs.invalid_service_codes = [code for code in codes if code not in refs.services]
+
+    if refs.employee_ids:
+        found = {
+            row.id for row in db.query(PortalEmployee.id).filter(
+                PortalEmployee.id.in_(refs.employee_ids),
+                PortalEmployee.cari_id == cari_id,
+                PortalEmployee.is_active == True,  # noqa: E712
+            )
+        }
+        refs.invalid_employee_ids = [emp_id for emp_id in refs.employee_ids if emp_id not in found]
+
+    if refs.vehicle_ids:
+        found = {
+            row.id for row in db.query(PortalVehicle.id).filter(
+                PortalVehicle.id.in_(refs.vehicle_ids),
+                PortalVehicle.cari_id == cari_id,
+                PortalVehicle.is_active == True,  # noqa: E712
+            )
+        }
+        refs.invalid_vehicle_ids = [veh_id for veh_id in refs.vehicle_ids if veh_id not in found]
+
+    return refs
+
+
+def service_item_row(work_order: WorkOrder, hizmet: Hizmet, service_code: str, created_by_name: Optional[str]) -> Dict[str, Any]:
+    """Hizmet kartından 1 adetlik iş emri kalemi (bulk INSERT parametresi)"""
+    quantity = 1.0
+    unit_price = float(hizmet.Fiyat or 0)
+    vat_rate = float(hizmet.KdvOrani or 0)
+    total_amount = quantity * unit_price
+    vat_amount = round(total_amount * (vat_rate / 100), 2) if vat_rate else 0.0
+    return {
+        "work_order_id": work_order.id,
+        "wo_number": work_order.wo_number,
+        "item_type": WorkOrderItemType.SERVICE,
+        "service_code": service_code,
+        "service_name": hizmet.Ad,
+        "quantity": quantity,
+        "unit": (hizmet.Birim or "ADET").upper(),
+        "unit_price": unit_price,
+        "currency": (hizmet.ParaBirimi or "TRY").upper()[:3],
+        "total_amount": total_amount,
+        "vat_rate": vat_rate,
+        "vat_amount": vat_amount,
+        "grand_total": total_amount + vat_amount,
+        "notes": hizmet.Aciklama or "",
+        "created_by_name": created_by_name,
+    }
+
+
+def insert_work_order_children(
+    db: Session,
+    work_order: WorkOrder,
+    refs: WorkOrderReferences,
+    personel_list: Optional[List[dict]],
+    created_by_name: Optional[str],
+) -> None:
+    """
+    Kalem, çalışan, araç ve kişi kayıtlarını tablo başına tek bulk INSERT ile yazar.
+
+    work_order flush edilmiş olmalı (id gerekli); refs doğrulanmış olmalı.
+    """
+    batches = (
+        (WorkOrderItem, [
+            service_item_row(work_order, refs.services[code], code, created_by_name)
+            for code in refs.service_codes
+        ]),
+        (WorkOrderEmployee, [{"work_order_id": work_order.id, "employee_id": emp_id} for emp_id in refs.employee_ids]),
+        (WorkOrderVehicle, [{"work_order_id": work_order.id, "vehicle_id": veh_id} for veh_id in refs.vehicle_ids]),
+        (WorkOrderPerson, [
+            {
+                "work_order_id": work_order.id,
+                "full_name": person.get("full_name"),
+                "tc_kimlik_no": person.get("tc_kimlik"),
+                "passport_no": person.get("pasaport"),
+                "nationality": person.get("nationality", "TUR"),
+                "phone": person.get("phone"),
+            }
+            for person in personel_list or []
+        ]),
+    )
+    for model, rows in batches:
+        if rows:
+            db.execute(insert(model), rows)
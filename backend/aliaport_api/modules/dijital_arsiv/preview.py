@@ -0,0 +1,360 @@
+"""
+DİJİTAL ARŞİV - Belge Önizleme Servisi
+
+- Strong ETag: Belgenin kayıtlı SHA-256 hash'i (file_hash). Aynı içerik her
+  zaman aynı ETag'i alır; If-None-Match eşleşirse gövde gönderilmez (304).
+- Range: FileResponse Range / If-Range isteklerini karşılar; If-Range strong
+  ETag ile karşılaştırıldığı için yarım kalan PDF indirmeleri güvenle devam eder.
+- Thumbnail: İlk sayfanın (PDF) veya görselin küçük JPEG kopyası arka planda
+  üretilir ve diskte cache'lenir. Anahtar hash + boyut olduğu için her belge
+  versiyonu kendi thumbnail'ini alır. Cache toplam boyutu aşınca en uzun
+  süredir kullanılmayan dosyalar silinir (LRU).
+- Üretilemeyen thumbnail (bozuk/desteklenmeyen PDF, render hatası) TTL süresince
+  negatif cache'lenir ve 404 döner; istemci 202 ile sonsuza kadar yoklamaz,
+  her yoklama yeni bir render başlatmaz.
+
+Thumbnail üretimi opsiyonel bağımlılıklar kullanır (Pillow, PDF için ayrıca
+pypdfium2). Kurulu değilse önizleme çalışmaya devam eder, yalnızca thumbnail
+üretilmez.
+
+Ortam değişkenleri:
+    THUMBNAIL_CACHE_DIR      (varsayılan: uploads/.thumbnails)
+    THUMBNAIL_CACHE_MAX_MB   (varsayılan: 256)
+    THUMBNAIL_FAILURE_TTL    (varsayılan: 600 saniye)
+"""
+
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from fastapi import BackgroundTasks, Request, Response
+from fastapi.responses import FileResponse
+
+from ...core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+THUMBNAIL_MAX_SIZE = 320  # px (uzun kenar)
+THUMBNAIL_QUALITY = 75
+THUMBNAIL_MEDIA_TYPE = "image/jpeg"
+THUMBNAIL_FAILURE_TTL = int(os.getenv("THUMBNAIL_FAILURE_TTL", "600"))  # saniye
+
+PREVIEW_CACHE_CONTROL = "private, no-cache"
+# Thumbnail içeriği hash'e bağlı olduğu için değişmez
+THUMBNAIL_CACHE_CONTROL = "private, max-age=86400"
+
+PDF_MEDIA_TYPE = "application/pdf"
+IMAGE_MEDIA_TYPES = frozenset({"image/jpeg", "image/png", "image/gif", "image/webp"})
+
+
+# ============================================
+# ETAG / CONDITIONAL REQUEST
+# ============================================
+
+def strong_etag(checksum: str) -> str:
+    """SHA-256 hash'inden strong ETag üretir."""
+    return f'"{checksum}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match başlığı ETag ile eşleşiyor mu (weak karşılaştırma, RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified_response(etag: str, cache_control: str = PREVIEW_CACHE_CONTROL) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def document_file_response(
+    request: Request,
+    file_path: str,
+    media_type: str,
+    filename: str,
+    checksum: Optional[str],
+) -> Response:
+    """
+    Belge dosyasını ETag / 304 / Range destekli döner.
+
+    Dosya tarayıcıda açılabilsin diye inline gönderilir.
+    """
+    headers = {"Cache-Control": PREVIEW_CACHE_CONTROL}
+    if checksum:
+        etag = strong_etag(checksum)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified_response(etag)
+        headers["ETag"] = etag
+
+    return FileResponse(
+        path=file_path,
+        media_type=media_type,
+        filename=filename,
+        headers=headers,
+        content_disposition_type="inline",
+    )
+
+
+# ============================================
+# THUMBNAIL RENDER
+# ============================================
+
+def render_thumbnail(source_path: str, media_type: str, max_size: int = THUMBNAIL_MAX_SIZE) -> Optional[bytes]:
+    """
+    PDF'in ilk sayfasını veya görseli JPEG thumbnail'e çevirir.
+
+    Returns:
+        JPEG byte'ları; tip desteklenmiyorsa veya kütüphane yoksa None
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    if media_type == PDF_MEDIA_TYPE:
+        try:
+            import pypdfium2 as pdfium
+        except ImportError:
+            return None
+        pdf = pdfium.PdfDocument(source_path)
+        try:
+            page = pdf[0]
+            width, height = page.get_size()
+            # Uzun kenar max_size olacak şekilde ölçekle (1pt = 1/72 inch)
+            scale = max_size / max(width, height, 1)
+            image = page.render(scale=scale).to_pil()
+            page.close()
+        finally:
+            pdf.close()
+    elif media_type in IMAGE_MEDIA_TYPES:
+        image = Image.open(source_path)
+        image.draft("RGB", (max_size, max_size))  # JPEG'de düşük çözünürlükte decode
+    else:
+        return None
+
+    image = image.convert("RGB")
+    image.thumbnail((max_size, max_size))
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+    return output.getvalue()
+
+
+# ============================================
+# THUMBNAIL CACHE (disk, LRU)
+# ============================================
+
+class ThumbnailCache:
+    """
+    Disk üzerinde boyut sınırlı LRU thumbnail cache'i.
+
+    Erişim sırası bellekte (OrderedDict) tutulur; açılışta dizindeki dosyalar
+    mtime sırasıyla yüklenir. Okunan dosyanın mtime'ı güncellenir, böylece
+    süreç yeniden başlasa da LRU sırası korunur.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.cache_dir.exists():
+            return
+        files = sorted(self.cache_dir.glob("*.jpg"), key=lambda p: p.stat().st_mtime)
+        for path in files:
+            size = path.stat().st_size
+            self._entries[path.name] = size
+            self._total_bytes += size
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.jpg"
+
+    def get(self, key: str) -> Optional[Path]:
+        """Cache'teki thumbnail yolunu döner (yoksa None) ve LRU sırasını günceller."""
+        path = self.path_for(key)
+        with self._lock:
+            self._load()
+            if path.name not in self._entries:
+                return None
+            if not path.exists():
+                self._total_bytes -= self._entries.pop(path.name)
+                return None
+            self._entries.move_to_end(path.name)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def put(self, key: str, data: bytes) -> Path:
+        """Thumbnail'i atomik olarak yazar ve gerekirse eski kayıtları siler."""
+        path = self.path_for(key)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._load()
+            previous = self._entries.pop(path.name, 0)
+            self._entries[path.name] = len(data)
+            self._total_bytes += len(data) - previous
+            self._evict()
+        return path
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                (self.cache_dir / name).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._load()
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+class ThumbnailService:
+    """Thumbnail'leri arka planda üreten ve cache'ten sunan servis."""
+
+    def __init__(self, cache: ThumbnailCache, max_size: int = THUMBNAIL_MAX_SIZE,
+                 failure_ttl: float = THUMBNAIL_FAILURE_TTL):
+        self.cache = cache
+        self.max_size = max_size
+        self.failure_ttl = failure_ttl
+        self._pending: Set[str] = set()
+        self._failures: Dict[str, float] = {}  # anahtar -> negatif kaydın bitişi (monotonic)
+        self._lock = threading.Lock()
+
+    def cache_key(self, checksum: str) -> str:
+        return f"{checksum}_{self.max_size}"
+
+    @staticmethod
+    def supports(media_type: str) -> bool:
+        return media_type == PDF_MEDIA_TYPE or media_type in IMAGE_MEDIA_TYPES
+
+    def is_pending(self, checksum: str) -> bool:
+        with self._lock:
+            return self.cache_key(checksum) in self._pending
+
+    def _failure_remaining(self, key: str) -> float:
+        """Negatif kaydın kalan süresi (saniye; yoksa/dolduysa 0). Kilit altında çağrılır."""
+        expires_at = self._failures.get(key)
+        if expires_at is None:
+            return 0.0
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            del self._failures[key]
+            return 0.0
+        return remaining
+
+    def _record_failure(self, key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for stale in [k for k, expires_at in self._failures.items() if expires_at <= now]:
+                del self._failures[stale]
+            self._failures[key] = now + self.failure_ttl
+
+    def generate(self, source_path: str, media_type: str, checksum: str) -> Optional[Path]:
+        """Thumbnail'i üretip cache'e yazar (background task gövdesi)."""
+        key = self.cache_key(checksum)
+        try:
+            existing = self.cache.get(key)
+            if existing:
+                return existing
+            data = render_thumbnail(source_path, media_type, self.max_size)
+            if data is None:
+                self._record_failure(key)
+                return None
+            return self.cache.put(key, data)
+        except Exception as exc:
+            logger.warning(f"Thumbnail üretilemedi: {source_path} ({exc})")
+            self._record_failure(key)
+            return None
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def schedule(self, background_tasks: BackgroundTasks, source_path: str, media_type: str, checksum: str) -> bool:
+        """Thumbnail üretimini kuyruğa ekler; zaten cache'te/kuyrukta ise veya yakın zamanda başarısız olduysa eklemez."""
+        if not self.supports(media_type):
+            return False
+        key = self.cache_key(checksum)
+        with self._lock:
+            if key in self._pending:
+                return True
+            if self._failure_remaining(key):
+                return False
+            if self.cache.get(key):
+                return False
+            self._pending.add(key)
+        background_tasks.add_task(self.generate, source_path, media_type, checksum)
+        return True
+
+    def response(
+        self,
+        request: Request,
+        background_tasks: BackgroundTasks,
+        source_path: str,
+        media_type: str,
+        checksum: str,
+    ) -> Response:
+        """
+        Thumbnail yanıtı: cache'te varsa dosya (ETag/304), yoksa üretimi
+        başlatıp 202 + Retry-After döner. Desteklenmeyen tipte 415; üretim
+        yakın zamanda başarısız olduysa negatif kayıt süresince 404.
+        """
+        if not self.supports(media_type):
+            return Response(status_code=415)
+
+        etag = strong_etag(self.cache_key(checksum))
+        cached = self.cache.get(self.cache_key(checksum))
+        if cached:
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return not_modified_response(etag, THUMBNAIL_CACHE_CONTROL)
+            return FileResponse(
+                path=str(cached),
+                media_type=THUMBNAIL_MEDIA_TYPE,
+                headers={"ETag": etag, "Cache-Control": THUMBNAIL_CACHE_CONTROL},
+            )
+
+        with self._lock:
+            failure_remaining = self._failure_remaining(self.cache_key(checksum))
+        if failure_remaining:
+            return Response(status_code=404, headers={"Cache-Control": f"private, max-age={int(failure_remaining)}"})
+
+        self.schedule(background_tasks, source_path, media_type, checksum)
+        return Response(status_code=202, headers={"Retry-After": "2"})
+
+
+thumbnail_service = ThumbnailService(
+    ThumbnailCache(
+        cache_dir=os.getenv("THUMBNAIL_CACHE_DIR", "uploads/.thumbnails"),
+        max_bytes=int(os.getenv("THUMBNAIL_CACHE_MAX_MB", "256")) * 1024 * 1024,
+    )
+)
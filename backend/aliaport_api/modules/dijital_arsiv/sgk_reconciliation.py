@@ -0,0 +1,217 @@
+"""
+SGK HİZMET DÖKÜMÜ - Toplu Mutabakat
+
+Hizmet dökümünden okunan TC listesi firmanın çalışanlarıyla küme işlemleriyle
+karşılaştırılır ve sonuç satır satır ORM nesnesi yerine toplu statement'larla
+yazılır:
+
+- new:     Dökümde olup sistemde olmayan TC'ler -> tek bulk INSERT (portal_employee)
+- matched: Dökümde ve sistemde olan TC'ler
+- missing: Sistemde olup dökümde olmayan çalışanlar
+- extra:   Dökümde olup hiçbir çalışana eşlenemeyen TC'ler (yeniler eklendiği
+           için normalde boştur; geçmiş dönem içe aktarımında bilinmeyen
+           TC'ler çalışan olarak eklenmez ve burada raporlanır)
+
+Dönem kayıtları (portal_employee_sgk_period) mevcutsa PK ile executemany UPDATE,
+yoksa tek bulk INSERT ile yazılır. Firma başına sorgu sayısı çalışan sayısından
+bağımsızdır. Fonksiyon commit etmez; çağıran endpoint aynı transaction'da
+SgkPeriodCheck kaydını ekler.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+
+from ..sgk.models import SgkPeriodCheck
+from ..sgk.parse_store import get_parse_result
+from .models import PortalEmployee, PortalEmployeeSgkPeriod
+
+SGK_PERIOD_SOURCE = "HIZMET_LISTESI"
+
+
+@dataclass
+class SgkReconciliation:
+    """Hizmet dökümü mutabakat sonucu"""
+    new_tcs: Set[str]
+    matched_tcs: Set[str]
+    missing_employee_ids: Set[int]
+    extra_tcs: Set[str]
+    employee_count: int
+
+    @property
+    def new_employees_added(self) -> int:
+        return len(self.new_tcs)
+
+    @property
+    def matched_employee_count(self) -> int:
+        # Yeni eklenen çalışanlar da dökümde olduğu için eşleşmiş sayılır
+        return len(self.matched_tcs) + len(self.new_tcs)
+
+    @property
+    def missing_employee_count(self) -> int:
+        return max(self.employee_count - self.matched_employee_count, 0)
+
+    @property
+    def extra_in_sgk_count(self) -> int:
+        return len(self.extra_tcs)
+
+
+def reconcile_sgk_employees(
+    db: Session,
+    cari_id: int,
+    period: str,
+    sgk_employees: Dict[str, str],
+    update_legacy_fields: bool = True,
+) -> SgkReconciliation:
+    """
+    Firmanın çalışanlarını SGK hizmet dökümüyle eşitler (commit etmez).
+
+    Args:
+        cari_id: Firma
+        period: Dönem ('YYYYMM')
+        sgk_employees: Dökümden okunan {tc_no: ad_soyad}
+        update_legacy_fields: sgk_last_check_period / sgk_is_active_last_period
+            güncellensin ve bilinmeyen TC'ler çalışan olarak eklensin mi.
+            Firmanın en güncel döneminden eski dökümler için False verilir:
+            geçmiş çalışanlar aktif kayıt olarak geri gelmez.
+    """
+    now = datetime.utcnow()
+    period_code = f"{period[:4]}-{period[4:]}"
+    sgk_tc_set = set(sgk_employees)
+
+    # Yalnızca (id, tc) okunur; aynı TC'li birden fazla kayıt varsa son id kazanır
+    employee_rows = (
+        db.query(PortalEmployee.id, PortalEmployee.tc_kimlik)
+        .filter(PortalEmployee.cari_id == cari_id)
+        .order_by(PortalEmployee.id)
+        .all()
+    )
+    tc_to_id: Dict[str, int] = {}
+    for employee_id, tc_kimlik in employee_rows:
+        tc_value = (tc_kimlik or "").strip()
+        if tc_value:
+            tc_to_id[tc_value] = employee_id
+
+    new_tcs = sgk_tc_set - tc_to_id.keys() if update_legacy_fields else set()
+    matched_tcs = sgk_tc_set & tc_to_id.keys()
+    matched_ids = {tc_to_id[tc] for tc in matched_tcs}
+    missing_employee_ids = {employee_id for employee_id, _ in employee_rows} - matched_ids
+
+    if update_legacy_fields:
+        # Eski alanlar (geriye dönük uyumluluk): tüm firma tek UPDATE, eşleşenler PK ile
+        db.execute(
+            update(PortalEmployee)
+            .where(PortalEmployee.cari_id == cari_id)
+            .values(sgk_last_check_period=period, sgk_is_active_last_period=False)
+            .execution_options(synchronize_session=False)
+        )
+        # Aynı TC'li mükerrer kayıtlar da aktif işaretlenir (eski davranış)
+        active_ids = [
+            employee_id
+            for employee_id, tc_kimlik in employee_rows
+            if (tc_kimlik or "").strip() in matched_tcs
+        ]
+        if active_ids:
+            db.execute(
+                update(PortalEmployee),
+                [{"id": employee_id, "sgk_is_active_last_period": True} for employee_id in active_ids],
+            )
+
+    # Yeni çalışanlar: tek bulk INSERT, id'ler RETURNING ile alınır
+    if new_tcs:
+        inserted = db.execute(
+            insert(PortalEmployee).returning(PortalEmployee.id, PortalEmployee.tc_kimlik),
+            [
+                {
+                    "cari_id": cari_id,
+                    "full_name": (sgk_employees.get(tc_no) or "").strip(),
+                    "tc_kimlik": tc_no,
+                    "nationality": "TUR",
+                    "is_active": True,
+                    "sgk_last_check_period": period,
+                    "sgk_is_active_last_period": True,
+                    "created_at": now,
+                }
+                for tc_no in sorted(new_tcs)
+            ],
+        )
+        for employee_id, tc_kimlik in inserted:
+            tc_to_id[tc_kimlik] = employee_id
+
+    # Dönem kayıtları: mevcutlar PK ile güncellenir, eksikler tek INSERT ile eklenir
+    period_employee_ids = {tc_to_id[tc] for tc in matched_tcs | new_tcs}
+    existing_periods = (
+        db.query(PortalEmployeeSgkPeriod.id, PortalEmployeeSgkPeriod.employee_id)
+        .join(PortalEmployee, PortalEmployee.id == PortalEmployeeSgkPeriod.employee_id)
+        .filter(
+            PortalEmployee.cari_id == cari_id,
+            PortalEmployeeSgkPeriod.period_code == period_code,
+        )
+        .all()
+    )
+    existing_periods = [(pid, eid) for pid, eid in existing_periods if eid in period_employee_ids]
+    if existing_periods:
+        db.execute(
+            update(PortalEmployeeSgkPeriod),
+            [
+                {"id": period_id, "is_active": True, "source": SGK_PERIOD_SOURCE, "updated_at": now}
+                for period_id, _ in existing_periods
+            ],
+        )
+    missing_period_ids = period_employee_ids - {employee_id for _, employee_id in existing_periods}
+    if missing_period_ids:
+        db.execute(
+            insert(PortalEmployeeSgkPeriod),
+            [
+                {
+                    "employee_id": employee_id,
+                    "period_code": period_code,
+                    "is_active": True,
+                    "source": SGK_PERIOD_SOURCE,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for employee_id in sorted(missing_period_ids)
+            ],
+        )
+
+    return SgkReconciliation(
+        new_tcs=new_tcs,
+        matched_tcs=matched_tcs,
+        missing_employee_ids=missing_employee_ids,
+        extra_tcs=sgk_tc_set - tc_to_id.keys(),
+        employee_count=len(employee_rows) + len(new_tcs),
+    )
+
+
+def latest_ok_period(db: Session, cari_id: int) -> str:
+    """Firmanın başarılı (OK) SGK kontrolü olan en güncel dönemi; yoksa boş string"""
+    return (
+        db.query(func.max(SgkPeriodCheck.period))
+        .filter(SgkPeriodCheck.firma_id == cari_id, SgkPeriodCheck.status == "OK")
+        .scalar()
+    ) or ""
+
+
+def rereconcile_period_check(db: Session, period_check: SgkPeriodCheck) -> Optional[SgkReconciliation]:
+    """
+    Geçmiş bir yüklemeyi PDF'i okumadan, saklanan parse sonucuyla yeniden eşitler.
+
+    SgkPeriodCheck sayımları güncellenir; commit etmez. Checksum için parse
+    sonucu yoksa (eski kayıt, parser sürümü değişmiş) None döner. Firmanın daha
+    yeni bir OK kontrolü varsa eski alanlar güncellenmez ve çalışan eklenmez.
+    """
+    parsed = get_parse_result(db, period_check.checksum)
+    if parsed is None:
+        return None
+    update_legacy_fields = period_check.period >= latest_ok_period(db, period_check.firma_id)
+    result = reconcile_sgk_employees(
+        db, period_check.firma_id, period_check.period, parsed.employees, update_legacy_fields=update_legacy_fields
+    )
+    period_check.matched_employee_count = result.matched_employee_count
+    period_check.missing_employee_count = result.missing_employee_count
+    period_check.extra_in_sgk_count = result.extra_in_sgk_count
+    return result
@@ -3,12 +3,13 @@ from __future__ import annotations
 
 from datetime import datetime, date, timedelta
 from enum import Enum
-from typing import Iterable, Optional, Sequence
+from typing import Dict, Iterable, Optional, Sequence
 import requests
 
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
-from .models import PortalEmployee, PortalEmployeeDocument, PortalEmployeeSgkPeriod
+from .models import PortalEmployee, PortalEmployeeDocument, PortalEmployeeSgkPeriod, PortalEmployeeSgkStatus
 
 SGK_HIRE_DOCUMENT_TYPES = {"SGK_ISE_GIRIS", "SGK_GIRIS"}
 
@@ -97,6 +98,14 @@ def get_active_sgk_period(today: Optional[date] = None) -> str:
     return f"{ref.year}-{ref.month:02d}"
 
 
+def normalize_period_code(value: Optional[str]) -> str:
+    """Dönem kodunu 'YYYY-MM' formatına çevirir (eski alanlar 'YYYYMM' tutar)."""
+    value = (value or "").strip()
+    if len(value) == 6 and value.isdigit():
+        return f"{value[:4]}-{value[4:]}"
+    return value
+
+
 def get_employee_period_status(
     db: Session,
     employee_id: int,
@@ -137,7 +146,7 @@ def _compute_base_status(
         return EmployeeSgkStatus.TAM
     
     # 2) Eski alanlardan kontrol et (geriye dönük uyumluluk)
-    last_period = (employee.sgk_last_check_period or "").strip()
+    last_period = normalize_period_code(employee.sgk_last_check_period)
     if last_period and employee.sgk_is_active_last_period and last_period >= required_period:
         return EmployeeSgkStatus.TAM
     
@@ -197,7 +206,23 @@ def compute_employee_sgk_status(
 
     # Aktif SGK dönemini hesapla (26'sı kuralı + resmi tatil kontrolü)
     today = reference_date.date() if reference_date else date.today()
-    required_period = get_active_sgk_period(today)
+    return compute_sgk_status_for_period(
+        db,
+        employee,
+        get_active_sgk_period(today),
+        prefetched_periods=prefetched_periods,
+        prefetched_documents=prefetched_documents,
+    )
+
+
+def compute_sgk_status_for_period(
+    db: Session,
+    employee: PortalEmployee,
+    required_period: str,
+    prefetched_periods: Optional[Sequence[PortalEmployeeSgkPeriod]] = None,
+    prefetched_documents: Optional[Iterable[PortalEmployeeDocument]] = None,
+) -> EmployeeSgkStatus:
+    """compute_employee_sgk_status ile aynı kurallar, dönem ('YYYY-MM') doğrudan verilir."""
     base_status = _compute_base_status(
         employee,
         required_period,
@@ -233,10 +258,217 @@ def compute_employee_sgk_status(
     return base_status
 
 
+# ============================================
+# MATERIALIZE EDİLMİŞ DURUM (portal_employee_sgk_status)
+# ============================================
+#
+# Liste ve iş emri guard'ı durumu hesaplamak yerine tablodan okur
+# (cari_id, period_code, status) index'i. Tabloda olmayan satırlar ilk
+# okumada hesaplanıp çağıranın transaction'ına yazılır; değişiklik noktaları
+# refresh_sgk_status ile ilgili çalışanların satırlarını yeniler. Commit
+# yalnızca yazma endpoint'leri ve dönem devri job'u tarafından yapılır.
+
+MATERIALIZE_BATCH_SIZE = 500
+
+
+def _status_upsert(db: Session):
+    """
+    (employee_id, period_code) çakışmasında satırı güncelleyen INSERT.
+
+    Aynı firma/dönemi ilk kez okuyan iki istek aynı satırları yazabilir;
+    düz INSERT uq_portal_emp_sgk_status_emp_period ile IntegrityError verirdi.
+    """
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(PortalEmployeeSgkStatus)
+    return stmt.on_conflict_do_update(
+        index_elements=[PortalEmployeeSgkStatus.employee_id, PortalEmployeeSgkStatus.period_code],
+        set_={
+            "cari_id": stmt.excluded.cari_id,
+            "status": stmt.excluded.status,
+            "computed_at": stmt.excluded.computed_at,
+        },
+    )
+
+
+def _materialize(
+    db: Session,
+    employees: Sequence[PortalEmployee],
+    period_code: str,
+) -> Dict[int, EmployeeSgkStatus]:
+    """
+    Çalışanların dönem durumunu toplu hesaplayıp tabloya yazar (commit etmez).
+
+    Dönem kayıtları ve güncel işe giriş bildirgeleri tek IN sorgusuyla okunur;
+    satırlar tek upsert ile yazılır (mevcutlar güncellenir).
+    """
+    if not employees:
+        return {}
+    employee_ids = [emp.id for emp in employees]
+
+    periods: Dict[int, list] = {emp_id: [] for emp_id in employee_ids}
+    for record in db.query(PortalEmployeeSgkPeriod).filter(
+        PortalEmployeeSgkPeriod.employee_id.in_(employee_ids),
+        PortalEmployeeSgkPeriod.period_code == period_code,
+    ):
+        periods[record.employee_id].append(record)
+
+    documents: Dict[int, list] = {emp_id: [] for emp_id in employee_ids}
+    for doc in db.query(PortalEmployeeDocument).filter(
+        PortalEmployeeDocument.employee_id.in_(employee_ids),
+        PortalEmployeeDocument.document_type.in_(SGK_HIRE_DOCUMENT_TYPES),
+        PortalEmployeeDocument.is_latest_version == True,  # noqa: E712
+    ):
+        documents[doc.employee_id].append(doc)
+
+    statuses = {
+        emp.id: compute_sgk_status_for_period(
+            db,
+            emp,
+            period_code,
+            prefetched_periods=periods[emp.id],
+            prefetched_documents=documents[emp.id],
+        )
+        for emp in employees
+    }
+
+    now = datetime.utcnow()
+    db.execute(
+        _status_upsert(db),
+        [
+            {
+                "employee_id": emp.id,
+                "cari_id": emp.cari_id,
+                "period_code": period_code,
+                "status": statuses[emp.id].value,
+                "computed_at": now,
+            }
+            for emp in employees
+        ],
+    )
+    return statuses
+
+
+def get_sgk_status_map(
+    db: Session,
+    employees: Sequence[PortalEmployee],
+    period_code: Optional[str] = None,
+) -> Dict[int, EmployeeSgkStatus]:
+    """
+    Çalışanların materialize edilmiş durumunu döner (tek indexed sorgu).
+
+    Tabloda karşılığı olmayan çalışanlar (yeni dönem, yeni kayıt) hesaplanıp
+    çağıranın transaction'ına yazılır; commit etmez. Okuma endpoint'lerinde
+    yazılanlar istek sonunda geri alınır, kalıcı satırları job ve yazma
+    noktaları üretir.
+    """
+    if not employees:
+        return {}
+    period_code = period_code or get_active_sgk_period()
+    employee_ids = [emp.id for emp in employees]
+
+    statuses = {
+        employee_id: EmployeeSgkStatus(status)
+        for employee_id, status in db.query(
+            PortalEmployeeSgkStatus.employee_id, PortalEmployeeSgkStatus.status
+        ).filter(
+            PortalEmployeeSgkStatus.employee_id.in_(employee_ids),
+            PortalEmployeeSgkStatus.period_code == period_code,
+        )
+    }
+
+    missing = [emp for emp in employees if emp.id not in statuses]
+    if missing:
+        for start in range(0, len(missing), MATERIALIZE_BATCH_SIZE):
+            statuses.update(_materialize(db, missing[start:start + MATERIALIZE_BATCH_SIZE], period_code))
+    return statuses
+
+
+def refresh_sgk_status(
+    db: Session,
+    employee_ids: Optional[Sequence[int]] = None,
+    cari_id: Optional[int] = None,
+    period_code: Optional[str] = None,
+) -> Dict[int, EmployeeSgkStatus]:
+    """
+    Durumu etkileyen bir değişiklikten sonra (SGK dökümü, işe giriş belgesi,
+    çalışan SGK alanları) ilgili çalışanların satırlarını yeniler. Commit etmez.
+
+    Tüm dönemlere ait eski satırlar silinir (diğer dönemler ilk okumada yeniden
+    hesaplanır), aktif dönem hemen hesaplanır.
+
+    Args:
+        employee_ids: Belirli çalışanlar
+        cari_id: Firmanın tüm çalışanları (SGK hizmet dökümü yüklemesi)
+
+    Returns:
+        {employee_id: aktif dönem durumu}
+    """
+    if employee_ids is None and cari_id is None:
+        raise ValueError("employee_ids veya cari_id verilmelidir")
+    period_code = period_code or get_active_sgk_period()
+
+    stale = db.query(PortalEmployeeSgkStatus)
+    employees = db.query(PortalEmployee)
+    if employee_ids is not None:
+        employee_ids = list(employee_ids)
+        if not employee_ids:
+            return {}
+        stale = stale.filter(PortalEmployeeSgkStatus.employee_id.in_(employee_ids))
+        employees = employees.filter(PortalEmployee.id.in_(employee_ids))
+    if cari_id is not None:
+        stale = stale.filter(PortalEmployeeSgkStatus.cari_id == cari_id)
+        employees = employees.filter(PortalEmployee.cari_id == cari_id)
+    stale.delete(synchronize_session=False)
+
+    employees = employees.order_by(PortalEmployee.id).all()
+    statuses: Dict[int, EmployeeSgkStatus] = {}
+    for start in range(0, len(employees), MATERIALIZE_BATCH_SIZE):
+        statuses.update(_materialize(db, employees[start:start + MATERIALIZE_BATCH_SIZE], period_code))
+    return statuses
+
+
+def recompute_sgk_status(
+    db: Session,
+    period_code: Optional[str] = None,
+    batch_size: int = MATERIALIZE_BATCH_SIZE,
+) -> int:
+    """
+    Aktif çalışanların dönem durumunu toplu hesaplar (dönem devri job'u).
+    Çalışanlar id sırasıyla batch'ler halinde okunur, her batch ayrı commit edilir.
+
+    Returns:
+        Hesaplanan çalışan sayısı
+    """
+    period_code = period_code or get_active_sgk_period()
+    employee_query = db.query(PortalEmployee).filter(PortalEmployee.is_active == True)  # noqa: E712
+
+    processed = 0
+    last_id = 0
+    while True:
+        batch = (
+            employee_query.filter(PortalEmployee.id > last_id)
+            .order_by(PortalEmployee.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+        _materialize(db, batch, period_code)
+        db.commit()
+        processed += len(batch)
+    return processed
+
+
 __all__ = [
     "EmployeeSgkStatus",
     "compute_employee_sgk_status",
+    "compute_sgk_status_for_period",
     "get_active_sgk_period",
+    "get_sgk_status_map",
+    "normalize_period_code",
+    "recompute_sgk_status",
+    "refresh_sgk_status",
     "HolidayClient",
     "SGK_HIRE_DOCUMENT_TYPES"
 ]
@@ -3,10 +3,12 @@ ARAÇ EVRAK YÖNETİMİ - Helper Functions
 Araç belgelerinin durum hesaplama ve otomatik oluşturma fonksiyonları
 """
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import datetime, date
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from .models import VehicleDocument, VehicleDocumentType, PortalVehicle
+from ...core.cache import cache, cache_key, cached_get_or_set
 
 
 # Zorunlu evrak tipleri tek yerde tutulur ki eksikse otomatik eklensin
@@ -73,6 +75,7 @@ def create_default_vehicle_documents(db: Session, vehicle_id: int) -> None:
             db.add(new_doc)
     
     db.commit()
+    invalidate_vehicle_document_stats()
 
 
 def compute_vehicle_status(db: Session, vehicle_id: int) -> str:
@@ -164,3 +167,93 @@ def check_document_expiry(db: Session) -> None:
     
     if expired_docs:
         db.commit()
+        invalidate_vehicle_document_stats()
+
+
+# ============================================
+# İSTATİSTİK (tek gruplu sorgu + cache)
+# ============================================
+
+VEHICLE_DOCUMENT_STATUSES = ("PENDING", "APPROVED", "REJECTED", "EXPIRED", "MISSING")
+VEHICLE_DOCUMENT_STATS_GROUPS = ("firma", "doc_type")
+VEHICLE_DOCUMENT_STATS_CACHE_PREFIX = "vehicle_documents:stats"
+VEHICLE_DOCUMENT_STATS_TTL = 300  # saniye; onay/red/yüklemede zaten invalidate edilir
+
+
+def _empty_status_counts() -> Dict[str, int]:
+    counts = {status.lower(): 0 for status in VEHICLE_DOCUMENT_STATUSES}
+    counts["total"] = 0
+    return counts
+
+
+def _add_count(counts: Dict[str, int], status: str, count: int) -> None:
+    key = (status or "MISSING").lower()
+    counts[key] = counts.get(key, 0) + count
+    counts["total"] += count
+
+
+def compute_vehicle_document_stats(db: Session, group_by: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Araç evrak durum sayılarını tek GROUP BY sorgusuyla hesaplar
+
+    Args:
+        db: Database session
+        group_by: None (yalnızca toplamlar), "firma" (cari_id) veya "doc_type" (evrak tipi kodu)
+
+    Returns:
+        {"pending": .., "approved": .., ..., "total": .., "groups": [...]}
+        groups yalnızca group_by verildiğinde döner; her eleman aynı sayaçları
+        ve grup anahtarını (cari_id / doc_type_code) içerir.
+    """
+    if group_by is not None and group_by not in VEHICLE_DOCUMENT_STATS_GROUPS:
+        raise ValueError(f"Geçersiz group_by: {group_by}")
+
+    count = func.count(VehicleDocument.id)
+    if group_by == "firma":
+        group_column = PortalVehicle.cari_id
+        query = db.query(group_column, VehicleDocument.status, count).join(
+            PortalVehicle, VehicleDocument.vehicle_id == PortalVehicle.id
+        )
+        group_key = "cari_id"
+    elif group_by == "doc_type":
+        group_column = VehicleDocumentType.code
+        query = db.query(group_column, VehicleDocument.status, count).join(
+            VehicleDocumentType, VehicleDocument.doc_type_id == VehicleDocumentType.id
+        )
+        group_key = "doc_type_code"
+    else:
+        rows = db.query(VehicleDocument.status, count).group_by(VehicleDocument.status).all()
+        totals = _empty_status_counts()
+        for status, status_count in rows:
+            _add_count(totals, status, status_count)
+        return totals
+
+    rows = query.group_by(group_column, VehicleDocument.status).all()
+
+    totals = _empty_status_counts()
+    groups: Dict[Any, Dict[str, int]] = {}
+    for key, status, status_count in rows:
+        _add_count(totals, status, status_count)
+        if key not in groups:
+            groups[key] = {group_key: key, **_empty_status_counts()}
+        _add_count(groups[key], status, status_count)
+
+    totals["groups"] = sorted(groups.values(), key=lambda g: (g[group_key] is None, g[group_key]))
+    return totals
+
+
+def get_vehicle_document_stats(db: Session, group_by: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+    """
+    Cache'li istatistik. Returns: (stats, cache_hit)
+    """
+    key = cache_key(VEHICLE_DOCUMENT_STATS_CACHE_PREFIX, group_by=group_by or "none")
+    return cached_get_or_set(
+        key,
+        ttl_seconds=VEHICLE_DOCUMENT_STATS_TTL,
+        fetcher=lambda: compute_vehicle_document_stats(db, group_by),
+    )
+
+
+def invalidate_vehicle_document_stats() -> int:
+    """Evrak durumu değiştiğinde (yükleme, onay, red, süre dolumu) cache'i temizler."""
+    return cache.invalidate(VEHICLE_DOCUMENT_STATS_CACHE_PREFIX)
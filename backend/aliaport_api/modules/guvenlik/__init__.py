@@ -2,7 +2,10 @@
 GÜVENLİK MODÜLÜ - Package Init
 """
 
-from .router import router
+from ...core.lazy_import import lazy_exports
+
+# Router ilk erişimde yüklenir (models import'u router zincirini tetiklemez)
+__getattr__ = lazy_exports(globals(), router=".router:router")
 from .models import GateLog, GateChecklistItem
 from .schemas import (
     GateLogCreate, GateLogCreateWithException, GateLogResponse,
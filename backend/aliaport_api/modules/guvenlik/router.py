@@ -12,6 +12,7 @@ import hashlib
 from ...config.database import get_db
 from ...core.responses import success_response, error_response, paginated_response
 from ...core.error_codes import ErrorCode, get_http_status_for_error
+from ...core.metrics import GATE_LOGS_TOTAL
 from .models import GateLog, GateChecklistItem
 from .schemas import (
     GateLogCreate, GateLogCreateWithException, GateLogResponse,
@@ -148,6 +149,7 @@ def create_gate_log(log_data: GateLogCreate, db: Session = Depends(get_db)):
     db.add(new_log)
     db.commit()
     db.refresh(new_log)
+    GATE_LOGS_TOTAL.labels(new_log.entry_type).inc()
     
     log_response = GateLogResponse.model_validate(new_log)
     return success_response(data=log_response, message="GateLog oluşturuldu")
@@ -167,6 +169,7 @@ def create_gate_log_with_exception(log_data: GateLogCreateWithException, db: Ses
     db.add(new_log)
     db.commit()
     db.refresh(new_log)
+    GATE_LOGS_TOTAL.labels(new_log.entry_type).inc()
     
     log_response = GateLogResponse.model_validate(new_log)
     return success_response(data=log_response, message="İstisna ile GateLog oluşturuldu")
@@ -367,6 +370,7 @@ def vehicle_entry(entry_data: VehicleEntryRequest, db: Session = Depends(get_db)
     db.add(new_log)
     db.commit()
     db.refresh(new_log)
+    GATE_LOGS_TOTAL.labels(new_log.entry_type).inc()
     
     log_response = GateLogResponse.model_validate(new_log)
     return success_response(data=log_response, message="Araç giriş kaydı oluşturuldu")
@@ -410,19 +414,26 @@ def vehicle_exit(exit_data: VehicleExitRequest, db: Session = Depends(get_db)):
     # Çıkış zamanını kaydet
     entry_log.exit_time = exit_data.exit_time
     
-    # Süre hesapla (dakika)
+    needs_extra_charge = False
+    
+    # Süre hesapla (dakika) - 4 saat kuralı isemri.overtime ile ortak
     if entry_log.entry_time:
-        delta = exit_data.exit_time - entry_log.entry_time
-        duration_minutes = int(delta.total_seconds() / 60)
-        entry_log.duration_minutes = duration_minutes
+        from ..isemri.overtime import price_vehicle_overtime, resolve_vehicle_4h_tariff, vehicle_overtime_for
         
-        # 4 saat kuralı hesaplaması
-        base_minutes = entry_log.base_charge_hours * 60
-        extra_minutes = max(0, duration_minutes - base_minutes)
-        entry_log.extra_minutes = extra_minutes
+        overtime = vehicle_overtime_for(
+            entry_log.id, entry_log.work_order_id, entry_log.wo_number, entry_log.vehicle_plate,
+            entry_log.entry_time, exit_data.exit_time, entry_log.base_charge_hours
+        )
+        # Ek süre varsa VEHICLE_4H_RULE tarifesiyle fiyatla (tarife yoksa yalnızca dakika kaydedilir)
+        tariff = resolve_vehicle_4h_tariff(db) if overtime.needs_extra_charge else None
+        if tariff:
+            price_vehicle_overtime(overtime, tariff)
+        entry_log.duration_minutes = overtime.duration_minutes
+        entry_log.extra_minutes = overtime.extra_minutes
+        if overtime.extra_charge is not None:
+            entry_log.extra_charge_calculated = overtime.extra_charge
         
-        # Ek ücret hesaplanacaksa (fiyat motoru ile hesaplanmalı - şimdilik sadece flag)
-        needs_extra_charge = extra_minutes > 0
+        needs_extra_charge = overtime.needs_extra_charge
         
         if exit_data.notes:
             entry_log.notes = (entry_log.notes or "") + f"\n[Çıkış] {exit_data.notes}"
@@ -1,26 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_
-from typing import List, Optional
+import logging
+from typing import List, Optional, Tuple
 from datetime import date, datetime, timedelta
+from decimal import Decimal
 from ...config.database import get_db
 from ...core import (
     success_response,
     error_response,
-    paginated_response,
+    fast_paginated_response,
     ErrorCode,
     get_http_status_for_error
 )
-from .models import Hizmet, TarifeListesi
+from .models import CalculationType, Hizmet, TarifeListesi
 from ..tarife.models import PriceListItem
 from .schemas import (
     HizmetResponse, 
     HizmetCreate, 
     HizmetUpdate,
     PriceCalculationRequest,
-    PriceCalculationResponse
+    PriceCalculationResponse,
+    BulkPriceCalculationRequest
 )
 from .pricing_engine import PricingEngine
+from .tariff_index import TariffEntry, tariff_index
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -62,11 +68,10 @@ def get_all_hizmetler(
         offset = (page - 1) * page_size
         items = query.order_by(Hizmet.Kod).offset(offset).limit(page_size).all()
         
-        # Convert to Pydantic models and then to dicts
-        hizmet_list = [HizmetResponse.model_validate(item).model_dump() for item in items]
-        
-        return paginated_response(
-            data=hizmet_list,
+        # ORM -> JSON byte'ları (cache'li şema serializer)
+        return fast_paginated_response(
+            rows=items,
+            schema=HizmetResponse,
             page=page,
             page_size=page_size,
             total=total,
@@ -315,93 +320,14 @@ def calculate_price(payload: PriceCalculationRequest, db: Session = Depends(get_
     # 2. Effective date kontrolü
     effective_date = payload.effective_date or date.today()
     
-    # 3. TarifeListesi'nde override var mı kontrol et
-    tarife_override = None
-    tarife_listesi_id = None
-    
+    # 3. TarifeListesi'nde override var mı kontrol et (bellek içi aralık index'i)
+    tarife = None
     if payload.override_price is None:  # Manuel override yoksa TarifeListesi'ne bak
-        tarife_query = db.query(TarifeListesi).filter(
-            and_(
-                TarifeListesi.HizmetId == hizmet.Id,
-                TarifeListesi.IsActive == True,
-                TarifeListesi.ValidFrom <= effective_date,
-                or_(
-                    TarifeListesi.ValidTo.is_(None),
-                    TarifeListesi.ValidTo >= effective_date
-                )
-            )
-        ).order_by(TarifeListesi.ValidFrom.desc())
-        
-        tarife_record = tarife_query.first()
-        
-        if tarife_record and tarife_record.OverridePrice is not None:
-            tarife_override = tarife_record.OverridePrice
-            tarife_listesi_id = tarife_record.Id
-            override_currency = tarife_record.OverrideCurrency or hizmet.ParaBirimi
+        tarife = tariff_index.lookup(db, hizmet.Id, effective_date)
     
     # 4. Fiyat hesaplama
-    pricing_engine = PricingEngine()
-    
     try:
-        # Override fiyat varsa direkt kullan
-        if payload.override_price is not None:
-            calculated_price = payload.override_price
-            formula_used = "Manual Override"
-            breakdown = {
-                "override_price": float(payload.override_price),
-                "source": "Manual"
-            }
-            currency = payload.override_currency or hizmet.ParaBirimi
-            tarife_override_applied = False
-            
-        elif tarife_override is not None:
-            calculated_price = tarife_override
-            formula_used = "TarifeListesi Override"
-            breakdown = {
-                "override_price": float(tarife_override),
-                "tarife_listesi_id": tarife_listesi_id,
-                "source": "TarifeListesi"
-            }
-            currency = override_currency
-            tarife_override_applied = True
-            
-        else:
-            # Hesaplama metodunu çağır
-            result = pricing_engine.calculate_price(
-                calculation_type=hizmet.CalculationType or "FIXED",
-                base_price=float(hizmet.Fiyat) if hizmet.Fiyat else 0.0,
-                formula_params=hizmet.FormulaParams or {},
-                quantity=payload.quantity,
-                person_count=payload.person_count,
-                multiplier_x=float(payload.multiplier_x) if payload.multiplier_x else None,
-                secondary_value=float(payload.secondary_value) if payload.secondary_value else None,
-                block_size=payload.block_size,
-                total_duration=payload.total_duration,
-                increment_value=float(payload.increment_value) if payload.increment_value else None,
-                vehicle_duration_minutes=payload.vehicle_duration_minutes
-            )
-            
-            calculated_price = result["total"]
-            formula_used = result["formula"]
-            breakdown = result["breakdown"]
-            currency = hizmet.ParaBirimi
-            tarife_override_applied = False
-        
-        # 5. Response oluştur
-        response_data = PriceCalculationResponse(
-            hizmet_id=hizmet.Id,
-            hizmet_kod=hizmet.Kod,
-            hizmet_ad=hizmet.Ad,
-            calculation_type=hizmet.CalculationType or "FIXED",
-            formula_used=formula_used,
-            calculated_price=calculated_price,
-            currency=currency,
-            tarife_override_applied=tarife_override_applied,
-            tarife_listesi_id=tarife_listesi_id,
-            breakdown=breakdown,
-            effective_date=effective_date
-        )
-        
+        response_data = _price_line(hizmet, payload, effective_date, tarife)
         return success_response(
             data=response_data.model_dump(),
             message="Fiyat başarıyla hesaplandı"
@@ -418,17 +344,180 @@ def calculate_price(payload: PriceCalculationRequest, db: Session = Depends(get_
             )
         )
     
-    except Exception as e:
+    except Exception:
+        logger.exception("Fiyat hesaplama hatası | hizmet_id=%s", payload.hizmet_id)
         raise HTTPException(
             status_code=500,
             detail=error_response(
                 code=ErrorCode.INTERNAL_SERVER_ERROR,
                 message="Fiyat hesaplanırken hata oluştu",
-                details={"error": str(e)}
+                details={"hizmet_id": payload.hizmet_id}
             )
         )
 
 
+@router.post("/calculate-price/bulk", response_model=dict)
+def calculate_price_bulk(payload: BulkPriceCalculationRequest, db: Session = Depends(get_db)):
+    """
+    Toplu fiyat hesaplama (ör. geçmiş iş emirlerinin yeniden fiyatlanması)
+    
+    Hizmetler tek IN sorgusuyla, tarifeler tarife index'inden toplu okunur;
+    satır başına sorgu atılmaz. Hatalı satırlar tüm isteği düşürmez, ilgili
+    sonuç `success: false` ve hata koduyla döner.
+    
+    Returns:
+        StandardResponse: {"items": [...], "succeeded": n, "failed": m}
+    """
+    lines = payload.items
+    hizmet_ids = {line.hizmet_id for line in lines}
+    hizmetler = {h.Id: h for h in db.query(Hizmet).filter(Hizmet.Id.in_(hizmet_ids))}
+    
+    today = date.today()
+    effective_dates = [line.effective_date or today for line in lines]
+    lookups = [
+        (index, (line.hizmet_id, effective_dates[index]))
+        for index, line in enumerate(lines)
+        if line.override_price is None and line.hizmet_id in hizmetler and hizmetler[line.hizmet_id].AktifMi
+    ]
+    tariffs = dict(zip(
+        (index for index, _ in lookups),
+        tariff_index.lookup_many(db, [request for _, request in lookups]),
+    ))
+    
+    items = []
+    for index, line in enumerate(lines):
+        hizmet = hizmetler.get(line.hizmet_id)
+        if hizmet is None:
+            items.append(_bulk_error(index, ErrorCode.HIZMET_NOT_FOUND, "Hizmet bulunamadı"))
+            continue
+        if not hizmet.AktifMi:
+            items.append(_bulk_error(index, ErrorCode.HIZMET_INACTIVE, "Bu hizmet aktif değil"))
+            continue
+        try:
+            result = _price_line(hizmet, line, effective_dates[index], tariffs.get(index))
+        except ValueError as e:
+            items.append(_bulk_error(index, ErrorCode.VALIDATION_ERROR, str(e)))
+            continue
+        except Exception:
+            logger.exception("Toplu fiyat hesaplama hatası | satır=%s hizmet_id=%s", index, line.hizmet_id)
+            items.append(_bulk_error(index, ErrorCode.INTERNAL_SERVER_ERROR, "Fiyat hesaplanırken hata oluştu"))
+            continue
+        items.append({"index": index, "success": True, "data": result.model_dump()})
+    
+    succeeded = sum(1 for item in items if item["success"])
+    return success_response(
+        data={"items": items, "succeeded": succeeded, "failed": len(items) - succeeded},
+        message=f"{succeeded}/{len(items)} satır fiyatlandı"
+    )
+
+
+def _bulk_error(index: int, code: ErrorCode, message: str) -> dict:
+    return {"index": index, "success": False, "error": {"code": code.value, "message": message}}
+
+
+def _price_line(
+    hizmet: Hizmet,
+    payload: PriceCalculationRequest,
+    effective_date: date,
+    tarife: Optional[TariffEntry],
+) -> PriceCalculationResponse:
+    """
+    Tek satırın fiyatı: manuel override > TarifeListesi override > PricingEngine
+    
+    Raises:
+        ValueError: Eksik/geçersiz hesaplama parametresi
+    """
+    tarife_listesi_id = None
+    
+    # Override fiyat varsa direkt kullan
+    if payload.override_price is not None:
+        calculated_price = payload.override_price
+        formula_used = "Manual Override"
+        breakdown = {
+            "override_price": float(payload.override_price),
+            "source": "Manual"
+        }
+        currency = payload.override_currency or hizmet.ParaBirimi
+        tarife_override_applied = False
+        
+    elif tarife is not None and tarife.override_price is not None:
+        calculated_price = tarife.override_price
+        tarife_listesi_id = tarife.id
+        formula_used = "TarifeListesi Override"
+        breakdown = {
+            "override_price": float(tarife.override_price),
+            "tarife_listesi_id": tarife_listesi_id,
+            "source": "TarifeListesi"
+        }
+        currency = tarife.override_currency or hizmet.ParaBirimi
+        tarife_override_applied = True
+        
+    else:
+        calculation_type, formula_params, input_data = _engine_input(hizmet, payload)
+        result = PricingEngine.calculate(
+            calculation_type=calculation_type,
+            base_price=Decimal(str(hizmet.Fiyat or 0)),
+            formula_params=formula_params,
+            input_data=input_data,
+            currency=hizmet.ParaBirimi,
+        )
+        
+        calculated_price = result["subtotal"]
+        formula_used = result["calculation_details"]
+        breakdown = result["breakdown"]
+        currency = result["currency"]
+        tarife_override_applied = False
+    
+    return PriceCalculationResponse(
+        hizmet_id=hizmet.Id,
+        hizmet_kod=hizmet.Kod,
+        hizmet_ad=hizmet.Ad,
+        calculation_type=hizmet.CalculationType or "FIXED",
+        formula_used=formula_used,
+        calculated_price=calculated_price,
+        currency=currency,
+        tarife_override_applied=tarife_override_applied,
+        tarife_listesi_id=tarife_listesi_id,
+        breakdown=breakdown,
+        effective_date=effective_date
+    )
+
+
+def _engine_input(hizmet: Hizmet, payload: PriceCalculationRequest) -> Tuple[CalculationType, dict, dict]:
+    """
+    İstek alanlarını PricingEngine.calculate girdisine çevirir.
+    
+    Raises:
+        ValueError: Bilinmeyen hesaplama tipi veya tipin gerektirdiği alan eksik
+    """
+    calculation_type = CalculationType(hizmet.CalculationType or CalculationType.FIXED)
+    formula_params = dict(hizmet.FormulaParams or {})
+    quantity = payload.quantity if payload.quantity is not None else payload.person_count
+    
+    def required(value, field: str):
+        if value is None:
+            raise ValueError(f"{calculation_type.value} hesaplaması için '{field}' gerekli")
+        return value
+    
+    input_data: dict = {}
+    if calculation_type == CalculationType.PER_UNIT:
+        input_data["quantity"] = required(quantity, "quantity")
+    elif calculation_type == CalculationType.X_SECONDARY:
+        input_data[formula_params.get("primary_field", "weight")] = required(payload.multiplier_x, "multiplier_x")
+        input_data[formula_params.get("secondary_field", "days")] = required(payload.secondary_value, "secondary_value")
+    elif calculation_type == CalculationType.PER_BLOCK:
+        input_data["weight"] = required(quantity, "quantity")
+        input_data["minutes"] = required(payload.total_duration, "total_duration")
+        if payload.block_size:
+            formula_params["base_time_min"] = payload.block_size
+    elif calculation_type == CalculationType.BASE_PLUS_INCREMENT:
+        increment_unit = formula_params.get("increment_unit", "GRT")
+        input_data[increment_unit.lower()] = required(payload.increment_value, "increment_value")
+    elif calculation_type == CalculationType.VEHICLE_4H_RULE:
+        input_data["minutes"] = required(payload.vehicle_duration_minutes, "vehicle_duration_minutes")
+    return calculation_type, formula_params, input_data
+
+
 @router.get("/analytics/pricing-trends")
 def get_pricing_analytics(
     start_date: Optional[str] = Query(None, description="Başlangıç tarihi (YYYY-MM-DD)"),
@@ -606,26 +695,93 @@ def get_pricing_analytics(
         )
 
 
+ANALYTICS_CSV_HEADERS = [
+    "Tarife ID", "Hizmet Kod", "Hizmet Ad", "Hesaplama Tipi", "Geçerlilik Başlangıç",
+    "Geçerlilik Bitiş", "Override Fiyat", "Override Para Birimi", "Override KDV",
+    "Aktif", "Versiyon Notu"
+]
+
+
+def _iter_tariff_export_rows(query):
+    """Tarife export sorgusunu yield_per ile okuyup CSV satırlarına çevirir."""
+    for row in query.execution_options(yield_per=1000):
+        yield [
+            row.Id,
+            row.hizmet_kod,
+            row.hizmet_ad,
+            row.calculation_type.value if row.calculation_type else "FIXED",
+            row.ValidFrom.isoformat() if row.ValidFrom else "",
+            row.ValidTo.isoformat() if row.ValidTo else "",
+            row.OverridePrice if row.OverridePrice is not None else "",
+            row.OverrideCurrency or "",
+            row.OverrideKdvOrani if row.OverrideKdvOrani is not None else "",
+            "Evet" if row.IsActive else "Hayır",
+            row.VersionNote or "",
+        ]
+
+
 @router.get("/analytics/export-csv")
 def export_analytics_csv(
-    start_date: Optional[str] = Query(None),
-    end_date: Optional[str] = Query(None),
-    hizmet_id: Optional[int] = Query(None),
+    start_date: Optional[str] = Query(None, description="Başlangıç tarihi (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Bitiş tarihi (YYYY-MM-DD)"),
+    hizmet_id: Optional[int] = Query(None, description="Hizmet ID filtresi"),
+    calculation_type: Optional[str] = Query(None, description="Hesaplama tipi filtresi"),
     db: Session = Depends(get_db),
 ):
     """
-    Analytics data CSV export
+    Analytics verisini (tarife satırları) CSV olarak export
     
-    NOTE: CSV generation needs additional library (e.g., pandas)
-    This is a placeholder endpoint
+    Tek join'li sorgu (TarifeListesi + Hizmet) yield_per ile okunur ve
+    StreamingResponse ile parça parça gönderilir. Tarih filtreleri verilirse
+    geçerlilik aralığı [start_date, end_date] ile kesişen tarifeler döner.
     """
-    raise HTTPException(
-        status_code=501,
-        detail=error_response(
-            code=ErrorCode.NOT_IMPLEMENTED,
-            message="CSV export henüz implement edilmedi",
-            details={"note": "pandas veya csv module ile implement edilecek"}
+    from ...core.streaming_export import iter_csv, streaming_download, CSV_MEDIA_TYPE
+    
+    try:
+        start_dt = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else None
+        end_dt = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=error_response(
+                code=ErrorCode.VALIDATION_ERROR,
+                message="Geçersiz tarih formatı",
+                details={"error": str(e)}
+            )
         )
+    
+    query = db.query(
+        TarifeListesi.Id,
+        TarifeListesi.ValidFrom,
+        TarifeListesi.ValidTo,
+        TarifeListesi.OverridePrice,
+        TarifeListesi.OverrideCurrency,
+        TarifeListesi.OverrideKdvOrani,
+        TarifeListesi.IsActive,
+        TarifeListesi.VersionNote,
+        Hizmet.Kod.label('hizmet_kod'),
+        Hizmet.Ad.label('hizmet_ad'),
+        Hizmet.CalculationType.label('calculation_type'),
+    ).join(Hizmet, TarifeListesi.HizmetId == Hizmet.Id)
+    
+    if hizmet_id:
+        query = query.filter(Hizmet.Id == hizmet_id)
+    
+    if calculation_type:
+        query = query.filter(Hizmet.CalculationType == calculation_type)
+    
+    if end_dt:
+        query = query.filter(TarifeListesi.ValidFrom <= end_dt)
+    
+    if start_dt:
+        query = query.filter(or_(TarifeListesi.ValidTo.is_(None), TarifeListesi.ValidTo >= start_dt))
+    
+    query = query.order_by(Hizmet.Kod, TarifeListesi.ValidFrom)
+    
+    return streaming_download(
+        iter_csv(ANALYTICS_CSV_HEADERS, _iter_tariff_export_rows(query)),
+        filename=f"fiyat_analitik_{datetime.now().strftime('%Y%m%d')}.csv",
+        media_type=CSV_MEDIA_TYPE,
     )
 
 
@@ -640,14 +796,17 @@ def export_analytics_pdf(
     Analytics data PDF export
     
     NOTE: PDF generation needs additional library (e.g., reportlab)
-    This is a placeholder endpoint
+    This is a placeholder endpoint - tablo verisi için /analytics/export-csv kullanın
     """
     raise HTTPException(
         status_code=501,
         detail=error_response(
             code=ErrorCode.NOT_IMPLEMENTED,
             message="PDF export henüz implement edilmedi",
-            details={"note": "reportlab veya weasyprint ile implement edilecek"}
+            details={
+                "note": "reportlab veya weasyprint ile implement edilecek",
+                "alternative": "/api/hizmet/analytics/export-csv"
+            }
         )
     )
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime, date
 from decimal import Decimal
 
@@ -107,6 +107,12 @@ class PriceCalculationRequest(BaseModel):
         }
 
 
+class BulkPriceCalculationRequest(BaseModel):
+    """Toplu fiyat hesaplama isteği (sonuçlar aynı sırayla döner)"""
+    
+    items: List[PriceCalculationRequest] = Field(..., min_length=1, max_length=5000, description="Fiyatlanacak satırlar")
+
+
 class PriceCalculationResponse(BaseModel):
     """Otomatik fiyat hesaplama sonucu"""
     
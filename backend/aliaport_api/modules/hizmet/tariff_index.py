@@ -0,0 +1,216 @@
+"""
+TarifeListesi için bellek içi geçerlilik aralığı index'i.
+
+Her hizmetin aktif tarife satırları, çakışmayan segmentlere bölünmüş bir zaman
+çizelgesine çevrilir: sıralı segment başlangıçları + her segmentte geçerli
+satır. "D tarihinde geçerli tarife" sorusu `bisect` ile O(log n) cevaplanır;
+sonuç eski SQL sorgusuyla aynıdır (ValidFrom <= D <= ValidTo/NULL olan aktif
+satırlardan ValidFrom'u en büyük olan, eşitlikte Id'si büyük olan).
+
+Güncellik:
+- ORM üzerinden yapılan TarifeListesi yazımları commit sonrası ilgili
+  hizmetin çizelgesini düşürür; bir sonraki sorguda yalnızca o hizmet yeniden
+  kurulur. Rollback edilen yazımlar index'e dokunmaz.
+- Her hizmetin bir nesil sayacı vardır; invalidate sayacı artırır. Yükleme
+  sürerken sayaç değiştiyse kurulan çizelge cache'e yazılmaz (commit öncesi
+  okunan satırlar TTL boyunca servis edilmez).
+- Oturumda flush edilmiş ama commit edilmemiş tarife yazımı olan hizmetlerin
+  çizelgesi o istek için kurulur, paylaşılan index'e konmaz.
+- `query.update()` / Core bulk yazımlar flush event'i üretmez; bu yollar
+  `tariff_index.invalidate(...)` çağırmalıdır.
+- Çok worker'lı kurulumda diğer worker'ların yazımlarını görmek için her
+  çizelge TARIFF_INDEX_TTL saniye (varsayılan 300) sonra yeniden kurulur.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from .models import TarifeListesi
+
+TARIFF_INDEX_TTL = float(os.getenv("TARIFF_INDEX_TTL", "300"))
+
+_DIRTY_KEY = "tariff_index_dirty"
+
+
+@dataclass(frozen=True)
+class TariffEntry:
+    id: int
+    valid_from: date
+    valid_to: Optional[date]
+    override_price: Optional[Decimal]
+    override_currency: Optional[str]
+    override_kdv_orani: Optional[Decimal]
+
+
+class ServiceTariffTimeline:
+    """Bir hizmetin tarife satırlarından kurulan, çakışmasız segment çizelgesi."""
+
+    __slots__ = ("starts", "entries", "built_at")
+
+    def __init__(self, rows: Iterable[TariffEntry]):
+        rows = list(rows)
+        boundaries = sorted(
+            {row.valid_from for row in rows}
+            | {row.valid_to + timedelta(days=1) for row in rows if row.valid_to is not None and row.valid_to < date.max}
+        )
+        self.starts: List[date] = []
+        self.entries: List[Optional[TariffEntry]] = []
+        for start in boundaries:
+            # Hizmet başına satır sayısı küçük (onlarca); segment başına tarama yeterli
+            covering = [
+                row for row in rows
+                if row.valid_from <= start and (row.valid_to is None or row.valid_to >= start)
+            ]
+            winner = max(covering, key=lambda row: (row.valid_from, row.id)) if covering else None
+            if self.entries and self.entries[-1] == winner:
+                continue  # Aynı satır devam ediyor, segmenti birleştir
+            self.starts.append(start)
+            self.entries.append(winner)
+        self.built_at = time.monotonic()
+
+    def lookup(self, on_date: date) -> Optional[TariffEntry]:
+        position = bisect_right(self.starts, on_date) - 1
+        return self.entries[position] if position >= 0 else None
+
+
+class TariffIndex:
+    """Hizmet id → ServiceTariffTimeline; eksik çizelgeler tek sorguda yüklenir."""
+
+    def __init__(self, ttl_seconds: float = TARIFF_INDEX_TTL):
+        self.ttl_seconds = ttl_seconds
+        self._timelines: Dict[int, ServiceTariffTimeline] = {}
+        self._generations: Dict[int, int] = {}
+        self._epoch = 0  # invalidate() (tümü) her çağrıldığında artar
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def lookup(self, db: Session, hizmet_id: int, on_date: date) -> Optional[TariffEntry]:
+        """hizmet_id için on_date tarihinde geçerli tarife satırı (yoksa None)."""
+        return self.lookup_many(db, [(hizmet_id, on_date)])[0]
+
+    def lookup_many(self, db: Session, requests: Sequence[Tuple[int, date]]) -> List[Optional[TariffEntry]]:
+        """Toplu fiyatlama: eksik hizmetler tek IN sorgusuyla yüklenir, her satır bisect ile çözülür."""
+        timelines = self._ensure(db, {hizmet_id for hizmet_id, _ in requests})
+        return [timelines[hizmet_id].lookup(on_date) for hizmet_id, on_date in requests]
+
+    def warm(self, db: Session) -> int:
+        """Tüm aktif tarife satırlarını tek sorguda yükler; yüklenen hizmet sayısını döndürür."""
+        with self._lock:
+            epoch = self._epoch
+        grouped = self._load(db, None)
+        uncommitted = db.info.get(_DIRTY_KEY, set())
+        with self._lock:
+            if epoch == self._epoch:
+                self._timelines = {
+                    hizmet_id: ServiceTariffTimeline(rows) for hizmet_id, rows in grouped.items()
+                    if hizmet_id not in uncommitted
+                }
+            self.builds += len(grouped)
+        return len(grouped)
+
+    def invalidate(self, hizmet_ids: Optional[Iterable[int]] = None) -> None:
+        """Verilen hizmetlerin (None ise tümünün) çizelgesini düşürür."""
+        with self._lock:
+            if hizmet_ids is None:
+                self._timelines.clear()
+                self._epoch += 1
+                return
+            for hizmet_id in hizmet_ids:
+                self._timelines.pop(hizmet_id, None)
+                self._generations[hizmet_id] = self._generations.get(hizmet_id, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"services": len(self._timelines), "builds": self.builds}
+
+    def _ensure(self, db: Session, hizmet_ids: Set[int]) -> Dict[int, ServiceTariffTimeline]:
+        now = time.monotonic()
+        with self._lock:
+            found = {
+                hizmet_id: timeline for hizmet_id in hizmet_ids
+                if (timeline := self._timelines.get(hizmet_id)) is not None
+                and now - timeline.built_at < self.ttl_seconds
+            }
+        missing = hizmet_ids - found.keys()
+        if missing:
+            with self._lock:
+                epoch = self._epoch
+                generations = {hizmet_id: self._generations.get(hizmet_id, 0) for hizmet_id in missing}
+            grouped = self._load(db, missing)
+            built = {hizmet_id: ServiceTariffTimeline(grouped.get(hizmet_id, ())) for hizmet_id in missing}
+            # Bu oturumun commit edilmemiş yazımlarını içeren çizelgeler paylaşılmaz
+            uncommitted = db.info.get(_DIRTY_KEY, set())
+            with self._lock:
+                if epoch == self._epoch:
+                    self._timelines.update(
+                        (hizmet_id, timeline) for hizmet_id, timeline in built.items()
+                        if hizmet_id not in uncommitted
+                        and self._generations.get(hizmet_id, 0) == generations[hizmet_id]
+                    )
+                self.builds += len(built)
+            found.update(built)
+        return found
+
+    @staticmethod
+    def _load(db: Session, hizmet_ids: Optional[Set[int]]) -> Dict[int, List[TariffEntry]]:
+        query = db.query(
+            TarifeListesi.HizmetId,
+            TarifeListesi.Id,
+            TarifeListesi.ValidFrom,
+            TarifeListesi.ValidTo,
+            TarifeListesi.OverridePrice,
+            TarifeListesi.OverrideCurrency,
+            TarifeListesi.OverrideKdvOrani,
+        ).filter(TarifeListesi.IsActive == True)  # noqa: E712
+        if hizmet_ids is not None:
+            query = query.filter(TarifeListesi.HizmetId.in_(hizmet_ids))
+        grouped: Dict[int, List[TariffEntry]] = {}
+        for hizmet_id, *fields in query:
+            grouped.setdefault(hizmet_id, []).append(TariffEntry(*fields))
+        return grouped
+
+
+tariff_index = TariffIndex()
+
+
+# ============================================
+# ORM yazımlarında artımlı güncelleme
+# ============================================
+
+@event.listens_for(Session, "after_flush")
+def _collect_tariff_writes(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(obj, TarifeListesi):
+            continue
+        dirty = session.info.setdefault(_DIRTY_KEY, set())
+        dirty.add(obj.HizmetId)
+        history = inspect(obj).attrs.HizmetId.history
+        dirty.update(hizmet_id for hizmet_id in history.deleted if hizmet_id is not None)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_tariff_writes(session: Session) -> None:
+    dirty = session.info.pop(_DIRTY_KEY, None)
+    if dirty:
+        tariff_index.invalidate(dirty)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_tariff_writes(session: Session, previous_transaction) -> None:
+    session.info.pop(_DIRTY_KEY, None)
+
+
+@event.listens_for(TarifeListesi.__table__, "after_create")
+@event.listens_for(TarifeListesi.__table__, "after_drop")
+def _reset_on_ddl(target, connection, **kw) -> None:
+    tariff_index.invalidate()
@@ -1,4 +1,7 @@
 """Isemri modülü"""
-from .router import router
+from ...core.lazy_import import lazy_exports
+
+# Router ilk erişimde yüklenir (models import'u router zincirini tetiklemez)
+__getattr__ = lazy_exports(globals(), router=".router:router")
 
 __all__ = ["router"]
@@ -0,0 +1,480 @@
+"""
+İŞ EMRİ MODÜLÜ - Toplu 4 Saat Kuralı / Fazla Mesai Motoru
+
+4 saat kuralının iki uygulaması tek yerde toplanır:
+
+- İş emri fazla mesaisi: Güvenlik çıkış saati (GateLog, yoksa WorkOrderPerson)
+  ile fiili iş bitişi (actual_end) arasındaki fark 240 dakikayı aşarsa aşan
+  süre saat ücretiyle fiyatlanır.
+- Araç kalış süresi: GateLog giriş/çıkış farkı base_charge_hours'u aşarsa
+  aşan dakika, VEHICLE_4H_RULE hizmet kartının dakika ücretiyle fiyatlanır
+  (PricingEngine._calculate_vehicle_4h_rule ile aynı formül: kart fiyatı /
+  kartın FormulaParams["base_minutes"] değeri, varsayılan 240).
+
+Ay sonu faturalamada iş emri başına endpoint çağırmak yerine:
+    results = compute_work_order_overtime(db, date_from=..., date_to=...)
+    vehicles = compute_vehicle_overtime(db, date_from=..., date_to=..., tariff=resolve_vehicle_4h_tariff(db))
+    apply_overtime_items(db, results, vehicles)
+
+Tüm iş emirlerinin çıkış / bitiş zamanları tek sorguda (korele alt sorgular,
+work_order_id index'leri üzerinden) okunur; hesaplama bellekte tek geçişte
+yapılır. Kalemler tek sorguda bulunan mevcut kayıtlar güncellenerek veya
+toplu eklenerek tek commit ile yazılır.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from ..guvenlik.models import GateLog
+from ..hizmet.models import CalculationType, Hizmet
+from .models import WorkOrder, WorkOrderItem, WorkOrderItemType, WorkOrderPerson
+
+BASE_MINUTES = 240  # 4 saat
+DEFAULT_VAT_RATE = 20.0
+
+OVERTIME_RESOURCE_CODE = "OVERTIME_4H"
+VEHICLE_RESOURCE_CODE_PREFIX = "VEHICLE_4H-"
+
+_CENT = Decimal("0.01")
+
+
+# ============================================
+# SONUÇ TİPLERİ
+# ============================================
+
+@dataclass
+class WorkOrderOvertime:
+    """Bir iş emrinin 4 saat kuralı sonucu"""
+    work_order_id: int
+    wo_number: str
+    actual_end: Optional[datetime]
+    gate_exit_time: Optional[datetime]
+    total_duration_minutes: Optional[int]
+    overtime_minutes: int
+    overtime_hours: float
+    overtime_charge: float
+    hourly_rate: float
+    base_minutes: int = BASE_MINUTES
+    currency: str = "TRY"
+    reason: Optional[str] = None  # Hesaplanamadıysa nedeni
+
+    @property
+    def is_overtime(self) -> bool:
+        return self.overtime_minutes > 0
+
+    def to_dict(self) -> dict:
+        return {
+            "work_order_id": self.work_order_id,
+            "wo_number": self.wo_number,
+            "actual_end": self.actual_end.isoformat() if self.actual_end else None,
+            "gate_exit_time": self.gate_exit_time.isoformat() if self.gate_exit_time else None,
+            "total_duration_minutes": self.total_duration_minutes,
+            "base_minutes": self.base_minutes,
+            "overtime_minutes": self.overtime_minutes,
+            "overtime_hours": self.overtime_hours,
+            "hourly_rate": self.hourly_rate,
+            "overtime_charge": self.overtime_charge,
+            "is_overtime": self.is_overtime,
+            "currency": self.currency,
+        }
+
+
+@dataclass
+class VehicleTariff:
+    """Araç 4 saat kuralı hizmet kartı (kesin ücret, kesin süre, para birimi)"""
+    service_code: str
+    base_price: Decimal
+    currency: str
+    vat_rate: float = DEFAULT_VAT_RATE
+    base_minutes: int = BASE_MINUTES  # FormulaParams["base_minutes"]; dakika ücretinin böleni
+
+
+@dataclass
+class VehicleOvertime:
+    """Bir araç giriş kaydının (GateLog) 4 saat kuralı sonucu"""
+    gate_log_id: int
+    work_order_id: int
+    wo_number: str
+    vehicle_plate: Optional[str]
+    entry_time: datetime
+    exit_time: datetime
+    duration_minutes: int
+    base_minutes: int
+    extra_minutes: int
+    minute_rate: Optional[Decimal] = None
+    extra_charge: Optional[Decimal] = None
+    currency: Optional[str] = None
+
+    @property
+    def needs_extra_charge(self) -> bool:
+        return self.extra_minutes > 0
+
+    def to_dict(self) -> dict:
+        return {
+            "gate_log_id": self.gate_log_id,
+            "work_order_id": self.work_order_id,
+            "wo_number": self.wo_number,
+            "vehicle_plate": self.vehicle_plate,
+            "entry_time": self.entry_time.isoformat(),
+            "exit_time": self.exit_time.isoformat(),
+            "duration_minutes": self.duration_minutes,
+            "base_minutes": self.base_minutes,
+            "extra_minutes": self.extra_minutes,
+            "needs_extra_charge": self.needs_extra_charge,
+            "extra_charge": float(self.extra_charge) if self.extra_charge is not None else None,
+            "currency": self.currency,
+        }
+
+
+# ============================================
+# ORTAK HESAPLAMA
+# ============================================
+
+def minutes_between(start: datetime, end: datetime) -> int:
+    """İki zaman arası tam dakika (aşağı yuvarlanır)"""
+    return int((end - start).total_seconds() / 60)
+
+
+def overtime_minutes(total_minutes: int, base_minutes: int = BASE_MINUTES) -> int:
+    """Kesin süreyi aşan dakika"""
+    return max(0, total_minutes - base_minutes)
+
+
+def vehicle_extra_charge(base_price: Decimal, base_minutes: int, extra_minutes: int) -> Tuple[Decimal, Decimal]:
+    """
+    Araç ek ücreti: dakika ücreti = kesin ücret / kesin dakika.
+
+    Returns:
+        (dakika ücreti, kuruşa yuvarlanmış ek ücret)
+    """
+    minute_rate = base_price / Decimal(base_minutes)
+    return minute_rate, (minute_rate * extra_minutes).quantize(_CENT, rounding=ROUND_HALF_UP)
+
+
+def _day_bounds(date_from: Optional[date], date_to: Optional[date]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Tarih aralığını [başlangıç 00:00, bitiş+1 gün 00:00) datetime aralığına çevirir."""
+    start = datetime.combine(date_from, time.min) if date_from else None
+    end = datetime.combine(date_to + timedelta(days=1), time.min) if date_to else None
+    return start, end
+
+
+# ============================================
+# İŞ EMRİ FAZLA MESAİ
+# ============================================
+
+def compute_work_order_overtime(
+    db: Session,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    hourly_rate: float = 100.0,
+    work_order_ids: Optional[Sequence[int]] = None,
+    base_minutes: int = BASE_MINUTES,
+) -> List[WorkOrderOvertime]:
+    """
+    Aktif iş emirlerinin fazla mesaisini tek sorguda hesaplar.
+
+    Args:
+        date_from / date_to: actual_end tarih aralığı (dahil). Verilirse
+            actual_end'i olmayan iş emirleri sonuçta yer almaz.
+        work_order_ids: Belirli iş emirleriyle sınırla (tekil endpoint)
+    """
+    gate_exit = (
+        select(func.max(GateLog.exit_time))
+        .where(GateLog.work_order_id == WorkOrder.id, GateLog.exit_time.isnot(None))
+        .correlate(WorkOrder)
+        .scalar_subquery()
+    )
+    person_exit = (
+        select(func.max(WorkOrderPerson.gate_exit_time))
+        .where(WorkOrderPerson.work_order_id == WorkOrder.id, WorkOrderPerson.gate_exit_time.isnot(None))
+        .correlate(WorkOrder)
+        .scalar_subquery()
+    )
+    query = select(
+        WorkOrder.id,
+        WorkOrder.wo_number,
+        WorkOrder.actual_end,
+        gate_exit.label("gate_exit"),
+        person_exit.label("person_exit"),
+    ).where(WorkOrder.is_active == True)
+
+    if work_order_ids is not None:
+        query = query.where(WorkOrder.id.in_(list(work_order_ids)))
+    start, end = _day_bounds(date_from, date_to)
+    if start:
+        query = query.where(WorkOrder.actual_end >= start)
+    if end:
+        query = query.where(WorkOrder.actual_end < end)
+
+    results = []
+    for wo_id, wo_number, actual_end, gate_exit_time, person_exit_time in db.execute(query.order_by(WorkOrder.id)):
+        # GateLog çıkışı öncelikli; yoksa personel çıkışı
+        exit_time = gate_exit_time or person_exit_time
+        if not exit_time or not actual_end:
+            results.append(WorkOrderOvertime(
+                work_order_id=wo_id, wo_number=wo_number, actual_end=actual_end, gate_exit_time=exit_time,
+                total_duration_minutes=None, overtime_minutes=0, overtime_hours=0.0, overtime_charge=0.0,
+                hourly_rate=hourly_rate, base_minutes=base_minutes,
+                reason="Güvenlik çıkış saati bulunamadı" if not exit_time else "İş bitiş saati (actual_end) girilmemiş",
+            ))
+            continue
+
+        total = minutes_between(actual_end, exit_time)
+        extra = overtime_minutes(total, base_minutes)
+        hours = round(extra / 60.0, 2)
+        results.append(WorkOrderOvertime(
+            work_order_id=wo_id, wo_number=wo_number, actual_end=actual_end, gate_exit_time=exit_time,
+            total_duration_minutes=total, overtime_minutes=extra, overtime_hours=hours,
+            overtime_charge=round(hours * hourly_rate, 2), hourly_rate=hourly_rate, base_minutes=base_minutes,
+        ))
+    return results
+
+
+# ============================================
+# ARAÇ 4 SAAT KURALI
+# ============================================
+
+def resolve_vehicle_4h_tariff(db: Session, service_code: Optional[str] = None) -> Optional[VehicleTariff]:
+    """VEHICLE_4H_RULE hesaplama tipli aktif hizmet kartını bulur (yoksa None)."""
+    query = db.query(Hizmet).filter(
+        Hizmet.CalculationType == CalculationType.VEHICLE_4H_RULE,
+        Hizmet.AktifMi == True,
+        Hizmet.Fiyat.isnot(None),
+    )
+    if service_code:
+        query = query.filter(Hizmet.Kod == service_code)
+    hizmet = query.order_by(Hizmet.SiraNo, Hizmet.Id).first()
+    if not hizmet:
+        return None
+    return VehicleTariff(
+        service_code=hizmet.Kod,
+        base_price=Decimal(str(hizmet.Fiyat)),
+        currency=hizmet.ParaBirimi or "TRY",
+        vat_rate=float(hizmet.KdvOrani) if hizmet.KdvOrani is not None else DEFAULT_VAT_RATE,
+        base_minutes=int((hizmet.FormulaParams or {}).get("base_minutes", BASE_MINUTES)),
+    )
+
+
+def vehicle_overtime_for(
+    gate_log_id: int,
+    work_order_id: int,
+    wo_number: str,
+    vehicle_plate: Optional[str],
+    entry_time: datetime,
+    exit_time: datetime,
+    base_charge_hours: Optional[int],
+    tariff: Optional[VehicleTariff] = None,
+) -> VehicleOvertime:
+    """Tek giriş kaydı için 4 saat kuralı (tarife verilmişse ücretlendirilir)."""
+    base_minutes = (base_charge_hours or 4) * 60
+    duration = minutes_between(entry_time, exit_time)
+    extra = overtime_minutes(duration, base_minutes)
+    result = VehicleOvertime(
+        gate_log_id=gate_log_id, work_order_id=work_order_id, wo_number=wo_number,
+        vehicle_plate=vehicle_plate, entry_time=entry_time, exit_time=exit_time,
+        duration_minutes=duration, base_minutes=base_minutes, extra_minutes=extra,
+    )
+    if tariff is not None:
+        price_vehicle_overtime(result, tariff)
+    return result
+
+
+def price_vehicle_overtime(result: VehicleOvertime, tariff: VehicleTariff) -> VehicleOvertime:
+    """
+    Sonuca tarifeye göre dakika ücreti ve ek ücret işler.
+
+    Aşan dakika giriş kaydının base_charge_hours'una göre, dakika ücreti
+    PricingEngine gibi kartın base_minutes değerine göre hesaplanır.
+    """
+    result.minute_rate, result.extra_charge = vehicle_extra_charge(
+        tariff.base_price, tariff.base_minutes, result.extra_minutes
+    )
+    result.currency = tariff.currency
+    return result
+
+
+def compute_vehicle_overtime(
+    db: Session,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    tariff: Optional[VehicleTariff] = None,
+) -> List[VehicleOvertime]:
+    """Çıkışı tarih aralığında olan tüm araç giriş kayıtlarını tek sorguda hesaplar."""
+    query = select(
+        GateLog.id,
+        GateLog.work_order_id,
+        GateLog.wo_number,
+        GateLog.vehicle_plate,
+        GateLog.entry_time,
+        GateLog.exit_time,
+        GateLog.base_charge_hours,
+    ).where(
+        GateLog.entry_type == "GIRIS",
+        GateLog.vehicle_plate.isnot(None),
+        GateLog.entry_time.isnot(None),
+        GateLog.exit_time.isnot(None),
+    )
+    start, end = _day_bounds(date_from, date_to)
+    if start:
+        query = query.where(GateLog.exit_time >= start)
+    if end:
+        query = query.where(GateLog.exit_time < end)
+
+    return [vehicle_overtime_for(*row, tariff=tariff) for row in db.execute(query.order_by(GateLog.id))]
+
+
+def persist_vehicle_overtime(db: Session, results: Iterable[VehicleOvertime]) -> int:
+    """Hesaplanan süre / ek ücretleri GateLog'a toplu (primary key bazlı) yazar; commit etmez."""
+    rows = []
+    for r in results:
+        row = {"id": r.gate_log_id, "duration_minutes": r.duration_minutes, "extra_minutes": r.extra_minutes}
+        if r.extra_charge is not None:
+            # Tarife yoksa önceden hesaplanmış ücret ezilmez
+            row["extra_charge_calculated"] = r.extra_charge
+        rows.append(row)
+    if rows:
+        db.execute(update(GateLog), rows)
+    return len(rows)
+
+
+# ============================================
+# TOPLU WORKORDERITEM
+# ============================================
+
+def _vat(total_amount: float, vat_rate: float) -> float:
+    return round(total_amount * vat_rate / 100, 2)
+
+
+def apply_overtime_items(
+    db: Session,
+    work_orders: Iterable[WorkOrderOvertime] = (),
+    vehicles: Iterable[VehicleOvertime] = (),
+    vehicle_tariff: Optional[VehicleTariff] = None,
+) -> Dict[str, Dict[int, Tuple[int, bool]]]:
+    """
+    Fazla mesai / araç ek süre kalemlerini toplu oluşturur veya günceller.
+
+    Mevcut kalemler (iş emri başına OVERTIME_4H, giriş kaydı başına
+    VEHICLE_4H-<gate_log_id>) tek sorguda bulunur; faturalanmış kalemlere
+    dokunulmaz. Araç sonuçları GateLog'a da yazılır. Tek commit yapılır.
+
+    Returns:
+        {"work_orders": {work_order_id: (item_id, created)},
+         "vehicles": {gate_log_id: (item_id, created)}}
+    """
+    work_orders = [r for r in work_orders if r.is_overtime]
+    vehicles = list(vehicles)
+    charged_vehicles = [r for r in vehicles if r.needs_extra_charge and r.extra_charge is not None]
+
+    wo_ids = [r.work_order_id for r in work_orders]
+    vehicle_codes = {f"{VEHICLE_RESOURCE_CODE_PREFIX}{r.gate_log_id}": r for r in charged_vehicles}
+
+    existing_overtime: Dict[int, WorkOrderItem] = {}
+    existing_vehicle: Dict[str, WorkOrderItem] = {}
+    if wo_ids:
+        for item in db.query(WorkOrderItem).filter(
+            WorkOrderItem.work_order_id.in_(wo_ids),
+            WorkOrderItem.item_type == WorkOrderItemType.WORKLOG,
+            WorkOrderItem.resource_code == OVERTIME_RESOURCE_CODE,
+        ):
+            existing_overtime.setdefault(item.work_order_id, item)
+    if vehicle_codes:
+        for item in db.query(WorkOrderItem).filter(WorkOrderItem.resource_code.in_(list(vehicle_codes))):
+            existing_vehicle[item.resource_code] = item
+
+    touched: List[Tuple[str, int, WorkOrderItem, bool]] = []
+
+    for r in work_orders:
+        notes = f"4 saat kuralı aşımı: {r.overtime_minutes} dakika ({r.overtime_hours} saat)"
+        item = existing_overtime.get(r.work_order_id)
+        if item is not None:
+            if item.is_invoiced:
+                continue
+            item.quantity = r.overtime_hours
+            item.unit_price = r.hourly_rate
+            item.total_amount = r.overtime_charge
+            item.vat_amount = _vat(r.overtime_charge, item.vat_rate)
+            item.grand_total = item.total_amount + item.vat_amount
+            item.notes = notes
+            touched.append(("work_orders", r.work_order_id, item, False))
+            continue
+        vat_amount = _vat(r.overtime_charge, DEFAULT_VAT_RATE)
+        item = WorkOrderItem(
+            work_order_id=r.work_order_id,
+            wo_number=r.wo_number,
+            item_type=WorkOrderItemType.WORKLOG,
+            resource_code=OVERTIME_RESOURCE_CODE,
+            resource_name="Fazla Mesai (4 Saat Kuralı Aşımı)",
+            quantity=r.overtime_hours,
+            unit="SAAT",
+            unit_price=r.hourly_rate,
+            currency=r.currency,
+            total_amount=r.overtime_charge,
+            vat_rate=DEFAULT_VAT_RATE,
+            vat_amount=vat_amount,
+            grand_total=r.overtime_charge + vat_amount,
+            notes=(
+                f"{notes}. Çıkış: {r.gate_exit_time.strftime('%Y-%m-%d %H:%M')}, "
+                f"İş bitişi: {r.actual_end.strftime('%Y-%m-%d %H:%M')}"
+            ),
+            is_invoiced=False,
+        )
+        touched.append(("work_orders", r.work_order_id, item, True))
+
+    vat_rate = vehicle_tariff.vat_rate if vehicle_tariff else DEFAULT_VAT_RATE
+    for code, r in vehicle_codes.items():
+        total_amount = float(r.extra_charge)
+        notes = (
+            f"Araç {r.vehicle_plate} kalış süresi {r.duration_minutes} dk, "
+            f"{r.base_minutes} dk kesin süreyi {r.extra_minutes} dk aştı"
+        )
+        item = existing_vehicle.get(code)
+        if item is not None:
+            if item.is_invoiced:
+                continue
+            item.quantity = r.extra_minutes
+            item.unit_price = float(r.minute_rate)
+            item.total_amount = total_amount
+            item.vat_amount = _vat(total_amount, item.vat_rate)
+            item.grand_total = item.total_amount + item.vat_amount
+            item.notes = notes
+            touched.append(("vehicles", r.gate_log_id, item, False))
+            continue
+        vat_amount = _vat(total_amount, vat_rate)
+        item = WorkOrderItem(
+            work_order_id=r.work_order_id,
+            wo_number=r.wo_number,
+            item_type=WorkOrderItemType.SERVICE,
+            resource_code=code,
+            resource_name=f"Araç Ek Süre ({r.vehicle_plate})",
+            service_code=vehicle_tariff.service_code if vehicle_tariff else None,
+            start_time=r.entry_time,
+            end_time=r.exit_time,
+            duration_minutes=r.duration_minutes,
+            quantity=r.extra_minutes,
+            unit="DAKIKA",
+            unit_price=float(r.minute_rate),
+            currency=r.currency or "TRY",
+            total_amount=total_amount,
+            vat_rate=vat_rate,
+            vat_amount=vat_amount,
+            grand_total=total_amount + vat_amount,
+            notes=notes,
+            is_invoiced=False,
+        )
+        touched.append(("vehicles", r.gate_log_id, item, True))
+
+    db.add_all([item for _, _, item, created in touched if created])
+    persist_vehicle_overtime(db, vehicles)
+    # ID'ler commit'ten önce alınır (commit sonrası expire edilen nesneler tek tek yenilenmesin)
+    db.flush()
+    applied: Dict[str, Dict[int, Tuple[int, bool]]] = {"work_orders": {}, "vehicles": {}}
+    for kind, key, item, created in touched:
+        applied[kind][key] = (item.id, created)
+    db.commit()
+    return applied
@@ -6,18 +6,26 @@ WorkOrder ve WorkOrderItem CRUD endpoints
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, selectinload, joinedload
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 import uuid
 
 from ...config.database import get_db
 from ...core.responses import success_response, error_response, paginated_response
 from ...core.error_codes import ErrorCode, get_http_status_for_error
+from ...core.metrics import WORK_ORDERS_TOTAL
 from . import models as models_isemri, schemas as schemas_isemri
 from ..hizmet.models import Hizmet
 from ..hizmet.pricing_engine import PricingEngine
+from .overtime import (
+    apply_overtime_items,
+    compute_vehicle_overtime,
+    compute_work_order_overtime,
+    resolve_vehicle_4h_tariff,
+)
 from ..sgk.models import SgkPeriodCheck
 from ..dijital_arsiv.models import PortalEmployee
+from ..dijital_arsiv.sgk_status import EmployeeSgkStatus, get_sgk_status_map
 
 
 router = APIRouter()
@@ -90,6 +98,12 @@ def ensure_sgk_compliance_for_firma_and_period(
             .all()
         )
         employee_map = {employee.id: employee for employee in employees}
+        # Materialize edilmiş durum: (employee_id, period_code) indexed lookup
+        status_map = get_sgk_status_map(
+            db,
+            [employee for employee in employees if employee.cari_id == work_order.CariId],
+            period_code=readable_period,
+        )
         invalid_employee_ids = []
 
         for employee_id in employee_ids:
@@ -97,7 +111,7 @@ def ensure_sgk_compliance_for_firma_and_period(
             if not employee or employee.cari_id != work_order.CariId:
                 invalid_employee_ids.append(employee_id)
                 continue
-            if employee.sgk_last_check_period != target_period or not employee.sgk_is_active_last_period:
+            if status_map.get(employee_id) != EmployeeSgkStatus.TAM:
                 invalid_employee_ids.append(employee_id)
 
         if invalid_employee_ids:
@@ -389,6 +403,7 @@ def create_work_order(
     db.add(db_work_order)
     db.commit()
     db.refresh(db_work_order)
+    WORK_ORDERS_TOTAL.labels(db_work_order.status.value).inc()
     
     wo_data = schemas_isemri.WorkOrderResponse.model_validate(db_work_order)
     return success_response(data=wo_data, message="İş emri oluşturuldu")
@@ -521,13 +536,10 @@ def calculate_work_order_overtime(
         - is_overtime: 4 saati aştı mı?
         - work_order_item: (Opsiyonel) Oluşturulan WorkOrderItem
     """
-    # İş emrini getir
-    work_order = db.query(models_isemri.WorkOrder).filter(
-        models_isemri.WorkOrder.id == work_order_id,
-        models_isemri.WorkOrder.is_active == True
-    ).first()
+    # İş emri, çıkış saati (GateLog, yoksa WorkOrderPerson) ve actual_end tek sorguda
+    results = compute_work_order_overtime(db, hourly_rate=hourly_rate, work_order_ids=[work_order_id])
     
-    if not work_order:
+    if not results:
         raise HTTPException(
             status_code=get_http_status_for_error(ErrorCode.WO_NOT_FOUND),
             detail=error_response(
@@ -536,145 +548,34 @@ def calculate_work_order_overtime(
                 details={"work_order_id": work_order_id}
             )
         )
-    
-    # Güvenlik çıkış saatini bul (GateLog'dan en son çıkış)
-    from .models import WorkOrderPerson
-    from ..guvenlik.models import GateLog
-    
-    gate_exit_time = None
-    
-    # Güvenlik çıkış saatini GateLog'dan al
-    latest_gatelog = db.query(GateLog).filter(
-        GateLog.work_order_id == work_order_id,
-        GateLog.exit_time.isnot(None)
-    ).order_by(GateLog.exit_time.desc()).first()
-    
-    if latest_gatelog:
-        gate_exit_time = latest_gatelog.exit_time
-    else:
-        # WorkOrderPerson'dan en son çıkış
-        latest_person_exit = db.query(WorkOrderPerson).filter(
-            WorkOrderPerson.work_order_id == work_order_id,
-            WorkOrderPerson.gate_exit_time.isnot(None)
-        ).order_by(WorkOrderPerson.gate_exit_time.desc()).first()
-        
-        if latest_person_exit:
-            gate_exit_time = latest_person_exit.gate_exit_time
-    
-    # İş bitiş zamanı
-    actual_end = work_order.actual_end
+    overtime = results[0]
     
     # Validasyon
-    if not gate_exit_time:
-        return success_response(
-            data={
-                "is_overtime": False,
-                "overtime_minutes": 0,
-                "overtime_hours": 0.0,
-                "overtime_charge": 0.0,
-                "message": "Güvenlik çıkış saati bulunamadı"
-            },
-            message="4 saat kuralı uygulanamaz - çıkış saati yok"
-        )
-    
-    if not actual_end:
+    if overtime.reason:
         return success_response(
             data={
                 "is_overtime": False,
                 "overtime_minutes": 0,
                 "overtime_hours": 0.0,
                 "overtime_charge": 0.0,
-                "message": "İş bitiş saati (actual_end) girilmemiş"
+                "message": overtime.reason
             },
-            message="4 saat kuralı uygulanamaz - iş bitiş saati yok"
+            message="4 saat kuralı uygulanamaz - çıkış saati yok" if not overtime.gate_exit_time
+            else "4 saat kuralı uygulanamaz - iş bitiş saati yok"
         )
     
-    # Süre farkını hesapla (dakika)
-    time_delta = gate_exit_time - actual_end
-    total_minutes = int(time_delta.total_seconds() / 60)
-    
-    # 4 saat = 240 dakika
-    BASE_MINUTES = 240
-    
-    # 4 saati aşan süre
-    overtime_minutes = max(0, total_minutes - BASE_MINUTES)
-    overtime_hours = round(overtime_minutes / 60.0, 2)
-    
-    # Ek ücret hesaplama
-    overtime_charge = round(overtime_hours * hourly_rate, 2)
-    
-    is_overtime = overtime_minutes > 0
-    
-    result = {
-        "work_order_id": work_order_id,
-        "wo_number": work_order.wo_number,
-        "actual_end": actual_end.isoformat() if actual_end else None,
-        "gate_exit_time": gate_exit_time.isoformat() if gate_exit_time else None,
-        "total_duration_minutes": total_minutes,
-        "base_minutes": BASE_MINUTES,
-        "overtime_minutes": overtime_minutes,
-        "overtime_hours": overtime_hours,
-        "hourly_rate": hourly_rate,
-        "overtime_charge": overtime_charge,
-        "is_overtime": is_overtime,
-        "currency": "TRY",
-        "work_order_item_id": None
-    }
+    is_overtime = overtime.is_overtime
+    result = {**overtime.to_dict(), "work_order_item_id": None}
     
-    # Otomatik WorkOrderItem oluştur
+    # Otomatik WorkOrderItem oluştur / güncelle
     if auto_create_item and is_overtime:
-        # Daha önce oluşturulmuş mu kontrol et
-        existing_item = db.query(models_isemri.WorkOrderItem).filter(
-            models_isemri.WorkOrderItem.work_order_id == work_order_id,
-            models_isemri.WorkOrderItem.item_type == models_isemri.WorkOrderItemType.WORKLOG,
-            models_isemri.WorkOrderItem.resource_code == "OVERTIME_4H"
-        ).first()
-        
-        if existing_item:
-            # Mevcut kalemi güncelle
-            existing_item.quantity = overtime_hours
-            existing_item.unit_price = hourly_rate
-            existing_item.total_amount = overtime_charge
-            existing_item.vat_amount = round(overtime_charge * existing_item.vat_rate / 100, 2)
-            existing_item.grand_total = existing_item.total_amount + existing_item.vat_amount
-            existing_item.notes = f"4 saat kuralı aşımı: {overtime_minutes} dakika ({overtime_hours} saat)"
-            
-            db.commit()
-            db.refresh(existing_item)
-            
-            result["work_order_item_id"] = existing_item.id
-            result["message"] = "Mevcut fazla mesai kalemi güncellendi"
+        applied = apply_overtime_items(db, work_orders=[overtime])["work_orders"]
+        if work_order_id in applied:
+            item_id, created = applied[work_order_id]
+            result["work_order_item_id"] = item_id
+            result["message"] = "Fazla mesai kalemi oluşturuldu" if created else "Mevcut fazla mesai kalemi güncellendi"
         else:
-            # Yeni kalem oluştur
-            vat_rate = 20.0
-            total_amount = overtime_charge
-            vat_amount = round(total_amount * vat_rate / 100, 2)
-            grand_total = total_amount + vat_amount
-            
-            new_item = models_isemri.WorkOrderItem(
-                work_order_id=work_order_id,
-                wo_number=work_order.wo_number,
-                item_type=models_isemri.WorkOrderItemType.WORKLOG,
-                resource_code="OVERTIME_4H",
-                resource_name="Fazla Mesai (4 Saat Kuralı Aşımı)",
-                quantity=overtime_hours,
-                unit="SAAT",
-                unit_price=hourly_rate,
-                currency="TRY",
-                total_amount=total_amount,
-                vat_rate=vat_rate,
-                vat_amount=vat_amount,
-                grand_total=grand_total,
-                notes=f"4 saat kuralı aşımı: {overtime_minutes} dakika ({overtime_hours} saat). Çıkış: {gate_exit_time.strftime('%Y-%m-%d %H:%M')}, İş bitişi: {actual_end.strftime('%Y-%m-%d %H:%M')}",
-                is_invoiced=False
-            )
-            
-            db.add(new_item)
-            db.commit()
-            db.refresh(new_item)
-            
-            result["work_order_item_id"] = new_item.id
-            result["message"] = "Fazla mesai kalemi oluşturuldu"
+            result["message"] = "Fazla mesai kalemi faturalanmış, güncellenmedi"
     
     return success_response(
         data=result,
@@ -682,6 +583,87 @@ def calculate_work_order_overtime(
     )
 
 
+@router.post("/work-order/overtime/batch")
+def calculate_overtime_batch(
+    date_from: date = Query(..., description="Başlangıç tarihi (iş bitişi / araç çıkışı, dahil)"),
+    date_to: date = Query(..., description="Bitiş tarihi (dahil)"),
+    hourly_rate: float = Query(100.0, description="Fazla mesai saat ücreti (TRY)"),
+    include_vehicles: bool = Query(True, description="Araç 4 saat kuralını da hesapla"),
+    vehicle_service_code: Optional[str] = Query(None, description="Araç tarifesi hizmet kodu (boşsa ilk VEHICLE_4H_RULE kartı)"),
+    create_items: bool = Query(False, description="WorkOrderItem'ları toplu oluştur/güncelle"),
+    db: Session = Depends(get_db)
+):
+    """
+    Toplu 4 saat kuralı (ay sonu faturalama)
+    
+    Tarih aralığındaki tüm iş emirlerinin fazla mesaisini ve araç kalış
+    sürelerini tek geçişte hesaplar. create_items=true ile kalemler toplu
+    yazılır ve araç ek ücretleri GateLog kayıtlarına işlenir.
+    
+    Yalnızca 4 saati aşan kayıtlar listelenir; summary tüm değerlendirilen kayıtları sayar.
+    """
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=get_http_status_for_error(ErrorCode.INVALID_INPUT),
+            detail=error_response(
+                code=ErrorCode.INVALID_INPUT,
+                message="Bitiş tarihi başlangıç tarihinden önce olamaz",
+                details={"date_from": date_from.isoformat(), "date_to": date_to.isoformat()}
+            )
+        )
+    
+    work_orders = compute_work_order_overtime(db, date_from=date_from, date_to=date_to, hourly_rate=hourly_rate)
+    
+    tariff = None
+    vehicles = []
+    if include_vehicles:
+        tariff = resolve_vehicle_4h_tariff(db, vehicle_service_code)
+        vehicles = compute_vehicle_overtime(db, date_from=date_from, date_to=date_to, tariff=tariff)
+    
+    overtime_orders = [r for r in work_orders if r.is_overtime]
+    overtime_vehicles = [r for r in vehicles if r.needs_extra_charge]
+    
+    applied = None
+    if create_items:
+        applied = apply_overtime_items(db, work_orders=overtime_orders, vehicles=vehicles, vehicle_tariff=tariff)
+    
+    def _with_item(data: dict, kind: str, key: int) -> dict:
+        if applied is not None and key in applied[kind]:
+            data["work_order_item_id"], data["item_created"] = applied[kind][key]
+        return data
+    
+    vehicle_charges = {}
+    for r in overtime_vehicles:
+        if r.extra_charge is not None:
+            vehicle_charges[r.currency] = vehicle_charges.get(r.currency, 0.0) + float(r.extra_charge)
+    
+    return success_response(
+        data={
+            "date_from": date_from.isoformat(),
+            "date_to": date_to.isoformat(),
+            "work_orders": [_with_item(r.to_dict(), "work_orders", r.work_order_id) for r in overtime_orders],
+            "vehicles": [_with_item(r.to_dict(), "vehicles", r.gate_log_id) for r in overtime_vehicles],
+            "vehicle_tariff": {
+                "service_code": tariff.service_code,
+                "base_price": float(tariff.base_price),
+                "currency": tariff.currency,
+            } if tariff else None,
+            "summary": {
+                "work_orders_evaluated": len(work_orders),
+                "work_orders_overtime": len(overtime_orders),
+                "overtime_minutes": sum(r.overtime_minutes for r in overtime_orders),
+                "overtime_charge": round(sum(r.overtime_charge for r in overtime_orders), 2),
+                "vehicles_evaluated": len(vehicles),
+                "vehicles_overtime": len(overtime_vehicles),
+                "vehicle_extra_minutes": sum(r.extra_minutes for r in overtime_vehicles),
+                "vehicle_extra_charge": {k: round(v, 2) for k, v in vehicle_charges.items()},
+                "items_written": sum(len(v) for v in applied.values()) if applied is not None else 0,
+            },
+        },
+        message="Toplu 4 saat kuralı hesaplandı"
+    )
+
+
 # ============================================
 # WORK ORDER ITEM ENDPOINTS
 # ============================================
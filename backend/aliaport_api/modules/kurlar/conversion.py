@@ -0,0 +1,216 @@
+"""
+Kurlar - Toplu Dönüşüm Servisi
+
+Fatura/rapor ekranlarının satır başına `GET /convert` çağırması yerine,
+bir istekteki tüm (tutar, kaynak, hedef, tarih) kalemlerini tek seferde çözer:
+
+- Her para birimi çifti için TEK aralık sorgusu (en eski hedef tarihin
+  fallback kaydından en yeni hedef tarihe kadar)
+- Tarih çözümü bellekte binary search (bisect) ile yapılır
+- Doğrudan/ters kur yoksa TRY üzerinden çapraz kur (triangulation)
+
+Kullanım:
+    book = RateBook(db)
+    results = book.convert_many(items)
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .models import ExchangeRate as ExchangeRateModel
+
+BASE_CURRENCY = "TRY"
+
+Pair = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class ResolvedRate:
+    """Bir çift için belirli tarihte çözülmüş kur"""
+    rate: float
+    rate_date: date
+
+
+class RateBook:
+    """
+    Çift bazlı kur serilerini yükleyip tarih bazlı çözümleyen yardımcı.
+
+    Seriler (RateDate artan sırada) yalnızca ilk ihtiyaç duyulduğunda yüklenir;
+    aynı çift için ikinci sorgu yapılmaz.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._series: Dict[Pair, Tuple[List[date], List[float]]] = {}
+        self.query_count = 0
+
+    # ------------------------------------------------------------------
+    # Yükleme
+    # ------------------------------------------------------------------
+
+    def load(self, pairs: Iterable[Pair], min_date: date, max_date: date) -> None:
+        """
+        Verilen çiftlerin [min_date fallback kaydı, max_date] aralığındaki kurlarını yükler.
+
+        Alt sınır, min_date'e eşit veya önceki en güncel kayıttır (scalar subquery);
+        böylece hafta sonu/tatil fallback'i de aynı sorguyla gelir.
+        """
+        for pair in pairs:
+            if pair in self._series:
+                continue
+            currency_from, currency_to = pair
+            pair_filter = (
+                ExchangeRateModel.CurrencyFrom == currency_from,
+                ExchangeRateModel.CurrencyTo == currency_to,
+            )
+            lower_bound = (
+                self.db.query(func.max(ExchangeRateModel.RateDate))
+                .filter(*pair_filter, ExchangeRateModel.RateDate <= min_date)
+                .scalar_subquery()
+            )
+            rows = (
+                self.db.query(ExchangeRateModel.RateDate, ExchangeRateModel.Rate)
+                .filter(
+                    *pair_filter,
+                    ExchangeRateModel.RateDate >= func.coalesce(lower_bound, min_date),
+                    ExchangeRateModel.RateDate <= max_date,
+                )
+                .order_by(ExchangeRateModel.RateDate.asc())
+                .all()
+            )
+            self.query_count += 1
+            self._series[pair] = ([r[0] for r in rows], [r[1] for r in rows])
+
+    # ------------------------------------------------------------------
+    # Çözümleme
+    # ------------------------------------------------------------------
+
+    def _lookup(self, pair: Pair, target_date: date) -> Optional[ResolvedRate]:
+        """Çift için target_date'e eşit veya önceki en güncel kur (yoksa None)."""
+        series = self._series.get(pair)
+        if not series or not series[0]:
+            return None
+        dates, rates = series
+        idx = bisect_right(dates, target_date) - 1
+        if idx < 0:
+            return None
+        return ResolvedRate(rate=rates[idx], rate_date=dates[idx])
+
+    def _resolve_leg(self, currency_from: str, currency_to: str, target_date: date) -> Optional[ResolvedRate]:
+        """Doğrudan kur, yoksa ters kurun tersi."""
+        direct = self._lookup((currency_from, currency_to), target_date)
+        if direct and direct.rate:
+            return direct
+        reverse = self._lookup((currency_to, currency_from), target_date)
+        if reverse and reverse.rate:
+            return ResolvedRate(rate=1.0 / reverse.rate, rate_date=reverse.rate_date)
+        return None
+
+    def resolve(self, currency_from: str, currency_to: str, target_date: date) -> Tuple[Optional[ResolvedRate], Optional[str]]:
+        """
+        Çift için kuru çözer.
+
+        Returns:
+            (ResolvedRate veya None, via) - via: çapraz kur kullanıldıysa ara para birimi
+        """
+        leg = self._resolve_leg(currency_from, currency_to, target_date)
+        if leg:
+            return leg, None
+
+        if BASE_CURRENCY in (currency_from, currency_to):
+            return None, None
+
+        first = self._resolve_leg(currency_from, BASE_CURRENCY, target_date)
+        second = self._resolve_leg(BASE_CURRENCY, currency_to, target_date)
+        if not first or not second:
+            return None, None
+        # Çapraz kurda kullanılan tarih: bacaklardan daha eski olanı
+        return ResolvedRate(
+            rate=first.rate * second.rate,
+            rate_date=min(first.rate_date, second.rate_date),
+        ), BASE_CURRENCY
+
+    # ------------------------------------------------------------------
+    # Toplu dönüşüm
+    # ------------------------------------------------------------------
+
+    def convert_many(self, items: List[dict]) -> List[dict]:
+        """
+        Kalemleri girdi sırasıyla dönüştürür.
+
+        Args:
+            items: [{"amount": float, "from": str, "to": str, "date": date}, ...]
+
+        Returns:
+            Her kalem için dönüşüm sonucu (kur bulunamazsa error alanı dolu)
+        """
+        if not items:
+            return []
+
+        min_date = min(item["date"] for item in items)
+        max_date = max(item["date"] for item in items)
+
+        # 1. Tur: doğrudan + ters çiftler
+        direct_pairs: Set[Pair] = set()
+        for item in items:
+            if item["from"] != item["to"]:
+                direct_pairs.add((item["from"], item["to"]))
+                direct_pairs.add((item["to"], item["from"]))
+        self.load(sorted(direct_pairs), min_date, max_date)
+
+        # 2. Tur: yalnızca çözülemeyen kalemler için TRY bacakları
+        leg_pairs: Set[Pair] = set()
+        for item in items:
+            if item["from"] == item["to"] or BASE_CURRENCY in (item["from"], item["to"]):
+                continue
+            if self._resolve_leg(item["from"], item["to"], item["date"]) is None:
+                for currency in (item["from"], item["to"]):
+                    leg_pairs.add((currency, BASE_CURRENCY))
+                    leg_pairs.add((BASE_CURRENCY, currency))
+        if leg_pairs:
+            self.load(sorted(leg_pairs), min_date, max_date)
+
+        return [self._convert_one(index, item) for index, item in enumerate(items)]
+
+    def _convert_one(self, index: int, item: dict) -> dict:
+        amount = item["amount"]
+        currency_from = item["from"]
+        currency_to = item["to"]
+        target_date = item["date"]
+
+        result = {
+            "index": index,
+            "amount": amount,
+            "from": currency_from,
+            "to": currency_to,
+            "target_date": target_date.isoformat(),
+            "rate": None,
+            "converted_amount": None,
+            "used_rate_date": None,
+            "is_fallback": False,
+            "via": None,
+            "error": None,
+        }
+
+        if currency_from == currency_to:
+            result.update(rate=1.0, converted_amount=amount, used_rate_date=target_date.isoformat())
+            return result
+
+        resolved, via = self.resolve(currency_from, currency_to, target_date)
+        if resolved is None:
+            result["error"] = "Kur bulunamadı (fallback dahil)"
+            return result
+
+        result.update(
+            rate=resolved.rate,
+            converted_amount=round(amount * resolved.rate, 2),
+            used_rate_date=resolved.rate_date.isoformat(),
+            is_fallback=resolved.rate_date != target_date,
+            via=via,
+        )
+        return result
@@ -8,7 +8,7 @@ import os
 import logging
 
 from ...config.database import get_db
-from ...core.responses import success_response, error_response, paginated_response
+from ...core.responses import success_response, error_response, fast_paginated_response
 from ...core.error_codes import ErrorCode, get_http_status_for_error
 from ...core.cache import cache_key, cached_get_or_set, cache
 from ...integrations.evds_client import EVDSClient, EVDSAPIError
@@ -20,8 +20,10 @@ from .schemas import (
     ExchangeRateUpdate,
     BulkExchangeRateRequest,
     FetchAPIRequest,
-    FetchTCMBRequest
+    FetchTCMBRequest,
+    ConvertBatchRequest
 )
+from .conversion import RateBook
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -90,8 +92,7 @@ def get_exchange_rates(
         query = query.order_by(ExchangeRateModel.RateDate.desc(), ExchangeRateModel.Id.desc())
         skip = (page - 1) * page_size
         items = query.offset(skip).limit(page_size).all()
-        data = [ExchangeRate.model_validate(r).model_dump() for r in items]
-        return paginated_response(data=data, page=page, page_size=page_size, total=total, message="Kurlar listelendi")
+        return fast_paginated_response(rows=items, schema=ExchangeRate, page=page, page_size=page_size, total=total, message="Kurlar listelendi")
     except Exception as e:
         raise HTTPException(status_code=500, detail=error_response(code=ErrorCode.INTERNAL_SERVER_ERROR, message="Kurlar listelenemedi", details={"error": str(e)}))
 
@@ -322,6 +323,42 @@ def convert_currency(
     }, message=msg)
 
 
+@router.post("/convert/batch")
+def convert_currency_batch(request: ConvertBatchRequest, db: Session = Depends(get_db)):
+    """
+    Toplu kur dönüşümü (fatura/rapor satırları için).
+
+    Gerekli kurlar para birimi çifti başına tek aralık sorgusuyla yüklenir;
+    doğrudan/ters kur yoksa TRY üzerinden çapraz kur kullanılır.
+    Sonuçlar girdi sırasıyla döner; kur bulunamayan kalemlerde `error` doludur.
+    """
+    today = date.today()
+    items = [
+        {
+            "amount": item.amount,
+            "from": item.from_currency.upper(),
+            "to": item.to_currency.upper(),
+            "date": item.date or today,
+        }
+        for item in request.items
+    ]
+
+    book = RateBook(db)
+    results = book.convert_many(items)
+    failed = sum(1 for r in results if r["error"])
+
+    msg = f"{len(results)} kalem dönüştürüldü"
+    if failed:
+        msg += f" ({failed} kalem için kur bulunamadı)"
+
+    return success_response(data={
+        "results": results,
+        "total": len(results),
+        "failed": failed,
+        "query_count": book.query_count
+    }, message=msg)
+
+
 @router.get("/{rate_id}")
 def get_exchange_rate(rate_id: int, db: Session = Depends(get_db)):
     """ID ile kur kaydı."""
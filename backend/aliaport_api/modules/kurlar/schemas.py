@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import date, datetime
+from datetime import date as date_type
 from typing import Optional, List, Generic, TypeVar
 
 T = TypeVar('T')
@@ -79,3 +80,16 @@ class FetchAPIRequest(BaseModel):
 class FetchTCMBRequest(FetchAPIRequest):
     """TCMB XML API request (geriye dönük uyumluluk)"""
     pass
+
+class ConvertBatchItem(BaseModel):
+    """Toplu dönüşüm kalemi"""
+    amount: float = Field(..., gt=0, description="Dönüştürülecek tutar")
+    from_currency: str = Field(..., alias="from", max_length=10, description="Kaynak para birimi")
+    to_currency: str = Field(..., alias="to", max_length=10, description="Hedef para birimi")
+    date: Optional[date_type] = Field(None, description="Kur tarihi (opsiyonel, default: bugün)")
+
+    model_config = {"populate_by_name": True}
+
+class ConvertBatchRequest(BaseModel):
+    """Toplu kur dönüşümü request (fatura/rapor satırları)"""
+    items: List[ConvertBatchItem] = Field(..., max_length=5000, description="Dönüştürülecek kalemler (girdi sırası korunur)")
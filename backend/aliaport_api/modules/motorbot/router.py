@@ -8,7 +8,7 @@ from ...config.database import get_db
 from ...core import (
     success_response,
     error_response,
-    paginated_response,
+    fast_paginated_response,
     ErrorCode,
     get_http_status_for_error
 )
@@ -55,11 +55,10 @@ def list_trips(
             MbTrip.Id.desc()
         ).offset(offset).limit(page_size).all()
         
-        # Convert to Pydantic models and then to dicts
-        trip_list = [MbTripOut.model_validate(item).model_dump() for item in items]
-        
-        return paginated_response(
-            data=trip_list,
+        # ORM -> JSON byte'ları (cache'li şema serializer)
+        return fast_paginated_response(
+            rows=items,
+            schema=MbTripOut,
             page=page,
             page_size=page_size,
             total=total,
@@ -263,11 +262,10 @@ def list_motorbotlar(
         offset = (page - 1) * page_size
         items = query.order_by(Motorbot.Kod).offset(offset).limit(page_size).all()
         
-        # Convert to Pydantic models and then to dicts
-        motorbot_list = [MotorbotOut.model_validate(item).model_dump() for item in items]
-        
-        return paginated_response(
-            data=motorbot_list,
+        # ORM -> JSON byte'ları (cache'li şema serializer)
+        return fast_paginated_response(
+            rows=items,
+            schema=MotorbotOut,
             page=page,
             page_size=page_size,
             total=total,
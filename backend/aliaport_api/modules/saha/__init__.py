@@ -2,7 +2,10 @@
 SAHA PERSONEL MODÜLÜ - Package Init
 """
 
-from .router import router
+from ...core.lazy_import import lazy_exports
+
+# Router ilk erişimde yüklenir (models import'u router zincirini tetiklemez)
+__getattr__ = lazy_exports(globals(), router=".router:router")
 from .models import WorkLog
 from .schemas import WorkLogCreate, WorkLogUpdate, WorkLogResponse, WorkLogStats
 
@@ -9,7 +9,7 @@ from typing import List, Optional
 from datetime import datetime, date
 
 from ...config.database import get_db
-from ...core.responses import success_response, error_response, paginated_response
+from ...core.responses import success_response, error_response, paginated_response, fast_paginated_response
 from ...core.error_codes import ErrorCode, get_http_status_for_error
 from .models import WorkLog
 from .schemas import WorkLogCreate, WorkLogUpdate, WorkLogResponse, WorkLogStats
@@ -51,11 +51,10 @@ def get_worklogs(
     # Sıralama ve pagination
     worklogs = query.order_by(WorkLog.created_at.desc()).offset((page - 1) * page_size).limit(page_size).all()
     
-    # Serialize
-    items = [WorkLogResponse.model_validate(log) for log in worklogs]
-    
-    return paginated_response(
-        data=items,
+    # Serialize (ORM -> JSON byte'ları, cache'li şema serializer)
+    return fast_paginated_response(
+        rows=worklogs,
+        schema=WorkLogResponse,
         page=page,
         page_size=page_size,
         total=total
@@ -0,0 +1,384 @@
+"""
+SGK hizmet dökümü toplu içe aktarma.
+
+Bir dizindeki (geçmiş dönemlere ait) SGK PDF'lerini okuyup firmalara göre
+mutabakat yapar:
+
+1. Dosyalar taranır, SHA-256 checksum'ı hesaplanır. Parse deposunda
+   (parse_store) sonucu olan dosyalar tekrar okunmaz.
+2. Kalan PDF'ler süreç havuzunda (ProcessPoolExecutor) portal endpoint'iyle
+   aynı parser'larla (pdf_parser.parse_sgk_pdf) parse edilir; pdfminer CPU
+   yoğun olduğu için thread yerine süreç kullanılır.
+3. Sonuçlar firmaya göre gruplanır; her firma dönem sırasıyla
+   reconcile_sgk_employees ile eşitlenir, SgkPeriodCheck kayıtları yazılır,
+   materialize SGK durumları yenilenir ve firma başına tek commit yapılır.
+   Yalnızca firmanın en güncel dönemi çalışan ekler ve eski alanları günceller;
+   daha eski dökümlerdeki bilinmeyen TC'ler extra olarak raporlanır.
+4. Dosya başına satır içeren rapor (CSV) ve throughput/hata özeti üretilir.
+
+Firma eşleştirme: `cari_kod` verilirse tüm dosyalar o firmaya aittir; aksi halde
+dosya yolundaki klasör adları CariKod ile (storage segment formatında)
+eşleştirilir - portal yüklemelerinin dizin yapısı (YYYY/CARIKOD/YYYYMM/) doğrudan
+kullanılabilir. Dönem PDF'ten okunamazsa dosya yolundaki YYYYMM kullanılır.
+
+Kullanım: backend/scripts/ingest_sgk_pdfs.py
+"""
+
+import csv
+import hashlib
+import logging
+import re
+import shutil
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ...config.storage import get_base_sgk_dir, sanitize_storage_segment
+from ..cari.models import Cari
+from ..dijital_arsiv.sgk_reconciliation import latest_ok_period, reconcile_sgk_employees
+from ..dijital_arsiv.sgk_status import refresh_sgk_status
+from .models import SgkPeriodCheck
+from .parse_store import ParsedSgkDocument, get_parse_result, save_parse_result
+from .pdf_parser import SGK_MIN_TC_COUNT, parse_sgk_pdf
+
+logger = logging.getLogger(__name__)
+
+PATH_PERIOD_REGEX = re.compile(r"(?<!\d)(20\d{2})(0[1-9]|1[0-2])(?!\d)")
+
+# Dosya durumları
+STATUS_OK = "OK"
+STATUS_DUPLICATE = "DUPLICATE"
+STATUS_FAILED_PARSE = "FAILED_PARSE"
+STATUS_NO_FIRM = "NO_FIRM"
+STATUS_NO_PERIOD = "NO_PERIOD"
+STATUS_ERROR = "ERROR"
+
+
+@dataclass
+class ParsedFile:
+    """Süreç havuzundan dönen parse sonucu"""
+    path: str
+    checksum: str
+    file_size: int
+    document: Optional[ParsedSgkDocument] = None
+    parse_ms: float = 0.0
+    from_store: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class FileReport:
+    """Rapordaki dosya satırı"""
+    path: str
+    status: str
+    cari_kod: str = ""
+    period: str = ""
+    tc_count: int = 0
+    matched_employee_count: int = 0
+    missing_employee_count: int = 0
+    new_employees_added: int = 0
+    parse_ms: float = 0.0
+    from_store: bool = False
+    error: str = ""
+
+
+@dataclass
+class IngestReport:
+    """Toplu içe aktarma sonucu"""
+    files: List[FileReport] = field(default_factory=list)
+    total_bytes: int = 0
+    parse_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+    workers: int = 1
+
+    def count(self, status: str) -> int:
+        return sum(1 for f in self.files if f.status == status)
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for f in self.files if f.status not in (STATUS_OK, STATUS_DUPLICATE))
+
+    def summary(self) -> Dict:
+        elapsed = self.elapsed_seconds or 1e-9
+        statuses: Dict[str, int] = defaultdict(int)
+        for f in self.files:
+            statuses[f.status] += 1
+        return {
+            "files": len(self.files),
+            "statuses": dict(statuses),
+            "failed": self.failed,
+            "failure_rate": round(self.failed / len(self.files), 4) if self.files else 0.0,
+            "parsed_from_store": sum(1 for f in self.files if f.from_store),
+            "workers": self.workers,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "parse_cpu_seconds": round(self.parse_seconds, 3),
+            "files_per_second": round(len(self.files) / elapsed, 2),
+            "mb_per_second": round(self.total_bytes / 1024 / 1024 / elapsed, 2),
+            "tc_per_second": round(sum(f.tc_count for f in self.files) / elapsed, 1),
+        }
+
+    def write_csv(self, destination: str) -> None:
+        columns = [f.name for f in fields(FileReport)]
+        with open(destination, "w", newline="", encoding="utf-8") as output:
+            writer = csv.DictWriter(output, fieldnames=columns, delimiter=";")
+            writer.writeheader()
+            for row in self.files:
+                writer.writerow(asdict(row))
+
+
+# ============================================
+# PARSE (süreç havuzu)
+# ============================================
+
+def discover_sgk_files(root: Path) -> List[Path]:
+    """Dizindeki PDF'leri (alt klasörler dahil) sıralı döner."""
+    return sorted(p for p in root.rglob("*") if p.is_file() and p.suffix.lower() == ".pdf")
+
+
+def parse_sgk_file(path: str) -> ParsedFile:
+    """Tek PDF'i okuyup parse eder (havuz worker'ında çalışır, DB'ye dokunmaz)."""
+    start = time.perf_counter()
+    try:
+        file_bytes = Path(path).read_bytes()
+        document = parse_sgk_pdf(file_bytes)
+        return ParsedFile(
+            path=path,
+            checksum=hashlib.sha256(file_bytes).hexdigest(),
+            file_size=len(file_bytes),
+            document=document,
+            parse_ms=(time.perf_counter() - start) * 1000,
+        )
+    except Exception as exc:
+        return ParsedFile(path=path, checksum="", file_size=0, error=f"{type(exc).__name__}: {exc}")
+
+
+def parse_files(db: Session, paths: Iterable[Path], workers: int) -> Iterator[ParsedFile]:
+    """
+    Dosyaları parse eder; deposunda sonucu olanlar havuza gönderilmez, aynı
+    içerikli dosyalar (aynı checksum) bir kez parse edilir.
+
+    workers <= 1 ise aynı süreçte sırayla çalışır.
+    """
+    pending: Dict[str, List[str]] = {}  # checksum -> yollar
+    for path in paths:
+        file_bytes = path.read_bytes()
+        checksum = hashlib.sha256(file_bytes).hexdigest()
+        if checksum in pending:
+            pending[checksum].append(str(path))
+            continue
+        stored = get_parse_result(db, checksum)
+        if stored is not None:
+            yield ParsedFile(path=str(path), checksum=checksum, file_size=len(file_bytes), document=stored, from_store=True)
+        else:
+            pending[checksum] = [str(path)]
+
+    first_paths = [path_list[0] for path_list in pending.values()]
+    if workers <= 1:
+        results = map(parse_sgk_file, first_paths)
+        yield from _expand_duplicates(results, pending)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Sıra korunur; chunksize küçük tutulur ki büyük PDF'ler işi tıkamasın
+        yield from _expand_duplicates(executor.map(parse_sgk_file, first_paths, chunksize=1), pending)
+
+
+def _expand_duplicates(results: Iterable[ParsedFile], pending: Dict[str, List[str]]) -> Iterator[ParsedFile]:
+    for path_list, parsed in zip(pending.values(), results):
+        yield parsed
+        for path in path_list[1:]:
+            yield replace(parsed, path=path, parse_ms=0.0)
+
+
+# ============================================
+# MUTABAKAT (firma bazında)
+# ============================================
+
+def period_from_path(path: Path) -> Optional[str]:
+    """Dosya yolundaki son YYYYMM ifadesini döner."""
+    matches = PATH_PERIOD_REGEX.findall(str(path))
+    if not matches:
+        return None
+    year, month = matches[-1]
+    return f"{year}{month}"
+
+
+def _resolve_firm(path: Path, root: Path, firms_by_segment: Dict[str, Cari]) -> Optional[Cari]:
+    for part in reversed(path.relative_to(root).parts[:-1]):
+        firm = firms_by_segment.get(sanitize_storage_segment(part))
+        if firm:
+            return firm
+    return None
+
+
+def _storage_key(source: Path, firm: Cari, period: str, checksum: str) -> str:
+    """Dosyayı SGK storage yapısına kopyalar (zaten oradaysa kopyalamaz)."""
+    base_dir = get_base_sgk_dir()
+    try:
+        return source.resolve().relative_to(base_dir).as_posix()
+    except ValueError:
+        pass
+    firma_segment = sanitize_storage_segment(firm.CariKod or f"FIRMA_{firm.Id}")
+    storage_dir = base_dir / period[:4] / firma_segment / period
+    storage_dir.mkdir(parents=True, exist_ok=True)
+    filename = f"sgk_{firma_segment}_{period}_{checksum[:12]}.pdf"
+    shutil.copyfile(source, storage_dir / filename)
+    return "/".join([period[:4], firma_segment, period, filename])
+
+
+def ingest_directory(
+    db: Session,
+    root: Path,
+    cari_kod: Optional[str] = None,
+    workers: int = 4,
+    uploaded_by_user_id: Optional[int] = None,
+) -> IngestReport:
+    """
+    Dizindeki SGK PDF'lerini içe aktarır.
+
+    Her firma kendi transaction'ında işlenir; bir firmadaki hata diğerlerini
+    etkilemez (o firmanın dosyaları ERROR olarak raporlanır).
+    """
+    start = time.perf_counter()
+    root = Path(root)
+    report = IngestReport(workers=max(workers, 1))
+
+    if cari_kod:
+        fixed_firm = db.query(Cari).filter(Cari.CariKod == cari_kod).first()
+        if fixed_firm is None:
+            raise ValueError(f"Cari bulunamadı: {cari_kod}")
+        firms_by_segment: Dict[str, Cari] = {}
+    else:
+        fixed_firm = None
+        firms_by_segment = {sanitize_storage_segment(c.CariKod): c for c in db.query(Cari).all() if c.CariKod}
+
+    # firma -> [(dönem, ParsedFile, FileReport)]
+    by_firm: Dict[int, list] = defaultdict(list)
+    firms: Dict[int, Cari] = {}
+    new_results: Dict[str, ParsedSgkDocument] = {}
+
+    for parsed in parse_files(db, discover_sgk_files(root), workers):
+        path = Path(parsed.path)
+        row = FileReport(path=str(path.relative_to(root)), status=STATUS_OK, parse_ms=round(parsed.parse_ms, 1), from_store=parsed.from_store)
+        report.files.append(row)
+        report.total_bytes += parsed.file_size
+        report.parse_seconds += parsed.parse_ms / 1000
+
+        if parsed.error or parsed.document is None:
+            row.status, row.error = STATUS_ERROR, parsed.error or ""
+            continue
+        if not parsed.from_store:
+            new_results[parsed.checksum] = parsed.document
+
+        document = parsed.document
+        row.tc_count = len(document.employees)
+        period = document.period or period_from_path(path.relative_to(root))
+        firm = fixed_firm or _resolve_firm(path, root, firms_by_segment)
+        row.period = period or ""
+        row.cari_kod = firm.CariKod if firm else ""
+        if firm is None:
+            row.status = STATUS_NO_FIRM
+            continue
+        if period is None:
+            row.status = STATUS_NO_PERIOD
+            continue
+        firms[firm.Id] = firm
+        by_firm[firm.Id].append((period, parsed, row))
+
+    # Yeni parse sonuçları depoya (sonraki çalıştırmalar PDF'i okumaz)
+    for checksum, document in new_results.items():
+        save_parse_result(db, checksum, document)
+    db.commit()
+
+    for firm_id, items in by_firm.items():
+        firm = firms[firm_id]
+        try:
+            _ingest_firm(db, firm, items, root, uploaded_by_user_id)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            logger.exception("SGK bulk ingest failed for firm %s", firm.CariKod)
+            for _, _, row in items:
+                row.status, row.error = STATUS_ERROR, f"{type(exc).__name__}: {exc}"
+
+    report.elapsed_seconds = time.perf_counter() - start
+    return report
+
+
+def _ingest_firm(db: Session, firm: Cari, items: list, root: Path, uploaded_by_user_id: Optional[int]) -> None:
+    """Bir firmanın dosyalarını dönem sırasıyla eşitler (commit etmez)."""
+    checksums = {parsed.checksum for _, parsed, _ in items}
+    already_ingested = {
+        (period, checksum)
+        for period, checksum in db.query(SgkPeriodCheck.period, SgkPeriodCheck.checksum).filter(
+            SgkPeriodCheck.firma_id == firm.Id,
+            SgkPeriodCheck.status == "OK",
+            SgkPeriodCheck.checksum.in_(checksums),
+        )
+    }
+
+    # Eski alanlar ve yeni çalışan kayıtları yalnızca firmanın en güncel dönemi
+    # (veritabanı + bu çalıştırma) için yazılır; geçmiş dönem dökümü çalışanları
+    # eski döneme geri çekmez, ayrılmış çalışanları aktif olarak geri getirmez
+    latest_period = max(
+        [latest_ok_period(db, firm.Id)]
+        + [
+            period for period, parsed, _ in items
+            if (period, parsed.checksum) not in already_ingested
+            and len(parsed.document.employees) >= SGK_MIN_TC_COUNT
+        ]
+    )
+
+    reconciled = False
+    for period, parsed, row in sorted(items, key=lambda item: (item[0], item[1].path)):
+        if (period, parsed.checksum) in already_ingested:
+            row.status = STATUS_DUPLICATE
+            continue
+        already_ingested.add((period, parsed.checksum))
+
+        employees = parsed.document.employees
+        check = SgkPeriodCheck(
+            firma_id=firm.Id,
+            period=period,
+            storage_key=_storage_key(Path(parsed.path), firm, period, parsed.checksum),
+            file_size=parsed.file_size,
+            checksum=parsed.checksum,
+            uploaded_by_user_id=uploaded_by_user_id,
+            uploaded_at=datetime.utcnow(),
+        )
+        if len(employees) < SGK_MIN_TC_COUNT:
+            check.status = STATUS_FAILED_PARSE
+            row.status = STATUS_FAILED_PARSE
+            db.add(check)
+            continue
+
+        update_legacy_fields = period >= latest_period
+        result = reconcile_sgk_employees(db, firm.Id, period, employees, update_legacy_fields=update_legacy_fields)
+        check.status = "OK"
+        check.matched_employee_count = row.matched_employee_count = result.matched_employee_count
+        check.missing_employee_count = row.missing_employee_count = result.missing_employee_count
+        check.extra_in_sgk_count = result.extra_in_sgk_count
+        row.new_employees_added = result.new_employees_added
+        db.add(check)
+        reconciled = True
+
+    if reconciled:
+        refresh_sgk_status(db, cari_id=firm.Id)
+
+
+__all__ = [
+    "FileReport",
+    "IngestReport",
+    "ParsedFile",
+    "discover_sgk_files",
+    "ingest_directory",
+    "parse_files",
+    "parse_sgk_file",
+    "period_from_path",
+]
@@ -1,7 +1,7 @@
 """SGK entegrasyonuna ait SQLAlchemy modelleri."""
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary
 from sqlalchemy.orm import relationship
 
 from ...config.database import Base
@@ -29,3 +29,26 @@ class SgkPeriodCheck(Base):
 
     def __repr__(self) -> str:  # pragma: no cover - debugging helper
         return f"<SgkPeriodCheck {self.period} firma={self.firma_id} status={self.status}>"
+
+
+class SgkParseResult(Base):
+    """
+    SGK hizmet dökümü parse sonucu (PDF'in SHA-256 checksum'ı ile anahtarlanır).
+
+    Aynı dosya tekrar yüklendiğinde veya yeniden mutabakat yapıldığında PDF
+    tekrar okunmaz. TC/ad listesi sıkıştırılmış olarak `payload` alanında tutulur
+    (bkz. parse_store.encode_employees).
+    """
+    __tablename__ = "sgk_parse_result"
+
+    id = Column(Integer, primary_key=True)
+    checksum = Column(String(64), nullable=False, unique=True, index=True)  # SgkPeriodCheck.checksum
+    parser_version = Column(Integer, nullable=False, default=1)
+    period = Column(String(6), nullable=True)  # PDF'ten okunan dönem (YYYYMM), bulunamadıysa None
+    employee_count = Column(Integer, nullable=False, default=0)
+    payload = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_used_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:  # pragma: no cover - debugging helper
+        return f"<SgkParseResult {self.checksum[:12]} period={self.period} employees={self.employee_count}>"
@@ -0,0 +1,123 @@
+"""
+SGK hizmet dökümü parse sonuç deposu.
+
+PDF'ten okunan dönem ve {tc_no: ad_soyad} listesi, dosyanın SHA-256
+checksum'ı (SgkPeriodCheck.checksum) ile saklanır:
+
+- Aynı PDF tekrar yüklendiğinde (aynı veya düzeltilmiş dönem) pdfminer
+  çalıştırılmaz.
+- Geçmiş bir yükleme, PDF'e dokunmadan yeniden mutabakata sokulabilir.
+
+Saklama formatı: "tc\\tad_soyad" satırları (TC sıralı), UTF-8, zlib ile
+sıkıştırılmış. 5.000 kişilik bir döküm birkaç on KB tutar.
+
+Parser değiştiğinde PARSER_VERSION artırılır; eski sürümle üretilmiş kayıtlar
+ilk kullanımda yeniden parse edilip güncellenir.
+"""
+
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .models import SgkParseResult
+
+PARSER_VERSION = 1
+
+
+@dataclass
+class ParsedSgkDocument:
+    """PDF'ten okunan hizmet dökümü içeriği"""
+    period: Optional[str]  # YYYYMM
+    employees: Dict[str, str]  # {tc_no: ad_soyad}
+
+
+def encode_employees(employees: Dict[str, str]) -> bytes:
+    """{tc: ad} listesini sıkıştırılmış satır formatına çevirir."""
+    lines = "\n".join(f"{tc}\t{employees[tc]}" for tc in sorted(employees))
+    return zlib.compress(lines.encode("utf-8"), 6)
+
+
+def decode_employees(payload: bytes) -> Dict[str, str]:
+    """encode_employees çıktısını {tc: ad} sözlüğüne geri çevirir."""
+    text = zlib.decompress(payload).decode("utf-8")
+    if not text:
+        return {}
+    employees = {}
+    for line in text.split("\n"):
+        tc, _, name = line.partition("\t")
+        employees[tc] = name
+    return employees
+
+
+def get_parse_result(db: Session, checksum: Optional[str]) -> Optional[ParsedSgkDocument]:
+    """Checksum için güncel parser sürümüyle üretilmiş sonucu döner (yoksa None)."""
+    if not checksum:
+        return None
+    record = db.query(SgkParseResult).filter(SgkParseResult.checksum == checksum).first()
+    if record is None or record.parser_version != PARSER_VERSION:
+        return None
+    record.last_used_at = datetime.utcnow()
+    return ParsedSgkDocument(period=record.period, employees=decode_employees(record.payload))
+
+
+def save_parse_result(db: Session, checksum: str, parsed: ParsedSgkDocument) -> SgkParseResult:
+    """Parse sonucunu kaydeder veya eski sürüm kaydın üzerine yazar (commit etmez)."""
+    record = db.query(SgkParseResult).filter(SgkParseResult.checksum == checksum).first()
+    if record is None:
+        record = SgkParseResult(checksum=checksum)
+        db.add(record)
+    now = datetime.utcnow()
+    record.parser_version = PARSER_VERSION
+    record.period = parsed.period
+    record.employee_count = len(parsed.employees)
+    record.payload = encode_employees(parsed.employees)
+    record.created_at = now
+    record.last_used_at = now
+    return record
+
+
+def get_or_parse(
+    db: Session,
+    checksum: str,
+    parse: Callable[[], ParsedSgkDocument],
+) -> tuple[ParsedSgkDocument, bool]:
+    """
+    Depodaki sonucu döner; yoksa `parse()` çağrılır ve sonuç kaydedilir (commit etmez).
+
+    Kayıt SAVEPOINT içinde yazılır: aynı dosya eşzamanlı yüklenip diğer istek
+    kaydı önce yazdıysa (IntegrityError) yalnızca savepoint geri alınır,
+    çağıranın bekleyen değişiklikleri korunur. Yüklemenin geri kalanı
+    reddedilse bile sonucun saklanması için çağıran commit eder.
+    (pysqlite: açık transaction yokken SAVEPOINT'in RELEASE'i yalnızca bu
+    kaydı commit eder; çağıranın bekleyen yazımları begin_nested öncesinde
+    flush edildiği için bu durumda zaten yoktur.)
+
+    Returns:
+        (parse sonucu, depodan mı geldi)
+    """
+    stored = get_parse_result(db, checksum)
+    if stored is not None:
+        return stored, True
+    parsed = parse()
+    try:
+        with db.begin_nested():
+            save_parse_result(db, checksum, parsed)
+    except IntegrityError:
+        # Aynı dosya eşzamanlı yüklendi; diğer istek kaydı yazdı
+        pass
+    return parsed, False
+
+
+__all__ = [
+    "PARSER_VERSION",
+    "ParsedSgkDocument",
+    "decode_employees",
+    "encode_employees",
+    "get_or_parse",
+    "get_parse_result",
+    "save_parse_result",
+]
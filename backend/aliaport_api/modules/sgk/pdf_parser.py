@@ -0,0 +1,205 @@
+"""
+SGK hizmet dökümü PDF parser'ları.
+
+Portal yükleme endpoint'i ve toplu içe aktarma (bulk_ingest) aynı
+fonksiyonları kullanır. Metin çıkarma (pdfminer) ile metin parse'ı ayrıdır;
+parse_sgk_pdf metni bir kez çıkarır, hem dönemi hem TC/ad listesini okur.
+
+Fonksiyonlar yalnızca byte/metin alır ve modül seviyesinde tanımlıdır; süreç
+havuzunda (ProcessPoolExecutor) pickle edilerek çalıştırılabilir.
+"""
+
+import logging
+import re
+from io import BytesIO
+from typing import Dict, Optional
+
+from ...core.lazy_import import lazy_import
+from .parse_store import ParsedSgkDocument
+
+logger = logging.getLogger(__name__)
+
+# pdfminer ağır bir bağımlılık; yalnızca SGK PDF parse edilirken yüklenir
+pdfminer_high_level = lazy_import("pdfminer.high_level")
+
+TC_REGEX = re.compile(r"\b[1-9][0-9]{10}\b")
+# Bundan az TC içeren döküm okunamamış sayılır (FAILED_PARSE)
+SGK_MIN_TC_COUNT = 3
+
+
+def extract_pdf_text(file_bytes: bytes) -> str:
+    """PDF'in metnini çıkarır; okunamazsa boş string döner."""
+    try:
+        return pdfminer_high_level.extract_text(BytesIO(file_bytes)) or ""
+    except Exception as e:
+        logger.error(f"PDF extract HATA: {e}")
+        return ""
+
+
+def parse_sgk_employees(text: str) -> Dict[str, str]:
+    """
+    SGK PDF metninden çalışan bilgilerini çıkar - INDEX BAZLI EŞLEŞTİRME.
+    Returns: {tc_no: full_name} dict
+
+    Yaklaşım:
+    1. Tüm TC numaralarını topla (sırayla)
+    2. TC'den 2 satır sonrasındaki tüm kelimeleri topla (AD listesi)
+    3. INDEX bazlı eşleştir: TC[i] => AD[i] + SOYAD[i]
+    """
+    if not text:
+        logger.warning("PDF boş text döndü")
+        return {}
+
+    lines = [line.strip() for line in text.split('\n')]
+    logger.info(f"SGK PDF parsing: {len(lines)} satır bulundu")
+    
+    # 1. ADIM: Tüm TC'leri topla ve pozisyonlarını kaydet
+    tc_list = []
+    tc_positions = {}  # {line_index: tc_no}
+    
+    for i, line in enumerate(lines):
+        if not line:
+            continue
+        tc_match = TC_REGEX.search(line)
+        if tc_match:
+            tc_no = tc_match.group(0)
+            tc_list.append(tc_no)
+            tc_positions[i] = tc_no
+    
+    logger.info(f"📋 {len(tc_list)} TC numarası bulundu")
+    
+    # 2. ADIM: Her TC için +2 offset'teki satırı al (AD)
+    ad_list = []
+    for i, line in enumerate(lines):
+        if i in tc_positions:
+            # TC bulundu, +2 satır sonraki kelimeleri al
+            ad_line = lines[i + 2] if i + 2 < len(lines) else ""
+            ad_words = [w for w in ad_line.split() if w.isalpha() and len(w) >= 2]
+            ad = " ".join(ad_words) if ad_words else ""
+            ad_list.append(ad)
+    
+    # 3. ADIM: Her TC için +4 veya sonraki satırlarda soyad ara
+    soyad_list = []
+    tc_indices = sorted(tc_positions.keys())
+    
+    for idx_pos, tc_idx in enumerate(tc_indices):
+        # Sonraki TC'nin pozisyonu
+        next_tc_idx = tc_indices[idx_pos + 1] if idx_pos + 1 < len(tc_indices) else len(lines)
+        
+        # TC+4 ile NextTC arası first non-empty, non-TC kelime
+        soyad = ""
+        for offset in range(4, next_tc_idx - tc_idx):
+            check_idx = tc_idx + offset
+            if check_idx >= len(lines):
+                break
+            
+            check_line = lines[check_idx].strip()
+            if not check_line:
+                continue
+            
+            # TC ise atla
+            if TC_REGEX.search(check_line):
+                break
+            
+            # Kelime varsa al
+            words = [w for w in check_line.split() if w.isalpha() and len(w) >= 2]
+            if words:
+                soyad = " ".join(words)
+                break
+        
+        soyad_list.append(soyad)
+    
+    # 4. ADIM: Eşleştir
+    result = {}
+    for i, tc_no in enumerate(tc_list):
+        ad = ad_list[i] if i < len(ad_list) else ""
+        soyad = soyad_list[i] if i < len(soyad_list) else ""
+        
+        full_name = f"{ad} {soyad}".strip().upper()
+        
+        # Türkçe karakter düzeltmeleri
+        if full_name:
+            full_name = full_name.replace('î', 'İ').replace('Î', 'İ')
+            full_name = full_name.replace('û', 'Ü').replace('Û', 'Ü')
+            full_name = full_name.replace('Ü', 'Ü').replace('ü', 'ü')
+        
+        # İlk 5 kaydı logla
+        if i < 5:
+            logger.info(f"🔍 TC #{i+1}: {tc_no}")
+            logger.info(f"   AD: [{ad}]")
+            logger.info(f"   SOYAD: [{soyad}]")
+            logger.info(f"   ✅ TAM İSİM: [{full_name}]")
+        
+        # Kaydet
+        if len(full_name) >= 3:
+            result[tc_no] = full_name
+        else:
+            result[tc_no] = ""
+    
+    successful_names = sum(1 for v in result.values() if v)
+    success_rate = (successful_names * 100 // len(result)) if result else 0
+    logger.info(f"✅ SGK extraction: {len(result)} TC bulundu, {successful_names} tanesi isimli ({success_rate}%)")
+    
+    return result
+
+
+def parse_sgk_period(text: str) -> Optional[str]:
+    """
+    Extract period (YYYYMM format) from SGK PDF text.
+    Searches for patterns like: '2017-09', '2024-11', 'KASIM 2024', etc.
+    Returns normalized period in YYYYMM format or None if not found.
+    """
+    if not text:
+        return None
+
+    # Pattern 1: "Yıl - Ay" field in SGK documents (most reliable)
+    # Look for ": YYYY-M" or ": YYYY-MM" after "Yıl" or near the field labels
+    yil_ay_pattern = re.search(r':\s*(20[0-9]{2})\s*[-–]\s*([1-9]|0[1-9]|1[0-2])\b', text)
+    if yil_ay_pattern:
+        year = yil_ay_pattern.group(1)
+        month = yil_ay_pattern.group(2).zfill(2)  # Pad single digit with zero
+        return f"{year}{month}"
+    
+    # Pattern 2: YYYY-MM format anywhere in document (less reliable, but fallback)
+    pattern2 = re.search(r'\b(20[0-9]{2})[-–]\s*(0[1-9]|1[0-2])\b', text)
+    if pattern2:
+        year, month = pattern2.groups()
+        return f"{year}{month}"
+    
+    # Pattern 3: Month name + Year (Turkish months)
+    # OCAK, ŞUBAT, MART, NİSAN, MAYIS, HAZİRAN, TEMMUZ, AĞUSTOS, EYLÜL, EKİM, KASIM, ARALIK
+    month_map = {
+        'OCAK': '01', 'ŞUBAT': '02', 'MART': '03', 'NİSAN': '04',
+        'MAYIS': '05', 'HAZİRAN': '06', 'TEMMUZ': '07', 'AĞUSTOS': '08',
+        'EYLÜL': '09', 'EKİM': '10', 'KASIM': '11', 'ARALIK': '12'
+    }
+    
+    for month_name, month_num in month_map.items():
+        # Look for "EYLÜL 2017", "2017 EYLÜL", "EYLÜL AYI 2017", etc.
+        pattern = rf'\b(?:({month_name})\s*(?:AYI)?\s*(20[0-9]{{2}})|(20[0-9]{{2}})\s*(?:AYI)?\s*({month_name}))\b'
+        match = re.search(pattern, text.upper())
+        if match:
+            # Check which group matched
+            if match.group(1):  # Month Year format
+                year = match.group(2)
+            else:  # Year Month format
+                year = match.group(3)
+            return f"{year}{month_num}"
+    
+    return None
+
+
+def parse_sgk_pdf(file_bytes: bytes) -> ParsedSgkDocument:
+    """PDF metnini bir kez çıkarıp dönem ve {tc: ad} listesini okur."""
+    text = extract_pdf_text(file_bytes)
+    return ParsedSgkDocument(period=parse_sgk_period(text), employees=parse_sgk_employees(text))
+
+
+__all__ = [
+    "SGK_MIN_TC_COUNT",
+    "TC_REGEX",
+    "extract_pdf_text",
+    "parse_sgk_employees",
+    "parse_sgk_period",
+    "parse_sgk_pdf",
+]
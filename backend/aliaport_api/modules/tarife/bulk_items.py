@@ -0,0 +1,151 @@
+"""
+TARİFE KALEMLERİ - Toplu Yükleme
+
+Yıllık tarife gibi binlerce satırlık yüklemeler için:
+
+1. Satırlar tek tek PriceListItemCreate ile doğrulanır; hatalı satır tüm
+   isteği 422 ile düşürmek yerine (index, alan, mesaj) olarak raporlanır.
+   Hata listesi BULK_ITEM_ERROR_LIMIT ile sınırlıdır, toplam sayı ayrıca döner.
+2. Tarifenin mevcut kalemleri (HizmetKodu -> Id) tek sorguyla okunur ve
+   çakışmalar on_conflict moduna göre ele alınır:
+   - error:  çakışan satırlar hata sayılır (varsayılan)
+   - skip:   çakışan satırlar atlanır
+   - update: çakışan satırlar mevcut kalemin üzerine yazılır (upsert)
+3. Yeni kalemler çok satırlı INSERT ... RETURNING ile yazılır (id'ler ve
+   CreatedAt satır başına SELECT olmadan döner); güncellemeler PK ile
+   executemany UPDATE olarak gider.
+
+Herhangi bir hata varsa hiçbir şey yazılmaz. Fonksiyon commit etmez.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ...core.error_codes import ErrorCode
+from .models import PriceListItem
+from .schemas import PriceListItemCreate
+
+BULK_ITEM_MAX_ROWS = 20000
+BULK_ITEM_ERROR_LIMIT = 200
+
+
+@dataclass
+class BulkItemResult:
+    """Toplu yükleme sonucu; items satırların gönderildiği sırayla yazılan kalemlerdir"""
+    items: List[PriceListItem] = field(default_factory=list)
+    inserted: int = 0
+    updated: int = 0
+    skipped: List[int] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    error_count: int = 0
+
+    def add_error(self, index: int, code: ErrorCode, message: str, field_name: Optional[str] = None) -> None:
+        self.error_count += 1
+        if len(self.errors) < BULK_ITEM_ERROR_LIMIT:
+            self.errors.append({"index": index, "code": code.value, "field": field_name, "message": message})
+
+    def error_details(self) -> Dict[str, Any]:
+        return {
+            "errors": self.errors,
+            "error_count": self.error_count,
+            "truncated": self.error_count > len(self.errors),
+        }
+
+
+def iter_validated_rows(
+    raw_rows: Iterable[Dict[str, Any]], price_list_id: int, result: BulkItemResult
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Geçerli satırları (index, kolon dict'i) olarak üretir; hataları result'a yazar.
+
+    PriceListId verilmeyen satırlar path'teki tarifeye aittir; farklı bir tarife
+    veya aynı HizmetKodu'nun istekte tekrarı hata sayılır.
+    """
+    seen: Dict[str, int] = {}
+    for index, raw in enumerate(raw_rows):
+        try:
+            item = PriceListItemCreate.model_validate({"PriceListId": price_list_id, **raw})
+        except ValidationError as e:
+            for err in e.errors():
+                result.add_error(index, ErrorCode.VALIDATION_ERROR, err["msg"], ".".join(str(part) for part in err["loc"]))
+            continue
+        if item.PriceListId != price_list_id:
+            result.add_error(index, ErrorCode.INVALID_INPUT, "Kalem başka bir tarifeye ait", "PriceListId")
+            continue
+        if item.HizmetKodu in seen:
+            result.add_error(index, ErrorCode.DUPLICATE_ENTRY,
+                             f"HizmetKodu istekte tekrar ediyor (satır {seen[item.HizmetKodu]})", "HizmetKodu")
+            continue
+        seen[item.HizmetKodu] = index
+        yield index, item.model_dump()
+
+
+def existing_item_ids(db: Session, price_list_id: int) -> Dict[str, int]:
+    """Tarifedeki HizmetKodu -> kalem Id (kod tekrar ediyorsa en eski kalem)"""
+    rows = db.execute(
+        select(PriceListItem.HizmetKodu, func.min(PriceListItem.Id))
+        .where(PriceListItem.PriceListId == price_list_id)
+        .group_by(PriceListItem.HizmetKodu)
+    )
+    return {code: item_id for code, item_id in rows}
+
+
+def bulk_upsert_items(
+    db: Session,
+    price_list_id: int,
+    raw_rows: List[Dict[str, Any]],
+    on_conflict: str = "error",
+) -> BulkItemResult:
+    """
+    Kalemleri doğrular ve toplu yazar (commit etmez).
+
+    Args:
+        price_list_id: Hedef tarife (varlığı çağıran tarafından kontrol edilir)
+        raw_rows: İstekten gelen ham satırlar
+        on_conflict: error | skip | update
+    """
+    result = BulkItemResult()
+    rows = list(iter_validated_rows(raw_rows, price_list_id, result))
+    existing = existing_item_ids(db, price_list_id)
+
+    new_rows: List[Tuple[int, Dict[str, Any]]] = []
+    update_rows: List[Tuple[int, Dict[str, Any]]] = []
+    for index, row in rows:
+        item_id = existing.get(row["HizmetKodu"])
+        if item_id is None:
+            new_rows.append((index, row))
+        elif on_conflict == "update":
+            update_rows.append((index, {"Id": item_id, **row}))
+        elif on_conflict == "skip":
+            result.skipped.append(index)
+        else:
+            result.add_error(index, ErrorCode.DUPLICATE_ENTRY,
+                             f"Tarifede bu hizmet kodu zaten var (kalem {item_id})", "HizmetKodu")
+    if result.error_count:
+        return result
+
+    written: Dict[int, PriceListItem] = {}
+    if new_rows:
+        # RETURNING sırası garanti değil (sort_by_parameter_order SQLite'ta satır
+        # satır INSERT'e düşer); yeni satırlarda HizmetKodu tekil olduğundan onunla eşlenir
+        created = db.scalars(insert(PriceListItem).returning(PriceListItem), [row for _, row in new_rows])
+        by_code = {item.HizmetKodu: item for item in created}
+        written.update((index, by_code[row["HizmetKodu"]]) for index, row in new_rows)
+    if update_rows:
+        db.execute(update(PriceListItem), [row for _, row in update_rows])
+        refreshed = db.scalars(
+            select(PriceListItem)
+            .where(PriceListItem.Id.in_([row["Id"] for _, row in update_rows]))
+            .execution_options(populate_existing=True)
+        )
+        by_id = {item.Id: item for item in refreshed}
+        written.update((index, by_id[row["Id"]]) for index, row in update_rows)
+
+    result.items = [written[index] for index in sorted(written)]
+    result.inserted = len(new_rows)
+    result.updated = len(update_rows)
+    return result
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from ...config.database import get_db
 from ...core.responses import success_response, error_response, paginated_response
 from ...core.error_codes import ErrorCode, raise_api_error, get_http_status_for_error
+from .bulk_items import BULK_ITEM_MAX_ROWS, bulk_upsert_items
 from .models import PriceList, PriceListItem
 from .schemas import (
     PriceListResponse,
@@ -543,12 +544,23 @@ def delete_price_list_item(item_id: int, db: Session = Depends(get_db)):
 @router.post("/{price_list_id}/items/bulk")
 def create_bulk_items(
     price_list_id: int,
-    items: List[PriceListItemCreate],
+    items: List[Dict[str, Any]] = Body(..., description="Kalem satırları (PriceListItemCreate alanları; PriceListId opsiyonel)"),
+    on_conflict: str = Query("error", pattern="^(error|skip|update)$", description="Tarifede zaten olan HizmetKodu: error | skip | update"),
     db: Session = Depends(get_db),
 ):
     """
     Toplu kalem ekleme
+    
+    - Satırlar tek tek doğrulanır; hatalar satır index'i ile döner ve hiçbir kalem yazılmaz
+    - Mevcut kalemlerle çakışma tek sorguda bulunur (on_conflict ile atla/güncelle)
+    - Yeni kalemler çok satırlı INSERT ... RETURNING ile tek transaction'da yazılır
     """
+    if len(items) > BULK_ITEM_MAX_ROWS:
+        return error_response(
+            code=ErrorCode.INVALID_INPUT,
+            message=f"Tek istekte en fazla {BULK_ITEM_MAX_ROWS} kalem yüklenebilir",
+            details={"price_list_id": price_list_id, "count": len(items)}
+        )
     try:
         # Tarife var mı kontrol et
         price_list = db.query(PriceList).filter(PriceList.Id == price_list_id).first()
@@ -559,21 +571,25 @@ def create_bulk_items(
                 details={"price_list_id": price_list_id}
             )
         
-        new_items = []
-        for item_data in items:
-            new_item = PriceListItem(**item_data.model_dump())
-            db.add(new_item)
-            new_items.append(new_item)
+        result = bulk_upsert_items(db, price_list_id, items, on_conflict=on_conflict)
+        if result.error_count:
+            db.rollback()
+            return error_response(
+                code=ErrorCode.VALIDATION_ERROR,
+                message=f"{result.error_count} satırda hata var, kalemler yazılmadı",
+                details={"price_list_id": price_list_id, **result.error_details()}
+            )
         
+        # commit nesneleri expire eder; serileştirme önce yapılır (kalem başına SELECT olmasın)
+        items_data = [PriceListItemResponse.model_validate(item).model_dump() for item in result.items]
         db.commit()
-        for item in new_items:
-            db.refresh(item)
-        
-        items_data = [PriceListItemResponse.model_validate(item).model_dump() for item in new_items]
         
         return success_response(
             data=items_data,
-            message=f"{len(items_data)} kalem toplu olarak eklendi"
+            message=(
+                f"{result.inserted} kalem toplu olarak eklendi"
+                f", {result.updated} güncellendi, {len(result.skipped)} atlandı"
+            )
         )
     except Exception as e:
         db.rollback()
@@ -0,0 +1,120 @@
+"""
+JSON ZARF BENCHMARK - büyük liste endpoint'leri
+
+Eski yol: model_validate().model_dump() (satır başına) -> paginated_response
+          -> jsonable_encoder -> stdlib json
+Yeni yol: fast_paginated_response (cache'li TypeAdapter + orjson, tek geçiş)
+
+Ayrıca /api/exchange-rate/ endpoint'i in-process TestClient ile uçtan uca ölçülür.
+
+Kullanım:
+    cd backend
+    python benchmarks/bench_json_envelope.py --rows 1000 --repeat 50
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi.encoders import jsonable_encoder
+
+from aliaport_api.core.responses import fast_paginated_response, paginated_response
+from aliaport_api.modules.kurlar.models import ExchangeRate as ExchangeRateModel
+from aliaport_api.modules.kurlar.schemas import ExchangeRate
+
+
+def make_rows(count: int):
+    base = date(2020, 1, 1)
+    return [
+        ExchangeRateModel(
+            Id=i,
+            CurrencyFrom="USD",
+            CurrencyTo="TRY",
+            Rate=30.0 + i / 1000,
+            SellRate=30.5 + i / 1000,
+            RateDate=base + timedelta(days=i),
+            Source="EVDS",
+            CreatedAt=datetime(2025, 11, 20, 10, 30),
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_path(rows) -> bytes:
+    data = [ExchangeRate.model_validate(r).model_dump() for r in rows]
+    payload = paginated_response(data=data, page=1, page_size=len(rows), total=len(rows))
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False).encode("utf-8")
+
+
+def fast_path(rows) -> bytes:
+    return fast_paginated_response(rows=rows, schema=ExchangeRate, page=1, page_size=len(rows), total=len(rows)).body
+
+
+def timeit(fn, rows, repeat: int) -> float:
+    fn(rows)  # ısınma (serializer cache)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(rows)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def bench_endpoint(rows_count: int, repeat: int) -> None:
+    """Gerçek /api/exchange-rate/ endpoint'i (in-memory SQLite) üzerinden ölçüm."""
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from aliaport_api.config.database import Base, get_db
+    from aliaport_api.main import app
+
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(make_rows(rows_count))
+    session.commit()
+
+    app.dependency_overrides[get_db] = lambda: session
+    try:
+        client = TestClient(app)
+        url = f"/api/exchange-rate/?page_size={min(rows_count, 500)}"
+        client.get(url)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            assert client.get(url).status_code == 200
+        elapsed = (time.perf_counter() - start) / repeat * 1000
+        print(f"GET {url}: {elapsed:.2f} ms/istek")
+    finally:
+        app.dependency_overrides.clear()
+        session.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Liste zarfı serileştirme karşılaştırması")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--endpoint", action="store_true", help="Uçtan uca endpoint ölçümü de yap")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    legacy_ms = timeit(legacy_path, rows, args.repeat)
+    fast_ms = timeit(fast_path, rows, args.repeat)
+
+    print(f"{args.rows} satır, {args.repeat} tekrar")
+    print(f"{'Yol':<36}{'ms/sayfa':>12}")
+    print(f"{'model_dump + jsonable_encoder':<36}{legacy_ms:>12.2f}")
+    print(f"{'fast_paginated_response':<36}{fast_ms:>12.2f}")
+    print(f"Hızlanma: {legacy_ms / fast_ms:.2f}x")
+
+    if args.endpoint:
+        bench_endpoint(args.rows, max(1, args.repeat // 5))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+LOGIN BURST BENCHMARK - event loop'ta bcrypt vs şifre havuzu
+
+Vardiya değişimi senaryosu: N kullanıcı aynı anda /api/auth/login çağırır.
+Burst sürerken ayrı bir görev /health'e düzenli istek atar; event loop
+bloklanıyorsa bu isteklerin gecikmesi login süresine yaklaşır.
+
+İki mod karşılaştırılır:
+    inline : eski davranış (bcrypt doğrudan async endpoint içinde, event loop'ta)
+    pool   : password_pool (sınırlı worker, kuyruk limiti, 503 ile yük atma)
+
+Çok çekirdekli makinede pool modu login throughput'unu da worker sayısıyla
+ölçekler; tek çekirdekte kazanım, loop'un diğer isteklere açık kalmasıdır.
+
+Kullanım:
+    cd backend
+    python benchmarks/bench_login_burst.py --users 500
+    BCRYPT_ROUNDS=10 PASSWORD_POOL_WORKERS=8 python benchmarks/bench_login_burst.py --users 500
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import httpx
+from sqlalchemy import create_engine
+
+from aliaport_api.main import app
+from aliaport_api.modules.auth.models import User
+from aliaport_api.modules.auth.service import AuthService
+from aliaport_api.modules.auth.utils import password_pool, pwd_context
+
+from benchmarks.datagen import BENCH_ADMIN_EMAIL, BENCH_ADMIN_PASSWORD, generate_dataset
+from benchmarks.load_driver import bench_database, percentile
+
+
+@contextmanager
+def inline_verification() -> Iterator[None]:
+    """Login'i eski haline döndürür: bcrypt async endpoint içinde, event loop'ta."""
+    original = AuthService.authenticate_user_async
+
+    async def authenticate_inline(db, email, password):
+        user = db.query(User).filter(User.email == email).first()
+        if not user or not pwd_context.verify(password, user.hashed_password):
+            return None
+        return user
+
+    AuthService.authenticate_user_async = staticmethod(authenticate_inline)
+    try:
+        yield
+    finally:
+        AuthService.authenticate_user_async = original
+
+
+async def _burst(users: int, probe_interval: float) -> Dict[str, float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await client.get("/health")
+        login_latencies: List[float] = []
+        probe_latencies: List[float] = []
+        statuses: Dict[int, int] = {}
+        done = asyncio.Event()
+
+        async def login() -> None:
+            start = time.perf_counter()
+            response = await client.post("/api/auth/login", json={"email": BENCH_ADMIN_EMAIL, "password": BENCH_ADMIN_PASSWORD})
+            login_latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        async def probe() -> None:
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/health")
+                probe_latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(probe_interval)
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(users)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+
+    login_latencies.sort()
+    probe_latencies.sort()
+    return {
+        "ok": statuses.get(200, 0),
+        "rejected": statuses.get(503, 0),
+        "seconds": round(elapsed, 2),
+        "logins_per_sec": round(statuses.get(200, 0) / elapsed, 1),
+        "login_p50_ms": round(percentile(login_latencies, 50), 1),
+        "login_p95_ms": round(percentile(login_latencies, 95), 1),
+        "probe_p95_ms": round(percentile(probe_latencies, 95), 1),
+        "probe_max_ms": round(probe_latencies[-1], 1) if probe_latencies else 0.0,
+    }
+
+
+def run_burst(users: int = 500, probe_interval: float = 0.05) -> Dict[str, Dict[str, float]]:
+    fd, db_path = tempfile.mkstemp(suffix=".db", prefix="aliaport_login_")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False, "timeout": 30})
+    try:
+        generate_dataset(engine, scale=0.0001)
+        results = {}
+        with bench_database(engine, app):
+            with inline_verification():
+                results["inline"] = asyncio.run(_burst(users, probe_interval))
+            results["pool"] = asyncio.run(_burst(users, probe_interval))
+        return results
+    finally:
+        engine.dispose()
+        os.unlink(db_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Login burst: inline bcrypt vs şifre havuzu")
+    parser.add_argument("--users", type=int, default=500, help="Aynı anda login olan kullanıcı")
+    parser.add_argument("--probe-interval", type=float, default=0.05, help="/health yoklama aralığı (s)")
+    args = parser.parse_args()
+
+    results = run_burst(args.users, args.probe_interval)
+    print(f"\nLogin burst: {args.users} kullanıcı, pool={password_pool.stats()['workers']} worker / "
+          f"{password_pool.max_pending} kuyruk\n")
+    columns = ("ok", "rejected", "seconds", "logins_per_sec", "login_p50_ms", "login_p95_ms", "probe_p95_ms", "probe_max_ms")
+    print(f"{'mod':<8}" + "".join(f"{c:>16}" for c in columns))
+    for mode, stats in results.items():
+        print(f"{mode:<8}" + "".join(f"{stats[c]:>16}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+MİKRO BENCHMARK'LAR - fiyat motoru, tarife index'i, SGK ayrıştırıcıları, cache
+
+Her ölçüm `repeat` tur koşturulur ve en iyi turun işlem başı süresi raporlanır
+(gürültüye en az maruz kalan tur). Sonuç sözlüğü run_suite.py raporunun
+"micro" bölümüdür: {ad: {"ops_per_sec", "us_per_op"}}.
+
+Kullanım:
+    cd backend
+    python benchmarks/bench_micro.py --employees 2000 --repeat 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from aliaport_api.core.cache import InMemoryCacheBackend
+from aliaport_api.modules.hizmet.models import CalculationType
+from aliaport_api.modules.hizmet.pricing_engine import PricingEngine
+from aliaport_api.modules.hizmet.tariff_index import ServiceTariffTimeline, TariffEntry
+from aliaport_api.modules.sgk.pdf_parser import extract_pdf_text, parse_sgk_employees, parse_sgk_pdf
+
+from benchmarks.datagen import build_sgk_pdf, synthetic_sgk_employees
+
+# (hesaplama tipi, baz fiyat, formula_params, input_data)
+PRICING_CASES = {
+    "fixed": (CalculationType.FIXED, "150.00", None, {}),
+    "per_unit": (CalculationType.PER_UNIT, "12.50", None, {"quantity": 40}),
+    "x_secondary": (CalculationType.X_SECONDARY, "0.05", {"primary_field": "weight", "secondary_field": "days", "secondary_rounding": "ceil"}, {"weight": 12500, "days": 3.4}),
+    "per_block": (CalculationType.PER_BLOCK, "80.00", {"base_weight_ton": 3, "base_time_min": 30}, {"weight": 5, "minutes": 45}),
+    "base_plus_increment": (CalculationType.BASE_PLUS_INCREMENT, "950.00", {"increment_unit": "GRT", "increment_rate": "0.03"}, {"grt": 5000}),
+    "vehicle_4h_rule": (CalculationType.VEHICLE_4H_RULE, "100.00", {"base_minutes": 240}, {"minutes": 310}),
+}
+
+
+def measure(func: Callable[[], Any], number: int, repeat: int = 3) -> Dict[str, float]:
+    """func'u `number` kez çağıran `repeat` turun en iyisi."""
+    best = float("inf")
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    per_op = best / number
+    return {"ops_per_sec": round(1 / per_op, 1) if per_op else 0.0, "us_per_op": round(per_op * 1e6, 3)}
+
+
+def bench_pricing(number: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, (calculation_type, base_price, params, input_data) in PRICING_CASES.items():
+        price = Decimal(base_price)
+        results[f"pricing.{name}"] = measure(
+            lambda: PricingEngine.calculate(calculation_type, price, params, input_data), number, repeat
+        )
+    return results
+
+
+def bench_tariff(number: int, repeat: int, tariffs: int = 200) -> Dict[str, Dict[str, float]]:
+    """Bir hizmetin `tariffs` satırlık geçmişinde "D tarihinde geçerli tarife" çözümü."""
+    rng = random.Random(42)
+    start = date(2020, 1, 1)
+    rows = []
+    for i in range(tariffs):
+        valid_from = start + timedelta(days=rng.randint(0, 365 * 5))
+        valid_to = valid_from + timedelta(days=rng.randint(30, 400)) if rng.random() < 0.8 else None
+        rows.append(TariffEntry(i + 1, valid_from, valid_to, Decimal(i + 1), "TRY", None))
+    timeline = ServiceTariffTimeline(rows)
+    days = [start + timedelta(days=rng.randint(0, 365 * 6)) for _ in range(1024)]
+    cycle = iter(range(10**12))
+    return {
+        f"tariff.build_{tariffs}": measure(lambda: ServiceTariffTimeline(rows), 1, repeat),
+        f"tariff.lookup_{tariffs}": measure(lambda: timeline.lookup(days[next(cycle) % 1024]), number, repeat),
+    }
+
+
+def bench_sgk(employees: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    pdf_bytes = build_sgk_pdf(synthetic_sgk_employees(employees))
+    text = extract_pdf_text(pdf_bytes)
+    return {
+        f"sgk.parse_text_{employees}": measure(lambda: parse_sgk_employees(text), 1, repeat),
+        f"sgk.parse_pdf_{employees}": measure(lambda: parse_sgk_pdf(pdf_bytes), 1, repeat),
+    }
+
+
+def bench_cache(number: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    cache = InMemoryCacheBackend(max_items=number * 2)
+    cache.set("bench:hit", {"value": 1}, ttl_seconds=600)
+    keys = iter(range(10**12))
+    return {
+        "cache.get_or_set_hit": measure(lambda: cache.get_or_set("bench:hit", 600, dict), number, repeat),
+        "cache.get_or_set_miss": measure(lambda: cache.get_or_set(f"bench:miss:{next(keys)}", 600, dict), number, repeat),
+    }
+
+
+def run_micro(number: int = 2000, employees: int = 2000, repeat: int = 3) -> Dict[str, Dict[str, float]]:
+    return {
+        **bench_pricing(number, repeat),
+        **bench_tariff(number, repeat),
+        **bench_sgk(employees, repeat),
+        **bench_cache(number, repeat),
+    }
+
+
+def print_micro_table(results: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'Ölçüm':<32}{'µs/işlem':>14}{'işlem/s':>14}")
+    for name, stats in results.items():
+        print(f"{name:<32}{stats['us_per_op']:>14.3f}{stats['ops_per_sec']:>14.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mikro benchmark'lar")
+    parser.add_argument("--number", type=int, default=2000, help="Tur başına çağrı (fiyat, cache)")
+    parser.add_argument("--employees", type=int, default=2000, help="SGK dökümündeki çalışan sayısı")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print_micro_table(run_micro(args.number, args.employees, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
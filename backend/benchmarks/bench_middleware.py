@@ -0,0 +1,108 @@
+"""
+MIDDLEWARE BENCHMARK - BaseHTTPMiddleware yığını vs pure-ASGI pipeline
+
+Eski yığın (RequestLoggingMiddleware + audit_middleware + security_headers) ile
+RequestPipelineMiddleware'i aynı basit endpoint üzerinde in-process karşılaştırır.
+Audit yazımı her iki tarafta no-op'tur; yalnızca middleware maliyeti ölçülür.
+
+Kullanım:
+    cd backend
+    python benchmarks/bench_middleware.py --requests 5000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import httpx
+from fastapi import FastAPI, Request
+
+from aliaport_api.middleware.asgi_pipeline import RequestPipelineMiddleware, build_security_headers
+from aliaport_api.middleware.request_logging import RequestLoggingMiddleware
+
+
+class NullSink:
+    def enqueue(self, record):
+        return True
+
+
+def _endpoint(app: FastAPI) -> None:
+    @app.get("/api/ping")
+    def ping():
+        return {"success": True, "data": {"pong": True}}
+
+
+def build_legacy_app() -> FastAPI:
+    """main.py'nin önceki middleware yığınının birebir kopyası (audit no-op)."""
+    app = FastAPI()
+    _endpoint(app)
+    app.add_middleware(RequestLoggingMiddleware)
+
+    @app.middleware("http")
+    async def audit_middleware(request: Request, call_next):
+        start = time.monotonic()
+        response = await call_next(request)
+        NullSink().enqueue({"duration_ms": int((time.monotonic() - start) * 1000)})
+        return response
+
+    @app.middleware("http")
+    async def security_headers(request: Request, call_next):
+        response = await call_next(request)
+        for name, value in build_security_headers():
+            response.headers[name.decode()] = value.decode()
+        return response
+
+    return app
+
+
+def build_pipeline_app() -> FastAPI:
+    app = FastAPI()
+    _endpoint(app)
+    app.add_middleware(RequestPipelineMiddleware, audit_sink=NullSink())
+    return app
+
+
+async def run(app: FastAPI, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Isınma
+        for _ in range(50):
+            await client.get("/api/ping")
+
+        remaining = total
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                resp = await client.get("/api/ping")
+                assert resp.status_code == 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return total / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Middleware throughput karşılaştırması")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    legacy_rps = asyncio.run(run(build_legacy_app(), args.requests, args.concurrency))
+    pipeline_rps = asyncio.run(run(build_pipeline_app(), args.requests, args.concurrency))
+
+    print(f"{'Yığın':<32}{'req/s':>12}")
+    print(f"{'BaseHTTPMiddleware (eski)':<32}{legacy_rps:>12.1f}")
+    print(f"{'RequestPipelineMiddleware':<32}{pipeline_rps:>12.1f}")
+    print(f"Hızlanma: {pipeline_rps / legacy_rps:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
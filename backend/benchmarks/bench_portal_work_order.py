@@ -0,0 +1,178 @@
+"""
+PORTAL İŞ EMRİ BENCHMARK - satır satır ORM vs toplu doğrulama + bulk INSERT
+
+Eski yol: Her hizmet kodu için ayrı Hizmet SELECT'i; kalem, çalışan, araç ve
+          kişi kayıtları tek tek ORM nesnesi olarak eklenir (doğrulama yok).
+Yeni yol: resolve_work_order_references (tür başına tek IN sorgusu, cari ve
+          aktiflik kontrolü) + insert_work_order_children (tablo başına tek
+          bulk INSERT).
+
+Senaryo: Büyük ekip talebi; N çalışan, M araç, S hizmet kodu ve N kişilik
+personel listesi. Her tur taze bir veritabanında (dosya tabanlı SQLite) ölçülür.
+
+Kullanım:
+    cd backend
+    python benchmarks/bench_portal_work_order.py --employees 200 --vehicles 30 --services 40 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from aliaport_api.config.database import Base
+from aliaport_api.main import app  # noqa: F401  (tüm modeller metadata'ya kaydolur)
+from aliaport_api.modules.cari.models import Cari
+from aliaport_api.modules.dijital_arsiv.models import PortalEmployee, PortalVehicle
+from aliaport_api.modules.dijital_arsiv.portal_work_orders import insert_work_order_children, resolve_work_order_references
+from aliaport_api.modules.hizmet.models import Hizmet
+from aliaport_api.modules.isemri.models import (
+    WorkOrder, WorkOrderEmployee, WorkOrderItem, WorkOrderItemType, WorkOrderPerson, WorkOrderStatus, WorkOrderVehicle,
+)
+
+CREATED_BY = "Benchmark"
+
+
+def _work_order(db, cari_id: int) -> WorkOrder:
+    work_order = WorkOrder(
+        wo_number=f"WO{datetime.utcnow().strftime('%Y%m%d%H%M%S%f')}", cari_id=cari_id, cari_code="BENCH",
+        cari_title="Benchmark Firma", type="HIZMET", subject="Ekip girişi", status=WorkOrderStatus.DRAFT,
+        approval_status="PENDING_APPROVAL", created_by_name=CREATED_BY,
+    )
+    db.add(work_order)
+    db.flush()
+    return work_order
+
+
+def legacy_create(db, cari_id: int, request: dict) -> WorkOrder:
+    """Eski endpoint gövdesi (hizmet başına SELECT, satır satır ORM)."""
+    work_order = _work_order(db, cari_id)
+    for service_code in request["service_codes"]:
+        hizmet = db.query(Hizmet).filter(Hizmet.Kod == service_code).first()
+        if not hizmet:
+            continue
+        unit_price = float(hizmet.Fiyat or 0)
+        vat_rate = float(hizmet.KdvOrani or 0)
+        vat_amount = round(unit_price * (vat_rate / 100), 2) if vat_rate else 0.0
+        db.add(WorkOrderItem(
+            work_order_id=work_order.id, wo_number=work_order.wo_number, item_type=WorkOrderItemType.SERVICE,
+            service_code=service_code, service_name=hizmet.Ad, quantity=1.0, unit=(hizmet.Birim or "ADET").upper(),
+            unit_price=unit_price, currency=(hizmet.ParaBirimi or "TRY").upper()[:3], total_amount=unit_price,
+            vat_rate=vat_rate, vat_amount=vat_amount, grand_total=unit_price + vat_amount,
+            notes=hizmet.Aciklama or "", created_by_name=CREATED_BY,
+        ))
+    for emp_id in request["employee_ids"]:
+        db.add(WorkOrderEmployee(work_order_id=work_order.id, employee_id=emp_id))
+    for veh_id in request["vehicle_ids"]:
+        db.add(WorkOrderVehicle(work_order_id=work_order.id, vehicle_id=veh_id))
+    for person in request["personel_list"]:
+        db.add(WorkOrderPerson(
+            work_order_id=work_order.id, full_name=person.get("full_name"), tc_kimlik_no=person.get("tc_kimlik"),
+            passport_no=person.get("pasaport"), nationality=person.get("nationality", "TUR"), phone=person.get("phone"),
+        ))
+    return work_order
+
+
+def fast_create(db, cari_id: int, request: dict) -> WorkOrder:
+    refs = resolve_work_order_references(
+        db, cari_id, request["service_codes"], request["employee_ids"], request["vehicle_ids"]
+    )
+    assert refs.is_valid, refs.invalid_details()
+    work_order = _work_order(db, cari_id)
+    insert_work_order_children(db, work_order, refs, request["personel_list"], CREATED_BY)
+    return work_order
+
+
+def seed(db, employee_count: int, vehicle_count: int, service_count: int) -> tuple:
+    cari = Cari(CariKod="BENCH", Unvan="Benchmark Firma", CariTip="GERCEK", Rol="MUSTERI")
+    db.add(cari)
+    db.flush()
+    db.bulk_insert_mappings(Hizmet, [
+        {"Kod": f"H{i:04d}", "Ad": f"Hizmet {i}", "Birim": "SAAT", "ParaBirimi": "TRY", "Fiyat": 100 + i,
+         "KdvOrani": 20, "AktifMi": True}
+        for i in range(service_count)
+    ])
+    db.bulk_insert_mappings(PortalEmployee, [
+        {"cari_id": cari.Id, "full_name": f"Çalışan {i}", "tc_kimlik": f"{10**10 + i}", "is_active": True}
+        for i in range(employee_count)
+    ])
+    db.bulk_insert_mappings(PortalVehicle, [
+        {"cari_id": cari.Id, "plaka": f"35 BN {i:04d}", "is_active": True} for i in range(vehicle_count)
+    ])
+    db.commit()
+    request = {
+        "service_codes": [f"H{i:04d}" for i in range(service_count)],
+        "employee_ids": [row.id for row in db.query(PortalEmployee.id).order_by(PortalEmployee.id)],
+        "vehicle_ids": [row.id for row in db.query(PortalVehicle.id).order_by(PortalVehicle.id)],
+        "personel_list": [
+            {"full_name": f"Misafir {i}", "tc_kimlik": f"{3 * 10**10 + i}", "phone": "5550000000"}
+            for i in range(employee_count)
+        ],
+    }
+    return cari.Id, request
+
+
+def _counts(db, work_order_id: int) -> tuple:
+    return tuple(
+        db.query(func.count()).select_from(model).filter(model.work_order_id == work_order_id).scalar()
+        for model in (WorkOrderItem, WorkOrderEmployee, WorkOrderVehicle, WorkOrderPerson)
+    )
+
+
+def run_once(fn, employee_count: int, vehicle_count: int, service_count: int) -> tuple:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        cari_id, request = seed(db, employee_count, vehicle_count, service_count)
+        start = time.perf_counter()
+        work_order = fn(db, cari_id, request)
+        db.commit()
+        elapsed = (time.perf_counter() - start) * 1000
+        counts = _counts(db, work_order.id)
+        db.close()
+        return elapsed, counts
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Portal iş emri oluşturma karşılaştırması")
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--vehicles", type=int, default=30)
+    parser.add_argument("--services", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {}
+    for name, fn in (("satır satır ORM", legacy_create), ("toplu doğrulama + bulk", fast_create)):
+        timings = []
+        for _ in range(args.repeat):
+            elapsed, counts = run_once(fn, args.employees, args.vehicles, args.services)
+            timings.append(elapsed)
+        results[name] = (min(timings), counts)
+
+    print(f"{args.employees} çalışan, {args.vehicles} araç, {args.services} hizmet, {args.repeat} tekrar (en iyi süre)")
+    print(f"{'Yol':<28}{'ms':>10}  (kalem, çalışan, araç, kişi)")
+    for name, (elapsed, counts) in results.items():
+        print(f"{name:<28}{elapsed:>10.1f}  {counts}")
+    legacy_ms = results["satır satır ORM"][0]
+    fast_ms = results["toplu doğrulama + bulk"][0]
+    assert results["satır satır ORM"][1] == results["toplu doğrulama + bulk"][1], "Kayıt sayıları farklı"
+    print(f"Hızlanma: {legacy_ms / fast_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
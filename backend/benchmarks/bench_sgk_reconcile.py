@@ -0,0 +1,144 @@
+"""
+SGK MUTABAKAT BENCHMARK - satır satır ORM vs toplu statement'lar
+
+Eski yol: Firmanın tüm PortalEmployee nesneleri yüklenir, yeni çalışanlar ve
+          dönem kayıtları tek tek eklenir/güncellenir (çalışan başına SELECT).
+Yeni yol: reconcile_sgk_employees (küme işlemleri + bulk INSERT/UPDATE).
+
+Senaryo: Firmada N çalışan var; hizmet dökümünde bunların %90'ı + %10 yeni TC
+bulunur. Her tur taze bir veritabanında (dosya tabanlı SQLite) ölçülür.
+
+Kullanım:
+    cd backend
+    python benchmarks/bench_sgk_reconcile.py --employees 5000 --repeat 3
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from aliaport_api.config.database import Base
+from aliaport_api.main import app  # noqa: F401  (tüm modeller metadata'ya kaydolur)
+from aliaport_api.modules.cari.models import Cari
+from aliaport_api.modules.dijital_arsiv.models import PortalEmployee, PortalEmployeeSgkPeriod
+from aliaport_api.modules.dijital_arsiv.sgk_reconciliation import reconcile_sgk_employees
+
+PERIOD = "202510"
+
+
+def legacy_reconcile(db, cari_id: int, period: str, sgk_employees: dict) -> tuple:
+    """Eski endpoint gövdesi (satır satır ORM)."""
+    sgk_tc_set = set(sgk_employees)
+    employees = db.query(PortalEmployee).filter(PortalEmployee.cari_id == cari_id).all()
+    employee_tc_map = {(e.tc_kimlik or "").strip(): e for e in employees if (e.tc_kimlik or "").strip()}
+    matched_tcs = sgk_tc_set.intersection(employee_tc_map.keys())
+    new_employee_tcs = sgk_tc_set - set(employee_tc_map.keys())
+    for tc_no in new_employee_tcs:
+        new_employee = PortalEmployee(
+            cari_id=cari_id, full_name=sgk_employees.get(tc_no, ""), tc_kimlik=tc_no, nationality="TUR",
+            is_active=True, sgk_last_check_period=period, sgk_is_active_last_period=True,
+        )
+        db.add(new_employee)
+        employee_tc_map[tc_no] = new_employee
+    db.flush()
+    matched_tcs = matched_tcs.union(new_employee_tcs)
+    period_code = f"{period[:4]}-{period[4:]}"
+    for tc_no in matched_tcs:
+        employee = employee_tc_map[tc_no]
+        record = db.query(PortalEmployeeSgkPeriod).filter(
+            PortalEmployeeSgkPeriod.employee_id == employee.id,
+            PortalEmployeeSgkPeriod.period_code == period_code,
+        ).first()
+        if not record:
+            db.add(PortalEmployeeSgkPeriod(employee_id=employee.id, period_code=period_code, is_active=True))
+        else:
+            record.is_active = True
+            record.updated_at = datetime.utcnow()
+    for employee in employees:
+        employee.sgk_last_check_period = period
+        employee.sgk_is_active_last_period = (employee.tc_kimlik or "").strip() in matched_tcs
+    employee_count = len(employees) + len(new_employee_tcs)
+    return len(matched_tcs), max(employee_count - len(matched_tcs), 0), len(new_employee_tcs)
+
+
+def fast_reconcile(db, cari_id: int, period: str, sgk_employees: dict) -> tuple:
+    result = reconcile_sgk_employees(db, cari_id, period, sgk_employees)
+    return result.matched_employee_count, result.missing_employee_count, result.new_employees_added
+
+
+def seed(db, employee_count: int) -> tuple:
+    cari = Cari(CariKod="BENCH", Unvan="Benchmark Firma", CariTip="GERCEK", Rol="MUSTERI")
+    db.add(cari)
+    db.flush()
+    db.bulk_insert_mappings(PortalEmployee, [
+        {"cari_id": cari.Id, "full_name": f"Çalışan {i}", "tc_kimlik": f"{10**10 + i}", "is_active": True}
+        for i in range(employee_count)
+    ])
+    # Çalışanların yarısının dönem kaydı zaten var (tekrar yükleme senaryosu)
+    ids = [row.id for row in db.query(PortalEmployee.id).order_by(PortalEmployee.id)]
+    db.bulk_insert_mappings(PortalEmployeeSgkPeriod, [
+        {"employee_id": employee_id, "period_code": f"{PERIOD[:4]}-{PERIOD[4:]}", "is_active": False}
+        for employee_id in ids[: employee_count // 2]
+    ])
+    db.commit()
+    keep = int(employee_count * 0.9)
+    sgk = {f"{10**10 + i}": "" for i in range(keep)}
+    sgk.update({f"{2 * 10**10 + i}": f"YENI {i}" for i in range(employee_count - keep)})
+    return cari.Id, sgk
+
+
+def run_once(fn, employee_count: int) -> tuple:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        cari_id, sgk = seed(db, employee_count)
+        start = time.perf_counter()
+        counts = fn(db, cari_id, PERIOD, sgk)
+        db.commit()
+        elapsed = (time.perf_counter() - start) * 1000
+        db.close()
+        return elapsed, counts
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SGK hizmet dökümü mutabakat karşılaştırması")
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {}
+    for name, fn in (("satır satır ORM", legacy_reconcile), ("reconcile_sgk_employees", fast_reconcile)):
+        timings = []
+        for _ in range(args.repeat):
+            elapsed, counts = run_once(fn, args.employees)
+            timings.append(elapsed)
+        results[name] = (min(timings), counts)
+
+    print(f"{args.employees} çalışan, {args.repeat} tekrar (en iyi süre)")
+    print(f"{'Yol':<28}{'ms':>10}  (eşleşen, eksik, yeni)")
+    for name, (elapsed, counts) in results.items():
+        print(f"{name:<28}{elapsed:>10.1f}  {counts}")
+    legacy_ms = results["satır satır ORM"][0]
+    fast_ms = results["reconcile_sgk_employees"][0]
+    assert results["satır satır ORM"][1] == results["reconcile_sgk_employees"][1], "Sayımlar farklı"
+    print(f"Hızlanma: {legacy_ms / fast_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
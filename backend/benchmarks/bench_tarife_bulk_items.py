@@ -0,0 +1,119 @@
+"""
+TARİFE KALEMİ TOPLU YÜKLEME BENCHMARK - ORM add + refresh vs INSERT ... RETURNING
+
+Eski yol: Her kalem ORM nesnesi olarak eklenir, commit sonrası her kalem için
+          db.refresh (kalem başına SELECT) yapılıp serileştirilir.
+Yeni yol: bulk_upsert_items (satır doğrulama + tek sorguda çakışma kontrolü +
+          çok satırlı INSERT ... RETURNING), serileştirme commit'ten önce.
+
+Senaryo: Tarifede bir önceki yılın N/10 kalemi var; N satırlık yıllık tarife
+yüklenir (on_conflict=update ile mevcutlar güncellenir, eski yolda hepsi
+eklenir). Her tur taze bir veritabanında (dosya tabanlı SQLite) ölçülür.
+
+Kullanım:
+    cd backend
+    python benchmarks/bench_tarife_bulk_items.py --items 3000 --repeat 3
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from aliaport_api.config.database import Base
+from aliaport_api.main import app  # noqa: F401  (tüm modeller metadata'ya kaydolur)
+from aliaport_api.modules.tarife.bulk_items import bulk_upsert_items
+from aliaport_api.modules.tarife.models import PriceList, PriceListItem
+from aliaport_api.modules.tarife.schemas import PriceListItemCreate, PriceListItemResponse
+
+
+def legacy_load(db, price_list_id: int, rows: list) -> list:
+    """Eski endpoint gövdesi (ORM add, commit, kalem başına refresh)."""
+    new_items = []
+    for row in rows:
+        new_item = PriceListItem(**PriceListItemCreate.model_validate({"PriceListId": price_list_id, **row}).model_dump())
+        db.add(new_item)
+        new_items.append(new_item)
+    db.commit()
+    for item in new_items:
+        db.refresh(item)
+    return [PriceListItemResponse.model_validate(item).model_dump() for item in new_items]
+
+
+def fast_load(db, price_list_id: int, rows: list) -> list:
+    result = bulk_upsert_items(db, price_list_id, rows, on_conflict="update")
+    assert not result.error_count, result.error_details()
+    data = [PriceListItemResponse.model_validate(item).model_dump() for item in result.items]
+    db.commit()
+    return data
+
+
+def seed(db, item_count: int) -> tuple:
+    price_list = PriceList(Kod="BENCH-2026", Ad="Yıllık Tarife")
+    db.add(price_list)
+    db.flush()
+    db.bulk_insert_mappings(PriceListItem, [
+        {"PriceListId": price_list.Id, "HizmetKodu": f"H{i:05d}", "HizmetAdi": f"Hizmet {i}", "BirimFiyat": 100}
+        for i in range(item_count // 10)
+    ])
+    db.commit()
+    rows = [
+        {"HizmetKodu": f"H{i:05d}", "HizmetAdi": f"Hizmet {i}", "Birim": "ADET", "BirimFiyat": f"{100 + i}.50",
+         "KdvOrani": 20, "SiraNo": i}
+        for i in range(item_count)
+    ]
+    return price_list.Id, rows
+
+
+def run_once(fn, item_count: int) -> tuple:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        price_list_id, rows = seed(db, item_count)
+        start = time.perf_counter()
+        data = fn(db, price_list_id, rows)
+        elapsed = (time.perf_counter() - start) * 1000
+        db.close()
+        return elapsed, len(data)
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tarife kalemi toplu yükleme karşılaştırması")
+    parser.add_argument("--items", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {}
+    for name, fn in (("ORM add + refresh", legacy_load), ("bulk_upsert_items", fast_load)):
+        timings = []
+        for _ in range(args.repeat):
+            elapsed, count = run_once(fn, args.items)
+            timings.append(elapsed)
+        results[name] = (min(timings), count)
+
+    print(f"{args.items} kalem, {args.repeat} tekrar (en iyi süre)")
+    print(f"{'Yol':<28}{'ms':>10}  dönen kalem")
+    for name, (elapsed, count) in results.items():
+        print(f"{name:<28}{elapsed:>10.1f}  {count}")
+    legacy_ms = results["ORM add + refresh"][0]
+    fast_ms = results["bulk_upsert_items"][0]
+    assert results["ORM add + refresh"][1] == results["bulk_upsert_items"][1], "Kalem sayıları farklı"
+    print(f"Hızlanma: {legacy_ms / fast_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+PERFORMANS BÜTÇELERİ - docs/FAZ5_PERFORMANCE_PLAN.md hedefleri
+
+- Kritik CRUD p95 < 300 ms
+- Login p95 < 200 ms
+- WorkOrder listesi (50 kayıt) p95 < 400 ms
+- Hata oranı < %1 (rate limit hariç; yük sürücüsü limiter'ı kapatır)
+
+Rapor ayrıca önceki bir rapora (baseline) göre karşılaştırılabilir: yük
+senaryolarında p95, mikro benchmark'larda işlem başı süre tolerans oranından
+fazla kötüleşirse regresyon sayılır.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# Bütçe grubu -> p95 üst sınırı (ms)
+P95_BUDGETS_MS = {
+    "crud": 300.0,
+    "login": 200.0,
+    "work_order_list": 400.0,
+}
+MAX_ERROR_RATE = 0.01
+DEFAULT_REGRESSION_TOLERANCE = 0.25
+
+
+@dataclass
+class Violation:
+    """Aşılan bütçe veya baseline'a göre regresyon"""
+    kind: str  # budget | error_rate | regression
+    name: str
+    metric: str
+    actual: float
+    limit: float
+
+    def __str__(self) -> str:
+        return f"[{self.kind}] {self.name}.{self.metric}: {self.actual:.2f} > {self.limit:.2f}"
+
+
+def check_budgets(report: Dict[str, Any]) -> List[Violation]:
+    """Yük senaryolarını plan bütçelerine göre kontrol eder."""
+    violations = []
+    for name, stats in report.get("load", {}).items():
+        budget = P95_BUDGETS_MS.get(stats.get("budget"))
+        if budget is not None and stats["p95_ms"] > budget:
+            violations.append(Violation("budget", name, "p95_ms", stats["p95_ms"], budget))
+        if stats["error_rate"] > MAX_ERROR_RATE:
+            violations.append(Violation("error_rate", name, "error_rate", stats["error_rate"], MAX_ERROR_RATE))
+    return violations
+
+
+def check_regressions(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = DEFAULT_REGRESSION_TOLERANCE,
+) -> List[Violation]:
+    """Baseline raporda da olan ölçümleri tolerans oranıyla karşılaştırır."""
+    violations = []
+    for section, metric in (("load", "p95_ms"), ("micro", "us_per_op")):
+        previous = baseline.get(section, {})
+        for name, stats in report.get(section, {}).items():
+            if name not in previous:
+                continue
+            limit = previous[name][metric] * (1 + tolerance)
+            if stats[metric] > limit:
+                violations.append(Violation("regression", name, metric, stats[metric], limit))
+    return violations
+
+
+def evaluate(
+    report: Dict[str, Any],
+    baseline: Optional[Dict[str, Any]] = None,
+    tolerance: float = DEFAULT_REGRESSION_TOLERANCE,
+) -> List[Violation]:
+    violations = check_budgets(report)
+    if baseline is not None:
+        violations += check_regressions(report, baseline, tolerance)
+    return violations
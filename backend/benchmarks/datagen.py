@@ -0,0 +1,279 @@
+"""
+SENTETİK VERİ ÜRETİCİSİ - benchmark ve yük testleri için ölçeklenebilir veri seti
+
+scale=1.0 hedef hacmi üretir: 2.000 cari, 100.000 iş emri, 1.000.000 GateLog,
+1.000.000 audit kaydı. Satırlar ORM nesnesi olmadan, chunk'lar halinde Core
+executemany INSERT ile yazılır; aynı seed ile aynı veri üretilir.
+
+Ayrıca pdfminer ile okunabilen, SGK hizmet dökümü düzeninde (TC / - / AD / - / SOYAD)
+büyük PDF'ler üretir (harici PDF kütüphanesi gerekmez).
+
+Kullanım:
+    cd backend
+    python benchmarks/datagen.py --db /tmp/bench.db --scale 1.0
+    python benchmarks/datagen.py --sgk-pdf /tmp/sgk_5000.pdf --sgk-employees 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine, insert
+
+from aliaport_api.config.database import Base
+from aliaport_api.main import app  # noqa: F401  (tüm modeller metadata'ya kaydolur)
+from aliaport_api.modules.audit.models import AuditEvent
+from aliaport_api.modules.auth.models import User
+from aliaport_api.modules.auth.utils import hash_password
+from aliaport_api.modules.cari.models import Cari
+from aliaport_api.modules.guvenlik.models import GateLog
+from aliaport_api.modules.isemri.models import WorkOrder
+
+# scale=1.0 hacimleri
+FULL_SCALE_ROWS = {
+    "cari": 2_000,
+    "work_orders": 100_000,
+    "gate_logs": 1_000_000,
+    "audit_events": 1_000_000,
+}
+
+BENCH_ADMIN_EMAIL = "bench.admin@aliaport.com.tr"
+BENCH_ADMIN_PASSWORD = "Bench123!"
+
+WO_TYPES = ("HIZMET", "MOTORBOT", "BARINMA", "DIGER")
+WO_STATUSES = ("DRAFT", "SUBMITTED", "APPROVED", "IN_PROGRESS", "COMPLETED", "INVOICED")
+WO_PRIORITIES = ("LOW", "MEDIUM", "HIGH", "URGENT")
+AUDIT_PATHS = ("/api/cari/", "/api/work-order", "/api/gatelog/", "/api/hizmet/", "/api/exchange-rate/latest")
+AUDIT_METHODS = ("GET", "GET", "GET", "POST", "PUT", "DELETE")
+NAMES = ("AHMET", "MEHMET", "AYSE", "FATMA", "MUSTAFA", "EMINE", "ALI", "ZEYNEP", "HASAN", "ELIF")
+SURNAMES = ("YILMAZ", "KAYA", "DEMIR", "CELIK", "SAHIN", "YILDIZ", "OZTURK", "AYDIN", "ARSLAN", "DOGAN")
+
+
+def scaled_counts(scale: float) -> Dict[str, int]:
+    """Ölçeğe göre tablo başına satır sayısı (her tablo en az 1 satır)."""
+    return {table: max(int(rows * scale), 1) for table, rows in FULL_SCALE_ROWS.items()}
+
+
+def _chunks(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    chunk: List[dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _bulk_insert(conn, table, rows: Iterable[dict], chunk_size: int) -> int:
+    written = 0
+    for chunk in _chunks(rows, chunk_size):
+        conn.execute(insert(table), chunk)
+        written += len(chunk)
+    return written
+
+
+def _cari_rows(count: int, rng: random.Random) -> Iterator[dict]:
+    for i in range(count):
+        yield {
+            "CariKod": f"BC{i:06d}",
+            "Unvan": f"Benchmark Firma {i} {rng.choice(SURNAMES)} A.Ş.",
+            "CariTip": "TUZEL",
+            "Rol": "MUSTERI",
+            "AktifMi": True,
+            "CreatedAt": datetime(2024, 1, 1),
+        }
+
+
+def _work_order_rows(count: int, cari_count: int, rng: random.Random, start: datetime) -> Iterator[dict]:
+    for i in range(count):
+        cari_index = rng.randrange(cari_count)
+        created = start + timedelta(minutes=i * 5)
+        yield {
+            "wo_number": f"BWO{i:08d}",
+            "cari_id": cari_index + 1,
+            "cari_code": f"BC{cari_index:06d}",
+            "cari_title": f"Benchmark Firma {cari_index}",
+            "type": rng.choice(WO_TYPES),
+            "subject": f"Benchmark iş emri {i}",
+            "description": "Sentetik yük testi kaydı",
+            "priority": rng.choice(WO_PRIORITIES),
+            "status": rng.choice(WO_STATUSES),
+            "created_at": created,
+        }
+
+
+def _gate_log_rows(count: int, work_order_count: int, rng: random.Random, start: datetime) -> Iterator[dict]:
+    for i in range(count):
+        wo_index = rng.randrange(work_order_count)
+        entry = start + timedelta(seconds=i * 30)
+        duration = rng.randint(20, 600)
+        yield {
+            "work_order_id": wo_index + 1,
+            "wo_number": f"BWO{wo_index:08d}",
+            "wo_status": "ONAYLANDI",
+            "entry_type": "GIRIS" if i % 2 == 0 else "CIKIS",
+            "security_personnel": "Benchmark Güvenlik",
+            "vehicle_plate": f"35 BN {i % 10000:04d}",
+            "entry_time": entry,
+            "exit_time": entry + timedelta(minutes=duration),
+            "duration_minutes": duration,
+            "extra_minutes": max(duration - 240, 0),
+            "gate_time": entry,
+            "created_at": entry,
+        }
+
+
+def _audit_rows(count: int, rng: random.Random, start: datetime) -> Iterator[dict]:
+    for i in range(count):
+        path = rng.choice(AUDIT_PATHS)
+        yield {
+            "user_id": None,
+            "method": rng.choice(AUDIT_METHODS),
+            "path": path,
+            "resource": path.split("/")[2],
+            "action": "read",
+            "status_code": 200 if i % 50 else 404,
+            "duration_ms": rng.randint(1, 400),
+            "ip": f"10.0.{i % 256}.{(i // 256) % 256}",
+            "created_at": start + timedelta(seconds=i * 3),
+        }
+
+
+def generate_dataset(engine, scale: float = 0.01, seed: int = 42, chunk_size: int = 10_000) -> Dict[str, int]:
+    """
+    Şemayı oluşturur ve ölçeklenmiş sentetik veriyi yazar.
+
+    Returns:
+        {tablo: yazılan satır sayısı}
+    """
+    Base.metadata.create_all(bind=engine)
+    counts = scaled_counts(scale)
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, 8, 0)
+
+    written = {}
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [{
+            "email": BENCH_ADMIN_EMAIL,
+            "hashed_password": hash_password(BENCH_ADMIN_PASSWORD),
+            "full_name": "Benchmark Admin",
+            "is_active": True,
+            "is_superuser": True,
+            "created_at": start,
+        }])
+        written["cari"] = _bulk_insert(conn, Cari.__table__, _cari_rows(counts["cari"], rng), chunk_size)
+        written["work_orders"] = _bulk_insert(
+            conn, WorkOrder.__table__, _work_order_rows(counts["work_orders"], counts["cari"], rng, start), chunk_size
+        )
+        written["gate_logs"] = _bulk_insert(
+            conn, GateLog.__table__, _gate_log_rows(counts["gate_logs"], counts["work_orders"], rng, start), chunk_size
+        )
+        written["audit_events"] = _bulk_insert(
+            conn, AuditEvent.__table__, _audit_rows(counts["audit_events"], rng, start), chunk_size
+        )
+    return written
+
+
+# ============================================
+# SGK HİZMET DÖKÜMÜ PDF
+# ============================================
+
+def synthetic_sgk_employees(count: int, seed: int = 42) -> Dict[str, str]:
+    """{tc: 'AD SOYAD'} listesi (TC'ler 11 hane, 0 ile başlamaz, benzersiz)."""
+    rng = random.Random(seed)
+    return {
+        f"{20_000_000_000 + i * 7 + 1}": f"{rng.choice(NAMES)} {rng.choice(SURNAMES)}"
+        for i in range(count)
+    }
+
+
+def _pdf_text(line: str) -> bytes:
+    escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return b"(" + escaped.encode("cp1252", errors="replace") + b") '"
+
+
+def build_pdf(pages: List[List[str]]) -> bytes:
+    """Her sayfası satır listesi olan, sıkıştırılmamış tek fontlu minimal PDF üretir."""
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    pages_id = add(b"")  # sayfa listesi sonradan yazılır
+    page_ids = []
+    for lines in pages:
+        stream = b"\n".join([b"BT /F1 9 Tf 11 TL 40 800 Td", *(_pdf_text(line) for line in lines), b"ET"])
+        content_id = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font_id, content_id)
+        ))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, xref_offset)
+    return bytes(out)
+
+
+def build_sgk_pdf(employees: Dict[str, str], period: str = "202510", lines_per_page: int = 70) -> bytes:
+    """SGK hizmet dökümü düzeninde PDF (parse_sgk_pdf ile okunur)."""
+    header = ["SOSYAL GUVENLIK KURUMU", "AYLIK PRIM VE HIZMET BELGESI", f"Yil - Ay : {period[:4]}-{period[4:]}"]
+    records = []
+    for tc, full_name in employees.items():
+        first_name, _, last_name = full_name.partition(" ")
+        records.append([tc, "30", first_name, "-", last_name or "-"])
+    # Gerçek dökümlerdeki gibi bir çalışanın satırları sayfa arasında bölünmez
+    per_page = max((lines_per_page - len(header)) // 5, 1)
+    pages = [
+        header + [line for record in records[i:i + per_page] for line in record]
+        for i in range(0, len(records), per_page)
+    ]
+    return build_pdf(pages or [header])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark için sentetik veri üretir")
+    parser.add_argument("--db", help="Hedef SQLite dosyası (yoksa oluşturulur)")
+    parser.add_argument("--scale", type=float, default=0.01, help="1.0 = 100k iş emri, 1M GateLog, 1M audit")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sgk-pdf", help="Üretilecek SGK hizmet dökümü PDF yolu")
+    parser.add_argument("--sgk-employees", type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.db:
+        engine = create_engine(f"sqlite:///{args.db}")
+        start = time.perf_counter()
+        written = generate_dataset(engine, scale=args.scale, seed=args.seed)
+        elapsed = time.perf_counter() - start
+        engine.dispose()
+        print(f"{args.db}: {written} ({elapsed:.1f} s, {sum(written.values()) / elapsed:,.0f} satır/s)")
+    if args.sgk_pdf:
+        pdf = build_sgk_pdf(synthetic_sgk_employees(args.sgk_employees, args.seed))
+        Path(args.sgk_pdf).write_bytes(pdf)
+        print(f"{args.sgk_pdf}: {args.sgk_employees} çalışan, {len(pdf) / 1024:.0f} KB")
+    if not args.db and not args.sgk_pdf:
+        parser.error("--db veya --sgk-pdf gerekli")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+YÜK SÜRÜCÜSÜ - ASGI uygulamasına in-process (httpx ASGITransport) başsız yük testi
+
+Gerçek uygulama (main.app, tüm middleware'ler dahil) benchmark veritabanına
+bağlanır: get_db override edilir, audit yazıcısı aynı veritabanına yazar,
+rate limiter'lar ölçüm süresince kapatılır. Ağ/uvicorn maliyeti ölçülmez; ölçülen
+uygulama + veritabanı gecikmesidir.
+
+Her senaryo ayrı ayrı, verilen eşzamanlılıkla koşturulur ve gecikme yüzdelikleri
+(p50/p95/p99), hata oranı ve throughput raporlanır. Lazy router'ların mount
+maliyeti ölçüme girmesin diye her senaryodan önce bir ısınma isteği atılır.
+
+Kullanım:
+    cd backend
+    python benchmarks/datagen.py --db /tmp/bench.db --scale 0.1
+    python benchmarks/load_driver.py --db /tmp/bench.db --requests 500 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import itertools
+import math
+import random
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import httpx
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from aliaport_api.config.database import get_db
+from aliaport_api.main import app as default_app
+from aliaport_api.modules.cari.models import Cari
+from aliaport_api.modules.isemri.models import WorkOrder
+
+from benchmarks.datagen import BENCH_ADMIN_EMAIL, BENCH_ADMIN_PASSWORD
+
+RequestSpec = Tuple[str, str, Dict[str, Any]]  # (method, url, httpx kwargs)
+
+
+@dataclass
+class LoadContext:
+    """Senaryoların istek üretirken kullandığı veri seti bilgisi"""
+    cari_count: int
+    work_order_count: int
+    token: Optional[str] = None
+    sequence: Iterator[int] = field(default_factory=itertools.count)
+
+    @property
+    def auth_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+
+@dataclass
+class Scenario:
+    name: str
+    budget: Optional[str]  # budgets.P95_BUDGETS_MS anahtarı
+    build: Callable[[random.Random, LoadContext], RequestSpec]
+
+
+def _cari_payload(code: str) -> Dict[str, Any]:
+    return {"CariKod": code, "Unvan": f"Yük Testi {code}", "CariTip": "TUZEL", "Rol": "MUSTERI"}
+
+
+def _page(rng: random.Random, total: int, page_size: int = 50) -> int:
+    return rng.randint(1, max(total // page_size, 1))
+
+
+def _cari_list(rng: random.Random, ctx: LoadContext) -> RequestSpec:
+    return "GET", "/api/cari/", {"params": {"page": _page(rng, ctx.cari_count), "page_size": 50}}
+
+
+def _cari_get(rng: random.Random, ctx: LoadContext) -> RequestSpec:
+    return "GET", f"/api/cari/{rng.randint(1, ctx.cari_count)}", {}
+
+
+def _cari_create(rng: random.Random, ctx: LoadContext) -> RequestSpec:
+    return "POST", "/api/cari/", {"json": _cari_payload(f"LT{next(ctx.sequence):07d}{rng.randrange(10**6):06d}")}
+
+
+def _cari_update(rng: random.Random, ctx: LoadContext) -> RequestSpec:
+    # datagen cari kodları: Id=n -> BC{n-1}
+    cari_id = rng.randint(1, ctx.cari_count)
+    return "PUT", f"/api/cari/{cari_id}", {"json": _cari_payload(f"BC{cari_id - 1:06d}")}
+
+
+def _work_order_list(rng: random.Random, ctx: LoadContext) -> RequestSpec:
+    return "GET", "/api/work-order", {"params": {"page": _page(rng, ctx.work_order_count), "page_size": 50}}
+
+
+def _gate_log_list(rng: random.Random, ctx: LoadContext) -> RequestSpec:
+    return "GET", "/api/gatelog/", {"params": {"page": rng.randint(1, 20), "page_size": 50}}
+
+
+def _audit_events(rng: random.Random, ctx: LoadContext) -> RequestSpec:
+    return "GET", "/api/audit/events", {"params": {"page": rng.randint(1, 20), "page_size": 50}, "headers": ctx.auth_headers}
+
+
+def _login(rng: random.Random, ctx: LoadContext) -> RequestSpec:
+    return "POST", "/api/auth/login", {"json": {"email": BENCH_ADMIN_EMAIL, "password": BENCH_ADMIN_PASSWORD}}
+
+
+SCENARIOS = [
+    Scenario("cari_list", "crud", _cari_list),
+    Scenario("cari_get", "crud", _cari_get),
+    Scenario("cari_create", "crud", _cari_create),
+    Scenario("cari_update", "crud", _cari_update),
+    Scenario("work_order_list", "work_order_list", _work_order_list),
+    Scenario("gate_log_list", "crud", _gate_log_list),
+    Scenario("audit_events", "crud", _audit_events),
+    Scenario("login", "login", _login),
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Sıralı listede en yakın sıra (nearest-rank) yüzdeliği."""
+    if not sorted_values:
+        return 0.0
+    index = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def summarize(latencies_ms: List[float], errors: int, elapsed: float, budget: Optional[str]) -> Dict[str, Any]:
+    ordered = sorted(latencies_ms)
+    count = len(ordered)
+    return {
+        "budget": budget,
+        "count": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "p50_ms": round(percentile(ordered, 50), 2),
+        "p95_ms": round(percentile(ordered, 95), 2),
+        "p99_ms": round(percentile(ordered, 99), 2),
+        "mean_ms": round(sum(ordered) / count, 2) if count else 0.0,
+        "rps": round(count / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+@contextmanager
+def bench_database(engine, app=default_app) -> Iterator[None]:
+    """Uygulamayı ölçüm süresince benchmark veritabanına bağlar, limiter'ları kapatır."""
+    from aliaport_api.modules.audit import utils as audit_utils
+    from aliaport_api.modules.auth import router as auth_router
+
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    limiters = [app.state.limiter, auth_router.limiter]
+    previous_enabled = [limiter.enabled for limiter in limiters]
+    previous_session_local = audit_utils.SessionLocal
+    previous_override = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    audit_utils.SessionLocal = session_factory
+    for limiter in limiters:
+        limiter.enabled = False
+    try:
+        yield
+    finally:
+        audit_utils.audit_queue.flush()
+        audit_utils.SessionLocal = previous_session_local
+        for limiter, enabled in zip(limiters, previous_enabled):
+            limiter.enabled = enabled
+        if previous_override is None:
+            app.dependency_overrides.pop(get_db, None)
+        else:
+            app.dependency_overrides[get_db] = previous_override
+
+
+def load_context(engine) -> LoadContext:
+    session = sessionmaker(bind=engine)()
+    try:
+        return LoadContext(
+            cari_count=session.query(func.count(Cari.Id)).scalar() or 1,
+            work_order_count=session.query(func.count(WorkOrder.id)).scalar() or 1,
+        )
+    finally:
+        session.close()
+
+
+async def _run_scenario(client: httpx.AsyncClient, scenario: Scenario, ctx: LoadContext,
+                        requests: int, concurrency: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    specs = [scenario.build(rng, ctx) for _ in range(requests + 1)]
+    method, url, kwargs = specs.pop()
+    await client.request(method, url, **kwargs)  # ısınma (lazy router mount, cache)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for spec in specs:
+        queue.put_nowait(spec)
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while not queue.empty():
+            method, url, kwargs = queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+    return summarize(latencies, errors, time.perf_counter() - start, scenario.budget)
+
+
+async def run_load_async(engine, requests: int = 200, concurrency: int = 10, scenarios: Optional[List[str]] = None,
+                         seed: int = 42, app=default_app) -> Dict[str, Dict[str, Any]]:
+    selected = [s for s in SCENARIOS if scenarios is None or s.name in scenarios]
+    ctx = load_context(engine)
+    results: Dict[str, Dict[str, Any]] = {}
+    with bench_database(engine, app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            login = await client.post("/api/auth/login", json={"email": BENCH_ADMIN_EMAIL, "password": BENCH_ADMIN_PASSWORD})
+            if login.status_code == 200:
+                ctx.token = login.json().get("access_token")
+            for index, scenario in enumerate(selected):
+                results[scenario.name] = await _run_scenario(client, scenario, ctx, requests, concurrency, seed + index)
+    return results
+
+
+def run_load(engine, **kwargs) -> Dict[str, Dict[str, Any]]:
+    """Senkron giriş noktası (bkz. run_load_async)."""
+    return asyncio.run(run_load_async(engine, **kwargs))
+
+
+def print_load_table(results: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'Senaryo':<18}{'n':>6}{'hata':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>9}")
+    for name, stats in results.items():
+        print(f"{name:<18}{stats['count']:>6}{stats['errors']:>6}{stats['p50_ms']:>9.1f}"
+              f"{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['rps']:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="In-process ASGI yük testi")
+    parser.add_argument("--db", required=True, help="datagen.py ile üretilmiş SQLite dosyası")
+    parser.add_argument("--requests", type=int, default=200, help="Senaryo başına istek")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--scenario", action="append", help="Yalnızca verilen senaryo(lar)")
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db}", connect_args={"check_same_thread": False, "timeout": 30})
+    results = run_load(engine, requests=args.requests, concurrency=args.concurrency, scenarios=args.scenario)
+    engine.dispose()
+    print_load_table(results)
+
+
+if __name__ == "__main__":
+    main()
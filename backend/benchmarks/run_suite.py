@@ -0,0 +1,105 @@
+"""
+BENCHMARK SÜİTİ - veri üretimi + yük testi + mikro benchmark + bütçe kontrolü
+
+1. Geçici bir SQLite dosyasına ölçekli sentetik veri üretir (datagen.py)
+2. In-process ASGI yük senaryolarını koşturur (load_driver.py)
+3. Mikro benchmark'ları koşturur (bench_micro.py)
+4. Raporu JSON olarak yazar; bütçe aşımı veya baseline'a göre regresyon varsa
+   ihlalleri listeler ve 1 koduyla çıkar (CI'da kapı olarak kullanılabilir).
+
+Kullanım:
+    cd backend
+    python benchmarks/run_suite.py --scale 0.01 --output bench-report.json
+    python benchmarks/run_suite.py --scale 0.01 --baseline bench-report.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine
+
+from benchmarks.bench_micro import print_micro_table, run_micro
+from benchmarks.budgets import DEFAULT_REGRESSION_TOLERANCE, evaluate
+from benchmarks.datagen import generate_dataset
+from benchmarks.load_driver import print_load_table, run_load
+
+
+def run_suite(
+    scale: float = 0.01,
+    requests: int = 200,
+    concurrency: int = 10,
+    micro_number: int = 2000,
+    sgk_employees: int = 2000,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """Tüm süiti koşturur ve raporu döndürür."""
+    fd, db_path = tempfile.mkstemp(suffix=".db", prefix="aliaport_bench_")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False, "timeout": 30})
+    try:
+        start = time.perf_counter()
+        dataset = generate_dataset(engine, scale=scale, seed=seed)
+        dataset_seconds = round(time.perf_counter() - start, 2)
+        load = run_load(engine, requests=requests, concurrency=concurrency, seed=seed)
+    finally:
+        engine.dispose()
+        os.unlink(db_path)
+    return {
+        "scale": scale,
+        "dataset": {**dataset, "seconds": dataset_seconds},
+        "load": load,
+        "micro": run_micro(micro_number, sgk_employees),
+    }
+
+
+def _load_json(path: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not path:
+        return None
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark süiti ve performans bütçeleri")
+    parser.add_argument("--scale", type=float, default=0.01, help="1.0 = 100k iş emri, 1M GateLog, 1M audit")
+    parser.add_argument("--requests", type=int, default=200, help="Senaryo başına istek")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--micro-number", type=int, default=2000)
+    parser.add_argument("--sgk-employees", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Raporun yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki rapor")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_REGRESSION_TOLERANCE,
+                        help="Baseline'a göre izin verilen kötüleşme oranı")
+    args = parser.parse_args()
+
+    baseline = _load_json(args.baseline)
+    report = run_suite(args.scale, args.requests, args.concurrency, args.micro_number, args.sgk_employees, args.seed)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print(f"\nVeri seti (scale={args.scale}): {report['dataset']}\n")
+    print_load_table(report["load"])
+    print()
+    print_micro_table(report["micro"])
+
+    violations = evaluate(report, baseline, args.tolerance)
+    if violations:
+        print(f"\n❌ {len(violations)} ihlal:")
+        for violation in violations:
+            print(f"   {violation}")
+        sys.exit(1)
+    print("\n✅ Tüm bütçeler sağlandı")
+
+
+if __name__ == "__main__":
+    main()
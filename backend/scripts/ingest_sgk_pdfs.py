@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+SGK Hizmet Dökümü Toplu İçe Aktarma
+
+Bir dizindeki SGK hizmet listesi PDF'lerini süreç havuzunda parse edip
+firmalara göre mutabakat yapar; dosya başına rapor ve throughput/hata özeti
+üretir. Ayrıntılar: aliaport_api/modules/sgk/bulk_ingest.py
+
+Kullanım:
+    cd backend
+    python scripts/ingest_sgk_pdfs.py arsiv/sgk --workers 8 --report sgk_rapor.csv
+    python scripts/ingest_sgk_pdfs.py arsiv/SIMSEKLER --cari-kod C-001
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aliaport_api.config.database import SessionLocal
+from aliaport_api.main import app  # noqa: F401  (tüm modeller mapper'a kaydolur)
+from aliaport_api.modules.sgk.bulk_ingest import ingest_directory
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="SGK hizmet dökümü PDF'lerini toplu içe aktar")
+    parser.add_argument("directory", type=Path, help="PDF'lerin bulunduğu dizin (alt klasörler dahil)")
+    parser.add_argument("--cari-kod", help="Tüm dosyalar bu firmaya ait (verilmezse klasör adından bulunur)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Parse süreç sayısı")
+    parser.add_argument("--report", help="Dosya başına CSV rapor yolu")
+    parser.add_argument("--user-id", type=int, help="SgkPeriodCheck.uploaded_by_user_id")
+    args = parser.parse_args()
+
+    if not args.directory.is_dir():
+        print(f"❌ Dizin bulunamadı: {args.directory}")
+        return 2
+
+    db = SessionLocal()
+    try:
+        report = ingest_directory(
+            db,
+            args.directory,
+            cari_kod=args.cari_kod,
+            workers=args.workers,
+            uploaded_by_user_id=args.user_id,
+        )
+    finally:
+        db.close()
+
+    for row in report.files:
+        if row.status not in ("OK", "DUPLICATE"):
+            print(f"⚠️  {row.status:<13} {row.path} {row.error}")
+    if args.report:
+        report.write_csv(args.report)
+        print(f"📄 Rapor: {args.report}")
+    print(json.dumps(report.summary(), ensure_ascii=False, indent=2))
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
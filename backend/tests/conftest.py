@@ -4,12 +4,13 @@ Pytest configuration and fixtures for Aliaport tests.
 """
 import os
 import sys
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Generator
+from typing import Generator, List
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -74,6 +75,32 @@ def client(db: Session) -> Generator[TestClient, None, None]:
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def count_statements():
+    """
+    Blok içinde çalışan SQL ifadelerini toplayan context manager.
+
+        with count_statements(db) as statements:
+            ...
+        assert len(statements) == 1
+    """
+    @contextmanager
+    def _count(session: Session) -> Generator[List[str], None, None]:
+        statements: List[str] = []
+
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        bind = session.get_bind()
+        event.listen(bind, "before_cursor_execute", listener)
+        try:
+            yield statements
+        finally:
+            event.remove(bind, "before_cursor_execute", listener)
+
+    return _count
+
+
 @pytest.fixture(scope="function")
 def admin_user(db: Session) -> User:
     """Testler için basit admin kullanıcı (şifre: Admin123!)."""
@@ -0,0 +1,139 @@
+"""
+Testler için süreç içi sahte Redis protokolü (RESP2) sunucusu.
+
+Gerçek soket üzerinden konuşur; rate limit storage'ının kullandığı komut alt
+kümesini (PING, GET, SET NX/PX, INCRBY, DECRBY, DEL, PTTL, SCAN, MULTI/EXEC,
+SELECT, FLUSHDB) destekler. MULTI/EXEC blokları tek kilit altında çalışır.
+"""
+import fnmatch
+import socketserver
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class FakeRespServer:
+    def __init__(self):
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.lock = threading.Lock()
+        self.commands_seen = 0
+        fake = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                queued: Optional[List[List[bytes]]] = None
+                while True:
+                    command = fake._read_command(self.rfile)
+                    if command is None:
+                        return
+                    name = command[0].upper()
+                    if name == b"MULTI":
+                        queued, reply = [], "+OK"
+                    elif name == b"EXEC":
+                        with fake.lock:
+                            reply = [fake._execute(queued_command) for queued_command in queued or []]
+                        queued = None
+                    elif queued is not None:
+                        queued.append(command)
+                        reply = "+QUEUED"
+                    else:
+                        with fake.lock:
+                            reply = fake._execute(command)
+                    self.wfile.write(fake._encode(reply))
+
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def uri(self) -> str:
+        host, port = self.server.server_address
+        return f"resp://{host}:{port}/0"
+
+    def __enter__(self) -> "FakeRespServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    # Protokol
+
+    @staticmethod
+    def _read_command(rfile) -> Optional[List[bytes]]:
+        header = rfile.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:-2])):
+            length = int(rfile.readline()[1:-2])
+            args.append(rfile.read(length + 2)[:-2])
+        return args
+
+    def _encode(self, reply: Any) -> bytes:
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, str):
+            return reply.encode() + b"\r\n"
+        if isinstance(reply, int):
+            return b":%d\r\n" % reply
+        if isinstance(reply, bytes):
+            return b"$%d\r\n%s\r\n" % (len(reply), reply)
+        return b"*%d\r\n" % len(reply) + b"".join(self._encode(item) for item in reply)
+
+    # Komutlar (kilit altında çağrılır)
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+    def _incr(self, key: bytes, delta: int) -> int:
+        current = self._live(key)
+        expires_at = self.data[key][1] if current is not None else None
+        value = int(current or 0) + delta
+        self.data[key] = (str(value).encode(), expires_at)
+        return value
+
+    def _execute(self, command: List[bytes]) -> Any:
+        self.commands_seen += 1
+        name, args = command[0].upper(), command[1:]
+        if name == b"PING":
+            return "+PONG"
+        if name in (b"SELECT", b"AUTH", b"FLUSHDB"):
+            if name == b"FLUSHDB":
+                self.data.clear()
+            return "+OK"
+        if name == b"GET":
+            return self._live(args[0])
+        if name == b"SET":
+            key, value, options = args[0], args[1], [a.upper() for a in args[2:]]
+            if b"NX" in options and self._live(key) is not None:
+                return None
+            expires_at = None
+            if b"PX" in options:
+                expires_at = time.time() + int(args[2 + options.index(b"PX") + 1]) / 1000
+            self.data[key] = (value, expires_at)
+            return "+OK"
+        if name == b"INCRBY":
+            return self._incr(args[0], int(args[1]))
+        if name == b"DECRBY":
+            return self._incr(args[0], -int(args[1]))
+        if name == b"DEL":
+            return sum(self.data.pop(key, None) is not None for key in args)
+        if name == b"PTTL":
+            if self._live(args[0]) is None:
+                return -2
+            expires_at = self.data[args[0]][1]
+            return -1 if expires_at is None else int((expires_at - time.time()) * 1000)
+        if name == b"SCAN":
+            pattern = args[args.index(b"MATCH") + 1].decode() if b"MATCH" in args else "*"
+            keys = [key for key in list(self.data) if self._live(key) is not None and fnmatch.fnmatchcase(key.decode(), pattern)]
+            return [b"0", keys]
+        return f"-ERR unknown command '{name.decode()}'"
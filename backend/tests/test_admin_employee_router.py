@@ -0,0 +1,100 @@
+"""
+Admin çalışan raporu testleri (N+1'siz liste, sayfalama, gruplanmış istatistik)
+"""
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from aliaport_api.main import app
+from aliaport_api.modules.dijital_arsiv.models import PortalEmployee, PortalEmployeeDocument
+from aliaport_api.modules.dijital_arsiv.portal_router import get_current_portal_user
+from tests.conftest import create_cari
+
+
+@pytest.fixture
+def admin_client(client: TestClient):
+    app.dependency_overrides[get_current_portal_user] = lambda: SimpleNamespace(is_admin=True)
+    yield client
+    app.dependency_overrides.pop(get_current_portal_user, None)
+
+
+def _seed(db: Session, employee_count: int = 6):
+    firm_a = create_cari(db, CariKod="FA", Unvan="Firma A")
+    firm_b = create_cari(db, CariKod="FB", Unvan="Firma B")
+    employees = []
+    for i in range(employee_count):
+        employees.append(PortalEmployee(
+            cari_id=firm_a.Id if i % 2 == 0 else firm_b.Id,
+            full_name=f"Çalışan {i:02d}",
+            position="SOFOR" if i < 4 else "FORKLIFT",
+            is_active=i != employee_count - 1,
+        ))
+    db.add_all(employees)
+    db.commit()
+    for emp in employees:
+        for doc_type in ("EHLIYET", "SRC5") if emp.position == "SOFOR" else ("EHLIYET",):
+            db.add(PortalEmployeeDocument(
+                employee_id=emp.id, cari_id=emp.cari_id, document_type=doc_type,
+                file_name=f"{doc_type}.pdf", file_path=f"/tmp/{emp.id}_{doc_type}.pdf",
+                file_size=10, file_type="application/pdf",
+            ))
+    db.commit()
+    return firm_a, firm_b, employees
+
+
+class TestAdminEmployeeReport:
+    base_url = "/api/v1/admin/employees"
+
+    def test_list_uses_constant_query_count(self, admin_client: TestClient, db: Session, count_statements):
+        _seed(db, employee_count=12)
+        admin_client.get(self.base_url + "?page_size=1")  # router mount + ısınma
+
+        with count_statements(db) as statements:
+            r = admin_client.get(self.base_url)
+
+        assert r.status_code == 200
+        body = r.json()
+        assert len(body) == 12
+        assert body[0]["cari_title"] == "Firma A"
+        assert {d["document_type"] for d in body[0]["documents"]} == {"EHLIYET", "SRC5"}
+        # Sayfasız istek: çalışanlar + belgeler + SGK dönemleri (count yok)
+        assert len(statements) == 3
+        assert r.headers["x-total-count"] == "12"
+        assert "x-page" not in r.headers
+
+    def test_pagination_headers(self, admin_client: TestClient, db: Session):
+        _seed(db)
+        r = admin_client.get(self.base_url + "?page=2&page_size=4")
+        assert r.status_code == 200
+        assert len(r.json()) == 2
+        assert r.headers["x-total-count"] == "6"
+        assert r.headers["x-page"] == "2"
+        assert r.headers["x-page-size"] == "4"
+
+    def test_document_type_filter(self, admin_client: TestClient, db: Session):
+        _seed(db)
+        r = admin_client.get(self.base_url + "?document_type=SRC5")
+        body = r.json()
+        assert len(body) == 4
+        assert all([d["document_type"] for d in emp["documents"]] == ["SRC5"] for emp in body)
+        assert r.headers["x-total-count"] == "4"
+
+    def test_stats_two_aggregate_queries(self, admin_client: TestClient, db: Session, count_statements):
+        _seed(db)
+        admin_client.get(self.base_url + "/stats")  # router mount + ısınma
+        with count_statements(db) as statements:
+            r = admin_client.get(self.base_url + "/stats")
+        assert r.status_code == 200
+        assert r.json() == {
+            "total_employees": 6,
+            "active_employees": 5,
+            "inactive_employees": 1,
+            "total_documents": 10,
+            "position_distribution": {"SOFOR": 4, "FORKLIFT": 1},
+            "companies_with_employees": 2,
+        }
+        # Gruplanmış çalışan sorgusu + ayrı belge sayısı
+        assert len(statements) == 2
+
@@ -0,0 +1,137 @@
+"""
+Admin araç evrak testleri (tek sorguluk istatistik, cache invalidation, onay kuyruğu)
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from aliaport_api.core.cache import cache
+from aliaport_api.main import app
+from aliaport_api.modules.auth.dependencies import get_current_active_user
+from aliaport_api.modules.dijital_arsiv.models import (
+    PortalUser,
+    PortalVehicle,
+    VehicleDocument,
+    VehicleDocumentType,
+)
+from aliaport_api.modules.dijital_arsiv.vehicle_documents import (
+    VEHICLE_DOCUMENT_STATS_CACHE_PREFIX,
+    compute_vehicle_document_stats,
+)
+from tests.conftest import create_cari
+
+
+@pytest.fixture(autouse=True)
+def clear_stats_cache():
+    cache.invalidate(VEHICLE_DOCUMENT_STATS_CACHE_PREFIX)
+    yield
+    cache.invalidate(VEHICLE_DOCUMENT_STATS_CACHE_PREFIX)
+
+
+@pytest.fixture
+def admin_client(client: TestClient):
+    app.dependency_overrides[get_current_active_user] = lambda: SimpleNamespace(id=1, is_superuser=True)
+    yield client
+    app.dependency_overrides.pop(get_current_active_user, None)
+
+
+def _seed(db: Session):
+    firm_a = create_cari(db, CariKod="FA", Unvan="Firma A")
+    firm_b = create_cari(db, CariKod="FB", Unvan="Firma B")
+    # Firma A'nın iki portal kullanıcısı var (eski join satırları çoğaltıyordu)
+    for i in range(2):
+        db.add(PortalUser(cari_id=firm_a.Id, email=f"u{i}@a.com", hashed_password="x", full_name=f"U{i}"))
+    ruhsat = VehicleDocumentType(code="RUHSAT", name="Araç Ruhsatı", is_required=True)
+    muayene = VehicleDocumentType(code="MUAYENE", name="Araç Muayene Belgesi", is_required=True)
+    vehicle_a = PortalVehicle(cari_id=firm_a.Id, plaka="35 A 001")
+    vehicle_b = PortalVehicle(cari_id=firm_b.Id, plaka="35 B 001")
+    db.add_all([ruhsat, muayene, vehicle_a, vehicle_b])
+    db.commit()
+
+    now = datetime.utcnow()
+    docs = [
+        VehicleDocument(vehicle_id=vehicle_a.id, doc_type_id=ruhsat.id, status="PENDING", uploaded_at=now - timedelta(hours=2)),
+        VehicleDocument(vehicle_id=vehicle_a.id, doc_type_id=muayene.id, status="APPROVED", uploaded_at=now - timedelta(days=3)),
+        VehicleDocument(vehicle_id=vehicle_b.id, doc_type_id=ruhsat.id, status="PENDING", uploaded_at=now - timedelta(hours=1)),
+        VehicleDocument(vehicle_id=vehicle_b.id, doc_type_id=muayene.id, status="MISSING"),
+    ]
+    db.add_all(docs)
+    db.commit()
+    return firm_a, firm_b, docs
+
+
+class TestVehicleDocumentStats:
+    base_url = "/api/v1/admin/vehicles/documents"
+
+    def test_compute_single_grouped_query(self, db: Session, count_statements):
+        _seed(db)
+        with count_statements(db) as statements:
+            stats = compute_vehicle_document_stats(db)
+
+        assert len(statements) == 1
+        assert stats == {"pending": 2, "approved": 1, "rejected": 0, "expired": 0, "missing": 1, "total": 4}
+
+    def test_group_by_firma_and_doc_type(self, db: Session):
+        firm_a, firm_b, _ = _seed(db)
+
+        by_firma = compute_vehicle_document_stats(db, "firma")
+        assert by_firma["total"] == 4
+        assert [(g["cari_id"], g["pending"], g["total"]) for g in by_firma["groups"]] == [
+            (firm_a.Id, 1, 2), (firm_b.Id, 1, 2)
+        ]
+
+        by_type = compute_vehicle_document_stats(db, "doc_type")
+        groups = {g["doc_type_code"]: g for g in by_type["groups"]}
+        assert groups["RUHSAT"]["pending"] == 2
+        assert groups["MUAYENE"]["approved"] == 1
+        assert groups["MUAYENE"]["missing"] == 1
+
+        with pytest.raises(ValueError):
+            compute_vehicle_document_stats(db, "plaka")
+
+    def test_stats_cached_and_invalidated_on_approve(self, admin_client: TestClient, db: Session):
+        _, _, docs = _seed(db)
+
+        r = admin_client.get(self.base_url + "/stats")
+        assert r.status_code == 200
+        assert r.json()["pending"] == 2
+
+        # Doğrudan DB değişikliği cache'i bozmaz (TTL içinde aynı sonuç)
+        db.add(VehicleDocument(vehicle_id=docs[0].vehicle_id, doc_type_id=docs[0].doc_type_id, status="REJECTED"))
+        db.commit()
+        assert admin_client.get(self.base_url + "/stats").json()["rejected"] == 0
+
+        r = admin_client.put(f"{self.base_url}/{docs[0].id}/approve", json={})
+        assert r.status_code == 200
+        stats = admin_client.get(self.base_url + "/stats").json()
+        assert stats["pending"] == 1
+        assert stats["approved"] == 2
+        assert stats["rejected"] == 1
+
+    def test_stats_group_by_param(self, admin_client: TestClient, db: Session):
+        _seed(db)
+        r = admin_client.get(self.base_url + "/stats?group_by=doc_type")
+        assert r.status_code == 200
+        assert {g["doc_type_code"] for g in r.json()["groups"]} == {"RUHSAT", "MUAYENE"}
+
+        assert admin_client.get(self.base_url + "/stats?group_by=plaka").status_code == 422
+
+    def test_pending_list_without_duplicates(self, admin_client: TestClient, db: Session):
+        firm_a, _, _ = _seed(db)
+
+        r = admin_client.get(self.base_url + "/pending")
+        assert r.status_code == 200
+        body = r.json()
+        assert body["total"] == 2
+        assert [item["vehicle_plaka"] for item in body["items"]] == ["35 B 001", "35 A 001"]
+        assert body["items"][1]["cari_name"] == "Firma A"
+
+        r = admin_client.get(f"{self.base_url}/pending?cari_id={firm_a.Id}&limit=1")
+        assert r.json()["total"] == 1
+
+        # Son sayfanın ötesinde de toplam doğru döner
+        r = admin_client.get(self.base_url + "/pending?skip=10")
+        assert r.json() == {"total": 2, "items": []}
@@ -0,0 +1,82 @@
+"""Audit arşivleme: batch'li taşıma, aylık JSONL export ve sıcak + arşiv tabloyu kapsayan sorgu."""
+import gzip
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from aliaport_api.jobs.audit_archive_job import audit_log_archive_job
+from aliaport_api.main import app
+from aliaport_api.modules.audit.archive import archive_audit_events
+from aliaport_api.modules.audit.models import AuditEvent, AuditEventArchive
+from aliaport_api.modules.auth.dependencies import get_current_active_user
+
+NOW = datetime.utcnow().replace(microsecond=0)
+
+
+def _add_events(db: Session, ages_in_days):
+    for age in ages_in_days:
+        db.add(AuditEvent(method="GET", path="/api/cari", resource="cari", action="read", status_code=200,
+                          extra={"age": age}, created_at=NOW - timedelta(days=age)))
+    db.commit()
+
+
+@pytest.fixture
+def admin():
+    app.dependency_overrides[get_current_active_user] = lambda: SimpleNamespace(id=1, is_superuser=True)
+    yield
+    app.dependency_overrides.pop(get_current_active_user, None)
+
+
+def test_archive_moves_old_rows_in_batches(db: Session, tmp_path):
+    _add_events(db, [1, 10, 95, 120, 130, 200, 400])
+
+    result = archive_audit_events(db, cutoff=NOW - timedelta(days=90), batch_size=2, export_dir=str(tmp_path))
+
+    assert (result.archived, result.batches) == (5, 3)
+    assert sorted(e.extra["age"] for e in db.query(AuditEvent)) == [1, 10]
+    archived = db.query(AuditEventArchive).order_by(AuditEventArchive.id).all()
+    assert [e.extra["age"] for e in archived] == [95, 120, 130, 200, 400]
+    assert all(e.archived_at is not None for e in archived)
+
+    months = {path.split("audit_events_")[1][:7] for path in result.exported_files}
+    assert months == {(NOW - timedelta(days=age)).strftime("%Y-%m") for age in (95, 120, 130, 200, 400)}
+    exported = [json.loads(line) for path in result.exported_files for line in gzip.open(path, "rt")]
+    assert sorted(row["extra"]["age"] for row in exported) == [95, 120, 130, 200, 400]
+
+
+def test_archive_respects_max_batches(db: Session):
+    _add_events(db, [100] * 5)
+
+    first = archive_audit_events(db, cutoff=NOW - timedelta(days=90), batch_size=2, max_batches=1, export_dir=None)
+    rest = archive_audit_events(db, cutoff=NOW - timedelta(days=90), batch_size=2, export_dir=None)
+
+    assert (first.archived, rest.archived) == (2, 3)
+    assert db.query(AuditEvent).count() == 0
+
+
+def test_job_without_old_rows_is_noop(db: Session):
+    _add_events(db, [0])
+
+    assert audit_log_archive_job(session=db).archived == 0
+    assert db.query(AuditEvent).count() == 1
+
+
+def test_events_endpoint_spans_archive_for_old_ranges(client: TestClient, db: Session, admin):
+    _add_events(db, [300, 200, 1, 0])
+    archive_audit_events(db, cutoff=datetime.utcnow() - timedelta(days=90), export_dir=None)
+
+    hot = client.get("/api/audit/events").json()["data"]
+    assert hot["total"] == 2
+
+    date_from = (datetime.utcnow() - timedelta(days=250)).isoformat()
+    spanning = client.get("/api/audit/events", params={"date_from": date_from, "page_size": 2}).json()["data"]
+    assert spanning["total"] == 3
+    assert spanning["total_pages"] == 2
+    ids = [item["id"] for item in spanning["items"]]
+    assert ids == sorted(ids, reverse=True)
+    last_page = client.get("/api/audit/events", params={"date_from": date_from, "page_size": 2, "page": 2}).json()["data"]
+    assert [item["archived"] for item in spanning["items"] + last_page["items"]] == [False, False, True]
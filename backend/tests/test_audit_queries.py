@@ -0,0 +1,89 @@
+"""Audit sorguları: keyset sayfalama, SQL'de hesaplanan özetler ve cache."""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from aliaport_api.core.cache import get_cache
+from aliaport_api.main import app
+from aliaport_api.modules.audit.models import AuditEvent
+from aliaport_api.modules.audit.queries import AUDIT_STATS_CACHE_PREFIX
+from aliaport_api.modules.auth.dependencies import get_current_active_user
+
+NOW = datetime.utcnow().replace(minute=30, second=0, microsecond=0)
+
+
+@pytest.fixture
+def admin():
+    get_cache().invalidate(AUDIT_STATS_CACHE_PREFIX)
+    app.dependency_overrides[get_current_active_user] = lambda: SimpleNamespace(id=1, is_superuser=True)
+    yield
+    app.dependency_overrides.pop(get_current_active_user, None)
+
+
+def _event(path="/api/cari", user_id=None, status_code=200, duration_ms=10, minutes_ago=0):
+    return AuditEvent(method="GET", path=path, resource=path.split("/")[2], action="read", user_id=user_id,
+                      status_code=status_code, duration_ms=duration_ms, created_at=NOW - timedelta(minutes=minutes_ago))
+
+
+def test_keyset_pagination_walks_all_events_once(client: TestClient, db: Session, admin):
+    # Aynı created_at'e sahip olaylar da id ile ayrışmalı
+    db.add_all([_event(minutes_ago=i // 3) for i in range(10)])
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        params = {"page_size": 4, **({"cursor": cursor} if cursor else {})}
+        data = client.get("/api/audit/events", params=params).json()["data"]
+        seen += [(item["created_at"], item["id"]) for item in data["items"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+        assert data["total"] is None or data["total"] == 10
+
+    assert len(seen) == len(set(seen)) == 10
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_invalid_cursor_returns_400(client: TestClient, db: Session, admin):
+    response = client.get("/api/audit/events", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+
+def test_path_stats_percentiles_and_error_rate(client: TestClient, db: Session, admin):
+    db.add_all([_event("/api/cari", duration_ms=ms) for ms in range(1, 101)])
+    db.add_all([_event("/api/tarife", status_code=500 if i < 2 else 200, duration_ms=400) for i in range(4)])
+    db.add(_event("/api/cari", duration_ms=999, minutes_ago=60 * 48))  # pencere dışı
+    db.commit()
+
+    response = client.get("/api/audit/stats/paths", params={"order_by": "p95"}).json()
+    rows = {row["path"]: row for row in response["data"]["items"]}
+
+    assert list(rows) == ["/api/tarife", "/api/cari"]
+    assert (rows["/api/cari"]["count"], rows["/api/cari"]["p50_ms"], rows["/api/cari"]["p95_ms"]) == (100, 50, 95)
+    assert rows["/api/cari"]["avg_ms"] == 50.5
+    assert (rows["/api/tarife"]["server_errors"], rows["/api/tarife"]["error_rate"]) == (2, 0.5)
+    assert response["meta"]["cached"] is False
+
+    db.add(_event("/api/cari", duration_ms=1))
+    db.commit()
+    cached = client.get("/api/audit/stats/paths", params={"order_by": "p95"}).json()
+    assert cached["meta"]["cached"] is True
+    assert cached["data"]["items"] == response["data"]["items"]
+
+
+def test_user_and_hourly_stats(client: TestClient, db: Session, admin):
+    db.add_all([_event(user_id=7, status_code=401) for _ in range(3)] + [_event(user_id=8, minutes_ago=60)])
+    db.commit()
+
+    users = client.get("/api/audit/stats/users").json()["data"]["items"]
+    hourly = client.get("/api/audit/stats/hourly").json()["data"]["items"]
+
+    assert [(row["user_id"], row["count"], row["client_errors"]) for row in users] == [(7, 3, 3), (8, 1, 0)]
+    assert [(row["hour"], row["count"]) for row in hourly] == [
+        ((NOW - timedelta(hours=1)).strftime("%Y-%m-%dT%H:00:00"), 1),
+        (NOW.strftime("%Y-%m-%dT%H:00:00"), 3),
+    ]
@@ -0,0 +1,66 @@
+"""Benchmark süiti: sentetik SGK PDF, bütçe/regresyon değerlendirmesi ve küçük ölçekli yük koşusu."""
+from sqlalchemy import create_engine
+
+from aliaport_api.modules.sgk.pdf_parser import parse_sgk_pdf
+from benchmarks.budgets import evaluate
+from benchmarks.datagen import build_sgk_pdf, generate_dataset, synthetic_sgk_employees
+from benchmarks.load_driver import percentile, run_load
+
+
+def _load_stats(p95_ms, error_rate=0.0, budget="crud"):
+    return {"budget": budget, "p95_ms": p95_ms, "error_rate": error_rate}
+
+
+def test_synthetic_sgk_pdf_round_trips_through_parser():
+    employees = synthetic_sgk_employees(150)
+
+    parsed = parse_sgk_pdf(build_sgk_pdf(employees, period="202510"))
+
+    assert parsed.period == "202510"
+    assert parsed.employees == employees
+
+
+def test_budget_and_error_rate_violations():
+    report = {"load": {
+        "cari_list": _load_stats(120.0),
+        "work_order_list": _load_stats(450.0, budget="work_order_list"),
+        "login": _load_stats(150.0, error_rate=0.05, budget="login"),
+    }}
+
+    violations = {(v.kind, v.name) for v in evaluate(report)}
+
+    assert violations == {("budget", "work_order_list"), ("error_rate", "login")}
+
+
+def test_regressions_against_baseline():
+    baseline = {"load": {"cari_list": _load_stats(100.0)}, "micro": {"pricing.fixed": {"us_per_op": 2.0}}}
+    report = {
+        "load": {"cari_list": _load_stats(130.0), "cari_get": _load_stats(50.0)},
+        "micro": {"pricing.fixed": {"us_per_op": 2.4}},
+    }
+
+    violations = evaluate(report, baseline, tolerance=0.25)
+
+    assert [(v.kind, v.name, v.metric) for v in violations] == [("regression", "cari_list", "p95_ms")]
+    assert violations[0].limit == 125.0
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile([], 95) == 0.0
+
+
+def test_small_scale_load_run(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bench.db'}", connect_args={"check_same_thread": False})
+    written = generate_dataset(engine, scale=0.0005)
+
+    results = run_load(engine, requests=5, concurrency=2, scenarios=["cari_get", "work_order_list", "audit_events"])
+    engine.dispose()
+
+    assert written["work_orders"] == 50
+    assert set(results) == {"cari_get", "work_order_list", "audit_events"}
+    for stats in results.values():
+        assert stats["count"] == 5
+        assert stats["error_rate"] == 0.0
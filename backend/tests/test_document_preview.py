@@ -0,0 +1,149 @@
+"""
+Belge önizleme servisi testleri (ETag / 304 / Range / thumbnail cache)
+"""
+import io
+from types import SimpleNamespace
+
+import pytest
+from fastapi import BackgroundTasks
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from aliaport_api.main import app
+from aliaport_api.modules.auth.dependencies import get_current_user
+from aliaport_api.modules.dijital_arsiv import internal_router
+from aliaport_api.modules.dijital_arsiv.models import ArchiveDocument, DocumentCategory, DocumentType
+from aliaport_api.modules.dijital_arsiv.preview import (
+    ThumbnailCache, ThumbnailService, etag_matches, render_thumbnail, strong_etag
+)
+from tests.conftest import create_cari
+
+CHECKSUM = "ab" * 32
+
+
+def _png_bytes(size=(800, 600)) -> bytes:
+    Image = pytest.importorskip("PIL.Image")
+    output = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(output, format="PNG")
+    return output.getvalue()
+
+
+class TestEtag:
+    def test_matches_list_weak_and_wildcard(self):
+        etag = strong_etag(CHECKSUM)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+
+
+class TestThumbnailCache:
+    def test_lru_eviction_by_total_size(self, tmp_path):
+        cache = ThumbnailCache(str(tmp_path), max_bytes=250)
+        cache.put("a", b"x" * 100)
+        cache.put("b", b"x" * 100)
+        assert cache.get("a") is not None  # a en son kullanılan olur
+        cache.put("c", b"x" * 100)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert not (tmp_path / "b.jpg").exists()
+        assert cache.stats()["total_bytes"] == 200
+
+    def test_reloads_existing_files(self, tmp_path):
+        ThumbnailCache(str(tmp_path), max_bytes=1000).put("a", b"123")
+        assert ThumbnailCache(str(tmp_path), max_bytes=1000).get("a") is not None
+
+
+class TestThumbnailRender:
+    def test_image_thumbnail_is_downscaled_jpeg(self, tmp_path):
+        Image = pytest.importorskip("PIL.Image")
+        source = tmp_path / "scan.png"
+        source.write_bytes(_png_bytes())
+
+        data = render_thumbnail(str(source), "image/png", max_size=100)
+
+        image = Image.open(io.BytesIO(data))
+        assert image.format == "JPEG"
+        assert max(image.size) == 100
+
+    def test_unsupported_type_returns_none(self, tmp_path):
+        source = tmp_path / "a.txt"
+        source.write_text("x")
+        assert render_thumbnail(str(source), "text/plain") is None
+
+    def test_schedule_skips_duplicates(self, tmp_path):
+        service = ThumbnailService(ThumbnailCache(str(tmp_path), max_bytes=10_000))
+        tasks = BackgroundTasks()
+        assert service.schedule(tasks, "x.png", "image/png", CHECKSUM)
+        assert service.schedule(tasks, "x.png", "image/png", CHECKSUM)
+        assert len(tasks.tasks) == 1
+        assert not service.schedule(tasks, "x.txt", "text/plain", CHECKSUM)
+
+
+class TestInternalDocumentPreview:
+    @pytest.fixture
+    def internal_client(self, client: TestClient, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            internal_router, "thumbnail_service",
+            ThumbnailService(ThumbnailCache(str(tmp_path / "thumbs"), max_bytes=1024 * 1024)),
+        )
+        app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, is_superuser=True)
+        yield client
+        app.dependency_overrides.pop(get_current_user, None)
+
+    def _add_document(self, db: Session, path, file_type: str) -> ArchiveDocument:
+        cari = create_cari(db)
+        doc = ArchiveDocument(
+            category=DocumentCategory.CARI, document_type=DocumentType.DIGER_EVRAK, cari_id=cari.Id,
+            file_name=path.name, file_path=str(path), file_size=path.stat().st_size,
+            file_type=file_type, file_hash=CHECKSUM,
+        )
+        db.add(doc)
+        db.commit()
+        return doc
+
+    def test_preview_etag_304_and_range(self, internal_client: TestClient, db: Session, tmp_path):
+        source = tmp_path / "belge.pdf"
+        source.write_bytes(b"%PDF-1.4 " + b"0123456789" * 1000)
+        doc = self._add_document(db, source, "application/pdf")
+        url = f"/api/v1/internal/archive/documents/{doc.id}/preview"
+
+        r = internal_client.get(url)
+        assert r.status_code == 200
+        assert r.headers["etag"] == strong_etag(CHECKSUM)
+        assert r.headers["content-disposition"].startswith("inline")
+
+        assert internal_client.get(url, headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+        partial = internal_client.get(url, headers={"Range": "bytes=0-99", "If-Range": r.headers["etag"]})
+        assert partial.status_code == 206
+        assert partial.content == source.read_bytes()[:100]
+
+    def test_thumbnail_generated_in_background(self, internal_client: TestClient, db: Session, tmp_path):
+        source = tmp_path / "scan.png"
+        source.write_bytes(_png_bytes())
+        doc = self._add_document(db, source, "image/png")
+        url = f"/api/v1/internal/archive/documents/{doc.id}/thumbnail"
+
+        first = internal_client.get(url)
+        assert first.status_code == 202
+        assert first.headers["retry-after"]
+
+        second = internal_client.get(url)
+        assert second.status_code == 200
+        assert second.headers["content-type"] == "image/jpeg"
+        assert internal_client.get(url, headers={"If-None-Match": second.headers["etag"]}).status_code == 304
+
+    def test_failed_thumbnail_cached_negative(self, internal_client: TestClient, db: Session, tmp_path):
+        source = tmp_path / "bozuk.png"
+        source.write_bytes(b"not an image")
+        doc = self._add_document(db, source, "image/png")
+        url = f"/api/v1/internal/archive/documents/{doc.id}/thumbnail"
+
+        assert internal_client.get(url).status_code == 202
+        # Render başarısız: yeniden üretim planlanmaz, istemci yoklamayı bırakır
+        failed = internal_client.get(url)
+        assert failed.status_code == 404
+        assert "max-age" in failed.headers["cache-control"]
+        assert internal_client.get(url).status_code == 404
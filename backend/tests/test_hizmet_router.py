@@ -163,3 +163,30 @@ class TestHizmetRouter:
         assert len(body["data"]) == 2
         assert body["pagination"]["page"] == 1
         assert body["pagination"]["total"] >= 5
+
+    def test_analytics_export_csv_streams_tariffs(self, client: TestClient, db: Session):
+        from datetime import date
+        from aliaport_api.modules.hizmet.models import TarifeListesi
+
+        hizmet = create_hizmet(db, Kod="CSV_HZ", Ad="Römorkaj")
+        db.add_all([
+            TarifeListesi(HizmetId=hizmet.Id, ValidFrom=date(2025, 1, 1), ValidTo=date(2025, 6, 30), OverridePrice=20),
+            TarifeListesi(HizmetId=hizmet.Id, ValidFrom=date(2025, 7, 1), OverridePrice=22, OverrideCurrency="USD"),
+        ])
+        db.commit()
+
+        r = client.get(self.base_url + "/analytics/export-csv?start_date=2025-08-01")
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/csv")
+        assert "attachment" in r.headers["content-disposition"]
+        lines = r.content.decode("utf-8-sig").strip().split("\r\n")
+        assert lines[0].startswith("Tarife ID;Hizmet Kod")
+        assert len(lines) == 2
+        assert "CSV_HZ;Römorkaj" in lines[1] and "USD" in lines[1]
+
+        r_all = client.get(self.base_url + "/analytics/export-csv")
+        assert len(r_all.content.decode("utf-8-sig").strip().split("\r\n")) == 3
+
+    def test_analytics_export_csv_invalid_date(self, client: TestClient):
+        r = client.get(self.base_url + "/analytics/export-csv?start_date=2025-13-01")
+        assert r.status_code == 400
@@ -0,0 +1,68 @@
+"""Hızlı JSON serileştirme: FastJSONResponse ve fast_paginated_response zarfı."""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+
+from aliaport_api.core.json_response import FastJSONResponse, dumps, serialize_rows
+from aliaport_api.core.responses import fast_paginated_response, paginated_response
+from aliaport_api.modules.kurlar.models import ExchangeRate as ExchangeRateModel
+from aliaport_api.modules.kurlar.schemas import ExchangeRate
+
+
+class Status(str, Enum):
+    ACTIVE = "ACTIVE"
+
+
+def make_rate(i: int) -> ExchangeRateModel:
+    return ExchangeRateModel(
+        Id=i,
+        CurrencyFrom="USD",
+        CurrencyTo="TRY",
+        Rate=30.0 + i,
+        RateDate=date(2025, 11, 20),
+        Source="TEST",
+        CreatedAt=datetime(2025, 11, 20, 10, 30),
+    )
+
+
+def test_dumps_handles_native_types():
+    payload = {
+        "price": Decimal("12.50"),
+        "count": Decimal("3"),
+        "when": datetime(2025, 11, 20, 10, 30, 15),
+        "day": date(2025, 11, 20),
+        "status": Status.ACTIVE,
+    }
+    assert json.loads(dumps(payload)) == {
+        "price": 12.5,
+        "count": 3,
+        "when": "2025-11-20T10:30:15",
+        "day": "2025-11-20",
+        "status": "ACTIVE",
+    }
+
+
+def test_fast_json_response_renders_bytes():
+    resp = FastJSONResponse({"amount": Decimal("1.25")})
+    assert resp.body == b'{"amount":1.25}'
+    assert resp.media_type == "application/json"
+
+
+def test_serialize_rows_matches_model_dump():
+    rows = [make_rate(i) for i in range(3)]
+    expected = [json.loads(ExchangeRate.model_validate(r).model_dump_json()) for r in rows]
+    assert json.loads(serialize_rows(ExchangeRate, rows)) == expected
+
+
+def test_fast_paginated_response_matches_envelope():
+    rows = [make_rate(i) for i in range(5)]
+    fast = json.loads(fast_paginated_response(rows=rows, schema=ExchangeRate, page=1, page_size=5, total=12, message="ok").body)
+    slow = paginated_response(
+        data=[ExchangeRate.model_validate(r).model_dump(mode="json") for r in rows],
+        page=1, page_size=5, total=12, message="ok",
+    )
+    for key in ("timestamp", "meta"):
+        fast.pop(key)
+        slow.pop(key)
+    assert fast == slow
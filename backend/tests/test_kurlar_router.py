@@ -260,6 +260,70 @@ class TestKurlarConversion:
         assert "kur bulunamadı" in r.json()["detail"]["error"]["message"].lower()
 
 
+class TestKurlarBatchConversion:
+    """Test bulk currency conversion endpoint."""
+    
+    def test_batch_preserves_input_order(self, client: TestClient, db: Session):
+        """Results come back in input order with direct and reverse rates."""
+        target_date = date(2025, 11, 20)
+        create_exchange_rate(db, "USD", "TRY", 28.50, rate_date=target_date)
+        create_exchange_rate(db, "EUR", "TRY", 31.20, rate_date=target_date)
+        
+        payload = {"items": [
+            {"amount": 100, "from": "EUR", "to": "TRY", "date": str(target_date)},
+            {"amount": 2850, "from": "TRY", "to": "USD", "date": str(target_date)},
+            {"amount": 10, "from": "USD", "to": "USD", "date": str(target_date)},
+        ]}
+        r = client.post("/api/exchange-rate/convert/batch", json=payload)
+        assert r.status_code == 200
+        data = r.json()["data"]
+        results = data["results"]
+        assert [res["index"] for res in results] == [0, 1, 2]
+        assert results[0]["converted_amount"] == 3120.0
+        assert abs(results[1]["converted_amount"] - 100.0) < 0.01
+        assert results[2]["rate"] == 1.0
+        assert data["failed"] == 0
+    
+    def test_batch_fallback_date(self, client: TestClient, db: Session):
+        """Weekend dates fall back to the latest earlier rate."""
+        create_exchange_rate(db, "USD", "TRY", 28.00, rate_date=date(2025, 11, 20))
+        create_exchange_rate(db, "USD", "TRY", 28.50, rate_date=date(2025, 11, 21))
+        
+        payload = {"items": [
+            {"amount": 1, "from": "USD", "to": "TRY", "date": "2025-11-23"},
+            {"amount": 1, "from": "USD", "to": "TRY", "date": "2025-11-20"},
+        ]}
+        r = client.post("/api/exchange-rate/convert/batch", json=payload)
+        results = r.json()["data"]["results"]
+        assert results[0]["rate"] == 28.50
+        assert results[0]["used_rate_date"] == "2025-11-21"
+        assert results[0]["is_fallback"] is True
+        assert results[1]["rate"] == 28.00
+        assert results[1]["is_fallback"] is False
+    
+    def test_batch_triangulates_through_try(self, client: TestClient, db: Session):
+        """Missing direct pair is resolved via TRY cross rate."""
+        target_date = date(2025, 11, 20)
+        create_exchange_rate(db, "USD", "TRY", 30.00, rate_date=target_date)
+        create_exchange_rate(db, "EUR", "TRY", 33.00, rate_date=target_date)
+        
+        payload = {"items": [{"amount": 100, "from": "EUR", "to": "USD", "date": str(target_date)}]}
+        r = client.post("/api/exchange-rate/convert/batch", json=payload)
+        result = r.json()["data"]["results"][0]
+        assert result["via"] == "TRY"
+        assert abs(result["rate"] - 1.1) < 1e-9
+        assert result["converted_amount"] == 110.0
+    
+    def test_batch_missing_rate_reports_error(self, client: TestClient, db: Session):
+        """Unresolvable items carry an error without failing the batch."""
+        payload = {"items": [{"amount": 100, "from": "XXX", "to": "YYY"}]}
+        r = client.post("/api/exchange-rate/convert/batch", json=payload)
+        assert r.status_code == 200
+        data = r.json()["data"]
+        assert data["failed"] == 1
+        assert "kur bulunamadı" in data["results"][0]["error"].lower()
+
+
 class TestKurlarCRUD:
     """Test CRUD operations."""
     
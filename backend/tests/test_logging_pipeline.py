@@ -0,0 +1,158 @@
+"""
+Queue tabanlı logging pipeline testleri
+"""
+import json
+import logging
+import os
+import queue
+import threading
+from pathlib import Path
+
+import pytest
+
+from aliaport_api.core.logging_config import (
+    JSONFormatter,
+    LoggingPipeline,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    flush_logging,
+    get_logging_stats,
+    log_api_request,
+    setup_logging,
+)
+
+
+def _api_record(status_code=200, duration_ms=5.0, name="aliaport_api.test") -> logging.LogRecord:
+    record = logging.LogRecord(name, logging.INFO, __file__, 1, "GET /x", None, None)
+    record.extra_data = {"type": "api_request", "status_code": status_code, "duration_ms": duration_ms}
+    return record
+
+
+def _read_json_lines(path: Path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line]
+
+
+@pytest.fixture
+def isolated_logging(tmp_path):
+    pipeline = setup_logging(log_dir=tmp_path, enable_console=False)
+    yield tmp_path, pipeline
+    setup_logging(log_dir=Path("logs"), log_level=os.getenv("LOG_LEVEL", "INFO"))
+
+
+class TestLoggingPipeline:
+    def test_api_request_written_once_to_api_log(self, isolated_logging):
+        log_dir, _ = isolated_logging
+        logger = logging.getLogger("aliaport_api.middleware.test")
+
+        log_api_request(logger, "GET", "/api/cari", 200, 3.2, request_id="req-1")
+        logger.info("Uygulama mesajı")
+        logging.getLogger("audit").info("İş emri onaylandı")
+        logger.error("Hata oluştu")
+        assert flush_logging()
+
+        api_lines = _read_json_lines(log_dir / "api.log")
+        app_lines = _read_json_lines(log_dir / "app.log")
+        assert [line["request_id"] for line in api_lines] == ["req-1"]
+        assert all(line.get("extra", {}).get("type") != "api_request" for line in app_lines)
+        assert any(line["message"] == "Uygulama mesajı" for line in app_lines)
+        assert [line["message"] for line in _read_json_lines(log_dir / "audit.log")] == ["İş emri onaylandı"]
+        assert [line["message"] for line in _read_json_lines(log_dir / "error.log")] == ["Hata oluştu"]
+        assert not any(line["message"] == "İş emri onaylandı" for line in app_lines)
+
+    def test_stats_counters(self, isolated_logging):
+        _, pipeline = isolated_logging
+        logging.getLogger("aliaport_api.test").info("bir")
+        flush_logging()
+
+        stats = get_logging_stats()
+        assert stats["enqueued"] >= 1
+        assert stats["written"] == stats["enqueued"]
+        assert stats["dropped"] == 0
+        assert stats["queued"] == 0
+
+
+class TestQueueHandler:
+    def test_full_queue_drops_without_blocking(self):
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        handler.handle(logging.LogRecord("x", logging.INFO, __file__, 1, "a %s", ("1",), None))
+        handler.handle(logging.LogRecord("x", logging.INFO, __file__, 1, "b", None, None))
+
+        assert handler.enqueued == 1
+        assert handler.dropped == 1
+        record = handler.queue.get_nowait()
+        assert record.msg == "a 1" and record.args is None
+
+    def test_listener_drains_in_batches(self):
+        class CountingHandler(logging.Handler):
+            def emit(self, record):
+                pass
+
+        pipeline = LoggingPipeline([CountingHandler()], queue_size=100, batch_size=50)
+        for i in range(20):
+            pipeline.queue_handler.handle(logging.LogRecord("x", logging.INFO, __file__, 1, str(i), None, None))
+        pipeline.start()
+        assert pipeline.flush()
+        pipeline.stop()
+
+        stats = pipeline.stats()
+        assert stats["written"] == 20
+        assert stats["batches"] < 20
+
+
+class TestSamplingFilter:
+    def test_samples_only_successful_fast_api_requests(self):
+        sampling = SamplingFilter(default_rate=0.0, rates={"aliaport_api.keep": 1.0}, slow_ms=500)
+
+        assert sampling.filter(_api_record()) is False
+        assert sampling.filter(_api_record(status_code=500)) is True
+        assert sampling.filter(_api_record(duration_ms=900)) is True
+        assert sampling.filter(_api_record(name="aliaport_api.keep")) is True
+        assert sampling.filter(logging.LogRecord("x", logging.INFO, __file__, 1, "normal", None, None)) is True
+        assert sampling.sampled_out == 1
+
+
+class TestJSONFormatter:
+    def test_uses_record_creation_time(self):
+        record = logging.LogRecord("x", logging.INFO, __file__, 1, "Ş mesaj", None, None)
+        record.created = 0
+        data = json.loads(JSONFormatter().format(record))
+        assert data["timestamp"] == "1970-01-01T00:00:00Z"
+        assert data["message"] == "Ş mesaj"
+
+
+class TestExceptionRecords:
+    def test_traceback_formatted_before_enqueue(self):
+        handler = NonBlockingQueueHandler(queue.Queue())
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord("x", logging.ERROR, __file__, 1, "hata", None, __import__("sys").exc_info())
+        handler.handle(record)
+
+        queued = handler.queue.get_nowait()
+        assert queued.exc_info is None
+        assert "ValueError: boom" in json.loads(JSONFormatter().format(queued))["exception"]
+        # Çağıranın kaydı değişmez (diğer handler'lar / caplog orijinali görür)
+        assert record.exc_info is not None and record.msg == "hata"
+
+    def test_prepare_keeps_original_args(self):
+        handler = NonBlockingQueueHandler(queue.Queue())
+        record = logging.LogRecord("x", logging.INFO, __file__, 1, "a %s", ("1",), None)
+        handler.handle(record)
+        assert (record.msg, record.args) == ("a %s", ("1",))
+        assert handler.queue.get_nowait().msg == "a 1"
+
+
+class TestPipelineStop:
+    def test_stop_does_not_hang_when_listener_died(self):
+        pipeline = LoggingPipeline([logging.NullHandler()], queue_size=1)
+        dead = threading.Thread(target=lambda: None)
+        dead.start()
+        dead.join()
+        pipeline.listener._thread, pipeline._started = dead, True
+        pipeline.queue.put_nowait(logging.LogRecord("x", logging.INFO, __file__, 1, "dolu", None, None))
+
+        pipeline.stop(timeout=0.1)
+
+        assert pipeline.listener._thread is None
+        assert pipeline.stats()["queued"] == 1
@@ -0,0 +1,139 @@
+"""Prometheus metrikleri: route şablonu etiketleri, istek başına DB sayımı, cache ve scheduler."""
+import threading
+import time
+
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.schedulers.background import BackgroundScheduler
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from aliaport_api.core.cache import cache, cached_get_or_set
+from aliaport_api.core.metrics import instrument_scheduler, render_metrics, statement_operation
+from aliaport_api.middleware.asgi_pipeline import RequestPipelineMiddleware
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def build_app():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    app = FastAPI()
+
+    @app.get("/metrics-test/items/{item_id}")
+    def get_item(item_id: int):
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    @app.get("/metrics-test/boom")
+    def boom():
+        raise RuntimeError("patladı")
+
+    app.add_middleware(RequestPipelineMiddleware, enable_audit=False)
+    return app
+
+
+def test_requests_labelled_by_route_template():
+    client = TestClient(build_app(), raise_server_exceptions=False)
+    template = "/metrics-test/items/{item_id}"
+    before = sample("aliaport_http_requests_total", method="GET", endpoint=template, status="200")
+    before_unmatched = sample("aliaport_http_requests_total", method="GET", endpoint="unmatched", status="404")
+    before_error = sample("aliaport_http_requests_total", method="GET", endpoint="/metrics-test/boom", status="500")
+
+    assert client.get("/metrics-test/items/1").status_code == 200
+    assert client.get("/metrics-test/items/2").status_code == 200
+    assert client.get("/metrics-test/yok").status_code == 404
+    assert client.get("/metrics-test/boom").status_code == 500
+
+    assert sample("aliaport_http_requests_total", method="GET", endpoint=template, status="200") == before + 2
+    assert sample("aliaport_http_requests_total", method="GET", endpoint="unmatched", status="404") == before_unmatched + 1
+    assert sample("aliaport_http_requests_total", method="GET", endpoint="/metrics-test/boom", status="500") == before_error + 1
+    assert sample("aliaport_http_request_duration_seconds_count", method="GET", endpoint="/metrics-test/items/1") == 0
+    assert sample("aliaport_http_requests_in_progress", method="GET") == 0
+
+
+def test_db_queries_counted_per_request():
+    client = TestClient(build_app())
+    template = "/metrics-test/items/{item_id}"
+    count_before = sample("aliaport_db_queries_per_request_count", endpoint=template)
+    sum_before = sample("aliaport_db_queries_per_request_sum", endpoint=template)
+
+    client.get("/metrics-test/items/7")
+
+    assert sample("aliaport_db_queries_per_request_count", endpoint=template) == count_before + 1
+    assert sample("aliaport_db_queries_per_request_sum", endpoint=template) == sum_before + 3
+    assert sample("aliaport_db_time_per_request_seconds_sum", endpoint=template) > 0
+
+
+def test_statement_operation():
+    assert statement_operation("  SELECT * FROM cari") == "select"
+    assert statement_operation("insert into x values (1)") == "insert"
+    assert statement_operation("PRAGMA foreign_keys=ON") == "other"
+
+
+def test_cache_hits_and_misses_by_namespace():
+    cache.invalidate("metrictest:")
+    before_hit = sample("aliaport_cache_requests_total", namespace="metrictest", result="hit")
+    before_miss = sample("aliaport_cache_requests_total", namespace="metrictest", result="miss")
+
+    for _ in range(3):
+        cached_get_or_set("metrictest:id=1", ttl_seconds=60, fetcher=lambda: {"ok": True})
+
+    assert sample("aliaport_cache_requests_total", namespace="metrictest", result="miss") == before_miss + 1
+    assert sample("aliaport_cache_requests_total", namespace="metrictest", result="hit") == before_hit + 2
+
+
+def _sleeping_job(seconds: float) -> str:
+    time.sleep(seconds)
+    return "ok"
+
+
+def _failing_job() -> None:
+    raise ValueError("boom")
+
+
+def test_scheduler_job_durations_measured_inside_job():
+    scheduler = BackgroundScheduler(executors={"default": ThreadPoolExecutor(2)})
+    instrument_scheduler(scheduler)
+    before_ok = sample("aliaport_scheduler_job_duration_seconds_count", job_id="metrics_test_job", status="success")
+    before_sum = sample("aliaport_scheduler_job_duration_seconds_sum", job_id="metrics_test_job", status="success")
+    before_err = sample("aliaport_scheduler_job_duration_seconds_count", job_id="metrics_test_fail", status="error")
+    finished = threading.Semaphore(0)
+    scheduler.add_listener(lambda _: finished.release(), EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
+
+    scheduler.start()
+    try:
+        job = scheduler.add_job(_sleeping_job, "date", args=[0.05], id="metrics_test_job")
+        scheduler.add_job(_failing_job, "date", id="metrics_test_fail")
+        assert finished.acquire(timeout=5) and finished.acquire(timeout=5)
+    finally:
+        scheduler.shutdown(wait=True)
+
+    assert job.name == "_sleeping_job"
+    assert sample("aliaport_scheduler_job_duration_seconds_count", job_id="metrics_test_job", status="success") == before_ok + 1
+    duration = sample("aliaport_scheduler_job_duration_seconds_sum", job_id="metrics_test_job", status="success") - before_sum
+    assert 0.05 <= duration < 1
+    assert sample("aliaport_scheduler_job_duration_seconds_count", job_id="metrics_test_fail", status="error") == before_err + 1
+
+
+def test_render_metrics_multiprocess(tmp_path, monkeypatch):
+    content, content_type = render_metrics()
+    assert b"aliaport_http_requests_total" in content
+    assert content_type.startswith("text/plain")
+
+    # Worker dosyası olmayan boş dizin: toplayıcı hata vermeden boş çıktı üretir
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    content, _ = render_metrics()
+    assert b"aliaport_http_requests_total" not in content
+
+
+def test_metrics_endpoint(client: TestClient):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "aliaport_cache_hit_rate" in response.text
@@ -0,0 +1,188 @@
+"""
+Toplu 4 saat kuralı / fazla mesai motoru testleri
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from aliaport_api.modules.guvenlik.models import GateLog
+from aliaport_api.modules.hizmet.models import CalculationType, Hizmet
+from aliaport_api.modules.hizmet.pricing_engine import PricingEngine
+from aliaport_api.modules.isemri.models import (
+    WorkOrder,
+    WorkOrderItem,
+    WorkOrderPerson,
+    WorkOrderType,
+)
+from aliaport_api.modules.isemri.overtime import (
+    apply_overtime_items,
+    compute_vehicle_overtime,
+    compute_work_order_overtime,
+    resolve_vehicle_4h_tariff,
+)
+
+DAY = datetime(2025, 11, 10, 8, 0)
+
+
+def _work_order(db: Session, no: int, actual_end=None) -> WorkOrder:
+    wo = WorkOrder(
+        wo_number=f"WO-T{no:03d}", cari_id=1, cari_code="C001", cari_title="Test Cari",
+        type=WorkOrderType.HIZMET, subject=f"İş {no}", actual_end=actual_end,
+    )
+    db.add(wo)
+    db.flush()
+    return wo
+
+
+def _gate_log(db: Session, wo: WorkOrder, entry_time, exit_time, plate=None) -> GateLog:
+    log = GateLog(
+        work_order_id=wo.id, wo_number=wo.wo_number, wo_status="ONAYLANDI", entry_type="GIRIS",
+        security_personnel="Güvenlik", vehicle_plate=plate, entry_time=entry_time, exit_time=exit_time,
+    )
+    db.add(log)
+    return log
+
+
+def _seed(db: Session):
+    # 1: GateLog çıkışı 6 saat sonra → 120 dk fazla mesai
+    wo1 = _work_order(db, 1, actual_end=DAY)
+    _gate_log(db, wo1, DAY - timedelta(hours=2), DAY + timedelta(hours=6), plate="35 ABC 01")
+    # 2: GateLog yok, personel çıkışı 5 saat sonra → 60 dk
+    wo2 = _work_order(db, 2, actual_end=DAY + timedelta(days=1))
+    db.add(WorkOrderPerson(work_order_id=wo2.id, full_name="Ali Veli", gate_exit_time=DAY + timedelta(days=1, hours=5)))
+    # 3: 4 saat içinde → fazla mesai yok
+    wo3 = _work_order(db, 3, actual_end=DAY)
+    _gate_log(db, wo3, DAY, DAY + timedelta(hours=3))
+    # 4: Aralık dışında
+    wo4 = _work_order(db, 4, actual_end=DAY + timedelta(days=40))
+    _gate_log(db, wo4, DAY + timedelta(days=40), DAY + timedelta(days=40, hours=9))
+    db.add(Hizmet(
+        Kod="ARAC-4H", Ad="Araç Giriş", Fiyat=Decimal("15.00"), ParaBirimi="USD",
+        CalculationType=CalculationType.VEHICLE_4H_RULE, FormulaParams={"base_minutes": 240},
+    ))
+    db.commit()
+    return wo1, wo2, wo3, wo4
+
+
+class TestOvertimeEngine:
+
+    def test_work_order_overtime_single_query(self, db: Session, count_statements):
+        wo1, wo2, wo3, _ = _seed(db)
+        with count_statements(db) as statements:
+            results = compute_work_order_overtime(
+                db, date_from=date(2025, 11, 1), date_to=date(2025, 11, 30), hourly_rate=100.0
+            )
+
+        assert len(statements) == 1
+        by_id = {r.work_order_id: r for r in results}
+        assert set(by_id) == {wo1.id, wo2.id, wo3.id}
+        assert (by_id[wo1.id].overtime_minutes, by_id[wo1.id].overtime_charge) == (120, 200.0)
+        assert (by_id[wo2.id].overtime_minutes, by_id[wo2.id].overtime_hours) == (60, 1.0)
+        assert not by_id[wo3.id].is_overtime
+
+    def test_vehicle_charge_matches_pricing_engine(self, db: Session):
+        _seed(db)
+        tariff = resolve_vehicle_4h_tariff(db)
+        vehicles = compute_vehicle_overtime(db, date_from=date(2025, 11, 1), date_to=date(2025, 11, 30), tariff=tariff)
+
+        charged = [v for v in vehicles if v.needs_extra_charge]
+        assert len(charged) == 1
+        vehicle = charged[0]
+        assert (vehicle.duration_minutes, vehicle.extra_minutes) == (480, 240)
+        expected = PricingEngine.calculate(
+            CalculationType.VEHICLE_4H_RULE, Decimal("15.00"), {"base_minutes": 240},
+            {"minutes": vehicle.duration_minutes}, "USD",
+        )
+        assert vehicle.extra_charge == Decimal(str(expected["breakdown"]["extra_charge"])).quantize(Decimal("0.01"))
+        assert vehicle.currency == "USD"
+
+    def test_vehicle_minute_rate_uses_card_base_minutes(self, db: Session):
+        _seed(db)
+        db.query(Hizmet).filter_by(Kod="ARAC-4H").update({"FormulaParams": {"base_minutes": 300}})
+        db.query(GateLog).filter_by(vehicle_plate="35 ABC 01").update({"base_charge_hours": 5})
+        db.commit()
+        tariff = resolve_vehicle_4h_tariff(db)
+        vehicle = next(
+            v for v in compute_vehicle_overtime(db, date_from=date(2025, 11, 1), date_to=date(2025, 11, 30), tariff=tariff)
+            if v.needs_extra_charge
+        )
+
+        expected = PricingEngine.calculate(
+            CalculationType.VEHICLE_4H_RULE, Decimal("15.00"), {"base_minutes": 300},
+            {"minutes": vehicle.duration_minutes}, "USD",
+        )
+        assert tariff.base_minutes == 300
+        assert vehicle.minute_rate == Decimal(str(expected["breakdown"]["minute_rate"]))
+        assert vehicle.extra_charge == Decimal("9.00")
+
+    def test_apply_items_is_idempotent_and_skips_invoiced(self, db: Session):
+        wo1, wo2, _, _ = _seed(db)
+        tariff = resolve_vehicle_4h_tariff(db)
+        results = compute_work_order_overtime(db, date_from=date(2025, 11, 1), date_to=date(2025, 11, 30))
+        vehicles = compute_vehicle_overtime(db, date_from=date(2025, 11, 1), date_to=date(2025, 11, 30), tariff=tariff)
+
+        first = apply_overtime_items(db, results, vehicles, vehicle_tariff=tariff)
+        assert all(created for _, created in first["work_orders"].values())
+        assert len(first["vehicles"]) == 1
+        assert db.query(WorkOrderItem).count() == 3
+        gate_log = db.query(GateLog).filter(GateLog.vehicle_plate == "35 ABC 01").one()
+        assert gate_log.extra_minutes == 240
+        assert gate_log.extra_charge_calculated == Decimal("15.00")
+
+        db.query(WorkOrderItem).filter(WorkOrderItem.work_order_id == wo2.id).update({"is_invoiced": True})
+        db.commit()
+        second = apply_overtime_items(db, results, vehicles, vehicle_tariff=tariff)
+        assert second["work_orders"] == {wo1.id: (first["work_orders"][wo1.id][0], False)}
+        assert db.query(WorkOrderItem).count() == 3
+
+
+class TestOvertimeEndpoints:
+
+    def test_batch_endpoint_creates_items(self, client: TestClient, db: Session):
+        wo1, wo2, _, _ = _seed(db)
+        r = client.post(
+            "/api/work-order/overtime/batch",
+            params={"date_from": "2025-11-01", "date_to": "2025-11-30", "create_items": True},
+        )
+        assert r.status_code == 200, r.text
+        data = r.json()["data"]
+        assert {w["work_order_id"] for w in data["work_orders"]} == {wo1.id, wo2.id}
+        assert data["summary"]["work_orders_evaluated"] == 3
+        assert data["summary"]["vehicle_extra_charge"] == {"USD": 15.0}
+        assert data["summary"]["items_written"] == 3
+        assert all(w["item_created"] for w in data["work_orders"])
+
+    def test_batch_endpoint_rejects_reversed_range(self, client: TestClient):
+        r = client.post("/api/work-order/overtime/batch", params={"date_from": "2025-11-30", "date_to": "2025-11-01"})
+        assert r.status_code == 400
+
+    def test_single_endpoint_uses_engine(self, client: TestClient, db: Session):
+        wo1, _, _, _ = _seed(db)
+        r = client.get(f"/api/work-order/{wo1.id}/calculate-overtime", params={"auto_create_item": True})
+        assert r.status_code == 200
+        data = r.json()["data"]
+        assert data["overtime_minutes"] == 120
+        assert data["work_order_item_id"] is not None
+
+        r = client.get(f"/api/work-order/{wo1.id}/calculate-overtime", params={"auto_create_item": True})
+        assert r.json()["data"]["message"] == "Mevcut fazla mesai kalemi güncellendi"
+
+        assert client.get("/api/work-order/999999/calculate-overtime").status_code == 404
+
+    def test_vehicle_exit_prices_extra_minutes(self, client: TestClient, db: Session):
+        wo1, _, _, _ = _seed(db)
+        log = _gate_log(db, wo1, DAY, None, plate="35 XYZ 02")
+        db.commit()
+        r = client.post("/api/gatelog/vehicle/exit", json={
+            "gate_log_id": log.id,
+            "exit_time": (DAY + timedelta(hours=5)).isoformat(),
+            "security_personnel": "Güvenlik",
+        })
+        assert r.status_code == 200, r.text
+        data = r.json()["data"]
+        assert data["extra_minutes"] == 60
+        assert data["needs_extra_charge"] is True
+        assert data["extra_charge_amount"] == pytest.approx(3.75)
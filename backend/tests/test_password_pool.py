@@ -0,0 +1,93 @@
+"""Şifre havuzu: doğrulama, cost değişiminde şeffaf rehash, doygunlukta 503 ve login entegrasyonu."""
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+from sqlalchemy.orm import Session
+
+from aliaport_api.modules.auth import router as auth_router
+from aliaport_api.modules.auth.models import User
+from aliaport_api.modules.auth.password_pool import PasswordHasherPool, PasswordPoolSaturated
+from aliaport_api.modules.auth.utils import BCRYPT_ROUNDS
+from aliaport_api.modules.dijital_arsiv.models import PortalUser
+from tests.conftest import create_cari
+
+# Testlerde düşük cost: rehash tetiklemek için uygulamanınkinden farklı olmalı
+LOW_COST = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=4)
+
+
+@pytest.fixture
+def pool():
+    pool = PasswordHasherPool(LOW_COST, max_workers=2, max_pending=4)
+    yield pool
+    pool.shutdown()
+
+
+def test_verify_and_hash_run_in_pool(pool):
+    hashed = pool.hash("Secret123!")
+
+    assert pool.verify("Secret123!", hashed)
+    assert pool.verify_and_update("wrong", hashed) == (False, None)
+    assert asyncio.run(pool.verify_and_update_async("Secret123!", hashed)) == (True, None)
+    assert pool.stats() == {**pool.stats(), "pending": 0, "completed": 4, "rejected": 0}
+
+
+def test_verify_and_update_returns_new_hash_when_cost_changes(pool):
+    stronger = PasswordHasherPool(CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5), max_workers=1)
+    try:
+        valid, new_hash = stronger.verify_and_update("Secret123!", pool.hash("Secret123!"))
+    finally:
+        stronger.shutdown()
+
+    assert valid
+    assert new_hash.startswith("$2b$05$")
+
+
+def test_saturated_pool_rejects_fast():
+    pool = PasswordHasherPool(LOW_COST, max_workers=1, max_pending=1)
+    release = threading.Event()
+    blocker = pool._submit("verify", release.wait)
+    try:
+        with pytest.raises(PasswordPoolSaturated):
+            pool.verify("x", LOW_COST.hash("x"))
+        assert pool.stats()["rejected"] == 1
+    finally:
+        release.set()
+        blocker.result()
+        pool.shutdown()
+
+
+def test_staff_login_rehashes_outdated_hash(client: TestClient, db: Session):
+    user = User(email="rehash@aliaport.com.tr", hashed_password=LOW_COST.hash("Rehash123!"), full_name="Rehash", is_active=True)
+    db.add(user)
+    db.commit()
+
+    auth_router.limiter.enabled = False
+    try:
+        assert client.post("/api/auth/login", json={"email": user.email, "password": "wrong-pass"}).status_code == 401
+        assert user.hashed_password.startswith("$2b$04$")
+        response = client.post("/api/auth/login", json={"email": user.email, "password": "Rehash123!"})
+    finally:
+        auth_router.limiter.enabled = True
+
+    assert response.status_code == 200
+    db.refresh(user)
+    assert user.hashed_password.startswith(f"$2b${BCRYPT_ROUNDS:02d}$")
+
+
+def test_portal_login_returns_503_when_pool_saturated(client: TestClient, db: Session, monkeypatch):
+    cari = create_cari(db)
+    portal_user = PortalUser(cari_id=cari.Id, email="portal@aliaport.com.tr", full_name="Portal", hashed_password=LOW_COST.hash("Portal123!"))
+    db.add(portal_user)
+    db.commit()
+
+    def saturated(*args):
+        raise PasswordPoolSaturated("busy")
+
+    monkeypatch.setattr("aliaport_api.modules.auth.utils.password_pool.verify_and_update", saturated)
+    response = client.post("/api/v1/portal/auth/login", data={"username": portal_user.email, "password": "Portal123!"})
+
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
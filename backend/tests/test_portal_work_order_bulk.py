@@ -0,0 +1,101 @@
+"""
+Portal iş emri oluşturma: toplu referans doğrulama ve bulk alt kayıt yazımı
+"""
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from aliaport_api.main import app
+from aliaport_api.modules.dijital_arsiv.models import PortalEmployee, PortalVehicle
+from aliaport_api.modules.dijital_arsiv.portal_router import get_current_portal_user
+from aliaport_api.modules.hizmet.models import Hizmet
+from aliaport_api.modules.isemri.models import WorkOrder, WorkOrderEmployee, WorkOrderItem, WorkOrderPerson, WorkOrderVehicle
+from tests.conftest import create_cari
+
+URL = "/api/v1/portal/work-orders"
+
+
+@pytest.fixture
+def firm(db: Session):
+    firm = create_cari(db, CariKod="WOB1", Unvan="Ekip Firma")
+    other = create_cari(db, CariKod="WOB2", Unvan="Diğer Firma")
+    db.add_all([
+        Hizmet(Kod="ROM", Ad="Römorkör", Birim="saat", ParaBirimi="usd", Fiyat=100, KdvOrani=20, AktifMi=True),
+        Hizmet(Kod="PER", Ad="Personel Transfer", Fiyat=50, AktifMi=True),
+    ])
+    db.add_all(PortalEmployee(cari_id=firm.Id, full_name=f"Çalışan {i}") for i in range(200))
+    db.add_all(PortalVehicle(cari_id=firm.Id, plaka=f"35 AB {i:03d}") for i in range(30))
+    db.add_all([
+        PortalEmployee(cari_id=firm.Id, full_name="Ayrılmış", is_active=False),
+        PortalEmployee(cari_id=other.Id, full_name="Başka Firma"),
+        PortalVehicle(cari_id=other.Id, plaka="34 ZZ 999"),
+    ])
+    db.commit()
+    app.dependency_overrides[get_current_portal_user] = lambda: SimpleNamespace(id=1, cari_id=firm.Id, full_name="Portal Kullanıcı")
+    yield firm
+    app.dependency_overrides.pop(get_current_portal_user, None)
+
+
+def _payload(firm, **extra) -> dict:
+    return {"cari_id": firm.Id, "cari_code": firm.CariKod, "cari_title": firm.Unvan,
+            "type": "HIZMET", "subject": "Ekip girişi", **extra}
+
+
+def _ids(db: Session, model, **filters):
+    return [row.id for row in db.query(model.id).filter_by(**filters).order_by(model.id)]
+
+
+def test_large_crew_written_with_constant_statement_count(client: TestClient, db: Session, firm, count_statements):
+    employee_ids = _ids(db, PortalEmployee, cari_id=firm.Id, is_active=True)
+    vehicle_ids = _ids(db, PortalVehicle, cari_id=firm.Id)
+
+    with count_statements(db) as statements:
+        response = client.post(URL, json=_payload(
+            firm,
+            service_codes=["ROM", "PER", "ROM"],
+            employee_ids=employee_ids + employee_ids[:5],
+            vehicle_ids=vehicle_ids,
+            personel_list=[{"full_name": "Misafir", "pasaport": "P1"}],
+        ))
+
+    assert response.status_code == 201, response.text
+    wo_id = response.json()["id"]
+    assert db.query(WorkOrderEmployee).filter_by(work_order_id=wo_id).count() == 200
+    assert db.query(WorkOrderVehicle).filter_by(work_order_id=wo_id).count() == 30
+    person = db.query(WorkOrderPerson).filter_by(work_order_id=wo_id).one()
+    assert (person.full_name, person.passport_no, person.nationality) == ("Misafir", "P1", "TUR")
+
+    items = db.query(WorkOrderItem).filter_by(work_order_id=wo_id).order_by(WorkOrderItem.id).all()
+    assert [item.service_code for item in items] == ["ROM", "PER", "ROM"]
+    assert (items[0].unit, items[0].currency, items[0].vat_amount, items[0].grand_total) == ("SAAT", "USD", 20.0, 120.0)
+    assert (items[1].unit, items[1].currency, items[1].grand_total) == ("ADET", "TRY", 50.0)
+
+    # 3 doğrulama SELECT'i + iş emri INSERT'i + 4 bulk INSERT (+ refresh); ekip boyutundan bağımsız
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+    assert len(inserts) == 5
+    assert len(statements) <= 12
+
+
+def test_invalid_references_rejected_without_writes(client: TestClient, db: Session, firm):
+    passive_id, foreign_id = _ids(db, PortalEmployee, is_active=False)[0], _ids(db, PortalEmployee, full_name="Başka Firma")[0]
+    foreign_vehicle = _ids(db, PortalVehicle, plaka="34 ZZ 999")[0]
+    valid_id = _ids(db, PortalEmployee, cari_id=firm.Id, is_active=True)[0]
+
+    response = client.post(URL, json=_payload(
+        firm,
+        service_codes=["ROM", "YOK"],
+        employee_ids=[valid_id, passive_id, foreign_id],
+        vehicle_ids=[foreign_vehicle],
+    ))
+
+    assert response.status_code == 400
+    details = response.json()["detail"]["error"]["details"]
+    assert details == {
+        "invalid_service_codes": ["YOK"],
+        "invalid_employee_ids": [passive_id, foreign_id],
+        "invalid_vehicle_ids": [foreign_vehicle],
+    }
+    assert db.query(WorkOrder).count() == 0
+    assert db.query(WorkOrderEmployee).count() == 0
@@ -0,0 +1,101 @@
+"""SQL teşhis katmanı: normalize SQL, N+1 tespiti, slow query logu, Server-Timing ve teşhis endpoint'i."""
+import logging
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from aliaport_api.core.metrics import _after_cursor_execute, has_statement_observer
+from aliaport_api.core.query_diagnostics import QueryDiagnostics, normalize_sql
+from aliaport_api.main import app
+from aliaport_api.middleware.asgi_pipeline import RequestPipelineMiddleware
+from aliaport_api.modules.auth.dependencies import get_current_active_user
+
+
+def build_app(diagnostics: QueryDiagnostics):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    diagnostics.install(engine)
+    test_app = FastAPI()
+
+    @test_app.get("/diag-test/cari/{cari_id}/items")
+    def items(cari_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            # Satır başına ayrı sorgu: N+1
+            for item_id in range(5):
+                conn.execute(text("SELECT :id AS id"), {"id": item_id})
+        return {"cari_id": cari_id}
+
+    test_app.add_middleware(RequestPipelineMiddleware, enable_audit=False, query_diagnostics=diagnostics)
+    return test_app, engine
+
+
+def test_normalize_sql():
+    assert normalize_sql("SELECT  *\n FROM cari WHERE id = 42 AND kod = 'A''B'") == "SELECT * FROM cari WHERE id = ? AND kod = ?"
+    assert normalize_sql("SELECT x FROM t WHERE id IN (?, ?, ?)") == "SELECT x FROM t WHERE id IN (?...)"
+    assert normalize_sql("SELECT anon_1.id FROM t1 AS anon_1") == "SELECT anon_1.id FROM t1 AS anon_1"
+
+
+def test_n_plus_one_flagged_with_route_and_server_timing():
+    diagnostics = QueryDiagnostics(enabled=True, n_plus_one_threshold=5, slow_query_ms=10_000)
+    test_app, _ = build_app(diagnostics)
+
+    response = TestClient(test_app).get("/diag-test/cari/3/items")
+
+    assert response.status_code == 200
+    assert 'desc="6 queries"' in response.headers["server-timing"]
+    report = diagnostics.snapshot()["requests"][0]
+    assert report["route"] == "/diag-test/cari/{cari_id}/items"
+    assert report["query_count"] == 6
+    assert report["n_plus_one"] == [{"sql": "SELECT ? AS id", "count": 5}]
+    assert len(report["slowest"]) == 5
+    summary = diagnostics.snapshot()["routes"]["GET /diag-test/cari/{cari_id}/items"]
+    assert summary == {**summary, "requests": 1, "max_queries": 6, "n_plus_one": 1}
+
+
+def test_slow_query_logged_outside_requests(caplog):
+    diagnostics = QueryDiagnostics(enabled=True, slow_query_ms=0)
+    _, engine = build_app(diagnostics)
+
+    with caplog.at_level(logging.WARNING, logger="aliaport_api.core.query_diagnostics"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 7"))
+
+    records = [r for r in caplog.records if getattr(r, "extra_data", {}).get("type") == "slow_query"]
+    assert records and records[0].extra_data["sql"] == "SELECT ?"
+    assert records[0].extra_data["route"] == "-"
+
+
+def test_disabled_adds_nothing():
+    diagnostics = QueryDiagnostics(enabled=False)
+    test_app, engine = build_app(diagnostics)
+
+    response = TestClient(test_app).get("/diag-test/cari/1/items")
+
+    assert "server-timing" not in response.headers
+    assert not has_statement_observer(engine, diagnostics.observe_statement)
+    assert diagnostics.snapshot()["requests"] == []
+
+
+def test_diagnostics_endpoint_requires_admin(client: TestClient):
+    assert client.get("/api/diagnostics/queries").status_code in (401, 403)
+
+    app.dependency_overrides[get_current_active_user] = lambda: SimpleNamespace(id=1, is_superuser=True)
+    try:
+        response = client.get("/api/diagnostics/queries")
+    finally:
+        app.dependency_overrides.pop(get_current_active_user, None)
+
+    assert response.status_code == 200
+    assert set(response.json()["data"]) >= {"enabled", "routes", "requests"}
+
+
+def test_statements_timed_once_by_metrics_listener():
+    diagnostics = QueryDiagnostics(enabled=True)
+    _, engine = build_app(diagnostics)
+
+    assert has_statement_observer(engine, diagnostics.observe_statement)
+    # Engine'de tek after_cursor_execute listener'ı var: metriklerinki
+    assert list(engine.dispatch.after_cursor_execute) == [_after_cursor_execute]
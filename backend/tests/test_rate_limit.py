@@ -0,0 +1,155 @@
+"""Rate limit: resp:// storage (sahte RESP sunucusu), atomik sliding window, fallback, metrikler ve anahtar çıkarımı."""
+import base64
+import json
+import socket
+import threading
+from datetime import timedelta
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+from prometheus_client import REGISTRY
+from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIMiddleware
+from slowapi import _rate_limit_exceeded_handler
+from starlette.requests import Request as StarletteRequest
+
+from aliaport_api.core.rate_limit import AliaportLimiter, RespStorage
+from aliaport_api.main import app, auth_aware_key_func
+from aliaport_api.modules.auth.utils import create_access_token, create_refresh_token
+from tests.fake_resp_server import FakeRespServer
+
+
+@pytest.fixture
+def resp_server():
+    with FakeRespServer() as server:
+        yield server
+
+
+def _rejections(limiter_name: str, policy: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "aliaport_rate_limit_requests_total", {"limiter": limiter_name, "policy": policy, "result": "rejected"}
+    )
+    return value or 0.0
+
+
+def _unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_workers_share_one_limit(resp_server):
+    # İki worker = iki ayrı storage nesnesi, aynı sunucu
+    workers = [SlidingWindowCounterRateLimiter(storage_from_string(resp_server.uri)) for _ in range(2)]
+    item = parse("5/minute")
+
+    allowed = [workers[i % 2].hit(item, "ip:10.0.0.1", "/api/cari") for i in range(8)]
+
+    assert isinstance(workers[0].storage, RespStorage)
+    assert allowed == [True] * 5 + [False] * 3
+    assert workers[1].get_window_stats(item, "ip:10.0.0.1", "/api/cari").remaining == 0
+    assert workers[0].hit(item, "ip:10.0.0.2", "/api/cari")
+
+
+def test_concurrent_hits_never_exceed_limit(resp_server):
+    limiter = SlidingWindowCounterRateLimiter(storage_from_string(resp_server.uri))
+    item = parse("10/minute")
+    results = []
+
+    def hit():
+        results.append(limiter.hit(item, "user:1", "/api/work-order"))
+
+    threads = [threading.Thread(target=hit) for _ in range(25)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == 10
+
+
+def test_storage_reset_and_clear(resp_server):
+    storage = storage_from_string(resp_server.uri)
+    limiter = SlidingWindowCounterRateLimiter(storage)
+    item = parse("1/minute")
+    assert limiter.hit(item, "a") and not limiter.hit(item, "a")
+
+    limiter.clear(item, "a")
+    assert limiter.hit(item, "a")
+    assert storage.check()
+    assert storage.reset() >= 1
+    assert limiter.hit(item, "a")
+
+
+def _limited_app(limiter: AliaportLimiter) -> FastAPI:
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    app.add_middleware(SlowAPIMiddleware)
+
+    @app.get("/ping")
+    def ping(request: Request):
+        return {"ok": True}
+
+    return app
+
+
+def test_limiter_rejects_and_records_metrics(resp_server):
+    limiter = AliaportLimiter("test-api", key_func=lambda request: "ip:1.2.3.4",
+                              storage_uri=resp_server.uri, default_limits=["3/minute"])
+    client = TestClient(_limited_app(limiter))
+    before = _rejections("test-api", "3 per 1 minute")
+
+    statuses = [client.get("/ping").status_code for _ in range(4)]
+
+    assert statuses == [200, 200, 200, 429]
+    assert _rejections("test-api", "3 per 1 minute") == before + 1
+
+
+def test_unreachable_storage_falls_back_to_memory():
+    limiter = AliaportLimiter("test-fallback", key_func=lambda request: "ip:1.2.3.4",
+                              storage_uri=f"resp://127.0.0.1:{_unused_port()}", default_limits=["2/minute"])
+    client = TestClient(_limited_app(limiter))
+
+    statuses = [client.get("/ping").status_code for _ in range(3)]
+
+    assert statuses == [200, 200, 429]
+
+
+def _request(authorization: str = None) -> StarletteRequest:
+    headers = [(b"authorization", authorization.encode())] if authorization else []
+    return StarletteRequest({"type": "http", "headers": headers, "client": ("10.1.2.3", 5000)})
+
+
+def _forged_token(user_id: int) -> str:
+    segments = [{"alg": "HS256", "typ": "JWT"}, {"user_id": user_id, "type": "access"}]
+    encoded = [base64.urlsafe_b64encode(json.dumps(part).encode()).rstrip(b"=").decode() for part in segments]
+    return ".".join(encoded + ["c2ln"])
+
+
+def test_key_func_uses_verified_user_only():
+    token = create_access_token({"user_id": 42, "email": "a@b.c"})
+    expired = create_access_token({"user_id": 42}, expires_delta=timedelta(minutes=-1))
+    refresh = create_refresh_token({"user_id": 42})
+
+    assert auth_aware_key_func(_request(f"Bearer {token}")) == "user:42"
+    for bad in (_forged_token(7), expired, refresh, "not-a-jwt"):
+        assert auth_aware_key_func(_request(f"Bearer {bad}")) == "ip:10.1.2.3"
+    assert auth_aware_key_func(_request()) == "ip:10.1.2.3"
+
+
+def test_forged_tokens_cannot_bypass_global_limit(client: TestClient):
+    limiter = app.state.limiter
+    limiter.reset()
+    try:
+        statuses = [
+            client.get("/", headers={"Authorization": f"Bearer {_forged_token(n)}"}).status_code
+            for n in range(305)
+        ]
+    finally:
+        limiter.reset()
+    assert statuses.count(429) == 5
@@ -0,0 +1,68 @@
+"""Pure-ASGI request pipeline middleware: başlıklar, request id, streaming ve audit kuyruğu."""
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from aliaport_api.middleware.asgi_pipeline import RequestPipelineMiddleware
+
+
+class ListSink:
+    def __init__(self):
+        self.records = []
+
+    def enqueue(self, record):
+        self.records.append(record)
+        return True
+
+
+def build_app(sink):
+    app = FastAPI()
+
+    @app.get("/api/ping")
+    def ping(request: Request):
+        return {"request_id": request.state.request_id}
+
+    @app.get("/api/stream")
+    def stream():
+        def chunks():
+            for i in range(3):
+                yield f"chunk-{i};".encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    app.add_middleware(RequestPipelineMiddleware, enable_hsts=True, audit_sink=sink)
+    return app
+
+
+def test_request_id_and_security_headers():
+    sink = ListSink()
+    client = TestClient(build_app(sink))
+    resp = client.get("/api/ping", headers={"Authorization": "Bearer abc", "User-Agent": "pytest"})
+    assert resp.status_code == 200
+    assert resp.headers["x-request-id"] == resp.json()["request_id"]
+    assert resp.headers["x-frame-options"] == "DENY"
+    assert resp.headers["x-content-type-options"] == "nosniff"
+    assert "strict-transport-security" in resp.headers
+
+    assert len(sink.records) == 1
+    record = sink.records[0]
+    assert record["path"] == "/api/ping"
+    assert record["status_code"] == 200
+    assert record["auth_header"] == "Bearer abc"
+    assert record["user_agent"] == "pytest"
+
+
+def test_streaming_response_passes_through():
+    sink = ListSink()
+    client = TestClient(build_app(sink))
+    with client.stream("GET", "/api/stream") as resp:
+        body = b"".join(resp.iter_bytes())
+    assert body == b"chunk-0;chunk-1;chunk-2;"
+    assert "x-request-id" in resp.headers
+    assert sink.records[0]["status_code"] == 200
+
+
+def test_main_app_uses_pipeline(client: TestClient):
+    resp = client.get("/")
+    assert resp.status_code == 200
+    assert resp.headers.get("x-request-id")
+    assert resp.headers.get("content-security-policy")
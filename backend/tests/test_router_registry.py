@@ -0,0 +1,62 @@
+"""Lazy router registry ve lazy import yardımcıları."""
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from aliaport_api.core.lazy_import import lazy_import
+from aliaport_api.core.router_registry import LazyRouterMiddleware, RouterRegistry
+
+alpha_router = APIRouter(prefix="/api/alpha")
+beta_router = APIRouter(prefix="/api/alpha")
+
+
+@alpha_router.get("/{item_id}")
+def alpha_item(item_id: str):
+    return {"router": "alpha", "item": item_id}
+
+
+@beta_router.get("/special")
+def beta_special():
+    return {"router": "beta"}
+
+
+def build_app():
+    app = FastAPI()
+
+    @app.get("/")
+    def root():
+        return {"ok": True}
+
+    registry = RouterRegistry(app)
+    registry.register("alpha", f"{__name__}:alpha_router", paths=("/api/alpha",))
+    registry.register("beta", f"{__name__}:beta_router", paths=("/api/alpha",))
+    registry.register("broken", "aliaport_api.does_not_exist:router", paths=("/api/broken",), optional=True)
+    app.add_middleware(LazyRouterMiddleware, registry=registry)
+    return app, registry
+
+
+def test_routers_mount_on_first_matching_request():
+    app, registry = build_app()
+    client = TestClient(app)
+
+    assert client.get("/").status_code == 200
+    assert [s.name for s in registry.pending] == ["alpha", "beta", "broken"]
+
+    resp = client.get("/api/alpha/special")
+    # Kayıt sırası korunur: alpha'nın /{item_id} route'u beta'dan önce eşleşir (eager ile aynı)
+    assert resp.json() == {"router": "alpha", "item": "special"}
+    assert registry.status()["pending"] == ["broken"]
+
+
+def test_unknown_path_mounts_everything_and_skips_optional_failures():
+    app, registry = build_app()
+    client = TestClient(app)
+
+    assert client.get("/api/unknown").status_code == 404
+    assert registry.pending == []
+
+
+def test_lazy_import_defers_module_load():
+    module = lazy_import("json")
+    assert module.is_loaded is False
+    assert module.dumps({"a": 1}) == '{"a": 1}'
+    assert module.is_loaded is True
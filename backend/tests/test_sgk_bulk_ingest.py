@@ -0,0 +1,126 @@
+"""
+SGK hizmet dökümü toplu içe aktarma testleri
+"""
+import csv
+
+import pytest
+from sqlalchemy.orm import Session
+
+from aliaport_api.modules.dijital_arsiv.models import PortalEmployee, PortalEmployeeSgkPeriod
+from aliaport_api.modules.sgk import bulk_ingest
+from aliaport_api.modules.sgk.bulk_ingest import ingest_directory, period_from_path
+from aliaport_api.modules.sgk.models import SgkParseResult, SgkPeriodCheck
+from aliaport_api.modules.sgk.parse_store import ParsedSgkDocument
+from tests.conftest import create_cari
+
+# Dosya içeriğine göre sahte parse sonucu (gerçek PDF yerine)
+DOCUMENTS = {
+    b"%PDF ekim": ParsedSgkDocument(period="202510", employees={"11111111111": "A", "22222222222": "B", "33333333333": "C"}),
+    b"%PDF eylul": ParsedSgkDocument(period=None, employees={"11111111111": "A", "44444444444": "D", "55555555555": "E"}),
+    b"%PDF bozuk": ParsedSgkDocument(period="202510", employees={}),
+}
+
+
+@pytest.fixture
+def sgk_storage(tmp_path, monkeypatch):
+    monkeypatch.setenv("BASE_SGK_DIR", str(tmp_path / "storage"))
+    return tmp_path
+
+
+@pytest.fixture
+def fake_parser(monkeypatch):
+    calls = []
+
+    def parse(file_bytes):
+        calls.append(file_bytes)
+        return DOCUMENTS[file_bytes]
+
+    monkeypatch.setattr(bulk_ingest, "parse_sgk_pdf", parse)
+    return calls
+
+
+def _write(path, content: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+
+
+def test_period_from_path():
+    assert period_from_path("2025/FIRMA/202510/liste.pdf") == "202510"
+    assert period_from_path("ŞİMŞEKLER AŞ 202509 - EYLÜL.pdf") == "202509"
+    assert period_from_path("liste_2025.pdf") is None
+
+
+class TestIngestDirectory:
+    def test_firms_resolved_from_folders_and_reconciled(self, db: Session, sgk_storage, fake_parser):
+        firm = create_cari(db, CariKod="C-001", Unvan="Firma Bir")
+        db.add(PortalEmployee(cari_id=firm.Id, full_name="A", tc_kimlik="11111111111"))
+        db.commit()
+        firm_id = firm.Id
+
+        root = sgk_storage / "arsiv"
+        _write(root / "C-001" / "ekim.pdf", b"%PDF ekim")
+        _write(root / "C-001" / "202509" / "eylul.pdf", b"%PDF eylul")
+        _write(root / "C-001" / "bozuk.pdf", b"%PDF bozuk")
+        _write(root / "BILINMEYEN" / "ekim.pdf", b"%PDF ekim")
+
+        report = ingest_directory(db, root, workers=1)
+        statuses = {row.path: row.status for row in report.files}
+
+        assert statuses == {
+            "C-001/ekim.pdf": "OK",
+            "C-001/202509/eylul.pdf": "OK",
+            "C-001/bozuk.pdf": "FAILED_PARSE",
+            "BILINMEYEN/ekim.pdf": "NO_FIRM",
+        }
+        summary = report.summary()
+        assert summary["files"] == 4 and summary["failed"] == 2
+        assert summary["files_per_second"] > 0
+
+        checks = db.query(SgkPeriodCheck).filter_by(firma_id=firm_id).all()
+        assert sorted((c.period, c.status) for c in checks) == [("202509", "OK"), ("202510", "FAILED_PARSE"), ("202510", "OK")]
+        # Geçmiş dönemdeki (202509) bilinmeyen TC'ler çalışan olarak eklenmez
+        assert sorted(e.tc_kimlik for e in db.query(PortalEmployee).filter_by(cari_id=firm_id)) == [
+            "11111111111", "22222222222", "33333333333"
+        ]
+        assert db.query(PortalEmployeeSgkPeriod).count() == 4
+        rows = {row.path: row for row in report.files}
+        assert (rows["C-001/202509/eylul.pdf"].new_employees_added, rows["C-001/ekim.pdf"].new_employees_added) == (0, 2)
+        # Eski alanlar en güncel dönemi gösterir (202509 sonradan işlense de geri çekilmez)
+        employee_a = db.query(PortalEmployee).filter_by(tc_kimlik="11111111111").one()
+        assert employee_a.sgk_last_check_period == "202510"
+
+    def test_rerun_uses_store_and_skips_duplicates(self, db: Session, sgk_storage, fake_parser, tmp_path):
+        create_cari(db, CariKod="C-002", Unvan="Firma İki")
+        root = sgk_storage / "arsiv"
+        _write(root / "ekim.pdf", b"%PDF ekim")
+
+        first = ingest_directory(db, root, cari_kod="C-002", workers=1)
+        second = ingest_directory(db, root, cari_kod="C-002", workers=1)
+
+        assert [row.status for row in first.files] == ["OK"]
+        assert [(row.status, row.from_store) for row in second.files] == [("DUPLICATE", True)]
+        assert len(fake_parser) == 1
+        assert db.query(SgkParseResult).count() == 1
+
+        report_path = tmp_path / "rapor.csv"
+        second.write_csv(str(report_path))
+        with open(report_path, encoding="utf-8") as report_file:
+            rows = list(csv.DictReader(report_file, delimiter=";"))
+        assert rows[0]["status"] == "DUPLICATE"
+
+    def test_unknown_cari_kod(self, db: Session, sgk_storage):
+        with pytest.raises(ValueError):
+            ingest_directory(db, sgk_storage, cari_kod="YOK")
+
+
+def test_process_pool_reports_unreadable_files(db: Session, sgk_storage):
+    create_cari(db, CariKod="C-003", Unvan="Firma Üç")
+    root = sgk_storage / "arsiv"
+    for i in range(3):
+        _write(root / f"202510_{i}.pdf", f"pdf değil {i}".encode())
+
+    report = ingest_directory(db, root, cari_kod="C-003", workers=2)
+
+    assert report.workers == 2
+    assert [row.status for row in report.files] == ["FAILED_PARSE"] * 3
+    assert report.summary()["failure_rate"] == 1.0
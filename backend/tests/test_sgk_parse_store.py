@@ -0,0 +1,170 @@
+"""
+SGK parse sonuç deposu testleri (checksum ile tekrar kullanım, yeniden mutabakat)
+"""
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from aliaport_api.main import app
+from aliaport_api.modules.dijital_arsiv import portal_router
+from aliaport_api.modules.dijital_arsiv.models import PortalEmployee, PortalUser
+from aliaport_api.modules.dijital_arsiv.portal_router import get_current_portal_user
+from aliaport_api.modules.dijital_arsiv.sgk_reconciliation import rereconcile_period_check
+from aliaport_api.modules.sgk import parse_store
+from aliaport_api.modules.sgk.models import SgkParseResult, SgkPeriodCheck
+from aliaport_api.modules.sgk.parse_store import (
+    ParsedSgkDocument,
+    decode_employees,
+    encode_employees,
+    get_or_parse,
+    get_parse_result,
+)
+from tests.conftest import create_cari
+
+SGK_LIST = {
+    "11111111111": "AHMET YILMAZ",
+    "22222222222": "ŞÜKRÜ ÇAĞLAR",
+    "33333333333": "",
+}
+
+
+def test_payload_roundtrip_is_compact():
+    employees = {f"{10**10 + i}": f"ÇALIŞAN {i}" for i in range(5000)}
+    payload = encode_employees(employees)
+    assert decode_employees(payload) == employees
+    assert decode_employees(encode_employees({})) == {}
+    assert len(payload) < 60_000
+
+
+class TestGetOrParse:
+    def test_parses_once_per_checksum(self, db: Session):
+        calls = []
+
+        def parse():
+            calls.append(1)
+            return ParsedSgkDocument(period="202510", employees=dict(SGK_LIST))
+
+        first, from_store = get_or_parse(db, "a" * 64, parse)
+        assert not from_store
+        second, from_store = get_or_parse(db, "a" * 64, parse)
+        assert from_store
+        assert len(calls) == 1
+        assert second.period == "202510"
+        assert second.employees == SGK_LIST
+
+    def test_old_parser_version_is_reparsed(self, db: Session, monkeypatch):
+        get_or_parse(db, "b" * 64, lambda: ParsedSgkDocument(period=None, employees={}))
+        monkeypatch.setattr(parse_store, "PARSER_VERSION", parse_store.PARSER_VERSION + 1)
+
+        assert get_parse_result(db, "b" * 64) is None
+        parsed, from_store = get_or_parse(db, "b" * 64, lambda: ParsedSgkDocument(period="202509", employees=dict(SGK_LIST)))
+        assert not from_store
+        record = db.query(SgkParseResult).filter_by(checksum="b" * 64).one()
+        assert (record.period, record.employee_count) == ("202509", 3)
+
+
+    def test_concurrent_insert_keeps_caller_changes(self, db: Session, monkeypatch):
+        firm = create_cari(db, CariKod="PST4", Unvan="Eşzamanlı")
+        get_or_parse(db, "f" * 64, lambda: ParsedSgkDocument(period="202510", employees={}))
+        db.commit()
+        # Diğer istek kaydı bizim okumamızdan sonra yazmış gibi: okuma boş döner, INSERT çakışır
+        monkeypatch.setattr(parse_store, "get_parse_result", lambda *_: None)
+        monkeypatch.setattr(parse_store, "save_parse_result",
+                            lambda session, checksum, parsed: session.add(SgkParseResult(checksum=checksum, payload=b"")))
+        pending = PortalEmployee(cari_id=firm.Id, full_name="Bekleyen")
+        db.add(pending)
+
+        parsed, from_store = get_or_parse(db, "f" * 64, lambda: ParsedSgkDocument(period="202510", employees=dict(SGK_LIST)))
+        db.commit()
+
+        assert (parsed.employees, from_store) == (SGK_LIST, False)
+        assert db.query(PortalEmployee).filter_by(full_name="Bekleyen").count() == 1
+        assert db.query(SgkParseResult).count() == 1
+
+    def test_does_not_commit_caller_changes(self, db: Session):
+        firm = create_cari(db, CariKod="PST5", Unvan="Bekleyen")
+        db.add(PortalEmployee(cari_id=firm.Id, full_name="Bekleyen"))
+
+        get_or_parse(db, "9" * 64, lambda: ParsedSgkDocument(period="202510", employees=dict(SGK_LIST)))
+        db.rollback()
+
+        assert db.query(PortalEmployee).filter_by(cari_id=firm.Id).count() == 0
+        assert db.query(SgkParseResult).count() == 0
+
+
+class TestUploadReuse:
+    def _upload(self, client: TestClient, period: str):
+        return client.post(
+            "/api/v1/portal/documents/sgk-hizmet-yukle",
+            data={"period": period},
+            files={"file": ("sgk.pdf", b"%PDF-1.4 ayni dosya", "application/pdf")},
+        )
+
+    def test_reupload_does_not_parse_pdf_again(self, client: TestClient, db: Session, monkeypatch, tmp_path):
+        firm = create_cari(db, CariKod="PST1", Unvan="Parse Firma")
+        user = PortalUser(cari_id=firm.Id, email="parse@firma.com", hashed_password="x", full_name="Parse")
+        db.add(user)
+        db.commit()
+
+        calls = []
+
+        def fake_parse(_):
+            calls.append(1)
+            return ParsedSgkDocument(period="202510", employees=dict(SGK_LIST))
+
+        monkeypatch.setattr(portal_router, "get_base_sgk_dir", lambda: tmp_path)
+        monkeypatch.setattr(portal_router, "parse_sgk_pdf", fake_parse)
+        app.dependency_overrides[get_current_portal_user] = lambda: SimpleNamespace(id=user.id, cari_id=firm.Id)
+        try:
+            assert self._upload(client, "2025-10").status_code == 200
+            # Dönem uyuşmazlığı PDF okunmadan, saklanan dönemle tespit edilir
+            mismatch = self._upload(client, "2025-09")
+            response = self._upload(client, "2025-10")
+        finally:
+            app.dependency_overrides.pop(get_current_portal_user, None)
+
+        assert mismatch.status_code == 400
+        assert response.status_code == 200
+        assert response.json()["data"]["matched_employee_count"] == 3
+        assert len(calls) == 1
+        assert db.query(SgkParseResult).count() == 1
+
+
+def test_rereconcile_from_stored_result(db: Session):
+    firm = create_cari(db, CariKod="PST2", Unvan="Yeniden Mutabakat")
+    db.add(PortalEmployee(cari_id=firm.Id, full_name="Eski", tc_kimlik="11111111111"))
+    db.add(PortalEmployee(cari_id=firm.Id, full_name="Ayrılan", tc_kimlik="99999999999"))
+    check = SgkPeriodCheck(firma_id=firm.Id, period="202510", storage_key="x.pdf", file_size=1, checksum="c" * 64)
+    db.add(check)
+    db.commit()
+
+    assert rereconcile_period_check(db, check) is None
+
+    get_or_parse(db, "c" * 64, lambda: ParsedSgkDocument(period="202510", employees=dict(SGK_LIST)))
+    result = rereconcile_period_check(db, check)
+    db.commit()
+
+    assert result.new_employees_added == 2
+    assert (check.matched_employee_count, check.missing_employee_count, check.extra_in_sgk_count) == (3, 1, 0)
+    assert db.query(PortalEmployee).filter_by(cari_id=firm.Id).count() == 4
+
+
+def test_rereconcile_older_check_keeps_latest_period(db: Session):
+    firm = create_cari(db, CariKod="PST3", Unvan="Eski Dönem")
+    employee = PortalEmployee(cari_id=firm.Id, full_name="Güncel", tc_kimlik="11111111111",
+                              sgk_last_check_period="202511", sgk_is_active_last_period=True)
+    old_check = SgkPeriodCheck(firma_id=firm.Id, period="202510", storage_key="x.pdf", file_size=1, checksum="d" * 64, status="OK")
+    db.add_all([employee, old_check,
+                SgkPeriodCheck(firma_id=firm.Id, period="202511", storage_key="y.pdf", file_size=1, checksum="e" * 64, status="OK")])
+    db.commit()
+    get_or_parse(db, "d" * 64, lambda: ParsedSgkDocument(period="202510", employees=dict(SGK_LIST)))
+
+    result = rereconcile_period_check(db, old_check)
+    db.commit()
+    db.refresh(employee)
+
+    assert (employee.sgk_last_check_period, employee.sgk_is_active_last_period) == ("202511", True)
+    assert result.new_employees_added == 0
+    assert old_check.extra_in_sgk_count == 2
+    assert db.query(PortalEmployee).filter_by(cari_id=firm.Id).count() == 1
@@ -0,0 +1,120 @@
+"""
+SGK hizmet dökümü toplu mutabakat testleri
+"""
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from aliaport_api.main import app
+from aliaport_api.modules.dijital_arsiv import portal_router
+from aliaport_api.modules.dijital_arsiv.models import PortalEmployee, PortalEmployeeSgkPeriod, PortalUser
+from aliaport_api.modules.dijital_arsiv.portal_router import get_current_portal_user
+from aliaport_api.modules.dijital_arsiv.sgk_reconciliation import reconcile_sgk_employees
+from aliaport_api.modules.sgk.models import SgkPeriodCheck
+from aliaport_api.modules.sgk.parse_store import ParsedSgkDocument
+from tests.conftest import create_cari
+
+PERIOD = "202510"
+
+
+def _seed(db: Session):
+    firm = create_cari(db, CariKod="REC1", Unvan="Mutabakat Firma")
+    other = create_cari(db, CariKod="REC2", Unvan="Diğer Firma")
+    employees = [
+        PortalEmployee(cari_id=firm.Id, full_name="Eşleşen", tc_kimlik="11111111111"),
+        PortalEmployee(cari_id=firm.Id, full_name="Boşluklu", tc_kimlik=" 22222222222 "),
+        PortalEmployee(cari_id=firm.Id, full_name="Ayrılan", tc_kimlik="33333333333", sgk_is_active_last_period=True),
+        PortalEmployee(cari_id=firm.Id, full_name="Yabancı", pasaport="P123"),
+        PortalEmployee(cari_id=other.Id, full_name="Başka Firma", tc_kimlik="44444444444"),
+    ]
+    db.add_all(employees)
+    db.commit()
+    # Eşleşen çalışanın bu döneme ait pasif kaydı var (güncellenmeli)
+    db.add(PortalEmployeeSgkPeriod(employee_id=employees[0].id, period_code="2025-10", is_active=False, source="MANUEL"))
+    db.commit()
+    return firm, other, employees
+
+
+SGK_LIST = {
+    "11111111111": "ESLESEN",
+    "22222222222": "BOSLUKLU",
+    "44444444444": "YENI PERSONEL",
+    "55555555555": "",
+}
+
+
+class TestReconcile:
+    def test_set_operations_and_counts(self, db: Session):
+        firm, other, employees = _seed(db)
+
+        result = reconcile_sgk_employees(db, firm.Id, PERIOD, SGK_LIST)
+        db.commit()
+
+        assert result.matched_tcs == {"11111111111", "22222222222"}
+        assert result.new_tcs == {"44444444444", "55555555555"}
+        assert result.missing_employee_ids == {employees[2].id, employees[3].id}
+        assert result.extra_tcs == set()
+        assert (result.matched_employee_count, result.missing_employee_count, result.extra_in_sgk_count) == (4, 2, 0)
+        assert result.new_employees_added == 2
+
+        firm_employees = {
+            e.tc_kimlik.strip() if e.tc_kimlik else e.pasaport: e
+            for e in db.query(PortalEmployee).filter_by(cari_id=firm.Id)
+        }
+        assert len(firm_employees) == 6
+        assert firm_employees["44444444444"].full_name == "YENI PERSONEL"
+        assert all(e.sgk_last_check_period == PERIOD for e in firm_employees.values())
+        active = {key for key, e in firm_employees.items() if e.sgk_is_active_last_period}
+        assert active == {"11111111111", "22222222222", "44444444444", "55555555555"}
+        # Başka firmanın çalışanına dokunulmaz
+        db.refresh(employees[4])
+        assert employees[4].sgk_last_check_period is None
+
+        periods = db.query(PortalEmployeeSgkPeriod).filter_by(period_code="2025-10").all()
+        assert len(periods) == 4
+        assert all(p.is_active and p.source == "HIZMET_LISTESI" for p in periods)
+
+    def test_statement_count_independent_of_firm_size(self, db: Session, count_statements):
+        firm = create_cari(db, CariKod="REC3", Unvan="Büyük Firma")
+        db.add_all(PortalEmployee(cari_id=firm.Id, full_name=f"P{i}", tc_kimlik=f"{i:011d}") for i in range(300))
+        db.commit()
+        sgk = {f"{i:011d}": "" for i in range(100, 400)}
+        firm_id = firm.Id
+
+        with count_statements(db) as statements:
+            result = reconcile_sgk_employees(db, firm_id, PERIOD, sgk)
+
+        assert (result.matched_employee_count, result.missing_employee_count, result.new_employees_added) == (300, 100, 100)
+        # SELECT çalışanlar, UPDATE firma, UPDATE eşleşenler, INSERT yeniler, SELECT dönem, INSERT dönem
+        assert len(statements) == 6
+
+
+class TestUploadEndpoint:
+    def test_upload_returns_counts(self, client: TestClient, db: Session, monkeypatch, tmp_path):
+        firm, _, _ = _seed(db)
+        user = PortalUser(cari_id=firm.Id, email="sgk@firma.com", hashed_password="x", full_name="SGK")
+        db.add(user)
+        db.commit()
+
+        monkeypatch.setattr(portal_router, "get_base_sgk_dir", lambda: tmp_path)
+        monkeypatch.setattr(portal_router, "parse_sgk_pdf", lambda _: ParsedSgkDocument(period=PERIOD, employees=dict(SGK_LIST)))
+        app.dependency_overrides[get_current_portal_user] = lambda: SimpleNamespace(id=user.id, cari_id=firm.Id)
+        try:
+            response = client.post(
+                "/api/v1/portal/documents/sgk-hizmet-yukle",
+                data={"period": "2025-10"},
+                files={"file": ("sgk.pdf", b"%PDF-1.4 test", "application/pdf")},
+            )
+        finally:
+            app.dependency_overrides.pop(get_current_portal_user, None)
+
+        assert response.status_code == 200, response.text
+        data = response.json()["data"]
+        assert data["matched_employee_count"] == 4
+        assert data["missing_employee_count"] == 2
+        assert data["extra_in_sgk_count"] == 0
+        assert data["new_employees_added"] == 2
+
+        check = db.query(SgkPeriodCheck).filter_by(firma_id=firm.Id, status="OK").one()
+        assert check.matched_employee_count == 4
@@ -0,0 +1,213 @@
+"""
+Materialize edilmiş SGK durumu testleri (lookup, artımlı yenileme, dönem devri job'u)
+"""
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from aliaport_api.config.database import Base
+from aliaport_api.jobs import sgk_status_job
+from aliaport_api.main import app
+from aliaport_api.modules.dijital_arsiv import sgk_status
+from aliaport_api.modules.dijital_arsiv.models import (
+    PortalEmployee,
+    PortalEmployeeDocument,
+    PortalEmployeeSgkPeriod,
+    PortalEmployeeSgkStatus,
+)
+from aliaport_api.modules.dijital_arsiv.portal_router import get_current_portal_user
+from aliaport_api.modules.dijital_arsiv.sgk_status import (
+    EmployeeSgkStatus,
+    get_sgk_status_map,
+    normalize_period_code,
+    recompute_sgk_status,
+    refresh_sgk_status,
+)
+from tests.conftest import create_cari
+
+PERIOD = "2025-10"
+
+
+@pytest.fixture(autouse=True)
+def fixed_active_period(monkeypatch):
+    monkeypatch.setattr(sgk_status, "get_active_sgk_period", lambda today=None: PERIOD)
+    monkeypatch.setattr(sgk_status_job, "get_active_sgk_period", lambda today=None: PERIOD)
+
+
+def _seed(db: Session, count: int = 3):
+    firm = create_cari(db, CariKod="SGK1", Unvan="SGK Firma")
+    employees = [
+        PortalEmployee(cari_id=firm.Id, full_name=f"Çalışan {i}", tc_kimlik=f"1000000000{i}", position="OPERATOR")
+        for i in range(count)
+    ]
+    db.add_all(employees)
+    db.commit()
+    # İlk çalışan dönem dökümünde var
+    db.add(PortalEmployeeSgkPeriod(employee_id=employees[0].id, period_code=PERIOD, is_active=True))
+    db.commit()
+    return firm, employees
+
+
+def _stored(db: Session, employee_id: int, period_code: str = PERIOD):
+    row = db.query(PortalEmployeeSgkStatus).filter_by(employee_id=employee_id, period_code=period_code).first()
+    return row.status if row else None
+
+
+class TestStatusMap:
+    def test_missing_rows_materialized_then_lookup_only(self, db: Session, count_statements):
+        _, employees = _seed(db)
+
+        statuses = get_sgk_status_map(db, employees)
+        assert statuses[employees[0].id] == EmployeeSgkStatus.TAM
+        assert statuses[employees[1].id] == EmployeeSgkStatus.EKSİK
+        assert _stored(db, employees[1].id) == EmployeeSgkStatus.EKSİK.value
+
+        employees = db.query(PortalEmployee).order_by(PortalEmployee.id).all()
+        with count_statements(db) as statements:
+            assert get_sgk_status_map(db, employees) == statuses
+        assert len(statements) == 1
+        assert "portal_employee_sgk_status" in statements[0]
+
+    def test_legacy_period_field_compared_in_same_format(self, db: Session):
+        _, employees = _seed(db, count=2)
+        employees[1].sgk_last_check_period = "202510"
+        employees[1].sgk_is_active_last_period = True
+        db.commit()
+
+        assert normalize_period_code("202510") == PERIOD
+        assert get_sgk_status_map(db, [employees[1]])[employees[1].id] == EmployeeSgkStatus.TAM
+        # Eski dönem yeni dönemi karşılamaz
+        assert get_sgk_status_map(db, [employees[1]], period_code="2025-11")[employees[1].id] == EmployeeSgkStatus.EKSİK
+
+
+class TestConcurrentMaterialize:
+    def test_read_path_does_not_commit(self, db: Session):
+        _, employees = _seed(db)
+        get_sgk_status_map(db, employees)
+        db.rollback()
+        assert db.query(PortalEmployeeSgkStatus).count() == 0
+
+    def test_back_to_back_sessions_upsert(self, db: Session):
+        _, employees = _seed(db)
+        other = sessionmaker(bind=db.get_bind())()
+        try:
+            # İki oturum da satırları eksik gördü; ikinci yazım çakışmada günceller
+            sgk_status._materialize(other, other.query(PortalEmployee).all(), PERIOD)
+            other.commit()
+            employees[1].sgk_last_check_period = "202510"
+            employees[1].sgk_is_active_last_period = True
+            db.flush()
+            sgk_status._materialize(db, employees, PERIOD)
+            db.commit()
+        finally:
+            other.close()
+
+        assert db.query(PortalEmployeeSgkStatus).count() == len(employees)
+        assert _stored(db, employees[1].id) == EmployeeSgkStatus.TAM.value
+
+    def test_concurrent_first_reads(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'sgk.db'}", connect_args={"timeout": 30})
+        Base.metadata.create_all(bind=engine)
+        Sessions = sessionmaker(bind=engine)
+        with Sessions() as setup:
+            firm, _ = _seed(setup, count=20)
+            firm_id = firm.Id
+        barrier = threading.Barrier(2)
+        errors = []
+
+        def first_read():
+            with Sessions() as session:
+                employees = session.query(PortalEmployee).filter_by(cari_id=firm_id).all()
+                barrier.wait()
+                try:
+                    get_sgk_status_map(session, employees)
+                    session.commit()
+                except Exception as exc:  # pragma: no cover - hata testte raporlanır
+                    errors.append(exc)
+
+        threads = [threading.Thread(target=first_read) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with Sessions() as session:
+            assert errors == []
+            assert session.query(PortalEmployeeSgkStatus).filter_by(period_code=PERIOD).count() == 20
+        engine.dispose()
+
+
+class TestIncrementalRefresh:
+    def test_hire_document_refreshes_status(self, db: Session):
+        firm, employees = _seed(db)
+        employee = employees[2]
+        assert get_sgk_status_map(db, [employee])[employee.id] == EmployeeSgkStatus.EKSİK
+
+        db.add(PortalEmployeeDocument(
+            employee_id=employee.id,
+            cari_id=firm.Id,
+            document_type="SGK_ISE_GIRIS",
+            file_name="giris.pdf",
+            file_path="uploads/giris.pdf",
+            file_size=10,
+            file_type="application/pdf",
+        ))
+        db.flush()
+        result = refresh_sgk_status(db, employee_ids=[employee.id])
+        db.commit()
+
+        assert result == {employee.id: EmployeeSgkStatus.TAM}
+        assert _stored(db, employee.id) == EmployeeSgkStatus.TAM.value
+
+    def test_refresh_by_firm_drops_other_periods(self, db: Session):
+        firm, employees = _seed(db)
+        get_sgk_status_map(db, employees, period_code="2025-09")
+
+        refresh_sgk_status(db, cari_id=firm.Id)
+        db.commit()
+
+        assert db.query(PortalEmployeeSgkStatus).filter_by(period_code="2025-09").count() == 0
+        assert db.query(PortalEmployeeSgkStatus).filter_by(period_code=PERIOD).count() == len(employees)
+
+    def test_refresh_requires_scope(self, db: Session):
+        with pytest.raises(ValueError):
+            refresh_sgk_status(db)
+
+    def test_employee_update_endpoint_refreshes(self, client: TestClient, db: Session):
+        firm, employees = _seed(db)
+        employee = employees[1]
+        get_sgk_status_map(db, [employee])
+        app.dependency_overrides[get_current_portal_user] = lambda: SimpleNamespace(id=1, cari_id=firm.Id)
+        try:
+            response = client.put(
+                f"/api/v1/portal/employees/{employee.id}",
+                json={"sgk_last_check_period": "202510", "sgk_is_active_last_period": True},
+            )
+            assert response.status_code == 200
+            assert response.json()["sgk_status"] == EmployeeSgkStatus.TAM.value
+
+            listed = client.get("/api/v1/portal/employees").json()
+        finally:
+            app.dependency_overrides.pop(get_current_portal_user, None)
+
+        db.expire_all()
+        assert _stored(db, employee.id) == EmployeeSgkStatus.TAM.value
+        assert {item["id"]: item["sgk_status"] for item in listed}[employee.id] == EmployeeSgkStatus.TAM.value
+
+
+class TestRolloverJob:
+    def test_recompute_in_batches(self, db: Session):
+        _, employees = _seed(db, count=5)
+        assert recompute_sgk_status(db, batch_size=2) == 5
+        assert db.query(PortalEmployeeSgkStatus).filter_by(period_code=PERIOD).count() == 5
+
+    def test_job_recomputes_only_when_period_incomplete(self, db: Session):
+        _, employees = _seed(db, count=4)
+        get_sgk_status_map(db, employees[:1])
+
+        assert sgk_status_job.sgk_status_rollover_job(db) == 4
+        assert sgk_status_job.sgk_status_rollover_job(db) == 0
@@ -0,0 +1,94 @@
+"""
+Streaming export (CSV / Excel) testleri
+"""
+from io import BytesIO
+
+import openpyxl
+from sqlalchemy.orm import Session
+
+from aliaport_api.core.streaming_export import UTF8_BOM, iter_csv, iter_xlsx
+from aliaport_api.modules.auth.models import User
+from aliaport_api.modules.dijital_arsiv.export import DOCUMENT_LIST_HEADERS, ArchiveReportExporter
+from aliaport_api.modules.dijital_arsiv.models import (
+    ArchiveDocument, DocumentCategory, DocumentStatus, DocumentType, PortalUser
+)
+from tests.conftest import create_cari
+
+
+def _add_document(db: Session, cari_id: int, **kwargs) -> ArchiveDocument:
+    base = {
+        "category": DocumentCategory.CARI,
+        "document_type": DocumentType.DIGER_EVRAK,
+        "cari_id": cari_id,
+        "file_name": "belge.pdf",
+        "file_path": "uploads/belge.pdf",
+        "file_size": 2 * 1024 * 1024,
+        "file_type": "application/pdf",
+        "file_hash": "0" * 64,
+    }
+    base.update(kwargs)
+    doc = ArchiveDocument(**base)
+    db.add(doc)
+    db.commit()
+    return doc
+
+
+class TestIterCsv:
+    def test_chunks_rows_and_prefixes_bom_once(self):
+        rows = ([i, f"Şirket {i}"] for i in range(5))
+        chunks = list(iter_csv(["ID", "Ünvan"], rows, chunk_rows=2))
+
+        assert len(chunks) == 3
+        assert chunks[0].startswith(UTF8_BOM)
+        assert not any(chunk.startswith(UTF8_BOM) for chunk in chunks[1:])
+        lines = b"".join(chunks)[len(UTF8_BOM):].decode("utf-8").split("\r\n")
+        assert lines[0] == "ID;Ünvan"
+        assert lines[5] == "4;Şirket 4"
+
+    def test_empty_rows_still_emit_header(self):
+        chunks = list(iter_csv(["A", "B"], [], bom=False))
+        assert b"".join(chunks) == b"A;B\r\n"
+
+
+class TestIterXlsx:
+    def test_write_only_workbook_roundtrip(self):
+        content = b"".join(iter_xlsx(["ID", "Ad"], ([i, f"R{i}"] for i in range(3)), sheet_title="Test", column_widths=[6, 20]))
+
+        ws = openpyxl.load_workbook(BytesIO(content))["Test"]
+        values = list(ws.iter_rows(values_only=True))
+        assert values[0] == ("ID", "Ad")
+        assert values[-1] == (2, "R2")
+        assert ws["A1"].font.bold is True
+        assert ws.column_dimensions["B"].width == 20
+
+
+class TestArchiveDocumentRows:
+    def test_joined_rows_resolve_related_names(self, db: Session):
+        cari = create_cari(db, Unvan="Liman A.Ş.")
+        approver = User(email="onay@aliaport.com", hashed_password="x", full_name="Onay Veren", is_active=True)
+        portal_user = PortalUser(cari_id=cari.Id, email="portal@firma.com", hashed_password="x", full_name="Portal Kişi")
+        db.add_all([approver, portal_user])
+        db.commit()
+
+        _add_document(db, cari.Id, uploaded_by_portal_user_id=portal_user.id, approved_by_id=approver.id, status=DocumentStatus.APPROVED)
+        _add_document(db, cari.Id, status=DocumentStatus.UPLOADED)
+        _add_document(db, cari.Id, is_latest_version=False)
+
+        rows = list(ArchiveReportExporter().document_rows(db, batch_size=1))
+
+        assert len(rows) == 2
+        assert len(rows[0]) == len(DOCUMENT_LIST_HEADERS)
+        assert rows[0][3] == "APPROVED"
+        assert rows[0][5] == "Liman A.Ş."
+        assert rows[0][6] == "Portal Kişi"
+        assert rows[0][8] == "Onay Veren"
+        assert rows[0][11] == 2.0
+        assert rows[1][6] == "" and rows[1][8] == ""
+
+    def test_status_filter(self, db: Session):
+        cari = create_cari(db)
+        _add_document(db, cari.Id, status=DocumentStatus.APPROVED)
+        _add_document(db, cari.Id, status=DocumentStatus.REJECTED)
+
+        rows = list(ArchiveReportExporter().document_rows(db, status=DocumentStatus.REJECTED))
+        assert [row[3] for row in rows] == ["REJECTED"]
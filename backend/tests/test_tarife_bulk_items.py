@@ -0,0 +1,86 @@
+"""Tarife kalemi toplu yükleme: RETURNING ile tek INSERT, çakışma modları ve satır bazlı doğrulama hataları."""
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from aliaport_api.modules.tarife.models import PriceList, PriceListItem
+
+
+def _price_list(db: Session, kod: str = "PLB") -> PriceList:
+    price_list = PriceList(Kod=kod, Ad=kod)
+    db.add(price_list)
+    db.commit()
+    return price_list
+
+
+def _url(price_list: PriceList) -> str:
+    return f"/api/price-list/{price_list.Id}/items/bulk"
+
+
+def test_large_load_uses_single_insert_returning(client: TestClient, db: Session, count_statements):
+    price_list = _price_list(db)
+    rows = [{"HizmetKodu": f"K{i:04d}", "HizmetAdi": f"Kalem {i}", "BirimFiyat": i + 1, "SiraNo": i} for i in range(3000)]
+
+    with count_statements(db) as statements:
+        response = client.post(_url(price_list), json=rows)
+
+    body = response.json()
+    assert body["success"], body
+    data = body["data"]
+    assert [item["HizmetKodu"] for item in data] == [row["HizmetKodu"] for row in rows]
+    assert all(item["Id"] and item["CreatedAt"] and item["PriceListId"] == price_list.Id for item in data)
+    assert db.query(PriceListItem).count() == 3000
+    # Satır başına refresh SELECT'i yok; INSERT ... RETURNING çok satırlı batch'ler halinde
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+    assert 0 < len(inserts) <= 10
+    assert len(statements) <= 15
+
+
+def test_conflict_modes(client: TestClient, db: Session):
+    price_list = _price_list(db)
+    db.add(PriceListItem(PriceListId=price_list.Id, HizmetKodu="VAR", HizmetAdi="Eski", BirimFiyat=10))
+    db.commit()
+    rows = [
+        {"HizmetKodu": "YENI", "HizmetAdi": "Yeni", "BirimFiyat": 5},
+        {"HizmetKodu": "VAR", "HizmetAdi": "Güncel", "BirimFiyat": 12},
+    ]
+
+    rejected = client.post(_url(price_list), json=rows).json()
+    assert rejected["error"]["code"] == "VALIDATION_ERROR"
+    assert [(e["index"], e["code"]) for e in rejected["error"]["details"]["errors"]] == [(1, "DUPLICATE_ENTRY")]
+    assert db.query(PriceListItem).count() == 1
+
+    skipped = client.post(_url(price_list), params={"on_conflict": "skip"}, json=rows).json()
+    assert [item["HizmetKodu"] for item in skipped["data"]] == ["YENI"]
+
+    rows[0]["HizmetKodu"] = "YENI2"
+    upserted = client.post(_url(price_list), params={"on_conflict": "update"}, json=rows).json()
+    assert [(item["HizmetKodu"], item["HizmetAdi"]) for item in upserted["data"]] == [("YENI2", "Yeni"), ("VAR", "Güncel")]
+    existing = db.query(PriceListItem).filter_by(HizmetKodu="VAR").one()
+    db.refresh(existing)
+    assert (existing.HizmetAdi, float(existing.BirimFiyat)) == ("Güncel", 12.0)
+    assert db.query(PriceListItem).count() == 3
+
+
+def test_row_errors_reported_by_index_and_nothing_written(client: TestClient, db: Session):
+    price_list = _price_list(db)
+    other = _price_list(db, "DIGER")
+    rows = [
+        {"HizmetKodu": "A", "HizmetAdi": "A", "BirimFiyat": 1},
+        {"HizmetKodu": "B", "HizmetAdi": "B", "BirimFiyat": "abc"},
+        {"HizmetKodu": "A", "HizmetAdi": "Tekrar", "BirimFiyat": 2},
+        {"HizmetKodu": "C", "HizmetAdi": "C", "BirimFiyat": 3, "PriceListId": other.Id},
+        {"HizmetAdi": "Kodsuz", "BirimFiyat": 4},
+    ]
+
+    body = client.post(_url(price_list), json=rows).json()
+
+    assert body["success"] is False
+    details = body["error"]["details"]
+    assert [(e["index"], e["code"], e["field"]) for e in details["errors"]] == [
+        (1, "VALIDATION_ERROR", "BirimFiyat"),
+        (2, "DUPLICATE_ENTRY", "HizmetKodu"),
+        (3, "INVALID_INPUT", "PriceListId"),
+        (4, "VALIDATION_ERROR", "HizmetKodu"),
+    ]
+    assert (details["error_count"], details["truncated"]) == (4, False)
+    assert db.query(PriceListItem).count() == 0
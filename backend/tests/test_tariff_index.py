@@ -0,0 +1,150 @@
+"""Tarife aralık index'i: SQL sorgusuyla eşdeğerlik, commit'te artımlı güncelleme ve toplu fiyatlama."""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, sessionmaker
+
+from aliaport_api.modules.hizmet.models import Hizmet, TarifeListesi
+from aliaport_api.modules.hizmet.tariff_index import tariff_index
+
+BASE_URL = "/api/hizmet"
+
+
+def _hizmet(db: Session, kod: str, **kw) -> Hizmet:
+    hizmet = Hizmet(Kod=kod, Ad=kod, AktifMi=True, ParaBirimi="TRY", Fiyat=100, CalculationType="FIXED", **kw)
+    db.add(hizmet)
+    db.commit()
+    return hizmet
+
+
+def _sql_lookup(db: Session, hizmet_id: int, on_date: date):
+    # calculate_price'ın önceki satır başına sorgusu
+    return db.query(TarifeListesi).filter(
+        TarifeListesi.HizmetId == hizmet_id,
+        TarifeListesi.IsActive == True,  # noqa: E712
+        TarifeListesi.ValidFrom <= on_date,
+        or_(TarifeListesi.ValidTo.is_(None), TarifeListesi.ValidTo >= on_date),
+    ).order_by(TarifeListesi.ValidFrom.desc(), TarifeListesi.Id.desc()).first()
+
+
+def test_index_matches_sql_for_overlapping_tariffs(db: Session):
+    rng = random.Random(7)
+    hizmet = _hizmet(db, "IDX")
+    start = date(2024, 1, 1)
+    for i in range(40):
+        valid_from = start + timedelta(days=rng.randint(0, 700))
+        valid_to = None if rng.random() < 0.2 else valid_from + timedelta(days=rng.randint(0, 200))
+        db.add(TarifeListesi(HizmetId=hizmet.Id, ValidFrom=valid_from, ValidTo=valid_to,
+                             OverridePrice=Decimal(i + 1), IsActive=rng.random() > 0.1))
+    db.commit()
+
+    days = [start + timedelta(days=offset) for offset in range(-5, 950, 3)]
+    indexed = tariff_index.lookup_many(db, [(hizmet.Id, day) for day in days])
+
+    for day, entry in zip(days, indexed):
+        expected = _sql_lookup(db, hizmet.Id, day)
+        assert (entry.id if entry else None) == (expected.Id if expected else None), day
+
+
+def test_calculate_price_sees_committed_tariff_writes(client: TestClient, db: Session):
+    hizmet = _hizmet(db, "WRITE")
+    payload = {"hizmet_id": hizmet.Id, "effective_date": "2025-08-01"}
+    assert tariff_index.lookup(db, hizmet.Id, date(2025, 8, 1)) is None
+
+    tarife = TarifeListesi(HizmetId=hizmet.Id, ValidFrom=date(2025, 7, 1), OverridePrice=22, OverrideCurrency="USD")
+    db.add(tarife)
+    db.commit()
+    data = client.post(f"{BASE_URL}/calculate-price", json=payload).json()["data"]
+    assert (data["calculated_price"], data["currency"], data["tarife_listesi_id"]) == ("22.0000", "USD", tarife.Id)
+
+    # Rollback edilen yazım index'i değiştirmez; commit edilen pasifleştirme değiştirir
+    other = sessionmaker(bind=db.get_bind())()
+    other.get(TarifeListesi, tarife.Id).OverridePrice = 99
+    other.flush()
+    other.rollback()
+    other.close()
+    assert client.post(f"{BASE_URL}/calculate-price", json=payload).json()["data"]["calculated_price"] == "22.0000"
+
+    tarife.IsActive = False
+    db.commit()
+    assert tariff_index.lookup(db, hizmet.Id, date(2025, 8, 1)) is None
+
+
+def test_commit_during_load_is_not_overwritten(db: Session, monkeypatch):
+    hizmet = _hizmet(db, "RACE")
+    load = tariff_index._load
+
+    def racing_load(session, hizmet_ids):
+        grouped = load(session, hizmet_ids)
+        # Yükleme sürerken başka bir istek tarife yazıp commit etti
+        other = sessionmaker(bind=db.get_bind())()
+        other.add(TarifeListesi(HizmetId=hizmet.Id, ValidFrom=date(2025, 1, 1), OverridePrice=7))
+        other.commit()
+        other.close()
+        return grouped
+
+    monkeypatch.setattr(tariff_index, "_load", racing_load)
+    assert tariff_index.lookup(db, hizmet.Id, date(2025, 8, 1)) is None
+    monkeypatch.undo()
+
+    assert tariff_index.lookup(db, hizmet.Id, date(2025, 8, 1)).override_price == Decimal(7)
+
+
+def test_uncommitted_tariff_rows_not_cached(db: Session):
+    hizmet = _hizmet(db, "DIRTY")
+    db.add(TarifeListesi(HizmetId=hizmet.Id, ValidFrom=date(2025, 1, 1), OverridePrice=5))
+    db.flush()
+    # Oturum kendi flush edilmiş satırını görür ama paylaşılan index'e yazmaz
+    assert tariff_index.lookup(db, hizmet.Id, date(2025, 8, 1)) is not None
+    db.rollback()
+    assert tariff_index.lookup(db, hizmet.Id, date(2025, 8, 1)) is None
+
+
+def test_bulk_pricing_resolves_each_line_by_date(client: TestClient, db: Session):
+    hizmet = _hizmet(db, "BULK")
+    passive = _hizmet(db, "PASIF")
+    passive.AktifMi = False
+    db.add_all([
+        TarifeListesi(HizmetId=hizmet.Id, ValidFrom=date(2025, 1, 1), ValidTo=date(2025, 6, 30), OverridePrice=20),
+        TarifeListesi(HizmetId=hizmet.Id, ValidFrom=date(2025, 7, 1), OverridePrice=22),
+    ])
+    db.commit()
+    builds = tariff_index.stats()["builds"]
+
+    lines = [{"hizmet_id": hizmet.Id, "effective_date": f"2025-{month:02d}-15"} for month in range(1, 13)]
+    lines += [
+        {"hizmet_id": hizmet.Id, "effective_date": "2025-03-01", "override_price": 5},
+        {"hizmet_id": passive.Id},
+        {"hizmet_id": 999999},
+    ]
+    response = client.post(f"{BASE_URL}/calculate-price/bulk", json={"items": lines})
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    prices = [float(item["data"]["calculated_price"]) for item in data["items"][:13]]
+    assert prices == [20] * 6 + [22] * 6 + [5]
+    assert [item["error"]["code"] for item in data["items"][13:]] == ["HIZMET_INACTIVE", "HIZMET_NOT_FOUND"]
+    assert (data["succeeded"], data["failed"]) == (13, 2)
+    assert tariff_index.stats()["builds"] == builds + 1
+
+
+def test_bulk_pricing_without_tariff_uses_engine(client: TestClient, db: Session):
+    per_unit = Hizmet(Kod="ADET", Ad="ADET", AktifMi=True, ParaBirimi="USD", Fiyat=100, CalculationType="PER_UNIT")
+    vehicle = Hizmet(Kod="ARAC", Ad="ARAC", AktifMi=True, ParaBirimi="USD", Fiyat=15, CalculationType="VEHICLE_4H_RULE")
+    db.add_all([per_unit, vehicle])
+    db.commit()
+
+    lines = [
+        {"hizmet_id": per_unit.Id, "effective_date": "2024-03-01", "quantity": 3},
+        {"hizmet_id": vehicle.Id, "vehicle_duration_minutes": 450},
+        {"hizmet_id": per_unit.Id},
+    ]
+    data = client.post(f"{BASE_URL}/calculate-price/bulk", json={"items": lines}).json()["data"]
+
+    assert [float(item["data"]["calculated_price"]) for item in data["items"][:2]] == [300, 28.125]
+    assert data["items"][0]["data"]["tarife_override_applied"] is False
+    assert data["items"][2]["error"]["code"] == "VALIDATION_ERROR"
+    assert "quantity" in data["items"][2]["error"]["message"]
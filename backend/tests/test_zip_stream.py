@@ -0,0 +1,136 @@
+"""
+Streaming ZIP writer ve admin toplu belge indirme testleri
+"""
+import io
+import os
+import time
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from aliaport_api.core.zip_stream import STALE_PART_SECONDS, ZipEntry, iter_zip, remove_stale_parts, write_zip_file
+from aliaport_api.main import app
+from aliaport_api.modules.dijital_arsiv.models import PortalEmployee, PortalEmployeeDocument
+from aliaport_api.modules.dijital_arsiv.portal_router import get_current_portal_user
+from tests.conftest import create_cari
+
+
+@pytest.fixture
+def sample_files(tmp_path):
+    pdf = tmp_path / "ehliyet.pdf"
+    pdf.write_bytes(b"%PDF-1.4" + bytes(range(256)) * 4000)
+    txt = tmp_path / "not.txt"
+    txt.write_bytes(b"aliaport " * 50000)
+    return pdf, txt
+
+
+class TestIterZip:
+    def test_streams_blocks_and_selects_compression(self, sample_files):
+        pdf, txt = sample_files
+        entries = [ZipEntry(str(pdf), "A/ehliyet.pdf"), ZipEntry(str(txt), "A/not.txt")]
+
+        chunks = list(iter_zip(entries, block_size=64 * 1024))
+
+        assert len(chunks) > 2
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+        assert archive.testzip() is None
+        infos = {info.filename: info for info in archive.infolist()}
+        assert infos["A/ehliyet.pdf"].compress_type == zipfile.ZIP_STORED
+        assert infos["A/not.txt"].compress_type == zipfile.ZIP_DEFLATED
+        assert archive.read("A/ehliyet.pdf") == pdf.read_bytes()
+
+    def test_skips_missing_and_dedupes_names(self, sample_files):
+        pdf, _ = sample_files
+        entries = [
+            ZipEntry(str(pdf), "A/belge.pdf"),
+            ZipEntry(str(pdf), "A/belge.pdf"),
+            ZipEntry("/yok/dosya.pdf", "A/yok.pdf"),
+        ]
+
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(iter_zip(entries))))
+        assert archive.namelist() == ["A/belge.pdf", "A/belge_2.pdf"]
+
+    def test_write_zip_file_is_atomic(self, sample_files, tmp_path):
+        pdf, txt = sample_files
+        destination = tmp_path / "out.zip"
+
+        written = write_zip_file([ZipEntry(str(pdf), "a.pdf"), ZipEntry(str(txt), "b.txt")], str(destination))
+
+        assert written == 2
+        assert not (tmp_path / "out.zip.part").exists()
+        assert zipfile.ZipFile(destination).testzip() is None
+
+    def test_remove_stale_parts_keeps_active_writes(self, tmp_path):
+        nested = tmp_path / "employee_documents"
+        nested.mkdir()
+        stale = nested / "old.zip.part"
+        active = nested / "new.zip.part"
+        done = nested / "old.zip"
+        for path in (stale, active, done):
+            path.write_bytes(b"x")
+        old = time.time() - STALE_PART_SECONDS - 1
+        os.utime(stale, (old, old))
+        os.utime(done, (old, old))
+
+        assert remove_stale_parts(tmp_path) == 1
+        assert not stale.exists() and active.exists() and done.exists()
+
+
+class TestAdminEmployeeDocumentsZip:
+    base_url = "/api/v1/admin/employees/documents"
+
+    @pytest.fixture
+    def admin_client(self, client: TestClient, tmp_path, monkeypatch):
+        monkeypatch.setenv("EXPORTS_DIR", str(tmp_path / "exports"))
+        app.dependency_overrides[get_current_portal_user] = lambda: SimpleNamespace(is_admin=True)
+        yield client
+        app.dependency_overrides.pop(get_current_portal_user, None)
+
+    def _add_document(self, db: Session, path) -> None:
+        cari = create_cari(db, CariKod="FRM1")
+        employee = PortalEmployee(cari_id=cari.Id, full_name="Ali Veli")
+        db.add(employee)
+        db.commit()
+        db.add(PortalEmployeeDocument(
+            employee_id=employee.id, cari_id=cari.Id, document_type="EHLIYET",
+            file_name="ehliyet.pdf", file_path=str(path), file_size=path.stat().st_size,
+            file_type="application/pdf",
+        ))
+        db.commit()
+
+    def test_download_zip_streams_archive(self, admin_client: TestClient, db: Session, sample_files):
+        self._add_document(db, sample_files[0])
+
+        r = admin_client.get(self.base_url + "/download-zip")
+
+        assert r.status_code == 200
+        assert r.headers["content-type"] == "application/zip"
+        names = zipfile.ZipFile(io.BytesIO(r.content)).namelist()
+        assert len(names) == 1 and names[0].startswith("FRM1/Ali_Veli/EHLIYET_")
+
+    def test_download_zip_not_found(self, admin_client: TestClient):
+        assert admin_client.get(self.base_url + "/download-zip").status_code == 404
+
+    def test_prepared_archive_supports_range(self, admin_client: TestClient, db: Session, sample_files, tmp_path):
+        self._add_document(db, sample_files[0])
+
+        r = admin_client.post(self.base_url + "/download-zip/prepare")
+        assert r.status_code == 202
+        body = r.json()
+        assert body["file_count"] == 1
+
+        full = admin_client.get(body["download_url"])
+        assert full.status_code == 200
+        assert full.headers["accept-ranges"] == "bytes"
+
+        partial = admin_client.get(body["download_url"], headers={"Range": "bytes=100-"})
+        assert partial.status_code == 206
+        assert partial.content == full.content[100:]
+        assert (tmp_path / "exports" / "employee_documents").is_dir()
+
+    def test_prepared_archive_unknown_id(self, admin_client: TestClient):
+        assert admin_client.get(self.base_url + "/archives/" + "0" * 32).status_code == 404
+        assert admin_client.get(self.base_url + "/archives/../../etc").status_code == 404
@@ -67,6 +67,7 @@ interface Stats {
 
 export function AdminEmployeeReport() {
   const [employees, setEmployees] = useState<EmployeeReport[]>([]);
+  const [totalCount, setTotalCount] = useState(0);
   const [stats, setStats] = useState<Stats | null>(null);
   const [isLoading, setIsLoading] = useState(true);
   
@@ -106,6 +107,8 @@ export function AdminEmployeeReport() {
         { headers: { Authorization: `Bearer ${token}` } }
       );
       setEmployees(response.data);
+      // Sayfasız istekte tüm liste döner; X-Total-Count sunucudaki toplamdır
+      setTotalCount(Number(response.headers['x-total-count'] ?? response.data.length));
     } catch (error: any) {
       toast.error(error.response?.data?.detail || 'Çalışanlar yüklenemedi');
     } finally {
@@ -328,7 +331,11 @@ export function AdminEmployeeReport() {
         <Card>
           <CardHeader>
             <div className="flex items-center justify-between">
-              <CardTitle>{employees.length} Çalışan Bulundu</CardTitle>
+              <CardTitle>
+                {totalCount > employees.length
+                  ? `${totalCount} Çalışandan ${employees.length} Tanesi Gösteriliyor`
+                  : `${employees.length} Çalışan Bulundu`}
+              </CardTitle>
               <div className="flex gap-2">
                 <Button onClick={downloadDocumentsZip} variant="outline" size="sm">
                   <Download className="h-4 w-4 mr-2" />